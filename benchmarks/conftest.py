@@ -0,0 +1,97 @@
+from collections import Counter
+from pathlib import Path
+
+import ape
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+DAY = 86400
+# SingleCampaign and Distributor before the optimizations, for the legacy comparisons
+LEGACY_SOURCES = Path(__file__).parent / "legacy"
+
+@pytest.fixture(scope="session")
+def alice(accounts):
+    return accounts[0]
+
+@pytest.fixture(scope="session")
+# guard address
+def bob(accounts):
+    return accounts[1]
+
+@pytest.fixture(scope="session")
+# diana is recovery address
+def diana(accounts):
+    return accounts[3]
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 30, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture(scope="module")
+def multicall(project, alice):
+    return alice.deploy(project.Multicall)
+
+@pytest.fixture
+def rpc_counter(networks):
+    """
+    counts the JSON-RPC requests sent through the connected provider by method, eth_call, eth_blockNumber, ...
+    """
+    web3_provider = networks.provider.web3.provider
+    make_request = web3_provider.make_request
+    counter = Counter()
+
+    def counting_make_request(method, params):
+        counter[method] += 1
+        return make_request(method, params)
+
+    # ape sends some requests to the web3 provider directly, web3 through a cached middleware chain
+    web3_provider.make_request = counting_make_request
+    web3_provider._request_func_cache = (None, None)
+    yield counter
+    del web3_provider.make_request
+    web3_provider._request_func_cache = (None, None)
+
+
+@pytest.fixture(scope="module")
+def deploy_fleet(project, alice, bob, crvusd_token, reward_token, test_gauge, diana):
+    """
+    deploys n campaigns with bob as guard behind one funded Distributor
+    """
+    def deploy(n, epochs, min_epoch_duration=4 * DAY):
+        campaigns = [alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS) for _ in range(n)]
+        distributor = alice.deploy(project.Distributor, [bob] + campaigns, reward_token, [test_gauge], diana)
+        reward_token.transfer(distributor, sum(epochs) * n, sender=bob)
+
+        for i, campaign in enumerate(campaigns):
+            campaign.setup(distributor, test_gauge, min_epoch_duration, i, f"campaign {i}", sender=bob)
+            campaign.set_reward_epochs(epochs, sender=bob)
+
+        return distributor, campaigns
+
+    return deploy
+
+
+@pytest.fixture(scope="session")
+def legacy_container(compilers):
+    """
+    compiles a contract as it was before the optimizations, for before and after comparisons
+
+    benchmarks/legacy/ holds the sources of the tree the optimizations started from,
+    the git history is not used, its first commit differs between clones.
+    """
+    def compile_legacy(name):
+        source = (LEGACY_SOURCES / f"{name}.vy").read_text()
+        return compilers.compile_source("vyper", source, contractName=f"Legacy{name}")
+
+    return compile_legacy
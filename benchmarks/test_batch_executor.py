@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def batch_executor(project, alice):
+    return alice.deploy(project.BatchExecutor)
+
+
+@pytest.mark.parametrize("n", [1, 5, 20, 27])
+def test_batch_execute_gas(n, alice, bob, chain, crvusd_token, deploy_fleet, batch_executor):
+    distributor, campaigns = deploy_fleet(n, [10**18] * 2)
+    for campaign in campaigns:
+        crvusd_token.mint(campaign, 10**18, sender=alice)
+
+    snapshot = chain.snapshot()
+    single_receipts = [campaign.execute(sender=bob) for campaign in campaigns]
+    single_gas = sum(receipt.gas_used for receipt in single_receipts)
+    single_calldata = sum(len(receipt.transaction.data) for receipt in single_receipts)
+    chain.restore(snapshot)
+
+    batch_receipt = batch_executor.execute(campaigns, sender=bob)
+    batch_gas = batch_receipt.gas_used
+    batch_calldata = len(batch_receipt.transaction.data)
+
+    print(f"\nexecute() for {n} campaigns")
+    print(f"{'':<8}{'txs':>5}{'gas':>12}{'calldata bytes':>16}")
+    print(f"{'single':<8}{n:>5}{single_gas:>12}{single_calldata:>16}")
+    print(f"{'batch':<8}{1:>5}{batch_gas:>12}{batch_calldata:>16}")
+    print(f"saved: {single_gas - batch_gas} gas, {n - 1} transactions")
+
+    executed = batch_executor.BatchExecuted.from_receipt(batch_receipt)[0].executed_campaigns
+    assert len(executed) == n
+    assert crvusd_token.balanceOf(bob) == n * 10**17
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+from scripts._addresses import campaign_proxy_addresses, campaign_salt
+from scripts._campaign_spec import load_campaign_spec
+from scripts._factory import campaign_params
+
+
+@pytest.fixture(scope="module")
+def factory(project, alice):
+    return alice.deploy(project.Proxy)
+
+
+@pytest.fixture(scope="module")
+def implementation(project, alice, bob, crvusd_token, factory):
+    # only the factory initializes the proxies
+    return alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, factory)
+
+
+def test_deploy_optimism_period(project, alice, bob, chain, crvusd_token, test_gauge, implementation, factory):
+    proxy_addresses = campaign_proxy_addresses(factory.address, implementation.address, alice.address, "optimism", 27)
+    campaign_specs = load_campaign_spec("campaigns/optimism.yaml", proxy_addresses, check_addresses=False)
+    for campaign_spec in campaign_specs:
+        campaign_spec.gauge = test_gauge.address
+        campaign_spec.distributor = alice.address
+    n = len(campaign_specs)
+
+    # deploy, setup and set_reward_epochs for every campaign
+    start = time.perf_counter()
+    legacy_gas = 0
+    for campaign_spec in campaign_specs:
+        campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+        legacy_gas += chain.get_receipt(campaign.txn_hash).gas_used
+        legacy_gas += campaign.setup(campaign_spec.distributor, campaign_spec.gauge, campaign_spec.min_epoch_duration, campaign_spec.id, campaign_spec.name, sender=bob).gas_used
+        legacy_gas += campaign.set_reward_epochs(campaign_spec.reward_epochs, sender=bob).gas_used
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    params = [campaign_params(campaign_spec, campaign_salt("optimism", i)) for i, campaign_spec in enumerate(campaign_specs)]
+    receipt = factory.deploy_campaigns(implementation, [bob], crvusd_token, 10**17, params, sender=alice)
+    factory_time = time.perf_counter() - start
+
+    print(f"\ndeploy and configure {n} Optimism campaigns")
+    print(f"{'':<9}{'txs':>5}{'gas':>12}{'wall time':>12}")
+    print(f"{'single':<9}{3 * n:>5}{legacy_gas:>12}{legacy_time:>11.3f}s")
+    print(f"{'factory':<9}{1:>5}{receipt.gas_used:>12}{factory_time:>11.3f}s")
+
+    assert factory.MultipleNewProxy.from_receipt(receipt)[0].proxies == [c.address for c in campaign_specs]
+    assert receipt.gas_used < legacy_gas
@@ -0,0 +1,53 @@
+import time
+
+from scripts._lens import read_campaign_lens
+
+N_CAMPAIGNS = 20
+
+# the getters a status view needs without the lens
+STATUS_GETTERS = (
+    "is_setup_complete",
+    "is_reward_epochs_set",
+    "distributor_address",
+    "receiving_gauge",
+    "min_epoch_duration",
+    "name",
+    "last_reward_distribution_time",
+    "have_rewards_started",
+    "last_reward_amount",
+    "get_all_epochs",
+    "get_next_epoch_info",
+    "execution_allowed",
+    "next_execution_allowed_time",
+    "execute_reward_amount",
+    "next_execution_payment_amount",
+)
+
+
+def test_campaign_lens_reads(project, alice, bob, deploy_fleet, rpc_counter):
+    distributor, campaigns = deploy_fleet(N_CAMPAIGNS, [10**18] * 3)
+    lens = alice.deploy(project.CampaignLens)
+    addresses = [c.address for c in campaigns]
+
+    rpc_counter["eth_call"] = 0
+    start = time.perf_counter()
+    for campaign in campaigns:
+        for getter in STATUS_GETTERS:
+            getattr(campaign, getter)()
+    getter_time = time.perf_counter() - start
+    getter_calls = rpc_counter["eth_call"]
+
+    rpc_counter["eth_call"] = 0
+    start = time.perf_counter()
+    states = read_campaign_lens(addresses, lens_address=lens.address)
+    lens_time = time.perf_counter() - start
+    lens_calls = rpc_counter["eth_call"]
+    lens_gas = lens.get_campaign_states.estimate_gas_cost(addresses)
+
+    print(f"\nstatus reads for {N_CAMPAIGNS} campaigns")
+    print(f"{'':<10}{'eth_call':>10}{'wall time':>12}")
+    print(f"{'getters':<10}{getter_calls:>10}{getter_time:>11.3f}s")
+    print(f"{'lens':<10}{lens_calls:>10}{lens_time:>11.3f}s  ({lens_gas} gas)")
+
+    assert [state.remaining_epochs for state in states] == [[10**18] * 3] * N_CAMPAIGNS
+    assert lens_calls == 1
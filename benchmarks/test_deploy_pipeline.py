@@ -0,0 +1,36 @@
+import time
+
+from ape.utils import ZERO_ADDRESS
+
+from scripts._pipeline import TransactionPipeline
+
+N_CAMPAIGNS = 20
+GAS_LIMIT = 2500000
+
+
+def test_deploy_pipeline(project, alice, bob, chain, crvusd_token):
+    # deploy_many_campaigns before the pipeline, without the sleep between deployments
+    start = time.perf_counter()
+    legacy_receipts = []
+    for _ in range(N_CAMPAIGNS):
+        campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS, gas_limit=GAS_LIMIT)
+        legacy_receipts.append(chain.get_receipt(campaign.txn_hash))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pipeline = TransactionPipeline(alice, poll_interval=0.1)
+    deployments = [pipeline.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS, gas_limit=GAS_LIMIT) for _ in range(N_CAMPAIGNS)]
+    pipelined_receipts = pipeline.wait()
+    pipelined_time = time.perf_counter() - start
+
+    legacy_blocks = legacy_receipts[-1].block_number - legacy_receipts[0].block_number + 1
+    pipelined_blocks = pipelined_receipts[-1].block_number - pipelined_receipts[0].block_number + 1
+
+    print(f"\ndeploy {N_CAMPAIGNS} campaigns on {chain.provider.name}")
+    print(f"{'':<11}{'blocks':>8}{'wall time':>12}")
+    print(f"{'sequential':<11}{legacy_blocks:>8}{legacy_time:>11.3f}s")
+    print(f"{'pipelined':<11}{pipelined_blocks:>8}{pipelined_time:>11.3f}s")
+
+    assert not any(receipt.failed for receipt in pipelined_receipts)
+    assert [receipt.contract_address for receipt in pipelined_receipts] == [d.contract_address for d in deployments]
+    assert pipelined_blocks <= legacy_blocks
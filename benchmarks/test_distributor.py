@@ -0,0 +1,72 @@
+import pytest
+
+DAY = 86400
+
+
+@pytest.fixture(scope="module")
+def legacy_distributor_container(legacy_container):
+    """
+    Distributor from benchmarks/legacy/, linear guard, gauge and campaign scans
+    """
+    return legacy_container("Distributor")
+
+
+def deploy(container, alice, bob, guard, n_guards, reward_token, test_gauge, diana):
+    # the sending guard is the last one, worst case for the linear scan
+    guards = [f"0x{i + 1:040x}" for i in range(n_guards - 1)] + [guard.address]
+    distributor = alice.deploy(container, guards, reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor, 10 ** 20, sender=bob)
+    return distributor
+
+
+@pytest.mark.parametrize("n_guards", [1, 10, 30])
+def test_send_reward_token_gas(n_guards, project, alice, bob, diana, reward_token, test_gauge, legacy_distributor_container):
+    gas = {}
+    for name, container in [("legacy", legacy_distributor_container), ("indexed", project.Distributor)]:
+        distributor = deploy(container, alice, bob, bob, n_guards, reward_token, test_gauge, diana)
+        gas[name] = [distributor.send_reward_token(test_gauge, 10 ** 15, 4 * DAY, sender=bob).gas_used for _ in range(30)]
+
+    print(f"\nsend_reward_token with {n_guards} guards")
+    print(f"{'':<9}{'first':>8}{'second':>8}{'30th':>8}{'total 30':>10}")
+    for name, used in gas.items():
+        print(f"{name:<9}{used[0]:>8}{used[1]:>8}{used[-1]:>8}{sum(used):>10}")
+
+    assert sum(gas["indexed"]) < sum(gas["legacy"])
+
+
+def test_many_distributions(project, alice, bob, diana, reward_token, test_gauge, legacy_distributor_container):
+    legacy = deploy(legacy_distributor_container, alice, bob, bob, 1, reward_token, test_gauge, diana)
+    indexed = deploy(project.Distributor, alice, bob, bob, 1, reward_token, test_gauge, diana)
+
+    for _ in range(30):
+        legacy.send_reward_token(test_gauge, 10 ** 15, 4 * DAY, sender=bob)
+        indexed.send_reward_token(test_gauge, 10 ** 15, 4 * DAY, sender=bob)
+
+    # one entry per distribution, the 31st reverts
+    with pytest.raises(Exception):
+        legacy.send_reward_token(test_gauge, 10 ** 15, 4 * DAY, sender=bob)
+
+    for _ in range(30):
+        indexed.send_reward_token(test_gauge, 10 ** 15, 4 * DAY, sender=bob)
+
+    print(f"\nlegacy: {len(legacy.get_all_campaign_addresses())} campaign entries after 30 distributions, 31st reverts")
+    print(f"indexed: {len(indexed.get_all_campaign_addresses())} campaign entry after {indexed.distribution_count(bob)} distributions")
+    assert indexed.distribution_count(bob) == 60
+
+
+def test_send_reward_tokens_batch(project, alice, bob, diana, reward_token):
+    # campaign-2 in deployments.yaml funds 14 allowlisted gauges
+    gauges = [alice.deploy(project.TestGauge, reward_token, diana) for _ in range(14)]
+    amounts = [10 ** 15] * len(gauges)
+    epochs = [4 * DAY] * len(gauges)
+
+    looped, batched = [alice.deploy(project.Distributor, [bob], reward_token, gauges, diana) for _ in range(2)]
+    for distributor in (looped, batched):
+        reward_token.transfer(distributor, 10 ** 20, sender=bob)
+
+    loop_gas = [looped.send_reward_token(gauge, amount, epoch, sender=bob).gas_used for gauge, amount, epoch in zip(gauges, amounts, epochs)]
+    batch_gas = batched.send_reward_tokens(gauges, amounts, epochs, sender=bob).gas_used
+
+    print(f"\n{len(gauges)} gauges: {len(loop_gas)} x send_reward_token {sum(loop_gas)} gas, send_reward_tokens {batch_gas} gas in 1 transaction")
+
+    assert batch_gas < sum(loop_gas)
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+from scripts._gas_baseline import GAS_BASELINE, GAS_REPORT, GAS_TOLERANCE_PERCENT, compare_gas, format_report, load_baseline, write_baseline
+from scripts._schedule import encode_packed_reward_epochs, encode_reward_schedule
+
+DAY = 86400
+
+EPOCH_COUNTS = [1, 7, 28, 52]
+DISTRIBUTOR_GUARD_COUNTS = [1, 10, 20, 30]
+ALLOWED_GAUGE_COUNTS = [1, 5, 10, 20]
+PROXY_COUNTS = [1, 9, 18, 27]
+
+
+def _epochs(n):
+    # a ramp followed by a flat tail, like the campaign specs
+    return [(k + 1) * 10**20 for k in range(min(n, 3))] + [4 * 10**20] * max(n - 3, 0)
+
+
+@pytest.fixture(scope="module")
+def measured():
+    return {}
+
+
+@pytest.fixture(scope="module")
+def record(measured):
+    def record(name, receipt):
+        measured[name] = {"gas": receipt.gas_used, "calldata": len(bytes(receipt.transaction.data))}
+        return receipt
+    return record
+
+
+@pytest.fixture(scope="module")
+def funded_distributor(project, alice, bob, diana, reward_token, test_gauge):
+    def deploy(guards, gauges=None):
+        distributor = alice.deploy(project.Distributor, guards, reward_token, gauges or [test_gauge], diana)
+        reward_token.transfer(distributor, 10 ** 24, sender=bob)
+        return distributor
+    return deploy
+
+
+@pytest.mark.parametrize("n", EPOCH_COUNTS)
+def test_reward_epochs_gas(n, project, alice, bob, crvusd_token, test_gauge, funded_distributor, record):
+    reward_epochs = _epochs(n)
+    calls = {
+        "set_reward_epochs": lambda campaign: campaign.set_reward_epochs(reward_epochs, sender=bob),
+        "set_reward_epochs_packed": lambda campaign: campaign.set_reward_epochs_packed(encode_packed_reward_epochs(reward_epochs), sender=bob),
+    }
+    schedule = encode_reward_schedule(reward_epochs)
+    if schedule is not None:
+        calls["set_reward_schedule"] = lambda campaign: campaign.set_reward_schedule(*schedule.args(), sender=bob)
+
+    for method, call in calls.items():
+        campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+        distributor = funded_distributor([bob, campaign])
+        setup = campaign.setup(distributor, test_gauge, 7 * DAY, 0, "gas baseline campaign", sender=bob)
+        record(f"SingleCampaign.{method}[epochs={n}]", call(campaign))
+
+    # setup takes the same arguments for every campaign, distributing the first epoch of the last one
+    record("SingleCampaign.setup", setup)
+    record(f"SingleCampaign.distribute_reward[epochs={n}]", campaign.distribute_reward(sender=alice))
+
+
+@pytest.mark.parametrize("n_distributor_guards", DISTRIBUTOR_GUARD_COUNTS)
+def test_execute_gas(n_distributor_guards, project, alice, bob, crvusd_token, test_gauge, funded_distributor, record):
+    campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+    # the campaign is the last guard of the Distributor, its own guard list stays [bob]
+    distributor = funded_distributor([f"0x{i + 1:040x}" for i in range(n_distributor_guards - 1)] + [campaign.address])
+    campaign.setup(distributor, test_gauge, 7 * DAY, 0, "gas baseline campaign", sender=bob)
+    campaign.set_reward_epochs(_epochs(7), sender=bob)
+    # the crvUSD execute reward is paid
+    crvusd_token.mint(campaign, 10**18, sender=alice)
+
+    record(f"SingleCampaign.execute[distributor_guards={n_distributor_guards}]", campaign.execute(sender=alice))
+
+
+@pytest.mark.parametrize("n_allowed_gauges", ALLOWED_GAUGE_COUNTS)
+def test_send_reward_token_gas(n_allowed_gauges, project, alice, bob, diana, reward_token, funded_distributor, record):
+    gauges = [alice.deploy(project.TestGauge, reward_token, diana) for _ in range(n_allowed_gauges)]
+    distributor = funded_distributor([bob], gauges)
+
+    # the gauge is the last of the Distributor allowlist
+    record(f"Distributor.send_reward_token[allowed_gauges={n_allowed_gauges}]", distributor.send_reward_token(gauges[-1], 10 ** 20, 7 * DAY, sender=bob))
+
+
+@pytest.mark.parametrize("n_proxies", PROXY_COUNTS)
+def test_deploy_multiple_proxies_gas(n_proxies, project, alice, bob, crvusd_token, record):
+    implementation = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+    factory = alice.deploy(project.Proxy)
+
+    record(f"Proxy.deploy_multiple_proxies[proxies={n_proxies}]", factory.deploy_multiple_proxies(implementation, n_proxies, sender=alice))
+
+
+def test_gas_baseline(project, measured):
+    """
+    runs after the measurements of this module, fails if an entry got more expensive than the baseline
+    or was not measured, e.g. under -k, -n auto or after a failed measurement
+
+    GAS_BASELINE_UPDATE=1 make benchmark_gas writes the measured values as new baseline
+    """
+    compiler = " ".join(f"{c.name} {c.version}" for c in project.manifest.compilers or [])
+
+    baseline = load_baseline()
+    changes = compare_gas(baseline, measured)
+    report = format_report(changes, GAS_TOLERANCE_PERCENT)
+    with open(GAS_REPORT, "w") as f:
+        f.write(report)
+    print(f"\n{report}")
+
+    if os.getenv('GAS_BASELINE_UPDATE') or not baseline:
+        write_baseline(measured, compiler)
+        print(f"baseline written to {GAS_BASELINE}")
+        return
+
+    missing = [change.name for change in changes if change.gas is None]
+    assert not missing, f"baseline entries not measured: {', '.join(missing)}, run the whole module without -k or -n, see {GAS_REPORT}"
+    regressions = [change.name for change in changes if change.regressed(GAS_TOLERANCE_PERCENT)]
+    assert not regressions, f"gas above the baseline by more than {GAS_TOLERANCE_PERCENT:g}%: {', '.join(regressions)}, see {GAS_REPORT}"
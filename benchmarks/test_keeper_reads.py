@@ -0,0 +1,47 @@
+import time
+
+from scripts._multicall import read_campaign_snapshots
+
+N_CAMPAIGNS = 20
+
+
+def legacy_keeper_reads(campaigns):
+    # the per campaign calls run_next_taiko did before the batched snapshot
+    due = []
+    for single_campaign in campaigns:
+        next_epoch_info = single_campaign.get_next_epoch_info()
+        DISTRIBUTION_BUFFER = single_campaign.DISTRIBUTION_BUFFER()
+        execution_allowed = single_campaign.execution_allowed()
+        if next_epoch_info[1] < DISTRIBUTION_BUFFER and execution_allowed:
+            due.append(single_campaign.address)
+        next_epoch_info = single_campaign.get_next_epoch_info()
+    return due
+
+
+def test_keeper_reads(bob, chain, deploy_fleet, multicall, rpc_counter):
+    distributor, campaigns = deploy_fleet(N_CAMPAIGNS, [10**18] * 3)
+    # half of the fleet has just distributed and is not due
+    for campaign in campaigns[::2]:
+        campaign.distribute_reward(sender=bob)
+
+    rpc_counter["eth_call"] = 0
+    start = time.perf_counter()
+    legacy_due = legacy_keeper_reads(campaigns)
+    legacy_time = time.perf_counter() - start
+    legacy_calls = rpc_counter["eth_call"]
+
+    rpc_counter["eth_call"] = 0
+    start = time.perf_counter()
+    snapshots = read_campaign_snapshots([c.address for c in campaigns], multicall_address=multicall.address)
+    batched_due = [s.address for s in snapshots if s.is_due]
+    batched_time = time.perf_counter() - start
+    batched_calls = rpc_counter["eth_call"]
+
+    print(f"\nkeeper reads for {N_CAMPAIGNS} campaigns")
+    print(f"{'':<10}{'eth_call':>10}{'wall time':>12}")
+    print(f"{'loop':<10}{legacy_calls:>10}{legacy_time:>11.3f}s")
+    print(f"{'multicall':<10}{batched_calls:>10}{batched_time:>11.3f}s")
+
+    assert batched_due == legacy_due
+    assert legacy_calls == 4 * N_CAMPAIGNS
+    assert batched_calls == 1
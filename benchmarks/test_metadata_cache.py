@@ -0,0 +1,61 @@
+import time
+
+from collections import Counter
+
+from scripts._keeper import read_campaign_deadlines
+from scripts._metadata import MetadataCache
+from scripts._planner import read_campaign_states
+
+# the Multicall takes 128 calls per eth_call, every read adds getBlockNumber() and the keeper getCurrentBlockTimestamp().
+# With 52 campaigns no read is within 15 calls of a chunk boundary:
+# keeper 2 + 3 * 52 = 158 live (2 requests) and 2 + 2 * 52 = 106 cached (1 request),
+# planner 1 + 7 * 52 = 365 live (3 requests) and 1 + 3 * 52 = 157 cached (2 requests), VERSION is read live
+N_CAMPAIGNS = 52
+# a Distributor takes at most 30 guards
+FLEET_SIZE = 26
+
+
+def test_metadata_cache(tmp_path, deploy_fleet, multicall, rpc_counter):
+    addresses = []
+    for _ in range(N_CAMPAIGNS // FLEET_SIZE):
+        addresses += [c.address for c in deploy_fleet(FLEET_SIZE, [10**18] * 3)[1]]
+    cache = MetadataCache.open(str(tmp_path / "metadata.sqlite"))
+
+    def measure(read):
+        # every JSON-RPC request counts, not only eth_call
+        rpc_counter.clear()
+        start = time.perf_counter()
+        result = read()
+        return result, Counter(rpc_counter), time.perf_counter() - start
+
+    keeper_live, keeper_live_requests, keeper_live_time = measure(lambda: read_campaign_deadlines(addresses, multicall.address)[1])
+    planner_live, planner_live_requests, planner_live_time = measure(lambda: read_campaign_states(addresses, multicall.address))
+
+    # first runs fill the cache
+    read_campaign_deadlines(addresses, multicall.address, cache=cache)
+    read_campaign_states(addresses, multicall.address, cache=cache)
+
+    keeper_cached, keeper_cached_requests, keeper_cached_time = measure(lambda: read_campaign_deadlines(addresses, multicall.address, cache=cache)[1])
+    planner_cached, planner_cached_requests, planner_cached_time = measure(lambda: read_campaign_states(addresses, multicall.address, cache=cache))
+    _, sync_requests, sync_time = measure(cache.sync_events)
+
+    def total(requests):
+        return f"{sum(requests.values())} ({requests['eth_call']})"
+
+    print(f"\nreads of {N_CAMPAIGNS} setup campaigns, JSON-RPC requests per read (eth_call)")
+    print(f"{'':<16}{'live':>10}{'cached':>10}{'live time':>12}{'cached time':>13}")
+    print(f"{'keeper tick':<16}{total(keeper_live_requests):>10}{total(keeper_cached_requests):>10}{keeper_live_time:>11.3f}s{keeper_cached_time:>12.3f}s")
+    print(f"{'planner state':<16}{total(planner_live_requests):>10}{total(planner_cached_requests):>10}{planner_live_time:>11.3f}s{planner_cached_time:>12.3f}s")
+    print(f"all requests: {dict(keeper_live_requests + planner_live_requests + keeper_cached_requests + planner_cached_requests)}")
+    print(f"event sync once per keeper run: {dict(sync_requests)}, {sync_time:.3f}s")
+
+    assert keeper_cached == keeper_live
+    assert planner_cached == planner_live
+    assert sync_requests["eth_call"] == 0
+    # the block number comes with the multicall, no eth_blockNumber request
+    for requests in (keeper_live_requests, planner_live_requests, keeper_cached_requests, planner_cached_requests):
+        assert requests["eth_blockNumber"] == 0
+    assert (keeper_live_requests["eth_call"], keeper_cached_requests["eth_call"]) == (2, 1)
+    assert (planner_live_requests["eth_call"], planner_cached_requests["eth_call"]) == (3, 2)
+    assert sum(keeper_cached_requests.values()) < sum(keeper_live_requests.values())
+    assert sum(planner_cached_requests.values()) < sum(planner_live_requests.values())
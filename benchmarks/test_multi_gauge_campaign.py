@@ -0,0 +1,85 @@
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+DAY = 86400
+EPOCH_DURATION = 3 * DAY + DAY // 2  # Taiko
+N_EPOCHS = 7
+
+
+class Counter:
+    def __init__(self):
+        self.gas = 0
+        self.transactions = 0
+
+    def add(self, receipt):
+        self.gas += receipt.gas_used
+        self.transactions += 1
+        return receipt
+
+
+def run_single_campaigns(project, alice, bob, crvusd_token, reward_token, gauges, diana, chain, epochs):
+    deploy, configure, execute = Counter(), Counter(), Counter()
+
+    campaigns = []
+    for _ in gauges:
+        campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+        deploy.add(campaign.creation_metadata.receipt)
+        campaigns.append(campaign)
+    distributor = alice.deploy(project.Distributor, [bob] + campaigns, reward_token, gauges, diana)
+    deploy.add(distributor.creation_metadata.receipt)
+    reward_token.transfer(distributor, sum(epochs) * len(gauges), sender=bob)
+
+    for i, (campaign, gauge) in enumerate(zip(campaigns, gauges)):
+        configure.add(campaign.setup(distributor, gauge, EPOCH_DURATION, i, f"campaign {i}", sender=bob))
+        configure.add(campaign.set_reward_epochs(epochs, sender=bob))
+
+    for _ in epochs:
+        for campaign in campaigns:
+            execute.add(campaign.execute(sender=alice))
+        chain.pending_timestamp = chain.pending_timestamp + EPOCH_DURATION
+        chain.mine()
+
+    return deploy, configure, execute
+
+
+def run_multi_gauge_campaign(project, alice, bob, crvusd_token, reward_token, gauges, diana, chain, epochs):
+    deploy, configure, execute = Counter(), Counter(), Counter()
+
+    campaign = alice.deploy(project.MultiGaugeCampaign, [bob], crvusd_token, 10**17)
+    deploy.add(campaign.creation_metadata.receipt)
+    distributor = alice.deploy(project.Distributor, [bob, campaign], reward_token, gauges, diana)
+    deploy.add(distributor.creation_metadata.receipt)
+    reward_token.transfer(distributor, sum(epochs) * len(gauges), sender=bob)
+
+    configure.add(campaign.setup(distributor, EPOCH_DURATION, 0, "multi gauge", sender=bob))
+    configure.add(campaign.set_reward_epochs(gauges, [epochs] * len(gauges), sender=bob))
+
+    for _ in epochs:
+        execute.add(campaign.execute(sender=alice))
+        chain.pending_timestamp = chain.pending_timestamp + EPOCH_DURATION
+        chain.mine()
+
+    return deploy, configure, execute
+
+
+@pytest.mark.parametrize("n_gauges", [3, 10])
+def test_multi_gauge_campaign(n_gauges, project, alice, bob, crvusd_token, reward_token, diana, chain):
+    gauges = [alice.deploy(project.TestGauge, reward_token, diana) for _ in range(n_gauges)]
+    epochs = [10**18 + i for i in range(N_EPOCHS)]
+    fixtures = (project, alice, bob, crvusd_token, reward_token, gauges, diana, chain, epochs)
+
+    result = {
+        "SingleCampaign": run_single_campaigns(*fixtures),
+        "MultiGaugeCampaign": run_multi_gauge_campaign(*fixtures),
+    }
+
+    print(f"\n{n_gauges} gauges, {N_EPOCHS} epochs")
+    print(f"{'':<20}{'deploy':>16}{'configure':>16}{'execute':>16}{'total gas':>14}")
+    for name, counters in result.items():
+        cells = "".join(f"{f'{c.gas} / {c.transactions} tx':>16}" for c in counters)
+        print(f"{name:<20}{cells}  {sum(c.gas for c in counters):>12}")
+
+    single, multi = result["SingleCampaign"], result["MultiGaugeCampaign"]
+    assert multi[2].transactions * n_gauges == single[2].transactions
+    assert sum(c.gas for c in multi) < sum(c.gas for c in single)
@@ -0,0 +1,45 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# seconds an offline command may take from process start to exit
+OFFLINE_STARTUP_BUDGET = float(os.getenv('OFFLINE_STARTUP_BUDGET') or 1.0)
+RUNS = 5
+
+OFFLINE_COMMANDS = {
+    "help": ["--help"],
+    "compile-schedule": ["compile-schedule", "campaigns/taiko.yaml"],
+    "dry-run-plan": ["dry-run-plan", "campaigns/taiko.yaml"],
+    "encode-constructor": ["encode-constructor", "SingleCampaign", "0x" + "ab" * 20, "0x" + "cd" * 20, "100000000000000000", "0x" + "ef" * 20],
+    "encode-constructors": ["encode-constructors"],
+    "predict-addresses": ["predict-addresses", "bench", "--factory", "0x" + "ab" * 20, "--implementation", "0x" + "cd" * 20, "--deployer", "0x" + "12" * 20],
+}
+
+
+def _wall_time(args, env):
+    start = time.perf_counter()
+    subprocess.run(args, env=env, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def test_offline_startup(project):
+    # current artifacts in the cache, like after any ape compile
+    project.SingleCampaign.contract_type
+    env = {**os.environ, "REWARD_TOKEN_DIGITS": "18", "DEPLOYED_DISTRIBUTOR": "0x" + "d1" * 20}
+
+    times = {
+        name: statistics.median(_wall_time([sys.executable, "-m", "scripts.offline", *args], env) for _ in range(RUNS))
+        for name, args in OFFLINE_COMMANDS.items()
+    }
+    # what every command paid before, loading the ape project without connecting
+    project_time = statistics.median(_wall_time([sys.executable, "-c", "from ape import project; project.SingleCampaign"], env) for _ in range(RUNS))
+
+    print(f"\noffline command startup, median of {RUNS} runs, budget {OFFLINE_STARTUP_BUDGET:.2f}s")
+    print(f"{'command':<20}{'wall time':>12}")
+    for name, seconds in times.items():
+        print(f"{name:<20}{seconds:>11.3f}s")
+    print(f"{'ape project load':<20}{project_time:>11.3f}s")
+
+    assert max(times.values()) < OFFLINE_STARTUP_BUDGET
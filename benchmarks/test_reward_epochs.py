@@ -0,0 +1,54 @@
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+DAY = 86400
+
+
+@pytest.fixture(scope="module")
+def legacy_single_campaign_container(legacy_container):
+    """
+    SingleCampaign from benchmarks/legacy/, epochs stored reversed in a DynArray and popped
+    """
+    return legacy_container("SingleCampaign")
+
+
+def measure(container, constructor_args, n_epochs, project, alice, bob, crvusd_token, reward_token, test_gauge, diana, chain):
+    epochs = [10**18 + i for i in range(n_epochs)]
+    campaign = alice.deploy(container, [bob], crvusd_token, 10**17, *constructor_args)
+    distributor = alice.deploy(project.Distributor, [bob, campaign], reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor, sum(epochs), sender=bob)
+    campaign.setup(distributor, test_gauge, 4 * DAY, 0, "benchmark", sender=bob)
+
+    gas = {
+        "set_reward_epochs": campaign.set_reward_epochs(epochs, sender=bob).gas_used,
+        "get_all_epochs": campaign.get_all_epochs.estimate_gas_cost(),
+    }
+
+    distributions = []
+    for _ in range(n_epochs):
+        distributions.append(campaign.distribute_reward(sender=bob).gas_used)
+        chain.pending_timestamp = chain.pending_timestamp + 4 * DAY
+        chain.mine()
+
+    gas["distribution (mean)"] = sum(distributions) // n_epochs
+    gas["distributions (total)"] = sum(distributions)
+    return gas
+
+
+@pytest.mark.parametrize("n_epochs", [7, 28, 52])
+def test_reward_epoch_gas(n_epochs, project, alice, bob, crvusd_token, reward_token, test_gauge, diana, chain, legacy_single_campaign_container):
+    gas = {
+        name: measure(container, constructor_args, n_epochs, project, alice, bob, crvusd_token, reward_token, test_gauge, diana, chain)
+        # the legacy campaign has no factory
+        for name, container, constructor_args in [("legacy", legacy_single_campaign_container, []), ("packed", project.SingleCampaign, [ZERO_ADDRESS])]
+    }
+
+    print(f"\n{n_epochs} reward epochs")
+    print(f"{'':<24}{'legacy':>10}{'packed':>10}")
+    for key in gas["legacy"]:
+        print(f"{key:<24}{gas['legacy'][key]:>10}{gas['packed'][key]:>10}")
+
+    assert gas["packed"]["set_reward_epochs"] < gas["legacy"]["set_reward_epochs"]
+    assert gas["packed"]["get_all_epochs"] <= gas["legacy"]["get_all_epochs"]
+    assert gas["packed"]["distributions (total)"] <= gas["legacy"]["distributions (total)"]
@@ -0,0 +1,55 @@
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+from scripts._campaign_spec import load_campaign_spec
+from scripts._schedule import encode_packed_reward_epochs, encode_reward_schedule
+
+TOKEN = 10**18
+
+# first campaign of every repo spec, plus long schedules
+SCHEDULES = {
+    f"{name} spec": load_campaign_spec(f"campaigns/{name}.yaml", [f"0x{i:040x}" for i in range(1, 20)], check_addresses=False)[0].reward_epochs
+    for name in ("taiko", "arbitrum", "optimism")
+}
+SCHEDULES["28 x 1071.42857"] = [1071428570000000000000] * 28
+SCHEDULES["52 declining"] = [(5200 - 37 * k) * TOKEN for k in range(52)]
+
+
+def calldata(receipt):
+    data = bytes(receipt.transaction.data)
+    zero = data.count(0)
+    return {
+        "calldata bytes": len(data),
+        "zero bytes": zero,
+        "non-zero bytes": len(data) - zero,
+        # EIP-2028 pricing, what L2s charge as L1 data
+        "L1 data gas": 4 * zero + 16 * (len(data) - zero),
+        "L2 gas used": receipt.gas_used,
+    }
+
+
+@pytest.mark.parametrize("name", SCHEDULES)
+def test_packed_calldata(name, project, alice, bob, crvusd_token):
+    reward_epochs = SCHEDULES[name]
+    calls = {
+        "epochs": ("set_reward_epochs", (reward_epochs,)),
+        "packed": ("set_reward_epochs_packed", (encode_packed_reward_epochs(reward_epochs),)),
+    }
+    schedule = encode_reward_schedule(reward_epochs)
+    if schedule is not None:
+        calls["schedule"] = ("set_reward_schedule", schedule.args())
+
+    result = {}
+    for label, (method, args) in calls.items():
+        campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+        result[label] = calldata(getattr(campaign, method)(*args, sender=bob))
+        assert campaign.get_all_epochs() == reward_epochs
+
+    print(f"\n{name}: {len(reward_epochs)} epochs")
+    print(f"{'':<16}" + "".join(f"{label:>12}" for label in result))
+    for key in result["epochs"]:
+        print(f"{key:<16}" + "".join(f"{result[label][key]:>12}" for label in result))
+
+    assert result["packed"]["L1 data gas"] < result["epochs"]["L1 data gas"]
+    assert result["packed"]["non-zero bytes"] <= result["epochs"]["non-zero bytes"]
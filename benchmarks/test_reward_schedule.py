@@ -0,0 +1,56 @@
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+from scripts._schedule import encode_reward_schedule
+
+DAY = 86400
+TOKEN = 10**18
+
+SCHEDULES = {
+    "ramp + 5 steady": [300 * TOKEN, 600 * TOKEN, 1200 * TOKEN] + [2100 * TOKEN] * 5,
+    "28 constant": [1071428570000000000000] * 28,
+    "linear decline": [(6000 - 200 * k) * TOKEN for k in range(7)],
+    "52 constant": [1000 * TOKEN] * 52,
+}
+
+
+def run(method, args, n_epochs, project, alice, bob, crvusd_token, reward_token, test_gauge, diana, chain):
+    campaign = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+    distributor = alice.deploy(project.Distributor, [bob, campaign], reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor, 10**26, sender=bob)
+    campaign.setup(distributor, test_gauge, 4 * DAY, 0, "benchmark", sender=bob)
+
+    receipt = getattr(campaign, method)(*args, sender=bob)
+    distributions = []
+    for _ in range(n_epochs):
+        distributions.append(campaign.distribute_reward(sender=bob).gas_used)
+        chain.pending_timestamp = chain.pending_timestamp + 4 * DAY
+        chain.mine()
+
+    return {
+        "calldata bytes": len(receipt.transaction.data),
+        "set gas": receipt.gas_used,
+        "distribution (mean)": sum(distributions) // n_epochs,
+    }
+
+
+@pytest.mark.parametrize("name", SCHEDULES)
+def test_reward_schedule_gas(name, project, alice, bob, crvusd_token, reward_token, test_gauge, diana, chain):
+    reward_epochs = SCHEDULES[name]
+    schedule = encode_reward_schedule(reward_epochs)
+    assert schedule.epochs() == reward_epochs
+
+    fixtures = (project, alice, bob, crvusd_token, reward_token, test_gauge, diana, chain)
+    result = {
+        "set_reward_epochs": run("set_reward_epochs", (reward_epochs,), len(reward_epochs), *fixtures),
+        "set_reward_schedule": run("set_reward_schedule", schedule.args(), len(reward_epochs), *fixtures),
+    }
+
+    print(f"\n{name}: {len(reward_epochs)} epochs")
+    print(f"{'':<22}{'epochs':>12}{'schedule':>12}")
+    for key in result["set_reward_epochs"]:
+        print(f"{key:<22}{result['set_reward_epochs'][key]:>12}{result['set_reward_schedule'][key]:>12}")
+
+    assert result["set_reward_schedule"]["calldata bytes"] < result["set_reward_epochs"]["calldata bytes"]
+    assert result["set_reward_schedule"]["set gas"] < result["set_reward_epochs"]["set gas"]
@@ -0,0 +1,29 @@
+import random
+import time
+
+from scripts._schedule_compiler import compile_schedules, compile_schedules_cached
+
+N_GAUGES = 10000
+N_EPOCHS = 52
+
+
+def test_compile_large_fleet(tmp_path):
+    rng = random.Random(0)
+    budgets = [str(rng.randint(1, 10**7) / 7) for _ in range(N_GAUGES)]
+    shapes = [[rng.randint(1, 100) for _ in range(N_EPOCHS)] for _ in range(N_GAUGES)]
+
+    start = time.perf_counter()
+    compiled = compile_schedules(budgets, shapes, 18)
+    compile_time = time.perf_counter() - start
+
+    compile_schedules_cached(budgets, shapes, 18, cache_dir=tmp_path)
+    start = time.perf_counter()
+    cached = compile_schedules_cached(budgets, shapes, 18, cache_dir=tmp_path)
+    cached_time = time.perf_counter() - start
+
+    print(f"\n{N_GAUGES} gauges x {N_EPOCHS} epochs")
+    print(f"{'':<10}{'wall time':>12}")
+    print(f"{'compile':<10}{compile_time:>11.3f}s")
+    print(f"{'cached':<10}{cached_time:>11.3f}s")
+
+    assert cached == compiled
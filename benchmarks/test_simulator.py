@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+
+from scripts._simulator import DISTRIBUTION_BUFFER, KEEPER_SCENARIOS, WEEK, keeper_latencies, simulate, simulate_scenarios
+
+N_CAMPAIGNS = 2000
+N_EPOCHS = 52
+RUNS = 4
+# campaigns of the scalar reference, extrapolated to N_CAMPAIGNS
+N_REFERENCE = 50
+
+
+def reference(amounts, min_epoch_duration, latency):
+    # one campaign at a time, the way a spreadsheet would do it
+    end_times = []
+    for epochs, lat in zip(amounts, latency):
+        t = lat[0]
+        rate, finish = 0.0, 0.0
+        for k, amount in enumerate(epochs):
+            if k > 0:
+                t += max(min_epoch_duration - DISTRIBUTION_BUFFER, min_epoch_duration - DISTRIBUTION_BUFFER + lat[k])
+            rate = (amount + max(finish - t, 0) * rate) / WEEK
+            finish = t + WEEK
+        end_times.append(finish)
+    return end_times
+
+
+def test_simulator_speed():
+    rng = np.random.default_rng(0)
+    amounts = rng.integers(100, 5000, (N_CAMPAIGNS, N_EPOCHS)).astype(float)
+    counts = np.full(N_CAMPAIGNS, N_EPOCHS)
+
+    start = time.perf_counter()
+    summary = simulate_scenarios(amounts, counts, WEEK, RUNS, rng)
+    vectorized_time = time.perf_counter() - start
+
+    latency = keeper_latencies(rng, (N_REFERENCE, N_EPOCHS), mean=3600)
+    start = time.perf_counter()
+    for _ in range(len(KEEPER_SCENARIOS) * RUNS):
+        end_times = reference(amounts[:N_REFERENCE], WEEK, latency)
+    reference_time = (time.perf_counter() - start) * N_CAMPAIGNS / N_REFERENCE
+
+    result = simulate(amounts[:N_REFERENCE], counts[:N_REFERENCE], WEEK, latency)
+    assert np.allclose(result.end_time, end_times)
+
+    simulated = len(KEEPER_SCENARIOS) * RUNS * N_CAMPAIGNS
+    print(f"\n{simulated} campaigns x {N_EPOCHS} epochs ({len(KEEPER_SCENARIOS)} scenarios x {RUNS} runs x {N_CAMPAIGNS})")
+    print(f"{'':<12}{'wall time':>12}")
+    print(f"{'scalar':<12}{reference_time:>11.2f}s  (extrapolated, without daily emission)")
+    print(f"{'numpy':<12}{vectorized_time:>11.2f}s  (with daily emission)")
+    print(f"{'scenario':<12}{'drift p95 h':>12}{'no rate h':>12}")
+    for i, name in enumerate(KEEPER_SCENARIOS):
+        print(f"{name:<12}{np.median(summary['end_drift_p95'][i]) / 3600:>12.1f}{summary['zero_rate_hours'][i].mean():>12.1f}")
+
+    assert vectorized_time < reference_time
@@ -0,0 +1,86 @@
+#pragma version ^0.4.0
+"""
+@title BatchExecutor
+@author martinkrung for curve.fi
+@license MIT
+@notice Calls execute() on many SingleCampaigns in one transaction
+@dev campaigns which are not allowed yet or fail to execute are skipped,
+     the crvUSD execute reward of all executed campaigns is forwarded to the caller
+"""
+
+from ethereum.ercs import IERC20
+
+interface ISingleCampaign:
+    def crvusd_address() -> address: view
+
+MAX_CAMPAIGNS: constant(uint256) = 30  # same as guards on Distributor
+VERSION: constant(String[8]) = "0.9.1"
+
+event BatchExecuted:
+    caller: address
+    executed_campaigns: DynArray[address, MAX_CAMPAIGNS]
+    skipped: uint256
+    execute_reward_amount: uint256
+    timestamp: uint256
+
+
+@external
+def execute(_campaigns: DynArray[address, MAX_CAMPAIGNS]) -> DynArray[address, MAX_CAMPAIGNS]:
+    """
+    @notice Execute every campaign which is allowed to distribute
+    @param _campaigns list of SingleCampaign addresses
+    @return DynArray[address, 30] list of executed campaigns
+    """
+    executed: DynArray[address, MAX_CAMPAIGNS] = []
+    reward_tokens: DynArray[address, MAX_CAMPAIGNS] = []
+    execute_reward_amount: uint256 = 0
+
+    for campaign: address in _campaigns:
+        # execution_allowed() reverts before setup and after the last epoch
+        if self._static_uint256(campaign, method_id("execution_allowed()")) == 0:
+            continue
+
+        payment: uint256 = self._static_uint256(campaign, method_id("next_execution_payment_amount()"))
+
+        if not raw_call(campaign, method_id("execute()"), revert_on_failure=False):
+            continue
+
+        executed.append(campaign)
+
+        if payment > 0:
+            execute_reward_amount += payment
+            reward_token: address = staticcall ISingleCampaign(campaign).crvusd_address()
+            if reward_token not in reward_tokens:
+                reward_tokens.append(reward_token)
+
+    # forward the execute rewards paid to this contract
+    for reward_token: address in reward_tokens:
+        amount: uint256 = staticcall IERC20(reward_token).balanceOf(self)
+        if amount > 0:
+            assert extcall IERC20(reward_token).transfer(msg.sender, amount, default_return_value=True)
+
+    log BatchExecuted(msg.sender, executed, len(_campaigns) - len(executed), execute_reward_amount, block.timestamp)
+
+    return executed
+
+
+@internal
+@view
+def _static_uint256(_target: address, _method_id: Bytes[4]) -> uint256:
+    """
+    @notice Call a view function without arguments which returns one word
+    @return uint256 the returned word, 0 if the call reverts
+    """
+    success: bool = False
+    response: Bytes[32] = b""
+    success, response = raw_call(
+        _target,
+        _method_id,
+        max_outsize=32,
+        is_static_call=True,
+        revert_on_failure=False
+    )
+    if not success or len(response) != 32:
+        return 0
+
+    return convert(convert(response, bytes32), uint256)
@@ -0,0 +1,122 @@
+#pragma version ^0.4.0
+"""
+@title CampaignLens
+@author martinkrung for curve.fi
+@license MIT
+@notice Read-only view of the full state of many SingleCampaigns in one call
+"""
+
+from ethereum.ercs import IERC20
+
+interface ISingleCampaign:
+    def is_setup_complete() -> bool: view
+    def is_reward_epochs_set() -> bool: view
+    def distributor_address() -> address: view
+    def receiving_gauge() -> address: view
+    def min_epoch_duration() -> uint256: view
+    def id() -> uint256: view
+    def name() -> String[64]: view
+    def last_reward_distribution_time() -> uint256: view
+    def have_rewards_started() -> bool: view
+    def last_reward_amount() -> uint256: view
+    def get_all_epochs() -> DynArray[uint256, 52]: view
+    def next_execution_allowed_time() -> uint256: view
+    def execute_reward_amount() -> uint256: view
+    def crvusd_address() -> address: view
+    def next_execution_payment_amount() -> uint256: view
+
+interface IDistributor:
+    def reward_token() -> address: view
+
+struct CampaignState:
+    campaign: address
+    is_setup_complete: bool
+    is_reward_epochs_set: bool
+    distributor_address: address
+    receiving_gauge: address
+    min_epoch_duration: uint256
+    id: uint256
+    name: String[64]
+    last_reward_distribution_time: uint256
+    have_rewards_started: bool
+    last_reward_amount: uint256
+    remaining_epochs: DynArray[uint256, 52]
+    # zero once all epochs are distributed, get_next_epoch_info() reverts then
+    next_reward_amount: uint256
+    seconds_until_next_distribution: uint256
+    # false before setup and once all epochs are distributed, execution_allowed() reverts then
+    execution_allowed: bool
+    next_execution_allowed_time: uint256
+    execute_reward_amount: uint256
+    next_execution_payment_amount: uint256
+    crvusd_balance: uint256
+    distributor_reward_balance: uint256
+
+VERSION: public(constant(String[8])) = "0.9.1"
+MAX_CAMPAIGNS: constant(uint256) = 64
+
+
+@external
+@view
+def get_campaign_states(_campaigns: DynArray[address, MAX_CAMPAIGNS]) -> DynArray[CampaignState, MAX_CAMPAIGNS]:
+    """
+    @notice Get the state of many campaigns in one call
+    @param _campaigns SingleCampaign addresses
+    @return DynArray[CampaignState, 64] state of every campaign in the order of _campaigns
+    """
+    states: DynArray[CampaignState, MAX_CAMPAIGNS] = []
+    for campaign: address in _campaigns:
+        states.append(self._campaign_state(campaign))
+    return states
+
+
+@internal
+@view
+def _campaign_state(_campaign: address) -> CampaignState:
+    campaign: ISingleCampaign = ISingleCampaign(_campaign)
+
+    state: CampaignState = CampaignState(
+        campaign=_campaign,
+        is_setup_complete=staticcall campaign.is_setup_complete(),
+        is_reward_epochs_set=staticcall campaign.is_reward_epochs_set(),
+        distributor_address=staticcall campaign.distributor_address(),
+        receiving_gauge=staticcall campaign.receiving_gauge(),
+        min_epoch_duration=staticcall campaign.min_epoch_duration(),
+        id=staticcall campaign.id(),
+        name=staticcall campaign.name(),
+        last_reward_distribution_time=staticcall campaign.last_reward_distribution_time(),
+        have_rewards_started=staticcall campaign.have_rewards_started(),
+        last_reward_amount=staticcall campaign.last_reward_amount(),
+        remaining_epochs=staticcall campaign.get_all_epochs(),
+        next_reward_amount=0,
+        seconds_until_next_distribution=0,
+        execution_allowed=False,
+        next_execution_allowed_time=staticcall campaign.next_execution_allowed_time(),
+        execute_reward_amount=staticcall campaign.execute_reward_amount(),
+        next_execution_payment_amount=0,
+        crvusd_balance=0,
+        distributor_reward_balance=0,
+    )
+
+    # both revert once the epochs are exhausted or before setup, a failed call leaves the defaults
+    success: bool = False
+    response: Bytes[64] = b""
+    success, response = raw_call(_campaign, method_id("get_next_epoch_info()"), max_outsize=64, is_static_call=True, revert_on_failure=False)
+    if success:
+        state.next_reward_amount, state.seconds_until_next_distribution = abi_decode(response, (uint256, uint256))
+
+    allowed: Bytes[32] = b""
+    success, allowed = raw_call(_campaign, method_id("execution_allowed()"), max_outsize=32, is_static_call=True, revert_on_failure=False)
+    if success:
+        state.execution_allowed = abi_decode(allowed, bool)
+
+    crvusd: address = staticcall campaign.crvusd_address()
+    if crvusd != empty(address):
+        state.crvusd_balance = staticcall IERC20(crvusd).balanceOf(_campaign)
+        state.next_execution_payment_amount = staticcall campaign.next_execution_payment_amount()
+
+    if state.distributor_address != empty(address):
+        reward_token: address = staticcall IDistributor(state.distributor_address).reward_token()
+        state.distributor_reward_balance = staticcall IERC20(reward_token).balanceOf(state.distributor_address)
+
+    return state
@@ -21,7 +21,13 @@ guards: public(DynArray[address, 30])
 reward_token: public(address)
 receiving_gauges: public(DynArray[address, 20])
 recovery_address: public(address)
-campaign_addresses: public(DynArray[address, 30])
+campaign_addresses: public(DynArray[address, 30])  # every sender once, in order of the first distribution
+
+# O(1) lookups next to the enumerable lists above
+is_guard: public(HashMap[address, bool])
+is_receiving_gauge: public(HashMap[address, bool])
+campaign_index: HashMap[address, uint256]  # position in campaign_addresses + 1, 0 if not listed
+distribution_count: public(HashMap[address, uint256])
 
 event SentRewardToken:
     receiving_gauge: address
@@ -45,6 +51,12 @@ def __init__(_guards: DynArray[address, 30], _reward_token: address, _receiving_
     self.receiving_gauges = _receiving_gauges
     self.recovery_address = _recovery_address
 
+    for guard: address in _guards:
+        self.is_guard[guard] = True
+
+    for receiving_gauge: address in _receiving_gauges:
+        self.is_receiving_gauge[receiving_gauge] = True
+
 @external
 def send_reward_token(_receiving_gauge: address, _amount: uint256, _epoch: uint256 = WEEK):
     """
@@ -53,21 +65,55 @@ def send_reward_token(_receiving_gauge: address, _amount: uint256, _epoch: uint2
     @param _amount The amount of reward token being sent
     @param _epoch The duration the rewards are distributed across in seconds. Between 3 days and a year, week by default
     """
-    assert msg.sender in self.guards, 'only reward guards can call this function'
-    assert _receiving_gauge in self.receiving_gauges, 'only reward receiver which are allowed'
-    assert 3 * WEEK // 7 <= _epoch and _epoch <= WEEK * 4 * 12, 'epoch duration must be between 3 days and a year'
-    assert extcall IERC20(self.reward_token).approve(_receiving_gauge, _amount, default_return_value=True)
+    assert self.is_guard[msg.sender], 'only reward guards can call this function'
+
+    self._record_distribution(msg.sender, 1)
+    self._send_reward_token(self.reward_token, _receiving_gauge, _amount, _epoch)
+
+
+@external
+def send_reward_tokens(_receiving_gauges: DynArray[address, 20], _amounts: DynArray[uint256, 20], _epochs: DynArray[uint256, 20]):
+    """
+    @notice send reward token from contract to many gauges in one transaction
+    @param _receiving_gauges gauges to receiver reward
+    @param _amounts The amount of reward token being sent to each gauge
+    @param _epochs The duration the rewards are distributed across in seconds for each gauge, WEEK for legacy gauges
+    @dev guard and bookkeeping are checked and written once for all gauges
+    """
+    assert self.is_guard[msg.sender], 'only reward guards can call this function'
+    assert len(_receiving_gauges) > 0, 'no gauges to send reward token to'
+    assert len(_receiving_gauges) == len(_amounts) and len(_receiving_gauges) == len(_epochs), 'gauges, amounts and epochs differ in length'
+
+    self._record_distribution(msg.sender, len(_receiving_gauges))
+
+    reward_token: address = self.reward_token
+    for i: uint256 in range(len(_receiving_gauges), bound=20):
+        self._send_reward_token(reward_token, _receiving_gauges[i], _amounts[i], _epochs[i])
+
+
+@internal
+def _record_distribution(_sender: address, _count: uint256):
+    # only guards send, the list can not grow beyond the 30 guards
+    if self.campaign_index[_sender] == 0:
+        self.campaign_addresses.append(_sender)
+        self.campaign_index[_sender] = len(self.campaign_addresses)
+    self.distribution_count[_sender] += _count
 
-    self.campaign_addresses.append(msg.sender)
+
+@internal
+def _send_reward_token(_reward_token: address, _receiving_gauge: address, _amount: uint256, _epoch: uint256):
+    assert self.is_receiving_gauge[_receiving_gauge], 'only reward receiver which are allowed'
+    assert 3 * WEEK // 7 <= _epoch and _epoch <= WEEK * 4 * 12, 'epoch duration must be between 3 days and a year'
+    assert extcall IERC20(_reward_token).approve(_receiving_gauge, _amount, default_return_value=True)
 
     # legacy gauges have no epoch parameter 
     # new deposit_reward_token has epoch parameter default to WEEK
     if _epoch == WEEK:
-       extcall LegacyGauge(_receiving_gauge).deposit_reward_token(self.reward_token, _amount)
+       extcall LegacyGauge(_receiving_gauge).deposit_reward_token(_reward_token, _amount)
     else:
-       extcall Gauge(_receiving_gauge).deposit_reward_token(self.reward_token, _amount, _epoch)
+       extcall Gauge(_receiving_gauge).deposit_reward_token(_reward_token, _amount, _epoch)
 
-    log SentRewardToken(_receiving_gauge, self.reward_token, _amount, _epoch, block.timestamp)
+    log SentRewardToken(_receiving_gauge, _reward_token, _amount, _epoch, block.timestamp)
 
 
 @external
@@ -76,15 +122,18 @@ def remove_campaign_address(_campaign_address: address):
     @notice Remove a campaign address from the list
     @param _campaign_address The address of the campaign to remove
     """
-    assert msg.sender in self.guards, 'only reward guards can call this function'
-    
-    for i: uint256 in range(len(self.campaign_addresses), bound=30):
-         # Move the last element to the found i and pop the last element
-        if self.campaign_addresses[i] == _campaign_address:    
-            last_idx: uint256 = len(self.campaign_addresses) - 1
-            if i != last_idx:
-                self.campaign_addresses[i] = self.campaign_addresses[last_idx]
-            self.campaign_addresses.pop()
+    assert self.is_guard[msg.sender], 'only reward guards can call this function'
+
+    index: uint256 = self.campaign_index[_campaign_address]
+    if index == 0:
+        return
+
+    # Move the last element to the removed position and pop the last element
+    last_campaign_address: address = self.campaign_addresses.pop()
+    if last_campaign_address != _campaign_address:
+        self.campaign_addresses[index - 1] = last_campaign_address
+        self.campaign_index[last_campaign_address] = index
+    self.campaign_index[_campaign_address] = 0
 
 @external
 def recover_token(_token: address, _amount: uint256):
@@ -92,7 +141,7 @@ def recover_token(_token: address, _amount: uint256):
     @notice recover wrong token from contract to recovery address
     @param _amount amount of the token to recover
     """
-    assert msg.sender in self.guards, 'only reward guards can call this function'
+    assert self.is_guard[msg.sender], 'only reward guards can call this function'
     assert _amount > 0, 'amount must be greater than 0'
 
     assert extcall IERC20(_token).transfer(self.recovery_address, _amount, default_return_value=True)
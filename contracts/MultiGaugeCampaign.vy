@@ -0,0 +1,376 @@
+#pragma version ^0.4.0
+"""
+@title MultiGaugeCampaign
+@author martinkrung for curve.fi
+@license MIT
+@notice Distributes variable rewards for many gauges in lockstep through Distributor
+"""
+
+from ethereum.ercs import IERC20
+
+# State Variables
+guards: public(DynArray[address, 5])
+distributor_address: public(address)
+min_epoch_duration: public(uint256)
+id: public(uint256)
+name: public(String[64])
+
+is_setup_complete: public(bool)
+
+# gauges in order of set_reward_epochs(), all share one distribution clock
+receiving_gauges: public(DynArray[address, MAX_GAUGES])
+# per gauge reward amounts in distribution order, two uint128 amounts per slot
+packed_reward_epochs: HashMap[address, uint256[MAX_PACKED_SLOTS]]
+# per gauge epoch count in the low 128 bits, index of the next epoch to distribute in the high 128 bits
+reward_epoch_position: HashMap[address, uint256]
+
+last_reward_distribution_time: public(uint256)
+have_rewards_started: public(bool)
+
+execute_reward_amount: public(uint256)
+crvusd_address: public(address)
+
+WEEK: public(constant(uint256)) = 7 * 24 * 60 * 60  # 1 week in seconds
+VERSION: public(constant(String[8])) = "0.9.1"
+DISTRIBUTION_BUFFER: public(constant(uint256)) = 2 * 60 * 60  # 2 hour window for early distribution, max divation is 2.7%
+
+# the Distributor allows 20 receiving gauges
+MAX_GAUGES: constant(uint256) = 20
+MAX_REWARD_EPOCHS: constant(uint256) = 52
+MAX_PACKED_SLOTS: constant(uint256) = MAX_REWARD_EPOCHS // 2
+EPOCH_AMOUNT_BITS: constant(uint256) = 128
+EPOCH_AMOUNT_MASK: constant(uint256) = 2**128 - 1
+
+# Events
+
+event SetupCompleted:
+    distributor_address: address
+    min_epoch_duration: uint256
+    timestamp: uint256
+
+event RewardEpochsSet:
+    receiving_gauge: address
+    reward_epochs: DynArray[uint256, 52]
+    timestamp: uint256
+
+event RewardDistributed:
+    receiving_gauge: address
+    reward_amount: uint256
+    remaining_reward_epochs: uint256
+    timestamp: uint256
+
+event RewardDistributionFailed:
+    receiving_gauge: address
+    reward_amount: uint256
+    timestamp: uint256
+
+event ExecuteRewardDistributed:
+    caller: address
+    distributed_gauges: uint256
+    reward_token: address
+    execute_reward_amount: uint256
+    timestamp: uint256
+
+
+@deploy
+def __init__(_guards: DynArray[address, 5], _crvusd_address: address, _execute_reward_amount: uint256):
+    """
+    @notice Initialize the contract with guards
+    @param _guards List of guard addresses that can control the contract
+    @param _crvusd_address Address of the crvUSD token to be distributed to the caller
+    @param _execute_reward_amount Amount of crvUSD to be distributed to the caller once per execute()
+    """
+    self.guards = _guards
+    self.min_epoch_duration = WEEK
+    self.crvusd_address = _crvusd_address
+    self.execute_reward_amount = _execute_reward_amount
+
+@external
+def setup(_distributor_address: address, _min_epoch_duration: uint256, _id: uint256, _name: String[64]):
+    """
+    @notice Set the Distributor and the epoch duration shared by all gauges (can only be set once)
+    @param _distributor_address Address of the Distributor contract
+    @param _min_epoch_duration Minimum epoch duration in seconds
+    """
+    assert msg.sender in self.guards, "only guards can call this function"
+    assert not self.is_setup_complete, "Setup already completed"
+    assert 3 * WEEK // 7 <= _min_epoch_duration and _min_epoch_duration <= WEEK  * 4 * 12, 'epoch duration must be between 3 days and a year'
+
+    self.distributor_address = _distributor_address
+    self.min_epoch_duration = _min_epoch_duration
+    self.id = _id
+    self.name = _name
+
+    self.is_setup_complete = True
+
+    log SetupCompleted(_distributor_address, _min_epoch_duration, block.timestamp)
+
+
+@external
+def set_reward_epochs(_receiving_gauges: DynArray[address, MAX_GAUGES], _reward_epochs: DynArray[DynArray[uint256, 52], MAX_GAUGES]):
+    """
+    @notice Add gauges with their reward epochs, first value is the first to be distributed
+    @param _receiving_gauges Gauges to add, every gauge can only be added once
+    @param _reward_epochs List of reward amounts for each gauge, ordered from first to last epoch
+    @dev gauges added after rewards started join the next distribution
+    """
+    assert msg.sender in self.guards, "only guards can call this function"
+    assert len(_receiving_gauges) == len(_reward_epochs), "Gauges and reward epochs differ in length"
+
+    for i: uint256 in range(len(_receiving_gauges), bound=MAX_GAUGES):
+        gauge: address = _receiving_gauges[i]
+        reward_epochs: DynArray[uint256, 52] = _reward_epochs[i]
+        assert self.reward_epoch_position[gauge] == 0, "Reward epochs can only be set once"
+        assert len(reward_epochs) > 0 and len(reward_epochs) <= 52, "Must set between 1 and 52 epochs"
+
+        n: uint256 = len(reward_epochs)
+        for slot: uint256 in range((n + 1) // 2, bound=MAX_PACKED_SLOTS):
+            first: uint256 = reward_epochs[2 * slot]
+            second: uint256 = 0
+            if 2 * slot + 1 < n:
+                second = reward_epochs[2 * slot + 1]
+            assert first <= EPOCH_AMOUNT_MASK and second <= EPOCH_AMOUNT_MASK, "Reward amount exceeds uint128"
+
+            self.packed_reward_epochs[gauge][slot] = first | (second << EPOCH_AMOUNT_BITS)
+
+        self.reward_epoch_position[gauge] = n
+        self.receiving_gauges.append(gauge)
+
+        log RewardEpochsSet(gauge, reward_epochs, block.timestamp)
+
+
+@external
+def distribute_reward():
+    self._distribute_reward()
+
+@internal
+def _distribute_reward() -> uint256:
+    """
+    @notice Distribute the current epoch of every gauge with remaining epochs if the epoch has ended
+    @return uint256 Number of gauges rewards were sent to
+    @dev a gauge the Distributor refuses, e.g. removed from its allowlist, is skipped with RewardDistributionFailed
+         and keeps its epoch for the next distribution, the other gauges are not blocked
+    """
+    assert self.is_setup_complete, "Setup not completed"
+
+    # @dev the DISTRIBUTION_BUFFER allows to distribute the reward earlier than the min_epoch_duration, to allow continuous distribution
+    if self.have_rewards_started:
+        assert block.timestamp >= self.last_reward_distribution_time + self.min_epoch_duration - DISTRIBUTION_BUFFER, "Minimum time between distributions not met"
+
+    distributor: address = self.distributor_address
+    # raw_call does not check for code, a call to an empty address would succeed
+    assert distributor.is_contract, "Distributor has no code"
+    due: uint256 = 0
+    distributed: uint256 = 0
+
+    for gauge: address in self.receiving_gauges:
+        position: uint256 = self.reward_epoch_position[gauge]
+        count: uint256 = position & EPOCH_AMOUNT_MASK
+        cursor: uint256 = position >> EPOCH_AMOUNT_BITS
+        if cursor == count:
+            continue
+
+        reward_amount: uint256 = self._reward_epoch(gauge, cursor)
+        self.reward_epoch_position[gauge] = position + (1 << EPOCH_AMOUNT_BITS)
+        due += 1
+
+        success: bool = raw_call(
+            distributor,
+            abi_encode(gauge, reward_amount, method_id=method_id("send_reward_token(address,uint256)")),
+            revert_on_failure=False
+        )
+        if not success:
+            self.reward_epoch_position[gauge] = position
+            log RewardDistributionFailed(gauge, reward_amount, block.timestamp)
+            continue
+
+        distributed += 1
+
+        log RewardDistributed(gauge, reward_amount, count - cursor - 1, block.timestamp)
+
+    assert due > 0, "No remaining reward epochs"
+    assert distributed > 0, "Distributor refused every gauge"
+
+    self.last_reward_distribution_time = block.timestamp
+    self.have_rewards_started = True
+
+    return distributed
+
+@external
+def execute():
+    """
+    @notice Distribute all due gauges and pay the caller incentive once
+    """
+    assert self._execution_allowed(), "Too early"
+
+    distributed: uint256 = self._distribute_reward()
+
+    if staticcall IERC20(self.crvusd_address).balanceOf(self) >= self.execute_reward_amount:
+        assert extcall IERC20(self.crvusd_address).transfer(msg.sender, self.execute_reward_amount, default_return_value=True)
+
+    log ExecuteRewardDistributed(
+        msg.sender,
+        distributed,
+        self.crvusd_address,
+        self.execute_reward_amount,
+        block.timestamp
+    )
+
+
+@external
+@view
+def execution_allowed() -> bool:
+    return self._execution_allowed()
+
+
+@internal
+@view
+def _execution_allowed() -> bool:
+    """
+    @notice Check if execution is allowed
+    @return bool True if execution is allowed, False otherwise
+    """
+    assert self.is_setup_complete, "Setup not completed"
+    assert self._has_remaining_epochs(), "No remaining reward epochs"
+
+    if not self.have_rewards_started:
+        return True
+
+    return block.timestamp >= self.last_reward_distribution_time + self.min_epoch_duration - DISTRIBUTION_BUFFER
+
+
+@internal
+@view
+def _has_remaining_epochs() -> bool:
+    for gauge: address in self.receiving_gauges:
+        position: uint256 = self.reward_epoch_position[gauge]
+        if position >> EPOCH_AMOUNT_BITS < position & EPOCH_AMOUNT_MASK:
+            return True
+    return False
+
+
+@internal
+@view
+def _reward_epoch(_gauge: address, _index: uint256) -> uint256:
+    """
+    @notice Unpack the reward amount of epoch _index of _gauge
+    """
+    return (self.packed_reward_epochs[_gauge][_index // 2] >> (EPOCH_AMOUNT_BITS * (_index % 2))) & EPOCH_AMOUNT_MASK
+
+
+@external
+@view
+def next_execution_allowed_time() -> uint256:
+    """
+    @notice Get the time when execution is allowed
+    @return uint256 timestamp when execution is allowed
+    """
+    return self.last_reward_distribution_time + self.min_epoch_duration
+
+@external
+@view
+def next_execution_allowed_time_buffer() -> uint256:
+    """
+    @notice Get the time when execution is allowed
+    @return uint256 timestamp when earliest execution is allowed
+    """
+    return self.last_reward_distribution_time + self.min_epoch_duration - DISTRIBUTION_BUFFER
+
+@external
+@view
+def next_execution_payment_amount() -> uint256:
+    """
+    @notice Get the amount of crvUSD that will be paid to the caller when execution is allowed
+    @return uint256 amount of crvUSD that will be paid to the caller
+    """
+    if staticcall IERC20(self.crvusd_address).balanceOf(self) >= self.execute_reward_amount:
+        return self.execute_reward_amount
+    else:
+        return 0
+
+
+@external
+@view
+def get_all_epochs(_receiving_gauge: address) -> DynArray[uint256, 52]:
+    """
+    @notice Get all remaining reward epochs of a gauge
+    @return DynArray[uint256, 52] Array containing all remaining reward epoch amounts
+    """
+    reward_epochs: DynArray[uint256, 52] = []
+
+    position: uint256 = self.reward_epoch_position[_receiving_gauge]
+    for i: uint256 in range(position >> EPOCH_AMOUNT_BITS, position & EPOCH_AMOUNT_MASK, bound=MAX_REWARD_EPOCHS):
+        reward_epochs.append(self._reward_epoch(_receiving_gauge, i))
+
+    return reward_epochs
+
+
+@external
+@view
+def get_number_of_remaining_epochs(_receiving_gauge: address = empty(address)) -> uint256:
+    """
+    @notice Get the number of remaining reward epochs of a gauge
+    @param _receiving_gauge gauge to count, all gauges if empty
+    @return uint256 Remaining number of reward epochs, of the longest schedule for all gauges
+    @dev without argument it is the number of remaining distributions, as on the SingleCampaign
+    """
+    if _receiving_gauge != empty(address):
+        return self._remaining_epochs(_receiving_gauge)
+
+    remaining: uint256 = 0
+    for gauge: address in self.receiving_gauges:
+        remaining = max(remaining, self._remaining_epochs(gauge))
+    return remaining
+
+
+@internal
+@view
+def _remaining_epochs(_gauge: address) -> uint256:
+    position: uint256 = self.reward_epoch_position[_gauge]
+    return (position & EPOCH_AMOUNT_MASK) - (position >> EPOCH_AMOUNT_BITS)
+
+
+@external
+@view
+def is_reward_epochs_set() -> bool:
+    """
+    @notice Check if reward epochs are set for at least one gauge
+    @return bool True once set_reward_epochs() added a gauge
+    """
+    return len(self.receiving_gauges) > 0
+
+
+@external
+@view
+def get_all_receiving_gauges() -> DynArray[address, MAX_GAUGES]:
+    """
+    @notice Get all gauges of this campaign
+    @return DynArray[address, 20] list containing all gauges
+    """
+    return self.receiving_gauges
+
+
+@external
+def recover_token(_token: address, target_address: address, _amount: uint256):
+    """
+    @notice recover wrong token from contract to recovery address
+    @param _token address of the token to recover
+    @param target_address address of the target to receive the token
+    @param _amount amount of the token to recover
+    """
+    assert msg.sender in self.guards, 'only reward guards can call this function'
+    assert target_address in self.guards, 'only guards allowed to receive token'
+
+    assert _amount > 0, 'amount must be greater than 0'
+
+    assert extcall IERC20(_token).transfer(target_address, _amount, default_return_value=True)
+
+
+@external
+@view
+def get_all_guards() -> DynArray[address, 5]:
+    """
+    @notice Get all guards
+    @return DynArray[address, 5] list containing all guards
+    """
+    return self.guards
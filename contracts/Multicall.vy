@@ -0,0 +1,71 @@
+#pragma version ^0.4.0
+"""
+@title Multicall
+@author martinkrung for curve.fi
+@license MIT
+@notice Aggregates many view calls into one eth_call
+@dev aggregate3() is ABI compatible with Multicall3 (0xcA11bde05977b3631167028862bE2a173976CA11),
+     so scripts can use this contract on local networks and the canonical one on live chains
+"""
+
+MAX_CALLS: constant(uint256) = 128
+MAX_CALLDATA: constant(uint256) = 256
+MAX_RETURNDATA: constant(uint256) = 2048  # fits get_all_epochs() with 52 epochs
+
+VERSION: constant(String[8]) = "0.9.1"
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[MAX_CALLDATA]
+
+struct Result:
+    success: bool
+    returnData: Bytes[MAX_RETURNDATA]
+
+
+@external
+@view
+def aggregate3(_calls: DynArray[Call3, MAX_CALLS]) -> DynArray[Result, MAX_CALLS]:
+    """
+    @notice Call every target with its calldata and collect the results
+    @param _calls list of (target, allowFailure, callData)
+    @return DynArray[Result, 128] list of (success, returnData) in the same order as _calls
+    @dev reverts if a call fails and allowFailure is not set for it
+    """
+    results: DynArray[Result, MAX_CALLS] = []
+
+    for call: Call3 in _calls:
+        success: bool = False
+        return_data: Bytes[MAX_RETURNDATA] = b""
+        success, return_data = raw_call(
+            call.target,
+            call.callData,
+            max_outsize=MAX_RETURNDATA,
+            is_static_call=True,
+            revert_on_failure=False
+        )
+        assert success or call.allowFailure, "call failed"
+        results.append(Result(success=success, returnData=return_data))
+
+    return results
+
+
+@external
+@view
+def getCurrentBlockTimestamp() -> uint256:
+    """
+    @notice Get the timestamp of the block the calls are executed in
+    @return uint256 block timestamp
+    """
+    return block.timestamp
+
+
+@external
+@view
+def getBlockNumber() -> uint256:
+    """
+    @notice Get the number of the block the calls are executed in
+    @return uint256 block number
+    """
+    return block.number
@@ -19,6 +19,28 @@ event MultipleNewProxy:
 interface ISProxy:
     def deploy_proxy(implementation: address) -> address: nonpayable
 
+interface ISingleCampaign:
+    def initialize(
+        _guards: DynArray[address, 5],
+        _crvusd_address: address,
+        _execute_reward_amount: uint256,
+        _distributor_address: address,
+        _receiving_gauge: address,
+        _min_epoch_duration: uint256,
+        _id: uint256,
+        _name: String[64],
+        _reward_epochs: DynArray[uint256, 52]
+    ): nonpayable
+
+struct CampaignParams:
+    salt: bytes32
+    distributor_address: address
+    receiving_gauge: address
+    min_epoch_duration: uint256
+    id: uint256
+    name: String[64]
+    reward_epochs: DynArray[uint256, 52]
+
 
 @external
 def deploy_proxy(implementation: address) -> address:
@@ -39,4 +61,63 @@ def deploy_multiple_proxies(implementation: address, n: uint256) -> DynArray[add
 
     log MultipleNewProxy(proxies, implementation, block.timestamp)
 
-    return proxies
\ No newline at end of file
+    return proxies
+
+
+@external
+def deploy_proxy_salted(implementation: address, salt: bytes32) -> address:
+    # Creates the proxy with CREATE2, the address only depends on this contract, implementation, caller and salt
+    return self._deploy_proxy_salted(implementation, salt)
+
+@external
+def deploy_multiple_proxies_salted(implementation: address, salts: DynArray[bytes32, 27]) -> DynArray[address, 27]:
+    # Creates one proxy per salt, addresses can be computed before with scripts/_addresses.py
+    proxies: DynArray[address, 27] = []
+
+    for salt: bytes32 in salts:
+        proxies.append(self._deploy_proxy_salted(implementation, salt))
+
+    log MultipleNewProxy(proxies, implementation, block.timestamp)
+
+    return proxies
+
+@external
+def deploy_campaigns(
+    implementation: address,
+    guards: DynArray[address, 5],
+    crvusd_address: address,
+    execute_reward_amount: uint256,
+    campaigns: DynArray[CampaignParams, 27]
+) -> DynArray[address, 27]:
+    # Creates and initializes one SingleCampaign proxy per params in one transaction
+    # empty distributor_address or reward_epochs leave setup() or set_reward_epochs() to the guards
+    proxies: DynArray[address, 27] = []
+
+    for params: CampaignParams in campaigns:
+        proxy: address = self._deploy_proxy_salted(implementation, params.salt)
+        extcall ISingleCampaign(proxy).initialize(
+            guards,
+            crvusd_address,
+            execute_reward_amount,
+            params.distributor_address,
+            params.receiving_gauge,
+            params.min_epoch_duration,
+            params.id,
+            params.name,
+            params.reward_epochs
+        )
+        proxies.append(proxy)
+
+    log MultipleNewProxy(proxies, implementation, block.timestamp)
+
+    return proxies
+
+
+@internal
+def _deploy_proxy_salted(implementation: address, salt: bytes32) -> address:
+    # the caller is part of the salt, nobody else can take an address which is already in a guard list
+    proxy: address = create_minimal_proxy_to(implementation, salt=keccak256(concat(convert(msg.sender, bytes32), salt)))
+
+    log NewProxy(proxy, implementation, block.timestamp)
+
+    return proxy
@@ -19,10 +19,17 @@ min_epoch_duration: public(uint256)
 id: public(uint256)
 name: public(String[64])
 
+is_initialized: public(bool)
 is_setup_complete: public(bool)
 is_reward_epochs_set: public(bool)
 
-reward_epochs: public(DynArray[uint256, 52])  # Storing reward amounts
+# explicit reward amounts in distribution order, two uint128 amounts per slot
+packed_reward_epochs: uint256[MAX_PACKED_SLOTS]
+# linear epochs after the explicit ones: start amount in the low 128 bits, int128 step in the high 128 bits
+reward_schedule_tail: uint256
+# epoch count in bits 0-63, explicit epoch count in bits 64-127, index of the next epoch to distribute
+# in the high 128 bits, one slot so a distribution reads and writes a single word
+reward_epoch_position: uint256
 last_reward_distribution_time: public(uint256)
 have_rewards_started: public(bool)
 last_reward_amount: public(uint256)
@@ -30,10 +37,24 @@ last_reward_amount: public(uint256)
 execute_reward_amount: public(uint256)
 crvusd_address: public(address)
 
+# the only caller of initialize(), empty for campaigns which are not cloned
+FACTORY: public(immutable(address))
+
 WEEK: public(constant(uint256)) = 7 * 24 * 60 * 60  # 1 week in seconds
-VERSION: public(constant(String[8])) = "0.9.1"
+VERSION: public(constant(String[8])) = "1.0.0"
 DISTRIBUTION_BUFFER: public(constant(uint256)) = 2 * 60 * 60  # 2 hour window for early distribution, max divation is 2.7%
 
+MAX_REWARD_EPOCHS: constant(uint256) = 52
+MAX_PACKED_SLOTS: constant(uint256) = MAX_REWARD_EPOCHS // 2
+EPOCH_AMOUNT_BITS: constant(uint256) = 128
+EPOCH_AMOUNT_MASK: constant(uint256) = 2**128 - 1
+MAX_EPOCH_STEP: constant(int256) = 2**127 - 1
+EXPLICIT_COUNT_SHIFT: constant(uint256) = 64
+EPOCH_COUNT_MASK: constant(uint256) = 2**64 - 1
+# set_reward_epochs_packed(): unit exponent, epoch width, then up to 52 epochs of up to 16 bytes
+MAX_PACKED_PAYLOAD: constant(uint256) = 2 + MAX_REWARD_EPOCHS * 16
+MAX_UNIT_EXPONENT: constant(uint256) = 38
+
 # Events
 
 event SetupCompleted:
@@ -46,6 +67,13 @@ event RewardEpochsSet:
     reward_epochs: DynArray[uint256, 52]
     timestamp: uint256
 
+event RewardScheduleSet:
+    ramp_epochs: DynArray[uint256, 52]
+    start_amount: uint256
+    step: int256
+    linear_epoch_count: uint256
+    timestamp: uint256
+
 event RewardDistributed:
     reward_amount: uint256
     epoch_duration: uint256
@@ -64,18 +92,60 @@ event ExecuteRewardDistributed:
 
 
 @deploy
-def __init__(_guards: DynArray[address, 5], _crvusd_address: address, _execute_reward_amount: uint256):
+def __init__(_guards: DynArray[address, 5], _crvusd_address: address, _execute_reward_amount: uint256, _factory: address):
     """
     @notice Initialize the contract with guards
     @param _guards List of guard addresses that can control the contract
     @param _crvusd_address Address of the crvUSD token to be distributed to the caller
     @param _execute_reward_amount Amount of crvUSD to be distributed to the caller
+    @param _factory Proxy factory which initializes minimal proxies of this contract, empty if it is not cloned
     @dev min_epoch_duration reflects the old default in legacy gauge contracts
     """
+    FACTORY = _factory
+    self._initialize(_guards, _crvusd_address, _execute_reward_amount)
+
+@external
+def initialize(
+    _guards: DynArray[address, 5],
+    _crvusd_address: address,
+    _execute_reward_amount: uint256,
+    _distributor_address: address,
+    _receiving_gauge: address,
+    _min_epoch_duration: uint256,
+    _id: uint256,
+    _name: String[64],
+    _reward_epochs: DynArray[uint256, 52]
+):
+    """
+    @notice Initialize a minimal proxy of this contract, proxies never run __init__
+    @param _guards List of guard addresses that can control the contract
+    @param _crvusd_address Address of the crvUSD token to be distributed to the caller
+    @param _execute_reward_amount Amount of crvUSD to be distributed to the caller
+    @param _distributor_address Address of the Distributor contract, empty to call setup() later
+    @param _receiving_gauge Address of the RewardReceiver contract
+    @param _min_epoch_duration Minimum epoch duration in seconds
+    @param _reward_epochs List of reward amounts ordered from first to last epoch, empty to call set_reward_epochs() later
+    @dev the implementation is initialized by __init__ and can not be initialized again,
+         proxies are initialized by FACTORY in the transaction which creates them
+    """
+    assert msg.sender == FACTORY, "only the factory can initialize"
+    assert not self.is_initialized, "Already initialized"
+
+    self._initialize(_guards, _crvusd_address, _execute_reward_amount)
+
+    if _distributor_address != empty(address):
+        self._setup(_distributor_address, _receiving_gauge, _min_epoch_duration, _id, _name)
+
+    if len(_reward_epochs) > 0:
+        self._set_reward_epochs(_reward_epochs)
+
+@internal
+def _initialize(_guards: DynArray[address, 5], _crvusd_address: address, _execute_reward_amount: uint256):
     self.guards = _guards
     self.min_epoch_duration = WEEK
     self.crvusd_address = _crvusd_address
     self.execute_reward_amount = _execute_reward_amount
+    self.is_initialized = True
 
 @external
 def setup(_distributor_address: address, _receiving_gauge: address, _min_epoch_duration: uint256, _id: uint256, _name: String[64]):
@@ -86,6 +156,10 @@ def setup(_distributor_address: address, _receiving_gauge: address, _min_epoch_d
     @param _min_epoch_duration Minimum epoch duration in seconds
     """
     assert msg.sender in self.guards, "only guards can call this function"
+    self._setup(_distributor_address, _receiving_gauge, _min_epoch_duration, _id, _name)
+
+@internal
+def _setup(_distributor_address: address, _receiving_gauge: address, _min_epoch_duration: uint256, _id: uint256, _name: String[64]):
     assert not self.is_setup_complete, "Setup already completed"
     assert 3 * WEEK // 7 <= _min_epoch_duration and _min_epoch_duration <= WEEK  * 4 * 12, 'epoch duration must be between 3 days and a year'
     
@@ -103,23 +177,95 @@ def setup(_distributor_address: address, _receiving_gauge: address, _min_epoch_d
 @external
 def set_reward_epochs(_reward_epochs: DynArray[uint256, 52]):
     """
-    @notice  Set the reward epochs in reverse order: last value is the first to be distributed, first value is the last to be distributed
+    @notice Set the reward epochs, first value is the first to be distributed
     @param _reward_epochs List of reward amounts ordered from first to last epoch
-    @dev Be aware that internal storage is reversed, to use pop() to get the next epoch
+    @dev two amounts share one storage slot, amounts must fit into uint128
+    """
+    assert msg.sender in self.guards, "only guards can call this function"
+    self._set_reward_epochs(_reward_epochs)
+
+@internal
+def _set_reward_epochs(_reward_epochs: DynArray[uint256, 52]):
+    self._store_reward_schedule(_reward_epochs, 0, 0, 0)
+
+    log RewardEpochsSet(_reward_epochs, block.timestamp)    
+
+@external
+def set_reward_epochs_packed(_payload: Bytes[MAX_PACKED_PAYLOAD]):
+    """
+    @notice Set the reward epochs from a compact payload, same result as set_reward_epochs() with less calldata
+    @param _payload 1 byte unit exponent e, 1 byte width w, then every epoch as w byte big-endian value, amount = value * 10**e
+    @dev [300e18, 600e18, 1200e18] is 0x1401 03 06 0c with e = 20 and w = 1, 5 bytes instead of 3 words
+    """
+    assert msg.sender in self.guards, "only guards can call this function"
+    self._set_reward_epochs(self._unpack_reward_epochs(_payload))
+
+@internal
+@pure
+def _unpack_reward_epochs(_payload: Bytes[MAX_PACKED_PAYLOAD]) -> DynArray[uint256, 52]:
+    assert len(_payload) > 2, "Must set between 1 and 52 epochs"
+    exponent: uint256 = convert(slice(_payload, 0, 1), uint256)
+    width: uint256 = convert(slice(_payload, 1, 1), uint256)
+    assert exponent <= MAX_UNIT_EXPONENT, "Unit exponent exceeds 38"
+    assert width > 0 and width <= 16, "Epoch width must be between 1 and 16 bytes"
+    assert (len(_payload) - 2) % width == 0, "Payload length does not match epoch width"
+
+    n: uint256 = (len(_payload) - 2) // width
+    assert n <= MAX_REWARD_EPOCHS, "Must set between 1 and 52 epochs"
+
+    unit: uint256 = 10 ** exponent
+    value_shift: uint256 = 256 - 8 * width
+    # 32 zero bytes after the payload keep extract32 in bounds for the last epoch
+    padded: Bytes[MAX_PACKED_PAYLOAD + 32] = concat(_payload, empty(bytes32))
+
+    reward_epochs: DynArray[uint256, 52] = []
+    for i: uint256 in range(n, bound=MAX_REWARD_EPOCHS):
+        reward_epochs.append((convert(extract32(padded, 2 + i * width), uint256) >> value_shift) * unit)
+    return reward_epochs
+
+@external
+def set_reward_schedule(_ramp_epochs: DynArray[uint256, 52], _start_amount: uint256, _step: int256, _linear_epoch_count: uint256):
+    """
+    @notice Set the reward epochs as explicit ramp followed by a linear segment, evaluated on distribution
+    @param _ramp_epochs List of reward amounts distributed first, can be empty
+    @param _start_amount Amount of the first epoch after the ramp
+    @param _step Amount added to each following epoch, 0 for constant epochs, negative for a decline
+    @param _linear_epoch_count Number of epochs after the ramp
+    @dev [300, 600, 1200] + [2100] * 5 is ([300, 600, 1200], 2100, 0, 5), [6000, 5800, ..., 4800] is ([], 6000, -200, 7)
     """
     assert msg.sender in self.guards, "only guards can call this function"
+    self._store_reward_schedule(_ramp_epochs, _start_amount, _step, _linear_epoch_count)
+
+    log RewardScheduleSet(_ramp_epochs, _start_amount, _step, _linear_epoch_count, block.timestamp)
+
+@internal
+def _store_reward_schedule(_ramp_epochs: DynArray[uint256, 52], _start_amount: uint256, _step: int256, _linear_epoch_count: uint256):
     assert not self.is_reward_epochs_set, "Reward epochs can only be set once"
-    assert len(_reward_epochs) > 0 and len(_reward_epochs) <= 52, "Must set between 1 and 52 epochs"
 
-    # Store epochs in reverse order  
-    n: uint256 = len(_reward_epochs)
+    n: uint256 = len(_ramp_epochs)
+    assert n + _linear_epoch_count > 0 and n + _linear_epoch_count <= 52, "Must set between 1 and 52 epochs"
 
-    for i: uint256 in range(n, bound=52):
-        self.reward_epochs.append(_reward_epochs[n - 1 - i])
+    for slot: uint256 in range((n + 1) // 2, bound=MAX_PACKED_SLOTS):
+        first: uint256 = _ramp_epochs[2 * slot]
+        second: uint256 = 0
+        if 2 * slot + 1 < n:
+            second = _ramp_epochs[2 * slot + 1]
+        assert first <= EPOCH_AMOUNT_MASK and second <= EPOCH_AMOUNT_MASK, "Reward amount exceeds uint128"
 
-    self.is_reward_epochs_set = True
+        self.packed_reward_epochs[slot] = first | (second << EPOCH_AMOUNT_BITS)
 
-    log RewardEpochsSet(_reward_epochs, block.timestamp)    
+    if _linear_epoch_count > 0:
+        assert -MAX_EPOCH_STEP <= _step and _step <= MAX_EPOCH_STEP, "Step exceeds int128"
+        # amounts are linear, checking the first and the last covers all epochs
+        last_amount: int256 = convert(_start_amount, int256) + _step * convert(_linear_epoch_count - 1, int256)
+        assert _start_amount <= EPOCH_AMOUNT_MASK and last_amount >= 0 and convert(last_amount, uint256) <= EPOCH_AMOUNT_MASK, "Reward amount exceeds uint128"
+
+        # two's complement of the step in 128 bits
+        step_bits: uint256 = convert(_step, uint256) if _step >= 0 else convert(_step + 2**128, uint256)
+        self.reward_schedule_tail = _start_amount | (step_bits << EPOCH_AMOUNT_BITS)
+
+    self.reward_epoch_position = (n + _linear_epoch_count) | (n << EXPLICIT_COUNT_SHIFT)
+    self.is_reward_epochs_set = True
 
 @external
 def distribute_reward():
@@ -132,7 +278,10 @@ def _distribute_reward():
     """
     assert self.is_setup_complete, "Setup not completed"
     assert self.is_reward_epochs_set, "Reward epochs not set"
-    assert len(self.reward_epochs) > 0, "No remaining reward epochs"
+    position: uint256 = self.reward_epoch_position
+    count: uint256 = position & EPOCH_COUNT_MASK
+    cursor: uint256 = position >> EPOCH_AMOUNT_BITS
+    assert cursor < count, "No remaining reward epochs"
 
     end_time: uint256 = 0
     end_time_buffer: uint256 = 0
@@ -144,7 +293,8 @@ def _distribute_reward():
         end_time_buffer = end_time - DISTRIBUTION_BUFFER
         assert block.timestamp >= end_time_buffer, "Minimum time between distributions not met"
     
-    reward_amount: uint256 = self.reward_epochs.pop()
+    reward_amount: uint256 = self._reward_epoch(cursor, position)
+    self.reward_epoch_position = position + (1 << EPOCH_AMOUNT_BITS)
     
     # Update last distribution time and mark rewards as started
     self.last_reward_distribution_time = block.timestamp
@@ -167,7 +317,7 @@ def _distribute_reward():
         self.min_epoch_duration,
         end_time,
         end_time_buffer,
-        len(self.reward_epochs),  # Remaining reward epochs
+        count - cursor - 1,  # Remaining reward epochs
         block.timestamp
     )
 
@@ -190,7 +340,7 @@ def execute():
 
     log ExecuteRewardDistributed(
         msg.sender,
-        len(self.reward_epochs),
+        self._remaining_epochs(),
         self.last_reward_amount,
         self.crvusd_address,
         self.execute_reward_amount,
@@ -213,7 +363,7 @@ def _execution_allowed() -> bool:
     """
     assert self.is_setup_complete, "Setup not completed"
     assert self.is_reward_epochs_set, "Reward epochs not set"
-    assert len(self.reward_epochs) > 0, "No remaining reward epochs"
+    assert self._remaining_epochs() > 0, "No remaining reward epochs"
 
     # start execution is always possible if not started    
     if not self.have_rewards_started:
@@ -266,7 +416,7 @@ def get_next_epoch_info() -> (uint256, uint256):
         seconds_until_next_distribution: Seconds left until next distribution is allowed
     )
     """
-    assert len(self.reward_epochs) > 0, "No remaining reward epochs"
+    assert self._remaining_epochs() > 0, "No remaining reward epochs"
     
     seconds_until_next_distribution: uint256 = 0
     if self.have_rewards_started:
@@ -274,7 +424,7 @@ def get_next_epoch_info() -> (uint256, uint256):
             seconds_until_next_distribution = self.last_reward_distribution_time + self.min_epoch_duration - block.timestamp
     
     return (
-        self.reward_epochs[len(self.reward_epochs) - 1],  # Next reward amount to distribute (last element)
+        self._reward_epoch(self._reward_epoch_cursor(), self.reward_epoch_position),  # Next reward amount to distribute
         seconds_until_next_distribution
     )
 
@@ -286,17 +436,66 @@ def get_all_epochs() -> DynArray[uint256, 52]:
     @notice Get all remaining reward epochs
     @return DynArray[uint256, 52] Array containing all remaining reward epoch amounts
     @dev returns the epochs list as the same order as they are set in set_reward_epochs()
-    @dev Be aware that internal storage is reversed, to use pop() to get the next epoch
     """
     reward_epochs: DynArray[uint256, 52] = []
 
-    n: uint256 = len(self.reward_epochs)
-    for i: uint256 in range(n, bound=52):
-        reward_epochs.append(self.reward_epochs[n - 1 - i])
+    position: uint256 = self.reward_epoch_position
+    for i: uint256 in range(position >> EPOCH_AMOUNT_BITS, position & EPOCH_COUNT_MASK, bound=MAX_REWARD_EPOCHS):
+        reward_epochs.append(self._reward_epoch(i, position))
 
     return reward_epochs
 
 
+@internal
+@view
+def _reward_epoch(_index: uint256, _position: uint256) -> uint256:
+    """
+    @notice Unpack or compute the reward amount of epoch _index
+    """
+    explicit_count: uint256 = (_position >> EXPLICIT_COUNT_SHIFT) & EPOCH_COUNT_MASK
+    if _index < explicit_count:
+        return (self.packed_reward_epochs[_index // 2] >> (EPOCH_AMOUNT_BITS * (_index % 2))) & EPOCH_AMOUNT_MASK
+
+    tail: uint256 = self.reward_schedule_tail
+    start_amount: uint256 = tail & EPOCH_AMOUNT_MASK
+    step_bits: uint256 = tail >> EPOCH_AMOUNT_BITS
+    k: uint256 = _index - explicit_count
+    if step_bits < 2**127:
+        return start_amount + step_bits * k
+    return start_amount - (2**128 - step_bits) * k
+
+
+@internal
+@view
+def _reward_epoch_cursor() -> uint256:
+    return self.reward_epoch_position >> EPOCH_AMOUNT_BITS
+
+
+@internal
+@view
+def _remaining_epochs() -> uint256:
+    position: uint256 = self.reward_epoch_position
+    return (position & EPOCH_COUNT_MASK) - (position >> EPOCH_AMOUNT_BITS)
+
+
+@external
+@view
+def reward_epoch_count() -> uint256:
+    """
+    @notice Number of reward epochs set, including already distributed ones
+    """
+    return self.reward_epoch_position & EPOCH_COUNT_MASK
+
+
+@external
+@view
+def reward_epoch_cursor() -> uint256:
+    """
+    @notice Index of the next reward epoch to distribute
+    """
+    return self._reward_epoch_cursor()
+
+
 @external
 def recover_token(_token: address, target_address: address, _amount: uint256):
     """
@@ -329,4 +528,4 @@ def get_number_of_remaining_epochs() -> uint256:
     @notice Get the number of remaining reward epochs
     @return uint256 Remaining number of reward epochs
     """
-    return len(self.reward_epochs)
+    return self._remaining_epochs()
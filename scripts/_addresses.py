@@ -0,0 +1,52 @@
+import rlp
+
+from eth_utils import keccak, to_bytes, to_checksum_address
+
+# init code of create_minimal_proxy_to() in vyper 0.4: loader + EIP-1167 forwarder around the implementation
+MINIMAL_PROXY_LOADER = bytes.fromhex("602d3d8160093d39f3")
+MINIMAL_PROXY_PREFIX = bytes.fromhex("363d3d373d3d3d363d73")
+MINIMAL_PROXY_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+
+def create_address(sender, nonce):
+    """
+    Address of the contract deployed by sender with nonce
+    """
+    return to_checksum_address(keccak(rlp.encode([to_bytes(hexstr=str(sender)), nonce]))[12:])
+
+
+def create2_address(deployer, salt, init_code):
+    """
+    Address of the contract deployed by deployer with CREATE2
+    """
+    return to_checksum_address(keccak(b"\xff" + to_bytes(hexstr=str(deployer)) + to_bytes(salt) + keccak(init_code))[12:])
+
+
+def minimal_proxy_code(implementation):
+    # runtime code of the proxy, what eth_getCode returns
+    return MINIMAL_PROXY_PREFIX + to_bytes(hexstr=str(implementation)) + MINIMAL_PROXY_SUFFIX
+
+
+def minimal_proxy_init_code(implementation):
+    return MINIMAL_PROXY_LOADER + minimal_proxy_code(implementation)
+
+
+def campaign_salt(label, index):
+    """
+    Salt of the campaign proxy number index of a period, e.g. campaign_salt("taiko-2025-01", 3)
+    """
+    return keccak(text=f"{label}:{index}")
+
+
+def proxy_address(factory, implementation, salt, deployer):
+    """
+    Address of the proxy factory creates for deployer with Proxy.deploy_proxy_salted(implementation, salt)
+    or Proxy.deploy_campaigns(), no RPC needed
+    """
+    # Proxy.vy binds the salt to the caller
+    salt = keccak(to_bytes(hexstr=str(deployer)).rjust(32, b"\0") + to_bytes(salt))
+    return create2_address(factory, salt, minimal_proxy_init_code(implementation))
+
+
+def campaign_proxy_addresses(factory, implementation, deployer, label, n):
+    return [proxy_address(factory, implementation, campaign_salt(label, i), deployer) for i in range(n)]
@@ -0,0 +1,155 @@
+import glob
+import hashlib
+import json
+import os
+
+from dataclasses import dataclass
+
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector, keccak
+from eth_utils.abi import collapse_if_tuple
+
+# written by ape compile, read without importing ape
+PROJECT_MANIFEST = os.getenv('PROJECT_MANIFEST') or ".build/__local__.json"
+# abi and bytecode per contract by source hash, a hit skips parsing the whole manifest
+ARTIFACT_CACHE = os.getenv('ARTIFACT_CACHE') or ".artifact_cache"
+CONTRACTS_FOLDER = "contracts"
+
+# constructor arguments stored as immutables, in declaration order, must match contracts/*.vy
+IMMUTABLE_ARGS = {
+    "SingleCampaign": ["_factory"],
+}
+
+
+def source_hash(source):
+    # ape stores sources with exactly one trailing newline
+    return hashlib.sha256((source.rstrip("\n") + "\n").encode()).hexdigest()
+
+
+def _source_path(name):
+    paths = glob.glob(os.path.join(CONTRACTS_FOLDER, "**", f"{name}.vy"), recursive=True)
+    assert paths, f"no source of {name} in {CONTRACTS_FOLDER}"
+    return paths[0]
+
+
+def contract_source_hash(name):
+    """
+    source_hash() of the current contracts/<name>.vy, as recorded for a deployment built from it
+    """
+    with open(_source_path(name)) as f:
+        return source_hash(f.read())
+
+
+def _types(inputs):
+    return [collapse_if_tuple(arg) for arg in inputs]
+
+
+@dataclass
+class Artifact:
+    name: str
+    source_hash: str
+    abi: list
+    deployment_bytecode: bytes
+    runtime_bytecode: bytes
+
+    def constructor_inputs(self):
+        return next((item for item in self.abi if item["type"] == "constructor"), {"inputs": []})["inputs"]
+
+    def constructor_types(self):
+        return _types(self.constructor_inputs())
+
+    def encode_constructor(self, args):
+        """
+        Constructor arguments as appended to the init code, as the block explorers ask for verification
+        """
+        return encode(self.constructor_types(), list(args))
+
+    def init_code(self, args):
+        return self.deployment_bytecode + self.encode_constructor(args)
+
+    def runtime_code(self, args):
+        """
+        Code at the address after deploying with args, vyper appends the immutables to the runtime bytecode
+        """
+        inputs = self.constructor_inputs()
+        names = [arg["name"] for arg in inputs]
+        immutables = [names.index(name) for name in IMMUTABLE_ARGS.get(self.name, [])]
+        return self.runtime_bytecode + encode([_types(inputs)[i] for i in immutables], [args[i] for i in immutables])
+
+    def method_abi(self, name, n_args):
+        """
+        abi of a method, overloads are selected by the number of args like in TransactionPipeline
+        """
+        return next(item for item in self.abi if item["type"] == "function" and item["name"] == name and len(item["inputs"]) == n_args)
+
+    def encode_call(self, name, args):
+        abi = self.method_abi(name, len(args))
+        return function_abi_to_4byte_selector(abi) + encode(_types(abi["inputs"]), list(args))
+
+
+def _bytecode(bytecode):
+    return bytes.fromhex((bytecode or {}).get("bytecode", "0x")[2:])
+
+
+def load_artifact(name, manifest_path=None, cache_dir=None):
+    """
+    Compiled abi and bytecode of a contract from the last ape compile, no compiler or ape import needed
+
+    Asserts that contracts/<name>.vy did not change since it was compiled, a stale
+    artifact would encode against an old abi.
+
+    @param cache_dir ARTIFACT_CACHE if None, "" disables the cache
+    """
+    cache_dir = ARTIFACT_CACHE if cache_dir is None else cache_dir
+    source = _source_path(name)
+    digest = contract_source_hash(name)
+
+    path = os.path.join(cache_dir, f"{name}-{digest}.json")
+    if cache_dir and os.path.exists(path):
+        with open(path) as f:
+            cached = json.load(f)
+        return Artifact(name, digest, cached["abi"], bytes.fromhex(cached["deployment_bytecode"]), bytes.fromhex(cached["runtime_bytecode"]))
+
+    manifest_path = manifest_path or PROJECT_MANIFEST
+    assert os.path.exists(manifest_path), f"{manifest_path} not found, run ape compile"
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    compiled = manifest["sources"].get(source.replace(os.sep, "/"), {}).get("content")
+    assert compiled is not None and source_hash(compiled) == digest, f"{source} changed since the last compile, run ape compile"
+
+    contract_type = manifest["contractTypes"][name]
+    artifact = Artifact(name, digest, contract_type["abi"], _bytecode(contract_type.get("deploymentBytecode")), _bytecode(contract_type.get("runtimeBytecode")))
+
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        # parallel test workers fill the cache at the same time, readers never see a partial file
+        with open(f"{path}.{os.getpid()}", "w") as f:
+            json.dump({"abi": artifact.abi, "deployment_bytecode": artifact.deployment_bytecode.hex(), "runtime_bytecode": artifact.runtime_bytecode.hex()}, f)
+        os.replace(f"{path}.{os.getpid()}", path)
+    return artifact
+
+
+def parse_arg(abi_type, value):
+    """
+    abi value of a command line or yaml argument, arrays are comma separated, "0x1,0x2" for address[]
+    """
+    if abi_type.endswith("[]"):
+        values = value.split(",") if isinstance(value, str) else value
+        return [parse_arg(abi_type[:-2], v.strip() if isinstance(v, str) else v) for v in values if v != ""]
+    if abi_type == "address" and isinstance(value, int):
+        # unquoted addresses are parsed as int by yaml
+        return f"0x{value:040x}"
+    if not isinstance(value, str):
+        return value
+    if abi_type.startswith(("uint", "int")):
+        return int(value, 0)
+    if abi_type == "bool":
+        return value.lower() in ("1", "true")
+    if abi_type.startswith("bytes"):
+        return bytes.fromhex(value.removeprefix("0x"))
+    return value
+
+
+def init_code_hash(artifact, args):
+    return keccak(artifact.init_code(args))
@@ -0,0 +1,139 @@
+import os
+import re
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+import yaml
+
+from eth_utils import is_address
+
+from scripts._schedule_compiler import compile_schedules_cached, to_wei
+
+REWARD_TOKEN_DIGITS = os.getenv('REWARD_TOKEN_DIGITS')
+CAMPAIGN_CONTRACT_LIST = os.getenv('CAMPAIGN_CONTRACT_LIST')
+DEPLOYED_DISTRIBUTOR = os.getenv('DEPLOYED_DISTRIBUTOR')
+
+# ${VAR} or $VAR, as os.path.expandvars
+ENV_VAR = re.compile(r"\$\{(\w+)\}|\$(\w+)")
+
+
+@dataclass
+class CampaignSpec:
+    id: int
+    name: str
+    address: str
+    gauge: str
+    distributor: str
+    min_epoch_duration: int
+    epochs: list  # reward amounts in token units, as written in the spec or compiled from budget and shape
+    reward_epochs: list  # reward amounts in wei, as passed to set_reward_epochs()
+
+
+def expand_epochs(epochs):
+    """
+    Expand the epoch list of a spec, entries are amounts, {amount: x, repeat: n} or {start: x, step: y, count: n}
+
+    [300, 600, {amount: 2100, repeat: 3}] -> [300, 600, 2100, 2100, 2100]
+    [{start: 6000, step: -200, count: 4}] -> [6000, 5800, 5600, 5400]
+    """
+    expanded = []
+    for epoch in epochs:
+        if isinstance(epoch, dict) and "start" in epoch:
+            start, step = Decimal(str(epoch["start"])), Decimal(str(epoch["step"]))
+            expanded += [start + step * k for k in range(int(epoch["count"]))]
+        elif isinstance(epoch, dict):
+            expanded += [epoch["amount"]] * int(epoch.get("repeat", 1))
+        else:
+            expanded.append(epoch)
+    return expanded
+
+
+def _expand_env(value, path, keep_unset=False):
+    # unquoted 0x... addresses are parsed as int by yaml
+    assert not isinstance(value, int) or value < 2**64, f"quote address {hex(value)} in the spec"
+    if not isinstance(value, str):
+        return value
+
+    def replace(match):
+        name = match.group(1) or match.group(2)
+        if keep_unset and name not in os.environ:
+            return match.group(0)
+        assert name in os.environ, f"{name} is not set, {path} uses it"
+        return os.environ[name]
+
+    return ENV_VAR.sub(replace, value)
+
+
+def _check_address(value, what):
+    assert isinstance(value, str) and is_address(value), f"{what} is no address: {value}"
+
+
+def load_campaign_spec(path, campaign_contract_list=None, distributor=None, check_addresses=True):
+    """
+    Load a campaign spec file
+
+    Campaigns without an address take the next address from CAMPAIGN_CONTRACT_LIST,
+    in the order they are listed. ${VAR} in values is replaced from the environment,
+    an unset variable is an error. Campaigns with budget and shape instead of epochs
+    are compiled together into exact wei amounts.
+
+    @param distributor used for all campaigns instead of the distributor of the spec
+    @param check_addresses False keeps unset ${VAR} as written and accepts any address,
+           for commands which only need the reward epochs
+    """
+    with open(path) as f:
+        spec = yaml.safe_load(f)
+
+    if campaign_contract_list is None and CAMPAIGN_CONTRACT_LIST:
+        campaign_contract_list = CAMPAIGN_CONTRACT_LIST.split(",")
+    campaign_contract_list = list(campaign_contract_list or [])
+
+    digits = int(spec.get("reward_token_digits") or REWARD_TOKEN_DIGITS)
+    keep_unset = not check_addresses
+    spec_distributor = distributor is None
+    if spec_distributor:
+        distributor = _expand_env(spec.get("distributor"), path, keep_unset) or DEPLOYED_DISTRIBUTOR
+    min_epoch_duration = spec.get("min_epoch_duration")
+
+    campaigns = []
+    budgets = {}
+    for i, campaign in enumerate(spec["campaigns"]):
+        campaign = {key: _expand_env(value, path, keep_unset) for key, value in campaign.items()}
+
+        address = campaign.get("address")
+        if not address:
+            assert campaign_contract_list, f"no address for campaign {campaign['name']}, set CAMPAIGN_CONTRACT_LIST"
+            address = campaign_contract_list.pop(0)
+
+        epochs = expand_epochs(campaign["shape"] if "budget" in campaign else campaign["epochs"])
+        assert 0 < len(epochs) <= 52, f"campaign {campaign['name']} must have between 1 and 52 epochs"
+
+        campaign_spec = CampaignSpec(
+            id=int(campaign.get("id", i)),
+            name=campaign["name"],
+            address=address.strip(),
+            gauge=campaign["gauge"],
+            distributor=campaign.get("distributor", distributor) if spec_distributor else distributor,
+            min_epoch_duration=int(campaign.get("min_epoch_duration", min_epoch_duration)),
+            epochs=epochs,
+            reward_epochs=[] if "budget" in campaign else [to_wei(epoch, digits) for epoch in epochs],
+        )
+        if check_addresses:
+            _check_address(campaign_spec.address, f"address of campaign {campaign_spec.name}")
+            _check_address(campaign_spec.gauge, f"gauge of campaign {campaign_spec.name}")
+            # a spec without distributor gets the one deployed with its campaigns, see deploy-period
+            if campaign_spec.distributor is not None:
+                _check_address(campaign_spec.distributor, f"distributor of campaign {campaign_spec.name}")
+        campaigns.append(campaign_spec)
+        if "budget" in campaign:
+            budgets[i] = campaign["budget"]
+
+    if budgets:
+        # budget campaigns hold their shape in epochs until here
+        compiled = compile_schedules_cached(list(budgets.values()), [campaigns[i].epochs for i in budgets], digits)
+        for i, reward_epochs in zip(budgets, compiled):
+            campaigns[i].reward_epochs = reward_epochs
+            campaigns[i].epochs = [Decimal(amount) / 10**digits for amount in reward_epochs]
+
+    return campaigns
@@ -0,0 +1,151 @@
+import os
+
+from dataclasses import dataclass
+
+import yaml
+
+from eth_utils import keccak, to_checksum_address
+
+from scripts._addresses import campaign_proxy_addresses, minimal_proxy_code, minimal_proxy_init_code
+from scripts._artifacts import contract_source_hash, load_artifact, parse_arg
+
+# contract name of the campaign clones created by Proxy.vy, they have no artifact
+MINIMAL_PROXY = "MinimalProxy"
+ZERO_ADDRESS = "0x" + "0" * 40
+
+GUARDS = os.getenv('GUARDS')
+GUARDS_AND_CAMPAIGNS = os.getenv('GUARDS_AND_CAMPAIGNS')
+CRVUSD_ADDRESS = os.getenv('CRVUSD_ADDRESS')
+EXECUTE_REWARD_AMOUNT = os.getenv('EXECUTE_REWARD_AMOUNT')
+REWARD_TOKEN = os.getenv('REWARD_TOKEN')
+GAUGE_ALLOWLIST = os.getenv('GAUGE_ALLOWLIST')
+RECOVERY_ADDRESS = os.getenv('RECOVERY_ADDRESS')
+PROXY_FACTORY = os.getenv('PROXY_FACTORY')
+SINGLE_CAMPAIGN_IMPLEMENTATION = os.getenv('SINGLE_CAMPAIGN_IMPLEMENTATION')
+CAMPAIGN_SALT_LABEL = os.getenv('CAMPAIGN_SALT_LABEL')
+CAMPAIGN_COUNT = os.getenv('CAMPAIGN_COUNT')
+DEPLOYER_ADDRESS = os.getenv('DEPLOYER_ADDRESS')
+
+
+@dataclass
+class Deployment:
+    chain: str
+    name: str
+    contract: str  # artifact name or MINIMAL_PROXY
+    address: str | None
+    args: list  # constructor arguments, the implementation for MINIMAL_PROXY
+    source_hash: str | None = None  # source_hash() of the deployed contract source, None if not recorded
+
+
+@dataclass
+class EncodedDeployment:
+    deployment: Deployment
+    constructor_args: bytes
+    # both None unless the deployment was built from the current contract source,
+    # the bytecode of older sources or compilers is not known
+    init_code_hash: bytes | None
+    code: bytes | None  # runtime code expected at the address, with the immutables
+
+    def code_hash(self):
+        return keccak(self.code) if self.code is not None else None
+
+
+def _address(value):
+    # unquoted addresses are parsed as int by yaml
+    if isinstance(value, int):
+        value = f"0x{value:040x}"
+    return to_checksum_address(value)
+
+
+def _proxy_deployments(chain, name, proxies):
+    # {factory, implementation, deployer, label, count} of a salted period, see deploy-salted-campaigns
+    implementation = _address(proxies["implementation"])
+    addresses = campaign_proxy_addresses(_address(proxies["factory"]), implementation, _address(proxies["deployer"]), proxies["label"], int(proxies["count"]))
+    return [Deployment(chain, f"{name} campaign {i}", MINIMAL_PROXY, address, [implementation]) for i, address in enumerate(addresses)]
+
+
+def load_deployments(path, chains=()):
+    """
+    Deployments of every campaign in deployments.yaml
+
+    The Distributor takes its constructor arguments from REWARD_MANAGERS, REWARD_TOKEN, GAUGE_ALLOWLIST
+    and RECOVERY_ADDRESS of the campaign. Any other contract entry with args, e.g.
+    SingleCampaign: {address: ..., args: [guards, crvusd, amount, factory]}, and CampaignProxies:
+    {factory, implementation, deployer, label, count} of a salted period are added as well.
+    An entry built from the current source records it as source_hash: <contract_source_hash()>,
+    only those get an expected init code hash and runtime code.
+
+    @param chains e.g. ["arbitrum:mainnet"], all chains if empty
+    """
+    with open(path) as f:
+        deployments = yaml.safe_load(f) or {}
+
+    loaded = []
+    for chain, campaigns in deployments.items():
+        if chains and chain not in chains:
+            continue
+        for key, campaign in (campaigns or {}).items():
+            name = campaign.get("name", key)
+            for contract, entry in campaign.items():
+                if not isinstance(entry, dict):
+                    continue
+                address = _address(entry["address"]) if entry.get("address") is not None else None
+                if contract == "CampaignProxies":
+                    loaded += _proxy_deployments(chain, name, entry)
+                elif "args" in entry:
+                    loaded.append(Deployment(chain, name, contract, address, list(entry["args"]), entry.get("source_hash")))
+                elif contract == "Distributor" and "REWARD_MANAGERS" in campaign:
+                    args = [campaign["REWARD_MANAGERS"], campaign["REWARD_TOKEN"], campaign["GAUGE_ALLOWLIST"], campaign["RECOVERY_ADDRESS"]]
+                    loaded.append(Deployment(chain, name, contract, address, args, entry.get("source_hash")))
+    return loaded
+
+
+def env_deployments():
+    """
+    The SingleCampaign and Distributor configured in the environment, as the deploy commands use them
+
+    Salted campaign proxies from CAMPAIGN_SALT_LABEL are added to the Distributor guards,
+    the constructor can be encoded before they exist. Both are built from the current sources.
+    """
+    deployments = []
+    if GUARDS and CRVUSD_ADDRESS and EXECUTE_REWARD_AMOUNT:
+        deployments.append(Deployment("env", "SingleCampaign", "SingleCampaign", None, [GUARDS, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, PROXY_FACTORY or ZERO_ADDRESS], contract_source_hash("SingleCampaign")))
+    if GUARDS_AND_CAMPAIGNS and REWARD_TOKEN and GAUGE_ALLOWLIST and RECOVERY_ADDRESS:
+        guards = GUARDS_AND_CAMPAIGNS.split(",")
+        if CAMPAIGN_SALT_LABEL:
+            guards += campaign_proxy_addresses(PROXY_FACTORY, SINGLE_CAMPAIGN_IMPLEMENTATION, DEPLOYER_ADDRESS, CAMPAIGN_SALT_LABEL, int(CAMPAIGN_COUNT))
+        deployments.append(Deployment("env", "Distributor", "Distributor", None, [guards, REWARD_TOKEN, GAUGE_ALLOWLIST, RECOVERY_ADDRESS], contract_source_hash("Distributor")))
+    return deployments
+
+
+def encode_deployments(deployments, manifest_path=None, cache_dir=None):
+    """
+    Constructor arguments, init code hash and expected runtime code of many deployments in one pass,
+    every artifact is loaded once
+
+    Init code hash and runtime code come from the current sources and compiler, they are only
+    given for deployments whose source_hash matches the current source, e.g. not for the 2024 Distributors.
+
+    @return list of EncodedDeployment in the order of deployments
+    """
+    artifacts = {}
+    encoded = []
+    for deployment in deployments:
+        if deployment.contract == MINIMAL_PROXY:
+            implementation = deployment.args[0]
+            encoded.append(EncodedDeployment(deployment, b"", keccak(minimal_proxy_init_code(implementation)), minimal_proxy_code(implementation)))
+            continue
+
+        if deployment.contract not in artifacts:
+            artifacts[deployment.contract] = load_artifact(deployment.contract, manifest_path, cache_dir)
+        artifact = artifacts[deployment.contract]
+
+        types = artifact.constructor_types()
+        assert len(deployment.args) == len(types), f"{deployment.name}: {deployment.contract} constructor takes {len(types)} arguments"
+        args = [parse_arg(abi_type, value) for abi_type, value in zip(types, deployment.args)]
+        if deployment.source_hash == artifact.source_hash:
+            encoded.append(EncodedDeployment(deployment, artifact.encode_constructor(args), keccak(artifact.init_code(args)), artifact.runtime_code(args)))
+        else:
+            # the constructor abi is stable, the bytecode of the source it was deployed from is not known
+            encoded.append(EncodedDeployment(deployment, artifact.encode_constructor(args), None, None))
+    return encoded
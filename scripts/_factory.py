@@ -0,0 +1,55 @@
+from ape.utils import ZERO_ADDRESS
+
+from scripts._addresses import campaign_salt
+
+# the 9 Optimism campaigns with 7 epochs each use about 6.7M gas, well below L2 block gas limits
+CAMPAIGNS_PER_TRANSACTION = 9
+
+
+def campaign_params(campaign_spec, salt):
+    """
+    Proxy.CampaignParams of one campaign spec
+    """
+    return (
+        salt,
+        campaign_spec.distributor,
+        campaign_spec.gauge,
+        campaign_spec.min_epoch_duration,
+        campaign_spec.id,
+        campaign_spec.name,
+        campaign_spec.reward_epochs,
+    )
+
+
+def guards_only_params(salt):
+    """
+    Proxy.CampaignParams which only initialize the guards, setup and reward epochs are left to them
+    """
+    return (salt, ZERO_ADDRESS, ZERO_ADDRESS, 0, 0, "", [])
+
+
+def deploy_campaigns_transactions(factory, implementation, guards, crvusd_address, execute_reward_amount, campaign_specs, label, proxy_addresses, campaigns_per_transaction=CAMPAIGNS_PER_TRANSACTION):
+    """
+    Proxy.deploy_campaigns() for all campaign specs, campaigns_per_transaction per transaction
+
+    proxy_addresses are the precomputed addresses of campaign_salt(label, i),
+    the salt of every spec is looked up from its address.
+    @return list of (contract method, args) as for preflight() and send_pipelined()
+    """
+    params = []
+    for campaign_spec in campaign_specs:
+        assert campaign_spec.address in proxy_addresses, f"{campaign_spec.name} has address {campaign_spec.address}, not a salted proxy of {label}"
+        params.append(campaign_params(campaign_spec, campaign_salt(label, proxy_addresses.index(campaign_spec.address))))
+
+    return [
+        (factory.deploy_campaigns, (implementation, guards, crvusd_address, execute_reward_amount, params[i:i + campaigns_per_transaction]))
+        for i in range(0, len(params), campaigns_per_transaction)
+    ]
+
+
+def send_deploy_campaigns(pipeline, factory, implementation, guards, crvusd_address, execute_reward_amount, campaign_specs, label, proxy_addresses, campaigns_per_transaction=CAMPAIGNS_PER_TRANSACTION):
+    """
+    Broadcast the transactions of deploy_campaigns_transactions() through the pipeline
+    """
+    transactions = deploy_campaigns_transactions(factory, implementation, guards, crvusd_address, execute_reward_amount, campaign_specs, label, proxy_addresses, campaigns_per_transaction)
+    return [pipeline.transact(method, *args) for method, args in transactions]
@@ -0,0 +1,137 @@
+import os
+
+from dataclasses import dataclass
+
+# inclusion target of a new transaction in blocks
+FEE_TARGET_BLOCKS = int(os.getenv('FEE_TARGET_BLOCKS') or 3)
+# a pending transaction is replaced with higher fees after this many blocks
+FEE_REPLACE_AFTER_BLOCKS = int(os.getenv('FEE_REPLACE_AFTER_BLOCKS') or 3)
+
+FEE_HISTORY_BLOCKS = 20
+# priority fee percentiles of the included transactions, asked from eth_feeHistory
+REWARD_PERCENTILES = [10, 25, 50, 75, 90]
+# tip paid when recent blocks have room, the scripts used 10 wei before
+MIN_PRIORITY_FEE = 10
+GAS_MARGIN_PERCENT = 20
+
+# EIP-1559, the base fee rises at most 12.5% per block
+BASE_FEE_CHANGE_NUMERATOR = 9
+BASE_FEE_CHANGE_DENOMINATOR = 8
+
+
+@dataclass
+class FeeSuggestion:
+    base_fee: int
+    max_priority_fee: int
+    max_fee: int
+
+    def tx_kwargs(self):
+        return {"max_fee": self.max_fee, "max_priority_fee": self.max_priority_fee}
+
+
+def reward_percentile(target_blocks):
+    """
+    Priority fee percentile to outbid for inclusion within target_blocks, a later target pays less
+    """
+    if target_blocks <= 1:
+        return 90
+    if target_blocks == 2:
+        return 75
+    if target_blocks <= 4:
+        return 50
+    if target_blocks <= 9:
+        return 25
+    return 10
+
+
+def max_base_fee(next_base_fee, target_blocks):
+    # highest base fee the next target_blocks full blocks can reach
+    base_fee = next_base_fee
+    for _ in range(max(target_blocks, 1) - 1):
+        base_fee = base_fee * BASE_FEE_CHANGE_NUMERATOR // BASE_FEE_CHANGE_DENOMINATOR + 1
+    return base_fee
+
+
+def suggest_fees(fee_history, target_blocks, min_priority_fee=MIN_PRIORITY_FEE, max_fee_cap=None, latest_base_fee=0):
+    """
+    EIP-1559 fees for inclusion within target_blocks at the lowest cost
+
+    The tip is the median over recent blocks of the priority fee percentile which belongs to the
+    target, empty blocks are left out, they include anything. The max fee covers the base fee of
+    target_blocks full blocks in a row, only the actual base fee plus the tip is paid.
+
+    @param fee_history eth_feeHistory result with REWARD_PERCENTILES
+    @param max_fee_cap upper bound of the max fee in wei, None for no bound
+    @param latest_base_fee used when the node returns an empty history
+    @return FeeSuggestion in wei
+    """
+    base_fees = fee_history["baseFeePerGas"]
+    # the history ends with the base fee of the next block
+    next_base_fee = base_fees[-1] if base_fees else latest_base_fee
+
+    column = REWARD_PERCENTILES.index(reward_percentile(target_blocks))
+    tips = sorted(
+        rewards[column]
+        for rewards, gas_used_ratio in zip(fee_history.get("reward") or [], fee_history["gasUsedRatio"])
+        if gas_used_ratio > 0
+    )
+    priority_fee = max(tips[len(tips) // 2] if tips else 0, min_priority_fee)
+
+    max_fee = max_base_fee(next_base_fee, target_blocks) + priority_fee
+    if max_fee_cap is not None and max_fee > max_fee_cap:
+        max_fee = max_fee_cap
+        priority_fee = min(priority_fee, max_fee_cap)
+    return FeeSuggestion(base_fee=next_base_fee, max_priority_fee=priority_fee, max_fee=max_fee)
+
+
+class FeeEngine:
+    """
+    Fees and gas limits from the chain instead of fixed values per ecosystem
+
+    New transactions target inclusion within target_blocks. TransactionPipeline replaces a
+    transaction still pending after replace_after_blocks with replacement_fees().
+    """
+
+    def __init__(self, web3, target_blocks=None, replace_after_blocks=None, min_priority_fee=MIN_PRIORITY_FEE, max_fee_cap=None, gas_margin_percent=GAS_MARGIN_PERCENT):
+        self.web3 = web3
+        self.target_blocks = target_blocks or FEE_TARGET_BLOCKS
+        self.replace_after_blocks = replace_after_blocks or FEE_REPLACE_AFTER_BLOCKS
+        self.min_priority_fee = min_priority_fee
+        self.max_fee_cap = max_fee_cap
+        self.gas_margin_percent = gas_margin_percent
+
+    def fee_history(self):
+        return self.web3.eth.fee_history(FEE_HISTORY_BLOCKS, "latest", REWARD_PERCENTILES)
+
+    def suggest(self, target_blocks=None):
+        history = self.fee_history()
+        latest_base_fee = 0 if history["baseFeePerGas"] else self.web3.eth.get_block("latest").get("baseFeePerGas", 0)
+        return suggest_fees(history, target_blocks or self.target_blocks, self.min_priority_fee, self.max_fee_cap, latest_base_fee)
+
+    def tx_kwargs(self, target_blocks=None):
+        """
+        max_fee and max_priority_fee for ape transaction kwargs
+        """
+        return self.suggest(target_blocks).tx_kwargs()
+
+    def gas_limit(self, estimate):
+        return estimate * (100 + self.gas_margin_percent) // 100
+
+    def estimate_gas(self, provider, txn):
+        """
+        Gas limit of an unsigned transaction, the estimate plus gas_margin_percent
+        """
+        return self.gas_limit(provider.estimate_gas_cost(txn))
+
+    def replacement_fees(self, max_fee, max_priority_fee, bump_numerator, bump_denominator):
+        """
+        Fees of a replacement, the current suggestion but at least the bump the node requires
+
+        @return FeeSuggestion, None if max_fee_cap does not allow the bump
+        """
+        suggestion = self.suggest()
+        max_priority_fee = max(max_priority_fee * bump_numerator // bump_denominator + 1, suggestion.max_priority_fee)
+        max_fee = max(max_fee * bump_numerator // bump_denominator + 1, suggestion.max_fee, max_priority_fee)
+        if self.max_fee_cap is not None and max_fee > self.max_fee_cap:
+            return None
+        return FeeSuggestion(base_fee=suggestion.base_fee, max_priority_fee=max_priority_fee, max_fee=max_fee)
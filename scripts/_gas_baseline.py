@@ -0,0 +1,98 @@
+import json
+import os
+
+from dataclasses import dataclass
+
+# measured gas of every entry point, committed and compared by benchmarks/test_gas_baseline.py
+GAS_BASELINE = os.getenv('GAS_BASELINE') or "benchmarks/gas_baseline.json"
+GAS_REPORT = os.getenv('GAS_REPORT') or "gas_report.md"
+# gas or calldata above the baseline by more than this fails the benchmark
+GAS_TOLERANCE_PERCENT = float(os.getenv('GAS_TOLERANCE_PERCENT') or 2)
+
+# bumped when the layout of the baseline file changes
+BASELINE_FORMAT = 1
+
+
+@dataclass
+class GasChange:
+    name: str
+    gas: int | None  # None if the entry is only in the baseline
+    calldata: int | None
+    baseline_gas: int | None  # None for a new entry
+    baseline_calldata: int | None
+
+    def change_percent(self):
+        if self.gas is None or not self.baseline_gas:
+            return None
+        return (self.gas - self.baseline_gas) * 100 / self.baseline_gas
+
+    def regressed(self, tolerance_percent):
+        if self.gas is None or self.baseline_gas is None:
+            return False
+        limit = 1 + tolerance_percent / 100
+        return self.gas > self.baseline_gas * limit or self.calldata > self.baseline_calldata * limit
+
+
+def load_baseline(path=None):
+    """
+    @return {entry: {"gas": int, "calldata": int}}, empty if there is no baseline yet
+    """
+    path = path or GAS_BASELINE
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        baseline = json.load(f)
+    assert baseline.get("format") == BASELINE_FORMAT, f"{path} has format {baseline.get('format')}, expected {BASELINE_FORMAT}"
+    return baseline["entries"]
+
+
+def write_baseline(measured, compiler, path=None):
+    """
+    @param measured {entry: {"gas": int, "calldata": int}}
+    @param compiler e.g. "vyper 0.4.3", a different compiler explains changes of every entry
+    """
+    with open(path or GAS_BASELINE, "w") as f:
+        json.dump({"format": BASELINE_FORMAT, "compiler": compiler, "entries": dict(sorted(measured.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def compare_gas(baseline, measured):
+    """
+    One GasChange per entry of measured and baseline, in the order of measured, removed entries last
+    """
+    changes = []
+    for name, values in measured.items():
+        base = baseline.get(name, {})
+        changes.append(GasChange(name, values["gas"], values["calldata"], base.get("gas"), base.get("calldata")))
+    for name, base in baseline.items():
+        if name not in measured:
+            changes.append(GasChange(name, None, None, base["gas"], base["calldata"]))
+    return changes
+
+
+def format_report(changes, tolerance_percent=GAS_TOLERANCE_PERCENT):
+    """
+    Markdown table of all entries for reviews, regressions beyond the tolerance are marked
+    """
+    regressions = [change for change in changes if change.regressed(tolerance_percent)]
+    lines = [
+        "# Gas Report",
+        "",
+        f"{len(changes)} entries, {len(regressions)} above the baseline by more than {tolerance_percent:g}%",
+        "",
+        "| entry | gas | baseline | change | calldata bytes | baseline |",
+        "| --- | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for change in changes:
+        percent = change.change_percent()
+        if change.gas is None:
+            status = "removed"
+        elif change.baseline_gas is None:
+            status = "new"
+        else:
+            status = f"{percent:+.2f}%" + (" **regression**" if change.regressed(tolerance_percent) else "")
+        lines.append(
+            f"| {change.name} | {'' if change.gas is None else change.gas} | {'' if change.baseline_gas is None else change.baseline_gas} | {status} "
+            f"| {'' if change.calldata is None else change.calldata} | {'' if change.baseline_calldata is None else change.baseline_calldata} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,234 @@
+import sqlite3
+
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from ape import networks, project
+from eth_utils import to_checksum_address
+
+# contract kind -> contract type name in the project, every event of the abi is indexed
+CONTRACT_KINDS = {
+    "distributor": "Distributor",
+    "campaign": "SingleCampaign",
+    "proxy": "Proxy",
+}
+
+INITIAL_BLOCK_RANGE = 2000
+MAX_BLOCK_RANGE = 100000
+
+# sqlite integers are 64 bit signed, larger values are stored as decimal text
+MAX_SQLITE_INT = 2**63 - 1
+
+
+class IntSum:
+    """
+    sqlite aggregate summing integers and decimal text without float rounding
+    """
+
+    def __init__(self):
+        self.total = 0
+
+    def step(self, value):
+        if value is not None:
+            self.total += int(value)
+
+    def finalize(self):
+        return str(self.total)
+
+
+def connect(db_path):
+    db = sqlite3.connect(db_path)
+    db.create_aggregate("int_sum", 1, IntSum)
+    db.execute("CREATE TABLE IF NOT EXISTS cursors (address TEXT PRIMARY KEY, kind TEXT NOT NULL, next_block INTEGER NOT NULL)")
+    for kind in CONTRACT_KINDS:
+        for abi in _event_abis(kind):
+            columns = "".join(f", {_column(i.name)}" for i in abi.inputs)
+            db.execute(
+                f"CREATE TABLE IF NOT EXISTS {abi.name} ("
+                "address TEXT NOT NULL, block_number INTEGER NOT NULL, log_index INTEGER NOT NULL, transaction_hash TEXT NOT NULL"
+                f"{columns}, PRIMARY KEY (transaction_hash, log_index))"
+            )
+    return db
+
+
+def _event_abis(kind):
+    return list(getattr(project, CONTRACT_KINDS[kind]).contract_type.events)
+
+
+def _column(name):
+    # vyper event fields like _epoch are valid sqlite names, keep them as they are
+    return f'"{name}"'
+
+
+def _sqlite_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value if value <= MAX_SQLITE_INT else str(value)
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(v) for v in value)
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    return str(value)
+
+
+def load_deployed_contracts(path, network_choice):
+    """
+    Distributors of all campaigns in deployments.yaml for one network, e.g. "arbitrum:mainnet"
+
+    @return list of (address, kind)
+    """
+    with open(path) as f:
+        deployments = yaml.safe_load(f) or {}
+
+    contracts = []
+    for campaign in (deployments.get(network_choice) or {}).values():
+        address = (campaign.get("Distributor") or {}).get("address")
+        if address is None:
+            continue
+        # unquoted addresses are parsed as int by yaml
+        if isinstance(address, int):
+            address = f"0x{address:040x}"
+        contracts.append((to_checksum_address(address), "distributor"))
+    return contracts
+
+
+def discover_campaigns(distributor_addresses):
+    """
+    Guards of the Distributors which are contracts, campaigns have to be on the guard list
+    """
+    web3 = networks.provider.web3
+
+    campaigns = []
+    for address in distributor_addresses:
+        for guard in project.Distributor.at(address).get_all_guards():
+            if web3.eth.get_code(guard) and guard not in campaigns:
+                campaigns.append(guard)
+    return [(address, "campaign") for address in campaigns]
+
+
+class EventIndexer:
+    """
+    Incremental log indexer into sqlite
+
+    Every contract has its own block cursor, a run only fetches blocks after it.
+    Contracts are fetched concurrently, block ranges grow after successful
+    requests and shrink when the node rejects a range as too large.
+    """
+
+    def __init__(self, db, max_workers=4, initial_block_range=INITIAL_BLOCK_RANGE, max_block_range=MAX_BLOCK_RANGE, confirmations=0):
+        self.db = db
+        self.web3 = networks.provider.web3
+        self.ecosystem = networks.provider.network.ecosystem
+        self.max_workers = max_workers
+        self.initial_block_range = initial_block_range
+        self.max_block_range = max_block_range
+        self.confirmations = confirmations
+
+    def add_contracts(self, contracts, start_block=0):
+        """
+        Register contracts, contracts which already have a cursor keep it
+        """
+        self.db.executemany(
+            "INSERT OR IGNORE INTO cursors (address, kind, next_block) VALUES (?, ?, ?)",
+            [(str(address), kind, start_block) for address, kind in contracts],
+        )
+        self.db.commit()
+
+    def run(self):
+        """
+        Fetch and store all new events up to the head block
+
+        @return number of stored events per contract address
+        """
+        head = self.web3.eth.block_number - self.confirmations
+        cursors = self.db.execute("SELECT address, kind, next_block FROM cursors WHERE next_block <= ?", (head,)).fetchall()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda cursor: (cursor, self._fetch(cursor[0], cursor[2], head)), cursors))
+
+        stored = {}
+        # sqlite connections are not shared between threads, all writes happen here
+        for (address, kind, _), logs in results:
+            stored[address] = self._store(address, kind, logs, head + 1)
+        return stored
+
+    def _fetch(self, address, from_block, to_block):
+        logs = []
+        block_range = self.initial_block_range
+        while from_block <= to_block:
+            end = min(from_block + block_range - 1, to_block)
+            try:
+                logs += self.web3.eth.get_logs({"address": address, "fromBlock": from_block, "toBlock": end})
+            except Exception:
+                # too many results or range too large, retry with half the range
+                if block_range == 1:
+                    raise
+                block_range = max(block_range // 2, 1)
+                continue
+
+            from_block = end + 1
+            block_range = min(block_range * 2, self.max_block_range)
+        return logs
+
+    def _store(self, address, kind, logs, next_block):
+        rows = {}
+        for log in self.ecosystem.decode_logs(logs, *_event_abis(kind)):
+            arguments = log.event_arguments
+            rows.setdefault(log.event_name, []).append((
+                str(log.contract_address),
+                log.block_number,
+                log.log_index,
+                _sqlite_value(log.transaction_hash),
+                *[_sqlite_value(value) for value in arguments.values()],
+            ))
+
+        for event_name, values in rows.items():
+            placeholders = ", ".join("?" * len(values[0]))
+            self.db.executemany(f"INSERT OR IGNORE INTO {event_name} VALUES ({placeholders})", values)
+        self.db.execute("UPDATE cursors SET next_block = ? WHERE address = ?", (next_block, address))
+        self.db.commit()
+
+        return sum(len(values) for values in rows.values())
+
+
+def gauge_payouts(db):
+    """
+    Reward token sent per gauge by all indexed Distributors
+
+    @return rows of (receiving_gauge, distributions, amount)
+    """
+    rows = db.execute(
+        "SELECT receiving_gauge, COUNT(*), int_sum(amount) FROM SentRewardToken GROUP BY receiving_gauge ORDER BY receiving_gauge"
+    ).fetchall()
+    return [(gauge, count, int(amount)) for gauge, count, amount in rows]
+
+
+def execution_lag(db):
+    """
+    Seconds between the end of an epoch and its distribution, negative inside the DISTRIBUTION_BUFFER
+
+    The first distribution of a campaign has no previous epoch and is skipped.
+    @return rows of (campaign, block_number, timestamp, lag)
+    """
+    return db.execute(
+        "SELECT address, block_number, timestamp, lag FROM ("
+        "  SELECT address, block_number, CAST(timestamp AS INTEGER) AS timestamp,"
+        "    CAST(timestamp AS INTEGER) - CAST(end_time AS INTEGER) AS lag,"
+        "    ROW_NUMBER() OVER (PARTITION BY address ORDER BY block_number, log_index) AS n"
+        "  FROM RewardDistributed"
+        ") WHERE n > 1 ORDER BY address, block_number"
+    ).fetchall()
+
+
+def keeper_payouts(db):
+    """
+    Executions and logged crvUSD incentive per caller, the incentive is logged even if the campaign had no crvUSD left
+
+    @return rows of (caller, executions, execute_reward_amount)
+    """
+    rows = db.execute(
+        "SELECT caller, COUNT(*), int_sum(execute_reward_amount) FROM ExecuteRewardDistributed GROUP BY caller ORDER BY caller"
+    ).fetchall()
+    return [(caller, count, int(amount)) for caller, count, amount in rows]
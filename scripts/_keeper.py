@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import time
+
+from ape import project
+from ape.contracts import ContractInstance
+
+from scripts._multicall import aggregate_at_block, method_abi, MULTICALL_ADDRESS
+from scripts._pipeline import TransactionPipeline
+from scripts._preflight import preflight, print_failures
+
+# must match MAX_CAMPAIGNS in contracts/BatchExecutor.vy
+MAX_BATCH_CAMPAIGNS = 30
+
+DEADLINE_METHODS = (
+    "is_setup_complete",
+    "get_number_of_remaining_epochs",
+    "next_execution_allowed_time_buffer",
+)
+
+
+def read_campaign_deadlines(campaign_addresses, multicall_address=None, cache=None):
+    """
+    Read the earliest execution time of all campaigns in one aggregated eth_call
+    @return (block timestamp, {campaign address: earliest execution timestamp})
+    @dev campaigns that are not setup or have no remaining epochs are left out,
+         a campaign that has not started yet is due right away.
+         is_setup_complete is taken from the MetadataCache if given, it never turns false again
+    """
+    multicall_address = multicall_address or MULTICALL_ADDRESS
+    contract_type = project.SingleCampaign.contract_type
+    cached = cache.get_many(campaign_addresses, ("is_setup_complete",)) if cache else {}
+    methods = {address: DEADLINE_METHODS[1:] if address in cached else DEADLINE_METHODS for address in campaign_addresses}
+
+    calls = [(multicall_address, method_abi(project.Multicall.contract_type, "getCurrentBlockTimestamp"), ())]
+    calls += [(address, method_abi(contract_type, name), ()) for address in campaign_addresses for name in methods[address]]
+    # the block number for the cache comes with the first eth_call
+    block_number, results = aggregate_at_block(calls, multicall_address=multicall_address)
+    results = iter(results)
+
+    timestamp = next(results)
+    deadlines = {}
+    for address in campaign_addresses:
+        values = {name: next(results) for name in methods[address]}
+        if address in cached:
+            values["is_setup_complete"] = True
+        elif cache:
+            cache.store(address, {"is_setup_complete": values["is_setup_complete"]}, block_number)
+
+        if values["is_setup_complete"] and values["get_number_of_remaining_epochs"]:
+            deadlines[address] = values["next_execution_allowed_time_buffer"]
+
+    return timestamp, deadlines
+
+
+class DeadlineKeeper:
+    """
+    Long running keeper, calls execute() on every campaign as soon as it is allowed
+
+    All deadlines are read once and kept in a min-heap. The keeper sleeps until the
+    earliest deadline, executes the due campaigns and re-reads only those campaigns.
+    Campaigns that are not due are never polled. With a BatchExecutor all campaigns
+    due at the same time are executed in one transaction per batch_size campaigns.
+
+    The chain reads and execute() block until the node answers or the transaction is mined,
+    run() sends them to a worker thread, so the event loop stays free for other tasks, e.g. a
+    keeper of another chain in the same process. The executions of one keeper are sent one after
+    another from its account, campaigns which become due meanwhile are executed together afterwards.
+
+    With a MetadataCache, campaigns known to be setup are not asked for is_setup_complete again.
+    With a FeeEngine, fees follow the chain and a pending execute is replaced with higher
+    fees after fee_engine.replace_after_blocks instead of waiting for the acceptance timeout.
+    """
+
+    def __init__(self, campaign_addresses, account, multicall_address=None, batch_executor_address=None, batch_size=MAX_BATCH_CAMPAIGNS, retry_delay=60, sleep=None, now=None, tx_kwargs=None, fee_engine=None, cache=None):
+        self.campaign_addresses = list(campaign_addresses)
+        self.account = account
+        self.multicall_address = multicall_address
+        self.batch_executor_address = batch_executor_address
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.sleep = sleep or asyncio.sleep
+        self._now = now
+        self._clock_offset = 0
+        self.tx_kwargs = tx_kwargs or {}
+        self.fee_engine = fee_engine
+        self.cache = cache
+        self.heap = []
+        self.executed = []
+
+    def now(self):
+        if self._now is not None:
+            return self._now()
+        # wall clock moved to chain time, updated on every read
+        return int(time.time()) + self._clock_offset
+
+    def read_deadlines(self, campaign_addresses):
+        timestamp, deadlines = read_campaign_deadlines(campaign_addresses, multicall_address=self.multicall_address, cache=self.cache)
+        self._clock_offset = timestamp - int(time.time())
+        return deadlines
+
+    def schedule(self, deadlines):
+        for address, deadline in deadlines.items():
+            heapq.heappush(self.heap, (deadline, address))
+
+    def send(self, method, *args):
+        if self.fee_engine is None:
+            return method(*args, sender=self.account, **self.tx_kwargs)
+
+        pipeline = TransactionPipeline(self.account, fee_engine=self.fee_engine, **self.tx_kwargs)
+        pipeline.transact(method, *args)
+        receipt = pipeline.wait()[0]
+        receipt.raise_for_status()
+        return receipt
+
+    def simulate(self, addresses):
+        """
+        execute() of every campaign as eth_call at the pending block, returns the ones which succeed
+        """
+        contract_type = project.SingleCampaign.contract_type
+        passing, failures = preflight([(ContractInstance(address, contract_type).execute, ()) for address in addresses], self.account)
+        # e.g. somebody else executed first, nothing is sent for them
+        print_failures(failures)
+        return [method.contract.address for method, _ in passing]
+
+    def report_failed_gauges(self, receipt):
+        """
+        Print the gauges a MultiGaugeCampaign skipped in receipt because the Distributor refused them
+
+        The other gauges were distributed, the skipped epochs are retried with every execute()
+        until a guard fixes the Distributor allowlist.
+        """
+        event = project.MultiGaugeCampaign.contract_type.events["RewardDistributionFailed"]
+        for log in receipt.decode_logs(event):
+            print(f"keeper: campaign {log.contract_address} could not send {log.reward_amount} to gauge {log.receiving_gauge}, refused by the Distributor")
+
+    def execute(self, addresses):
+        """
+        Execute all given campaigns which pass the simulation, returns the executed ones
+        """
+        addresses = self.simulate(addresses)
+        if not addresses:
+            return []
+
+        executed = []
+        if self.batch_executor_address:
+            batch_executor = ContractInstance(self.batch_executor_address, project.BatchExecutor.contract_type)
+            for start in range(0, len(addresses), self.batch_size):
+                batch = addresses[start:start + self.batch_size]
+                try:
+                    receipt = self.send(batch_executor.execute, batch)
+                except Exception as e:
+                    # the campaigns of this batch are retried after retry_delay
+                    print(f"keeper: batch execute failed for {len(batch)} campaigns: {e}")
+                    continue
+                # return values need a trace, the summary event is always there
+                batch_executed = batch_executor.BatchExecuted.from_receipt(receipt)[0].executed_campaigns
+                print(f"keeper: batch executed {len(batch_executed)} of {len(batch)} campaigns: {receipt.txn_hash}")
+                self.report_failed_gauges(receipt)
+                executed += batch_executed
+            return executed
+
+        for address in addresses:
+            single_campaign = ContractInstance(address, project.SingleCampaign.contract_type)
+            try:
+                receipt = self.send(single_campaign.execute)
+                executed.append(address)
+                print(f"keeper: executed campaign {address}: {receipt.txn_hash}")
+                self.report_failed_gauges(receipt)
+            except Exception as e:
+                # e.g. somebody else executed first, the re-read has the new deadline
+                print(f"keeper: execute failed for campaign {address}: {e}")
+        return executed
+
+    async def run(self, max_executions=None):
+        """
+        Run until all campaigns are exhausted or max_executions is reached in this run
+        """
+        executed_before = len(self.executed)
+        self.heap = []
+        if self.cache:
+            await asyncio.to_thread(self.cache.sync_events)
+        self.schedule(await asyncio.to_thread(self.read_deadlines, self.campaign_addresses))
+        print(f"keeper: {len(self.heap)} active campaigns")
+
+        while self.heap:
+            if max_executions is not None and len(self.executed) - executed_before >= max_executions:
+                break
+
+            deadline, address = self.heap[0]
+            delay = deadline - self.now()
+            if delay > 0:
+                print(f"keeper: next campaign {address} in {delay/60/60:.2f} hours")
+                await self.sleep(delay)
+                continue
+
+            due = []
+            while self.heap and self.heap[0][0] <= self.now():
+                due.append(heapq.heappop(self.heap)[1])
+
+            executed = await asyncio.to_thread(self.execute, due)
+            self.executed += executed
+
+            deadlines = await asyncio.to_thread(self.read_deadlines, due)
+            for address in due:
+                if address not in deadlines:
+                    print(f"keeper: campaign {address} has no remaining epochs")
+                elif deadlines[address] <= self.now() and address not in executed:
+                    # failed although due, try again later instead of spinning
+                    deadlines[address] = self.now() + self.retry_delay
+            self.schedule(deadlines)
+
+        return self.executed
@@ -0,0 +1,40 @@
+import os
+
+from ape import project
+from ape.contracts import ContractInstance
+
+from scripts._multicall import CampaignSnapshot
+
+CAMPAIGN_LENS = os.getenv('CAMPAIGN_LENS')
+
+# must match MAX_CAMPAIGNS in contracts/CampaignLens.vy
+MAX_CAMPAIGNS = 64
+
+
+def read_campaign_lens(campaign_addresses, lens_address=None, block_id=None):
+    """
+    Read the full state of all campaigns through CampaignLens, one eth_call per 64 campaigns
+
+    @return list of CampaignState structs in the order of campaign_addresses
+    """
+    lens = ContractInstance(lens_address or CAMPAIGN_LENS, project.CampaignLens.contract_type)
+
+    states = []
+    for start in range(0, len(campaign_addresses), MAX_CAMPAIGNS):
+        states += lens.get_campaign_states(campaign_addresses[start:start + MAX_CAMPAIGNS], block_id=block_id)
+    return states
+
+
+def to_snapshot(state, distribution_buffer):
+    """
+    Keeper snapshot from a lens state, exhausted campaigns have no next reward amount
+    """
+    exhausted = len(state.remaining_epochs) == 0
+    return CampaignSnapshot(
+        address=state.campaign,
+        next_reward_amount=None if exhausted else state.next_reward_amount,
+        seconds_until_next_distribution=None if exhausted else state.seconds_until_next_distribution,
+        execution_allowed=state.execution_allowed,
+        remaining_epochs=len(state.remaining_epochs),
+        distribution_buffer=distribution_buffer,
+    )
@@ -0,0 +1,180 @@
+import json
+import os
+import sqlite3
+
+from ape import networks, project
+from eth_utils import encode_hex, keccak, to_checksum_address
+
+from scripts._multicall import aggregate_at_block, method_abi
+
+METADATA_CACHE = os.getenv('METADATA_CACHE') or ".metadata_cache.sqlite"
+
+# cached field -> SingleCampaign getter, none of them changes once setup() ran
+METADATA_FIELDS = {
+    "is_setup_complete": "is_setup_complete",
+    "distributor_address": "distributor_address",
+    "receiving_gauge": "receiving_gauge",
+    "min_epoch_duration": "min_epoch_duration",
+    "id": "id",
+    "name": "name",
+    "guards": "get_all_guards",
+    "crvusd_address": "crvusd_address",
+    "execute_reward_amount": "execute_reward_amount",
+}
+
+# a campaign with one of these events after its cached block is read again
+INVALIDATING_EVENTS = ("SetupCompleted", "RewardEpochsSet", "RewardScheduleSet")
+
+
+def connect_metadata_cache(db_path=None):
+    # the keeper reads in worker threads, one at a time
+    db = sqlite3.connect(db_path or METADATA_CACHE, check_same_thread=False)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS campaign_metadata ("
+        "chain_id INTEGER NOT NULL, address TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, block_number INTEGER NOT NULL, "
+        "PRIMARY KEY (chain_id, address, field))"
+    )
+    db.execute("CREATE TABLE IF NOT EXISTS metadata_cursors (chain_id INTEGER PRIMARY KEY, next_block INTEGER NOT NULL)")
+    return db
+
+
+def _key(address):
+    return to_checksum_address(str(address))
+
+
+def _json_value(value):
+    # addresses as checksummed strings, json keeps python integers of any size
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, (bool, int, str)):
+        return value
+    return str(value)
+
+
+class MetadataCache:
+    """
+    Setup-once campaign fields on disk, keyed by (chain_id, address, field)
+
+    Only campaigns with is_setup_complete are stored, before setup every field can still change.
+    Keeper, planner and status read the cached fields instead of calling the campaign and fetch
+    only the mutable state live. sync_events() drops campaigns which emitted an
+    INVALIDATING_EVENTS event after they were cached, e.g. a proxy redeployed at the same address.
+    """
+
+    def __init__(self, db, chain_id):
+        self.db = db
+        self.chain_id = chain_id
+
+    @classmethod
+    def open(cls, db_path=None):
+        """
+        Cache of the connected chain
+        """
+        return cls(connect_metadata_cache(db_path), networks.provider.chain_id)
+
+    def get_many(self, addresses, fields=tuple(METADATA_FIELDS)):
+        """
+        @return {address: {field: value}} of the addresses which have all requested fields cached
+        """
+        cached = {}
+        for address in addresses:
+            rows = self.db.execute(
+                "SELECT field, value FROM campaign_metadata WHERE chain_id = ? AND address = ?",
+                (self.chain_id, _key(address)),
+            ).fetchall()
+            values = {field: json.loads(value) for field, value in rows}
+            if all(field in values for field in fields):
+                cached[address] = {field: values[field] for field in fields}
+        return cached
+
+    def store(self, address, values, block_number):
+        """
+        Cache fields of one campaign read at block_number, campaigns before setup are ignored
+        """
+        if not values.get("is_setup_complete"):
+            return
+        self.db.executemany(
+            "INSERT OR REPLACE INTO campaign_metadata (chain_id, address, field, value, block_number) VALUES (?, ?, ?, ?, ?)",
+            [(self.chain_id, _key(address), field, json.dumps(_json_value(value)), block_number) for field, value in values.items() if field in METADATA_FIELDS],
+        )
+        self.db.execute("INSERT OR IGNORE INTO metadata_cursors (chain_id, next_block) VALUES (?, ?)", (self.chain_id, block_number + 1))
+        self.db.commit()
+
+    def store_states(self, states, block_number):
+        """
+        Cache the setup-once fields of CampaignLens states or any object with those attributes
+        """
+        for state in states:
+            self.store(state.campaign, {field: getattr(state, field) for field in METADATA_FIELDS if hasattr(state, field)}, block_number)
+
+    def fill(self, addresses, multicall_address=None):
+        """
+        Read every missing field of the uncached campaigns in one aggregated eth_call
+
+        @return {address: {field: value}} of all campaigns which are setup
+        """
+        cached = self.get_many(addresses)
+        missing = [address for address in addresses if address not in cached]
+        if not missing:
+            return cached
+
+        contract_type = project.SingleCampaign.contract_type
+        abis = [method_abi(contract_type, name) for name in METADATA_FIELDS.values()]
+        block_number, results = aggregate_at_block([(address, abi, ()) for address in missing for abi in abis], multicall_address=multicall_address)
+
+        n = len(abis)
+        for i, address in enumerate(missing):
+            values = dict(zip(METADATA_FIELDS, results[i * n:(i + 1) * n]))
+            if values["is_setup_complete"]:
+                self.store(address, values, block_number)
+                cached[address] = {field: _json_value(value) for field, value in values.items()}
+        return cached
+
+    def invalidate(self, addresses, block_number=None):
+        """
+        Drop the cached fields of campaigns, only the ones cached at or before block_number if given
+        """
+        for address in addresses:
+            if block_number is None:
+                self.db.execute("DELETE FROM campaign_metadata WHERE chain_id = ? AND address = ?", (self.chain_id, _key(address)))
+            else:
+                self.db.execute(
+                    "DELETE FROM campaign_metadata WHERE chain_id = ? AND address = ? AND block_number <= ?",
+                    (self.chain_id, _key(address), block_number),
+                )
+        self.db.commit()
+
+    def sync_events(self, web3=None):
+        """
+        Invalidate campaigns by their INVALIDATING_EVENTS since the last sync, one eth_getLogs request
+
+        @return addresses which were invalidated
+        """
+        web3 = web3 or networks.provider.web3
+        cursor = self.db.execute("SELECT next_block FROM metadata_cursors WHERE chain_id = ?", (self.chain_id,)).fetchone()
+        addresses = [row[0] for row in self.db.execute("SELECT DISTINCT address FROM campaign_metadata WHERE chain_id = ?", (self.chain_id,))]
+        head = web3.eth.block_number
+        if cursor is None or not addresses or cursor[0] > head:
+            return []
+
+        events = {abi.name: abi for abi in project.SingleCampaign.contract_type.events}
+        topics = [encode_hex(keccak(text=events[name].selector)) for name in INVALIDATING_EVENTS]
+        try:
+            logs = web3.eth.get_logs({"address": addresses, "fromBlock": cursor[0], "toBlock": head, "topics": [topics]})
+        except Exception as e:
+            # range too large for the node, reading everything again is always correct
+            print(f"metadata cache: event sync failed, dropping the cache of chain {self.chain_id}: {e}")
+            self.invalidate(addresses)
+            logs = []
+
+        invalidated = []
+        for log in logs:
+            address = to_checksum_address(log["address"])
+            changes = self.db.total_changes
+            self.invalidate([address], log["blockNumber"])
+            if self.db.total_changes > changes:
+                invalidated.append(address)
+
+        self.db.execute("UPDATE metadata_cursors SET next_block = ? WHERE chain_id = ?", (head + 1, self.chain_id))
+        self.db.commit()
+        return list(dict.fromkeys(invalidated))
@@ -0,0 +1,129 @@
+import os
+
+from dataclasses import dataclass
+
+from ape import networks, project
+
+# canonical Multicall3, deployed on all chains we run campaigns on
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL_ADDRESS = os.getenv('MULTICALL_ADDRESS') or MULTICALL3_ADDRESS
+
+# must match MAX_CALLS in contracts/Multicall.vy
+MAX_CALLS = 128
+
+
+def method_abi(contract_type, name):
+    return next(abi for abi in contract_type.methods if abi.name == name)
+
+
+def _decode(ecosystem, abi, return_data):
+    decoded = ecosystem.decode_returndata(abi, return_data)
+    # same unwrapping ape does for a direct contract call
+    if isinstance(decoded, (list, tuple)) and len(decoded) == 1:
+        return decoded[0]
+    return decoded
+
+
+def aggregate(calls, multicall_address=None, block_id=None):
+    """
+    Run many view calls in one eth_call through a Multicall3 compatible contract
+
+    calls: list of (target, method_abi, args)
+    returns a list with the decoded value of every call, None where the call reverted
+    """
+    ecosystem = networks.provider.network.ecosystem
+    web3 = networks.provider.web3
+    aggregate3 = method_abi(project.Multicall.contract_type, "aggregate3")
+
+    results = []
+    for start in range(0, len(calls), MAX_CALLS):
+        chunk = calls[start:start + MAX_CALLS]
+        encoded = [
+            (target, True, ecosystem.get_method_selector(abi) + ecosystem.encode_calldata(abi, *args))
+            for target, abi, args in chunk
+        ]
+        # one eth_call per chunk, a contract call through ape adds chain id, code and account requests
+        data = ecosystem.get_method_selector(aggregate3) + ecosystem.encode_calldata(aggregate3, encoded)
+        return_data = web3.eth.call({"to": multicall_address or MULTICALL_ADDRESS, "data": data}, "latest" if block_id is None else block_id)
+        raw_results = _decode(ecosystem, aggregate3, bytes(return_data))
+
+        for (target, abi, args), result in zip(chunk, raw_results):
+            results.append(_decode(ecosystem, abi, result.returnData) if result.success else None)
+
+    return results
+
+
+def aggregate_at_block(calls, multicall_address=None):
+    """
+    aggregate() with all eth_calls at one block, without an eth_blockNumber request
+
+    getBlockNumber() runs in the first eth_call at the latest block,
+    the further eth_calls are sent for the block it returned.
+    @return (block number, list of decoded values as for aggregate())
+    """
+    multicall_address = multicall_address or MULTICALL_ADDRESS
+    block_number_call = (multicall_address, method_abi(project.Multicall.contract_type, "getBlockNumber"), ())
+
+    results = aggregate([block_number_call] + calls[:MAX_CALLS - 1], multicall_address=multicall_address)
+    block_number = results.pop(0)
+    results += aggregate(calls[MAX_CALLS - 1:], multicall_address=multicall_address, block_id=block_number)
+    return block_number, results
+
+
+@dataclass
+class CampaignSnapshot:
+    address: str
+    next_reward_amount: int | None
+    seconds_until_next_distribution: int | None
+    execution_allowed: bool
+    remaining_epochs: int
+    distribution_buffer: int | None  # None if the call failed, e.g. no campaign at the address
+
+    @property
+    def is_exhausted(self):
+        return self.next_reward_amount is None
+
+    @property
+    def is_due(self):
+        # same rule the keeper used with one call per field
+        if self.is_exhausted or self.distribution_buffer is None:
+            return False
+        return self.seconds_until_next_distribution < self.distribution_buffer and self.execution_allowed
+
+
+CAMPAIGN_SNAPSHOT_METHODS = (
+    "get_next_epoch_info",
+    "execution_allowed",
+    "get_number_of_remaining_epochs",
+    "DISTRIBUTION_BUFFER",
+)
+
+
+def read_campaign_snapshots(campaign_addresses, multicall_address=None, block_id=None):
+    """
+    Read the keeper relevant state of all campaigns in one aggregated eth_call
+    @dev get_next_epoch_info() and execution_allowed() revert once all epochs are distributed
+         or before setup, those campaigns come back as exhausted / not allowed
+    """
+    contract_type = project.SingleCampaign.contract_type
+    abis = [method_abi(contract_type, name) for name in CAMPAIGN_SNAPSHOT_METHODS]
+
+    calls = [(address, abi, ()) for address in campaign_addresses for abi in abis]
+    results = aggregate(calls, multicall_address=multicall_address, block_id=block_id)
+
+    snapshots = []
+    n = len(abis)
+    for i, address in enumerate(campaign_addresses):
+        next_epoch_info, execution_allowed, remaining_epochs, distribution_buffer = results[i * n:(i + 1) * n]
+        next_reward_amount, seconds_until_next_distribution = next_epoch_info or (None, None)
+
+        snapshots.append(CampaignSnapshot(
+            address=address,
+            next_reward_amount=next_reward_amount,
+            seconds_until_next_distribution=seconds_until_next_distribution,
+            execution_allowed=bool(execution_allowed),
+            remaining_epochs=remaining_epochs or 0,
+            distribution_buffer=distribution_buffer,
+        ))
+
+    return snapshots
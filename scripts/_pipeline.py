@@ -0,0 +1,230 @@
+import time
+
+from dataclasses import dataclass, field
+
+from ape import networks
+from ape.contracts.base import ContractTransaction
+from eth_utils import to_hex
+from web3.exceptions import TransactionNotFound
+
+from scripts._addresses import create_address
+
+# a replacement needs at least 10% higher fees to be accepted by geth based nodes
+FEE_BUMP_NUMERATOR = 9
+FEE_BUMP_DENOMINATOR = 8
+
+
+@dataclass
+class PendingTransaction:
+    nonce: int
+    txn: object
+    sent_at: float
+    sent_block: int = None
+    txn_hashes: list = field(default_factory=list)  # every broadcast, the last one is the current
+    contract_address: str = None
+    receipt: object = None
+
+
+class TransactionPipeline:
+    """
+    Sign and broadcast many transactions back to back with locally assigned nonces
+
+    Nothing waits for the previous receipt before the next transaction is sent,
+    wait() tracks the receipts of all transactions in one polling loop.
+    A transaction which is not mined after rebroadcast_after seconds is sent
+    again with the same nonce: unchanged if the node dropped it, with bumped
+    fees if it is stuck in the mempool.
+
+    Gas estimation runs against the current state, transactions which depend on
+    an earlier transaction of the same pipeline need an explicit gas_limit.
+
+    With a FeeEngine, transactions without explicit fees get its suggestion, gas estimates
+    get its margin and a transaction pending for replace_after_blocks blocks is replaced
+    with replacement_fees(), whatever rebroadcast_after says.
+    """
+
+    def __init__(self, account, rebroadcast_after=60, poll_interval=1, timeout=900, sleep=None, now=None, fee_engine=None, **tx_kwargs):
+        self.account = account
+        self.provider = networks.provider
+        self.rebroadcast_after = rebroadcast_after
+        self.fee_engine = fee_engine
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.sleep = sleep or time.sleep
+        self.now = now or time.monotonic
+        self.tx_kwargs = tx_kwargs
+
+        self.next_nonce = None  # read from the chain with the first transaction
+        self.fees = None  # fee_engine suggestion, read with the first transaction
+        self.transactions = []
+
+    def deploy(self, contract_container, *args, **tx_kwargs):
+        """
+        Broadcast a deployment, the contract address is known before it is mined
+        """
+        nonce = self._nonce()
+        tx_kwargs = self._tx_kwargs(tx_kwargs)
+        txn = contract_container.constructor.serialize_transaction(*args, sender=self.account, nonce=nonce, **tx_kwargs)
+        txn = self._prepare(txn, tx_kwargs)
+        return self._broadcast(txn, contract_address=create_address(self.account.address, nonce))
+
+    def transact(self, method, *args, **tx_kwargs):
+        """
+        Broadcast a contract method call
+
+        The contract may be a deployment of this pipeline which is not mined yet,
+        ape refuses to build calls to addresses without code, so the method abi is
+        selected here.
+        """
+        abi = next(abi for abi in method.abis if len(abi.inputs) == len(args))
+        tx_kwargs = self._tx_kwargs(tx_kwargs)
+        txn = ContractTransaction(abi, method.contract.address).serialize_transaction(
+            *args, sender=self.account, nonce=self._nonce(), **tx_kwargs
+        )
+        txn = self._prepare(txn, tx_kwargs)
+        return self._broadcast(txn)
+
+    def wait(self):
+        """
+        Wait until every broadcast transaction is mined
+
+        @return list of receipts in nonce order
+        """
+        web3 = self.provider.web3
+        deadline = self.now() + self.timeout
+
+        while True:
+            # every nonce below the account nonce is mined, no receipt polling for the others
+            mined_nonce = web3.eth.get_transaction_count(self.account.address, "latest")
+            for pending in self._pending():
+                if pending.nonce < mined_nonce:
+                    pending.receipt = self._find_receipt(pending)
+
+            if not self._pending():
+                return [pending.receipt for pending in self.transactions]
+
+            assert self.now() < deadline, f"transactions from nonce {self._pending()[0].nonce} not mined after {self.timeout}s"
+
+            block_number = web3.eth.block_number
+            for pending in self._pending():
+                if self.now() - pending.sent_at >= self.rebroadcast_after or self._blocks_pending(pending, block_number):
+                    self._rebroadcast(pending)
+
+            self.sleep(self.poll_interval)
+
+    def _nonce(self):
+        if self.next_nonce is None:
+            self.next_nonce = self.account.nonce
+        return self.next_nonce
+
+    def _tx_kwargs(self, tx_kwargs):
+        tx_kwargs = {**self.tx_kwargs, **tx_kwargs}
+        if self.fee_engine is None or "max_fee" in tx_kwargs:
+            return tx_kwargs
+        if self.fees is None:
+            self.fees = self.fee_engine.tx_kwargs()
+        return {**self.fees, **tx_kwargs}
+
+    def _prepare(self, txn, tx_kwargs):
+        if self.fee_engine is not None and "gas_limit" not in tx_kwargs:
+            txn.gas_limit = self.fee_engine.estimate_gas(self.provider, txn)
+        return self.account.prepare_transaction(txn, sign=True)
+
+    def _blocks_pending(self, pending, block_number):
+        if self.fee_engine is None:
+            return False
+        return block_number - pending.sent_block >= self.fee_engine.replace_after_blocks
+
+    def _pending(self):
+        return [pending for pending in self.transactions if pending.receipt is None]
+
+    def _broadcast(self, txn, contract_address=None):
+        pending = PendingTransaction(nonce=txn.nonce, txn=txn, sent_at=self.now(), sent_block=self._block_number(), contract_address=contract_address)
+        pending.txn_hashes.append(self._send(txn))
+        self.transactions.append(pending)
+        self.next_nonce += 1
+        return pending
+
+    def _block_number(self):
+        return self.provider.web3.eth.block_number
+
+    def _send(self, txn):
+        return to_hex(self.provider.web3.eth.send_raw_transaction(txn.serialize_transaction()))
+
+    def _rebroadcast(self, pending):
+        try:
+            self.provider.web3.eth.get_transaction(pending.txn_hashes[-1])
+        except TransactionNotFound:
+            # dropped by the node, the signed transaction is still valid
+            txn = pending.txn
+        else:
+            # stuck in the mempool, replace it with higher fees
+            txn = self._bump_fees(pending.txn)
+
+        pending.sent_at = self.now()
+        pending.sent_block = self._block_number()
+        try:
+            txn_hash = self._send(txn)
+        except Exception as e:
+            # already known or mined meanwhile, the next poll sorts it out
+            print(f"rebroadcast of nonce {pending.nonce} failed: {e}")
+            return
+
+        pending.txn = txn
+        if txn_hash not in pending.txn_hashes:
+            pending.txn_hashes.append(txn_hash)
+        print(f"rebroadcast nonce {pending.nonce}: {txn_hash}")
+
+    def _bump_fees(self, txn):
+        if self.fee_engine is not None and getattr(txn, "max_fee", None):
+            fees = self.fee_engine.replacement_fees(txn.max_fee, txn.max_priority_fee, FEE_BUMP_NUMERATOR, FEE_BUMP_DENOMINATOR)
+            if fees is None:
+                # max_fee_cap reached, keep waiting with the current fees
+                print(f"nonce {txn.nonce}: replacement fees above max_fee_cap {self.fee_engine.max_fee_cap}")
+                return txn
+            replacement = txn.model_copy(deep=True)
+            replacement.signature = None
+            replacement.max_fee, replacement.max_priority_fee = fees.max_fee, fees.max_priority_fee
+            return self._sign_replacement(replacement, txn)
+
+        replacement = txn.model_copy(deep=True)
+        replacement.signature = None
+
+        for fee in ("max_fee", "max_priority_fee", "gas_price"):
+            value = getattr(replacement, fee, None)
+            if value:
+                setattr(replacement, fee, value * FEE_BUMP_NUMERATOR // FEE_BUMP_DENOMINATOR + 1)
+        return self._sign_replacement(replacement, txn)
+
+    def _sign_replacement(self, replacement, txn):
+        signed = self.account.sign_transaction(replacement)
+        if signed is None or signed.signature is None:
+            # e.g. a declined signing prompt, the signed transaction with the current fees is sent again
+            print(f"nonce {txn.nonce}: replacement not signed, keeping the current fees")
+            return txn
+        return signed
+
+    def _find_receipt(self, pending):
+        web3 = self.provider.web3
+        # a replaced transaction can still be the one which got mined
+        for txn_hash in reversed(pending.txn_hashes):
+            try:
+                web3.eth.get_transaction_receipt(txn_hash)
+            except TransactionNotFound:
+                continue
+            return self.provider.get_receipt(txn_hash)
+
+        raise AssertionError(f"nonce {pending.nonce} was used by a transaction not sent through this pipeline")
+
+
+def send_pipelined(transactions, account, **tx_kwargs):
+    """
+    Sign and broadcast many contract transactions back to back, then wait for all receipts
+
+    transactions: list of (contract method, args)
+    """
+    pipeline = TransactionPipeline(account, **tx_kwargs)
+    for method, args in transactions:
+        pipeline.transact(method, *args)
+
+    return pipeline.wait()
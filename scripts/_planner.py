@@ -0,0 +1,228 @@
+from dataclasses import dataclass, field
+
+from scripts._schedule import CAMPAIGN_VERSION, RewardSchedule, decode_packed_reward_epochs, reward_epochs_call
+
+CAMPAIGN_STATE_METHODS = (
+    "is_setup_complete",
+    "is_reward_epochs_set",
+    "distributor_address",
+    "receiving_gauge",
+    "min_epoch_duration",
+    "get_all_epochs",
+    "VERSION",
+)
+
+
+@dataclass
+class CampaignState:
+    address: str
+    is_setup_complete: bool
+    is_reward_epochs_set: bool
+    distributor_address: str
+    receiving_gauge: str
+    min_epoch_duration: int
+    remaining_epochs: list
+    version: str = CAMPAIGN_VERSION  # which reward epoch setters the campaign has
+
+
+@dataclass
+class PlannedTransaction:
+    campaign: str
+    name: str
+    method: str
+    args: tuple
+
+
+@dataclass
+class Plan:
+    transactions: list = field(default_factory=list)
+    conflicts: list = field(default_factory=list)
+    complete: list = field(default_factory=list)
+    # transactions which revert in preflight_plan(), never sent
+    failures: list = field(default_factory=list)
+
+
+# getters of CAMPAIGN_STATE_METHODS which are taken from the MetadataCache once a campaign is setup
+CACHED_STATE_FIELDS = ("is_setup_complete", "distributor_address", "receiving_gauge", "min_epoch_duration")
+
+
+def read_campaign_states(campaign_addresses, multicall_address=None, cache=None):
+    """
+    Read the setup state of all campaigns in one aggregated eth_call
+
+    With a MetadataCache the setup-once fields of cached campaigns are not read again,
+    campaigns found setup are added to the cache.
+    """
+    # ape is imported by the functions which need a chain, plan_campaigns() runs offline
+    from ape import project
+    from scripts._multicall import aggregate_at_block, method_abi
+
+    contract_type = project.SingleCampaign.contract_type
+    cached = cache.get_many(campaign_addresses, CACHED_STATE_FIELDS) if cache else {}
+    live_methods = [name for name in CAMPAIGN_STATE_METHODS if name not in CACHED_STATE_FIELDS]
+    methods = {address: live_methods if address in cached else list(CAMPAIGN_STATE_METHODS) for address in campaign_addresses}
+
+    calls = [(address, method_abi(contract_type, name), ()) for address in campaign_addresses for name in methods[address]]
+    # the block number for the cache comes with the first eth_call
+    block_number, results = aggregate_at_block(calls, multicall_address=multicall_address)
+    results = iter(results)
+
+    states = {}
+    for address in campaign_addresses:
+        values = {name: next(results) for name in methods[address]}
+        assert None not in values.values(), f"{address} is not a SingleCampaign"
+        if address in cached:
+            values.update(cached[address])
+        elif cache:
+            cache.store(address, {field: values[field] for field in CACHED_STATE_FIELDS}, block_number)
+
+        states[address] = CampaignState(
+            address=address,
+            is_setup_complete=values["is_setup_complete"],
+            is_reward_epochs_set=values["is_reward_epochs_set"],
+            distributor_address=values["distributor_address"],
+            receiving_gauge=values["receiving_gauge"],
+            min_epoch_duration=values["min_epoch_duration"],
+            remaining_epochs=list(values["get_all_epochs"]),
+            version=values["VERSION"],
+        )
+
+    return states
+
+
+def _same_address(a, b):
+    return str(a).lower() == str(b).lower()
+
+
+def plan_campaigns(campaign_specs, states):
+    """
+    Compare the spec with the on-chain state and return the transactions still needed
+
+    setup() and set_reward_epochs() can only run once, a campaign which is already
+    configured differently from the spec is reported as conflict instead.
+    """
+    plan = Plan()
+
+    for spec in campaign_specs:
+        state = states[spec.address]
+        transactions = []
+        conflicts = []
+
+        if not state.is_setup_complete:
+            transactions.append(PlannedTransaction(
+                spec.address,
+                spec.name,
+                "setup",
+                (spec.distributor, spec.gauge, spec.min_epoch_duration, spec.id, spec.name),
+            ))
+        else:
+            if not _same_address(state.distributor_address, spec.distributor):
+                conflicts.append(f"distributor is {state.distributor_address}, spec has {spec.distributor}")
+            if not _same_address(state.receiving_gauge, spec.gauge):
+                conflicts.append(f"gauge is {state.receiving_gauge}, spec has {spec.gauge}")
+            if state.min_epoch_duration != spec.min_epoch_duration:
+                conflicts.append(f"min_epoch_duration is {state.min_epoch_duration}, spec has {spec.min_epoch_duration}")
+
+        if not state.is_reward_epochs_set:
+            # linear tails are sent as compact schedule, the contract computes them on distribution,
+            # other epochs packed, campaigns deployed from older bytecode only get set_reward_epochs()
+            method, args = reward_epochs_call(spec.reward_epochs, state.version)
+            transactions.append(PlannedTransaction(spec.address, spec.name, method, args))
+        else:
+            # already distributed epochs are gone on-chain, the rest has to match the end of the spec
+            remaining = state.remaining_epochs
+            if len(remaining) > len(spec.reward_epochs) or remaining != spec.reward_epochs[len(spec.reward_epochs) - len(remaining):]:
+                conflicts.append("remaining epochs on-chain differ from spec")
+
+        if conflicts:
+            # never finish a campaign which is already configured differently
+            plan.conflicts += [f"{spec.name} ({spec.address}): {conflict}" for conflict in conflicts]
+        elif transactions:
+            plan.transactions += transactions
+        else:
+            plan.complete.append(spec.address)
+
+    return plan
+
+
+def print_plan(plan):
+    for txn in plan.transactions:
+        if txn.method == "set_reward_epochs":
+            epochs = txn.args[0]
+            print(f"{txn.name} ({txn.campaign}): set_reward_epochs {len(epochs)} epochs, sum: {sum(epochs)}")
+        elif txn.method == "set_reward_epochs_packed":
+            epochs = decode_packed_reward_epochs(txn.args[0])
+            print(f"{txn.name} ({txn.campaign}): set_reward_epochs_packed {len(epochs)} epochs in {len(txn.args[0])} bytes, sum: {sum(epochs)}")
+        elif txn.method == "set_reward_schedule":
+            schedule = RewardSchedule(*txn.args)
+            epochs = schedule.epochs()
+            print(
+                f"{txn.name} ({txn.campaign}): set_reward_schedule {len(schedule.ramp_epochs)} ramp + "
+                f"{schedule.linear_epoch_count} linear epochs (step {schedule.step}), sum: {sum(epochs)}"
+            )
+        else:
+            print(f"{txn.name} ({txn.campaign}): {txn.method}{txn.args}")
+    for conflict in plan.conflicts:
+        print(f"CONFLICT {conflict}")
+    for failure in plan.failures:
+        print(f"REVERTS {failure}")
+    print(
+        f"{len(plan.transactions)} transactions, {len(plan.conflicts)} conflicts, {len(plan.failures)} reverting, "
+        f"{len(plan.complete)} campaigns complete"
+    )
+
+
+def fresh_campaign_state(address):
+    """
+    State of a campaign proxy which is not deployed yet, for plans without a chain
+
+    The proxy will be a clone of an implementation compiled from the current source.
+    """
+    return CampaignState(address, False, False, None, None, 0, [])
+
+
+def _contract_transactions(plan):
+    from ape import project
+    from ape.contracts import ContractInstance
+
+    contract_type = project.SingleCampaign.contract_type
+    return [
+        (getattr(ContractInstance(txn.campaign, contract_type), txn.method), txn.args)
+        for txn in plan.transactions
+    ]
+
+
+def preflight_plan(plan, sender):
+    """
+    Simulate all planned transactions from sender at the pending block
+
+    Transactions which revert are moved from plan.transactions to plan.failures with their
+    decoded revert reason, e.g. a guard check or setup() which ran meanwhile. The other
+    transactions of a campaign with a reverting one are dropped as well, a campaign is
+    never configured half.
+    """
+    from scripts._preflight import preflight
+
+    _, failures = preflight(_contract_transactions(plan), sender)
+    failed = {failure.index: failure.reason for failure in failures}
+    failed_campaigns = {plan.transactions[i].campaign for i in failed}
+
+    transactions = []
+    for i, txn in enumerate(plan.transactions):
+        if i in failed:
+            plan.failures.append(f"{txn.name} ({txn.campaign}): {txn.method} reverts: {failed[i]}")
+        elif txn.campaign in failed_campaigns:
+            plan.failures.append(f"{txn.name} ({txn.campaign}): {txn.method} dropped, another transaction of the campaign reverts")
+        else:
+            transactions.append(txn)
+    plan.transactions = transactions
+    return plan
+
+
+def apply_plan(plan, account, **tx_kwargs):
+    """
+    Send all planned transactions as one pipelined batch, run preflight_plan() first to skip reverting ones
+    """
+    from scripts._pipeline import send_pipelined
+
+    return send_pipelined(_contract_transactions(plan), account, **tx_kwargs)
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+
+from ape import networks
+from eth_abi import decode
+from eth_utils import to_hex
+from hexbytes import HexBytes
+
+ERROR_SELECTOR = HexBytes("0x08c379a0")  # Error(string), vyper assert messages
+PANIC_SELECTOR = HexBytes("0x4e487b71")  # Panic(uint256)
+
+
+def decode_revert_reason(data):
+    data = HexBytes(data)
+    if data[:4] == ERROR_SELECTOR:
+        return decode(["string"], data[4:])[0]
+    if data[:4] == PANIC_SELECTOR:
+        return f"panic {decode(['uint256'], data[4:])[0]:#x}"
+    return f"revert data {to_hex(data)}" if data else "reverted without reason"
+
+
+def _revert_data(data):
+    return data if isinstance(data, str) and data.startswith("0x") and len(data) > 2 else None
+
+
+def revert_reason(error):
+    """
+    Revert reason of a JSON-RPC error object or a web3 exception
+    """
+    if isinstance(error, dict):
+        data = _revert_data(error.get("data"))
+        return decode_revert_reason(data) if data else error.get("message", str(error))
+
+    # web3 keeps the revert data, eth-tester only the message
+    data = _revert_data(getattr(error, "data", None))
+    if data:
+        return decode_revert_reason(data)
+    return str(error).split("execution reverted: ", 1)[-1]
+
+
+@dataclass
+class PreflightFailure:
+    index: int
+    to: str
+    method: str
+    args: tuple
+    reason: str
+
+
+def encode_call(method, args, sender):
+    """
+    eth_call transaction of a contract method, the abi is selected by the number of args like in TransactionPipeline
+    """
+    abi = next(abi for abi in method.abis if len(abi.inputs) == len(args))
+    ecosystem = networks.provider.network.ecosystem
+    data = ecosystem.get_method_selector(abi) + ecosystem.encode_calldata(abi, *args)
+    return {"from": str(sender), "to": str(method.contract.address), "data": to_hex(data)}
+
+
+def simulate_calls(web3, calls, block_identifier="pending"):
+    """
+    eth_call every transaction at one block, in one JSON-RPC batch when the node supports it
+
+    Every call runs against the same state, a call which depends on an earlier one of the list
+    is simulated without it.
+
+    @param calls transaction dicts with from, to and data
+    @return revert reason per call, None for calls which succeed
+    """
+    if not calls:
+        return []
+
+    responses = None
+    make_batch_request = getattr(web3.provider, "make_batch_request", None)
+    if make_batch_request is not None:
+        try:
+            responses = make_batch_request([("eth_call", [call, block_identifier]) for call in calls])
+        except NotImplementedError:
+            pass
+
+    if isinstance(responses, list) and len(responses) == len(calls):
+        return [revert_reason(response["error"]) if "error" in response else None for response in responses]
+
+    # no batch support or the whole batch was rejected, one request per call
+    reasons = []
+    for call in calls:
+        try:
+            web3.eth.call(call, block_identifier)
+            reasons.append(None)
+        except Exception as error:
+            # revert exceptions differ between web3 backends
+            if "revert" not in str(error).lower() and not _revert_data(getattr(error, "data", None)):
+                raise
+            reasons.append(revert_reason(error))
+    return reasons
+
+
+def preflight(transactions, sender, block_identifier="pending"):
+    """
+    Simulate contract transactions before anything is broadcast
+
+    @param transactions list of (contract method, args) as for send_pipelined()
+    @return (transactions which succeed, list of PreflightFailure)
+    """
+    calls = [encode_call(method, args, sender) for method, args in transactions]
+    reasons = simulate_calls(networks.provider.web3, calls, block_identifier)
+
+    passing, failures = [], []
+    for i, ((method, args), call, reason) in enumerate(zip(transactions, calls, reasons)):
+        if reason is None:
+            passing.append((method, args))
+        else:
+            failures.append(PreflightFailure(i, call["to"], method.abis[0].name, tuple(args), reason))
+    return passing, failures
+
+
+def print_failures(failures):
+    for failure in failures:
+        print(f"preflight: {failure.method} on {failure.to} reverts: {failure.reason}")
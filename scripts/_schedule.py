@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+
+# start amount, step and count cost three calldata words, shorter linear tails stay explicit
+MIN_LINEAR_EPOCHS = 4
+
+# must match MAX_UNIT_EXPONENT in contracts/SingleCampaign.vy, epochs are at most uint128
+MAX_UNIT_EXPONENT = 38
+MAX_EPOCH_WIDTH = 16
+
+# must match DISTRIBUTION_BUFFER in contracts/SingleCampaign.vy
+DISTRIBUTION_BUFFER = 2 * 60 * 60
+
+# must match VERSION in contracts/SingleCampaign.vy
+CAMPAIGN_VERSION = "1.0.0"
+# campaigns of an older VERSION, e.g. the 0.9.1 Taiko campaigns, only have set_reward_epochs(),
+# not set_reward_schedule() or set_reward_epochs_packed()
+COMPACT_EPOCHS_VERSION = "1.0.0"
+
+
+@dataclass
+class RewardSchedule:
+    ramp_epochs: list  # explicit amounts distributed first
+    start_amount: int
+    step: int
+    linear_epoch_count: int
+
+    def epochs(self):
+        return self.ramp_epochs + [self.start_amount + self.step * k for k in range(self.linear_epoch_count)]
+
+    def args(self):
+        return (self.ramp_epochs, self.start_amount, self.step, self.linear_epoch_count)
+
+
+def encode_reward_schedule(reward_epochs, min_linear_epochs=MIN_LINEAR_EPOCHS):
+    """
+    Split reward epochs into an explicit ramp and the longest linear tail
+
+    [300, 600, 1200, 2100, 2100, 2100, 2100, 2100] -> ramp [300, 600, 1200], 2100 + 0 * k for 5 epochs
+    Returns None if the linear tail is shorter than min_linear_epochs.
+    """
+    n = len(reward_epochs)
+    if n < min_linear_epochs:
+        return None
+
+    step = reward_epochs[-1] - reward_epochs[-2] if n > 1 else 0
+    start = n - 1
+    while start > 0 and reward_epochs[start] - reward_epochs[start - 1] == step:
+        start -= 1
+
+    if n - start < min_linear_epochs:
+        return None
+
+    return RewardSchedule(list(reward_epochs[:start]), reward_epochs[start], step, n - start)
+
+
+def version_tuple(version):
+    return tuple(int(part) for part in version.split("."))
+
+
+def reward_epochs_call(reward_epochs, version=CAMPAIGN_VERSION):
+    """
+    SingleCampaign method and arguments which set reward_epochs with the least calldata
+
+    @param version VERSION of the campaign, before COMPACT_EPOCHS_VERSION only set_reward_epochs() exists
+    @return ("set_reward_schedule", args), ("set_reward_epochs_packed", (payload,)) or ("set_reward_epochs", (reward_epochs,))
+    """
+    if version_tuple(version) < version_tuple(COMPACT_EPOCHS_VERSION):
+        return "set_reward_epochs", (list(reward_epochs),)
+
+    schedule = encode_reward_schedule(reward_epochs)
+    if schedule is None:
+        # never more calldata than set_reward_epochs(), one word per 32 payload bytes instead of per epoch
+        return "set_reward_epochs_packed", (encode_packed_reward_epochs(reward_epochs),)
+    return "set_reward_schedule", schedule.args()
+
+
+def encode_packed_reward_epochs(reward_epochs):
+    """
+    Payload of set_reward_epochs_packed(): unit exponent, epoch width, then every epoch in units
+
+    The unit is the largest power of ten dividing all amounts, the width the bytes of the largest amount in units.
+    [300 * 10**18, 600 * 10**18, 1200 * 10**18] -> 0x1401 03 06 0c (unit 10**20, 1 byte per epoch)
+    """
+    exponent = 0
+    while exponent < MAX_UNIT_EXPONENT and all(amount % 10**(exponent + 1) == 0 for amount in reward_epochs):
+        exponent += 1
+
+    values = [amount // 10**exponent for amount in reward_epochs]
+    width = max((max(values).bit_length() + 7) // 8, 1)
+    assert width <= MAX_EPOCH_WIDTH, "Reward amount exceeds uint128"
+    return bytes([exponent, width]) + b"".join(value.to_bytes(width, "big") for value in values)
+
+
+def decode_packed_reward_epochs(payload):
+    exponent, width = payload[0], payload[1]
+    return [int.from_bytes(payload[i:i + width], "big") * 10**exponent for i in range(2, len(payload), width)]
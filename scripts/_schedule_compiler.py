@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+import numpy as np
+
+# compiled schedules by input hash, repeated dry runs of the same spec skip compilation
+SCHEDULE_CACHE = os.getenv('SCHEDULE_CACHE') or ".schedule_cache"
+
+
+def to_wei(amount, digits):
+    # str() keeps 1071.42857 from turning into 1071.4285699999...
+    return int(Decimal(str(amount)) * 10**digits)
+
+
+def _integer_weights(shape):
+    # decimal weights scaled to integers with the same ratios, [0.5, 1.25] -> [50, 125]
+    if all(type(weight) is int for weight in shape):
+        assert min(shape) >= 0 and sum(shape) > 0, f"shape {shape} needs positive weights"
+        return shape
+    weights = [Decimal(str(weight)) for weight in shape]
+    assert all(weight >= 0 for weight in weights) and sum(weights) > 0, f"shape {shape} needs positive weights"
+    places = max(-weight.as_tuple().exponent for weight in weights)
+    return [int(weight.scaleb(max(places, 0))) for weight in weights]
+
+
+def compile_schedules(budgets, shapes, digits):
+    """
+    Exact reward epochs in wei for many gauges in one pass
+
+    Every gauge gets budget * weight / sum(weights) per epoch rounded down, the remaining wei go
+    one each to the epochs with the largest remainders, the earlier epoch wins a tie.
+    The epochs of a gauge always sum to its budget.
+
+    @param budgets total per gauge in token units, e.g. 7500 or "1071.42857"
+    @param shapes relative weights per epoch, e.g. [1, 4, 5, 4, 3, 2, 1]
+    @return list of reward epoch lists in wei
+    """
+    assert len(budgets) == len(shapes), "budgets and shapes differ in length"
+    if not shapes:
+        return []
+
+    counts = [len(shape) for shape in shapes]
+    # wei amounts exceed int64, object arrays keep python integers
+    weights = np.zeros((len(shapes), max(counts)), dtype=object)
+    for i, shape in enumerate(shapes):
+        weights[i, :counts[i]] = _integer_weights(shape)
+    budget = np.array([to_wei(b, digits) for b in budgets], dtype=object)[:, None]
+    total_weight = weights.sum(axis=1)[:, None]
+
+    amounts = budget * weights // total_weight
+    remainders = budget * weights % total_weight
+    dust = budget[:, 0] - amounts.sum(axis=1)
+
+    # remainders are below the weight sum, which fits int64 for any sensible shape
+    assert max(total_weight[:, 0]) < 2**63, "shape weights too large"
+    # rank of every epoch by remainder, largest first, stable keeps the earlier epoch first
+    order = np.argsort(-remainders.astype(np.int64), axis=1, kind="stable")
+    ranks = np.argsort(order, axis=1)
+
+    amounts = amounts + (ranks < dust.astype(np.int64)[:, None])
+    return [[int(amount) for amount in row[:count]] for row, count in zip(amounts, counts)]
+
+
+def schedule_hash(budgets, shapes, digits):
+    key = json.dumps([[str(b) for b in budgets], [[str(w) for w in shape] for shape in shapes], int(digits)])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def compile_schedules_cached(budgets, shapes, digits, cache_dir=None):
+    """
+    compile_schedules() with results stored in cache_dir (SCHEDULE_CACHE) by the hash of the inputs, "" disables the cache
+    """
+    cache_dir = SCHEDULE_CACHE if cache_dir is None else cache_dir
+    if not cache_dir:
+        return compile_schedules(budgets, shapes, digits)
+
+    path = os.path.join(cache_dir, f"{schedule_hash(budgets, shapes, digits)}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return [[int(amount) for amount in epochs] for epochs in json.load(f)]
+
+    compiled = compile_schedules(budgets, shapes, digits)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(f"{path}.{os.getpid()}", "w") as f:
+        # strings, json readers lose precision above 2**53
+        json.dump([[str(amount) for amount in epochs] for epochs in compiled], f)
+    os.replace(f"{path}.{os.getpid()}", path)
+    return compiled
+
+
+@dataclass
+class ScheduleTotals:
+    label: str
+    campaigns: int
+    distribute_events: int
+    total: int
+    runtime: int  # seconds of the longest campaign
+
+    def per_day(self, digits):
+        return Decimal(self.total) / 10**digits / Decimal(self.runtime) * 86400 if self.runtime else Decimal(0)
+
+
+def schedule_totals(label, campaign_specs):
+    """
+    Totals of one spec file, usually one chain
+    """
+    return ScheduleTotals(
+        label=label,
+        campaigns=len(campaign_specs),
+        distribute_events=sum(len(c.reward_epochs) for c in campaign_specs),
+        total=sum(sum(c.reward_epochs) for c in campaign_specs),
+        runtime=max((len(c.reward_epochs) * c.min_epoch_duration for c in campaign_specs), default=0),
+    )
@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from scripts._schedule import DISTRIBUTION_BUFFER
+
+WEEK = 7 * 24 * 60 * 60
+DAY = 24 * 60 * 60
+
+
+def pad_epochs(epoch_lists):
+    """
+    Reward epochs of many campaigns as one zero padded array
+
+    @return (amounts (campaigns, epochs), counts (campaigns,))
+    """
+    counts = np.array([len(epochs) for epochs in epoch_lists])
+    amounts = np.zeros((len(epoch_lists), counts.max()))
+    for i, epochs in enumerate(epoch_lists):
+        amounts[i, :len(epochs)] = [float(epoch) for epoch in epochs]
+    return amounts, counts
+
+
+def keeper_latencies(rng, shape, mean, missed_probability=0.0, missed_delay=DAY):
+    """
+    Exponential keeper latency in seconds, a missed run adds missed_delay
+    """
+    latency = rng.exponential(mean, shape) if mean else np.zeros(shape)
+    if missed_probability:
+        latency += (rng.random(shape) < missed_probability) * missed_delay
+    return latency
+
+
+# name -> keeper_latencies() keyword arguments
+KEEPER_SCENARIOS = {
+    "punctual": dict(mean=60),
+    "slow": dict(mean=60 * 60),
+    "flaky": dict(mean=10 * 60, missed_probability=0.05),
+    "daily cron": dict(mean=DAY / 2),
+}
+
+
+def distribution_times(counts, min_epoch_duration, latency, start_time=0, keeper_target=-DISTRIBUTION_BUFFER):
+    """
+    Timestamps of all distributions
+
+    @param counts number of epochs per campaign (campaigns,)
+    @param min_epoch_duration seconds, scalar or (campaigns,)
+    @param latency seconds the keeper is late per epoch (..., campaigns, epochs)
+    @param keeper_target seconds relative to the end of an epoch the keeper aims at,
+           -DISTRIBUTION_BUFFER executes as soon as it is allowed
+    @return times (..., campaigns, epochs), epochs after the count repeat the last distribution time
+    """
+    latency = np.asarray(latency, dtype=float)
+    min_epoch_duration = np.asarray(min_epoch_duration, dtype=float)[..., None]
+
+    # earlier calls revert with "Minimum time between distributions not met"
+    intervals = np.maximum(min_epoch_duration - DISTRIBUTION_BUFFER, min_epoch_duration + keeper_target + latency[..., 1:])
+    intervals = np.where(np.arange(1, latency.shape[-1]) < np.asarray(counts)[:, None], intervals, 0)
+
+    first = start_time + latency[..., :1]
+    return np.concatenate([first, first + np.cumsum(intervals, axis=-1)], axis=-1)
+
+
+def gauge_stream(times, amounts, counts, gauge_epoch=WEEK):
+    """
+    Reward rate on the gauge after every deposit
+
+    @return (rates, period_finish), both (..., campaigns, epochs), rate is 0 after the count
+    """
+    valid = np.arange(amounts.shape[-1]) < np.asarray(counts)[:, None]
+    rates = np.zeros(times.shape)
+    period_finish = np.zeros(times.shape)
+
+    rate = np.zeros(times.shape[:-1])
+    finish = np.full(times.shape[:-1], -np.inf)
+    for k in range(times.shape[-1]):
+        t = times[..., k]
+        leftover = np.maximum(finish - t, 0) * rate
+        rate = np.where(valid[:, k], (amounts[:, k] + leftover) / gauge_epoch, rate)
+        finish = np.where(valid[:, k], t + gauge_epoch, finish)
+        rates[..., k] = np.where(valid[:, k], rate, 0)
+        period_finish[..., k] = finish
+    return rates, period_finish
+
+
+def _segment_ends(times, period_finish, counts):
+    # a rate runs until the next deposit replaces it or the period finishes, epochs after the count are empty
+    epochs = np.arange(times.shape[-1])
+    next_times = np.concatenate([times[..., 1:], times[..., -1:]], axis=-1)
+    ends = np.where(epochs + 1 < np.asarray(counts)[:, None], np.minimum(period_finish, next_times), period_finish)
+    return np.where(epochs < np.asarray(counts)[:, None], ends, times)
+
+
+def emitted(times, rates, segment_ends, at):
+    """
+    Rewards streamed until one timestamp per campaign, at is (..., campaigns)
+    """
+    elapsed = np.clip(np.asarray(at, dtype=float)[..., None] - times, 0, segment_ends - times)
+    return np.sum(rates * elapsed, axis=-1)
+
+
+def daily_emission(times, rates, segment_ends, start_time, days):
+    """
+    Rewards streamed per day from start_time on, (..., campaigns, days)
+
+    The streamed amount is piecewise linear between deposits and segment ends, all campaigns
+    are interpolated in one np.interp call by shifting every campaign into its own time range.
+    """
+    batch_shape = times.shape[:-1]
+    t, e, r = (a.reshape(-1, a.shape[-1]) for a in (times, segment_ends, rates))
+    rows = t.shape[0]
+
+    # cumulative amount at every deposit and every segment end, interleaved in time order
+    streamed = r * (e - t)
+    at_deposit = np.cumsum(streamed, axis=-1) - streamed
+    x = np.stack([t, e], axis=-1).reshape(rows, -1)
+    y = np.stack([at_deposit, at_deposit + streamed], axis=-1).reshape(rows, -1)
+
+    boundaries = start_time + DAY * np.arange(days + 1, dtype=float)
+    span = max(np.max(e), boundaries[-1]) - min(np.min(t), boundaries[0]) + DAY
+    offset = span * np.arange(rows)[:, None]
+    cumulative = np.interp((boundaries + offset).ravel(), (x + offset).ravel(), y.ravel()).reshape(rows, -1)
+
+    # outside its own range np.interp would mix in the neighbouring campaigns
+    cumulative = np.where(boundaries <= t[:, :1], 0, cumulative)
+    cumulative = np.where(boundaries >= e[:, -1:], y[:, -1:], cumulative)
+    return np.diff(cumulative, axis=-1).reshape(*batch_shape, days)
+
+
+@dataclass
+class SimulationResult:
+    times: np.ndarray
+    rates: np.ndarray
+    period_finish: np.ndarray
+    # end of the stream of the last epoch
+    end_time: np.ndarray
+    # end if every epoch is distributed exactly min_epoch_duration after the previous one
+    nominal_end_time: np.ndarray
+    end_drift: np.ndarray
+    # seconds the gauge had no reward rate between the first and the last deposit
+    zero_rate_seconds: np.ndarray
+    total_distributed: np.ndarray
+    streamed_by_nominal_end: np.ndarray
+    start_time: float
+    # None unless simulate(..., days=n)
+    daily: np.ndarray | None
+
+
+def simulate(amounts, counts, min_epoch_duration, latency, start_time=0, keeper_target=-DISTRIBUTION_BUFFER, gauge_epoch=WEEK, days=None):
+    """
+    Simulate campaigns under keeper latencies
+
+    Distribution times follow _distribute_reward() / _execution_allowed(): the first epoch can be
+    distributed at any time, every later one from last_reward_distribution_time + min_epoch_duration
+    - DISTRIBUTION_BUFFER on. Every deposit_reward_token() streams the amount plus what is left of
+    the running period over the next gauge epoch, like the Curve gauges do.
+
+    @param amounts reward epochs (campaigns, epochs), see pad_epochs()
+    @param latency (..., campaigns, epochs) seconds, leading dimensions are scenarios
+    @param days number of days of daily emission to compute from start_time, None skips it
+    """
+    counts = np.asarray(counts)
+    min_epoch_duration = np.broadcast_to(np.asarray(min_epoch_duration, dtype=float), counts.shape)
+
+    times = distribution_times(counts, min_epoch_duration, latency, start_time, keeper_target)
+    rates, period_finish = gauge_stream(times, amounts, counts, gauge_epoch)
+    segment_ends = _segment_ends(times, period_finish, counts)
+
+    end_time = period_finish[..., -1]
+    nominal_end_time = start_time + (counts - 1) * min_epoch_duration + gauge_epoch
+    gaps = np.maximum(times[..., 1:] - period_finish[..., :-1], 0)
+    gaps = np.where(np.arange(1, times.shape[-1]) < counts[:, None], gaps, 0)
+
+    return SimulationResult(
+        times=times,
+        rates=rates,
+        period_finish=period_finish,
+        end_time=end_time,
+        nominal_end_time=nominal_end_time,
+        end_drift=end_time - nominal_end_time,
+        zero_rate_seconds=gaps.sum(axis=-1),
+        total_distributed=amounts.sum(axis=-1),
+        streamed_by_nominal_end=emitted(times, rates, segment_ends, nominal_end_time),
+        start_time=start_time,
+        daily=None if days is None else daily_emission(times, rates, segment_ends, start_time, days),
+    )
+
+
+def summarize(result):
+    """
+    End date spread, rate gaps and payouts over all campaigns of every scenario
+
+    @return dict of arrays with one value per scenario (the leading dimensions)
+    """
+    summary = {
+        "end_drift_p50": np.percentile(result.end_drift, 50, axis=-1),
+        "end_drift_p95": np.percentile(result.end_drift, 95, axis=-1),
+        "end_drift_max": result.end_drift.max(axis=-1),
+        "zero_rate_hours": result.zero_rate_seconds.mean(axis=-1) / 3600,
+        "streamed_by_nominal_end": result.streamed_by_nominal_end.sum(axis=-1) / result.total_distributed.sum(),
+        "total_distributed": np.broadcast_to(result.total_distributed.sum(), result.end_drift.shape[:-1]),
+    }
+    if result.daily is not None:
+        # days inside the nominal campaign without any reward on the gauge
+        nominal_days = int((result.nominal_end_time.min() - result.start_time) // DAY)
+        summary["empty_days"] = (result.daily[..., :nominal_days] == 0).sum(axis=-1).mean(axis=-1)
+    return summary
+
+
+def simulate_scenarios(amounts, counts, min_epoch_duration, runs, rng, scenarios=KEEPER_SCENARIOS):
+    """
+    All keeper scenarios in one vectorized run, runs latency samples per scenario
+
+    @return dict of summarize() arrays with the shape (scenarios, runs)
+    """
+    latency = np.stack([keeper_latencies(rng, (runs, *amounts.shape), **kwargs) for kwargs in scenarios.values()])
+    nominal_end_time = (np.asarray(counts) - 1) * np.asarray(min_epoch_duration) + WEEK
+    result = simulate(amounts, counts, min_epoch_duration, latency, days=int(np.max(nominal_end_time) // DAY))
+    return summarize(result)
@@ -0,0 +1,316 @@
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+import yaml
+
+from ape import networks, project
+from eth_utils import to_checksum_address
+
+from scripts._indexer import load_deployed_contracts
+from scripts._lens import MAX_CAMPAIGNS
+from scripts._metadata import MetadataCache
+from scripts._multicall import _decode, method_abi
+from scripts._schedule import DISTRIBUTION_BUFFER
+
+# chain of the unsuffixed CAMPAIGN_CONTRACT_LIST and CAMPAIGN_LENS, the keeper runs on taiko
+CAMPAIGN_CONTRACT_NETWORK = os.getenv('CAMPAIGN_CONTRACT_NETWORK') or "taiko:mainnet"
+
+# without a deployed lens the CampaignLens runtime code is placed here with an eth_call state override
+LENS_OVERRIDE_ADDRESS = "0x00000000000000000000000000000000000c1E25"
+
+
+def chain_env(name, chain):
+    """
+    Per chain env var, e.g. CAMPAIGN_LENS_ARBITRUM_MAINNET for "arbitrum:mainnet",
+    the unsuffixed var belongs to CAMPAIGN_CONTRACT_NETWORK
+    """
+    value = os.getenv(f"{name}_{chain_suffix(chain)}")
+    if value is None and chain == CAMPAIGN_CONTRACT_NETWORK:
+        value = os.getenv(name)
+    return value or None
+
+
+def chain_suffix(chain):
+    return chain.replace(":", "_").replace("-", "_").upper()
+
+
+def env_chains(name, known_chains):
+    """
+    Chains with a per chain env var, e.g. "arbitrum:mainnet-fork" for CAMPAIGN_CONTRACT_LIST_ARBITRUM_MAINNET_FORK
+
+    @param known_chains chain names the suffixes are looked up in, the suffix alone is ambiguous
+    @return list of chain names in the order of the env vars
+    """
+    by_suffix = {}
+    for chain in known_chains:
+        by_suffix.setdefault(chain_suffix(chain), chain)
+
+    chains = []
+    for key in os.environ:
+        if key.startswith(f"{name}_"):
+            suffix = key[len(name) + 1:]
+            assert suffix in by_suffix, f"{key} does not name a known chain, e.g. {name}_{chain_suffix(CAMPAIGN_CONTRACT_NETWORK)}"
+            chains.append(by_suffix[suffix])
+    return chains
+
+
+def _ape_chains():
+    return [f"{ecosystem_name}:{network_name}" for ecosystem_name, ecosystem in networks.ecosystems.items() for network_name in ecosystem.networks]
+
+
+def _addresses(value):
+    return [to_checksum_address(address.strip()) for address in (value or "").split(",") if address.strip()]
+
+
+@dataclass
+class ChainFleet:
+    chain: str
+    provider_choice: str
+    distributors: list
+    campaigns: list
+    lens_address: str | None
+
+
+def load_fleet(deployments_path, network_choices=()):
+    """
+    Distributors from deployments.yaml and campaigns from CAMPAIGN_CONTRACT_LIST[_<CHAIN>] per chain
+
+    @param network_choices extra chains or providers, "taiko:mainnet:node" picks the provider for taiko:mainnet
+    @dev the <CHAIN> suffixes are looked up in these chains, deployments.yaml and the networks ape knows
+    @return list of ChainFleet, campaigns of the Distributor guard lists are added when the chain is read
+    """
+    provider_choices = {}
+    for choice in network_choices:
+        provider_choices[":".join(choice.split(":")[:2])] = choice
+
+    chains = list(provider_choices)
+    if deployments_path:
+        with open(deployments_path) as f:
+            chains += list(yaml.safe_load(f) or {})
+    chains += env_chains('CAMPAIGN_CONTRACT_LIST', chains + [CAMPAIGN_CONTRACT_NETWORK] + _ape_chains())
+    if os.getenv('CAMPAIGN_CONTRACT_LIST'):
+        chains.append(CAMPAIGN_CONTRACT_NETWORK)
+
+    fleets = []
+    for chain in dict.fromkeys(chains):
+        distributors = [address for address, _ in load_deployed_contracts(deployments_path, chain)] if deployments_path else []
+        campaigns = _addresses(chain_env('CAMPAIGN_CONTRACT_LIST', chain))
+        if not distributors and not campaigns:
+            continue
+        fleets.append(ChainFleet(
+            chain=chain,
+            provider_choice=provider_choices.get(chain, chain),
+            distributors=distributors,
+            campaigns=campaigns,
+            lens_address=chain_env('CAMPAIGN_LENS', chain),
+        ))
+    return fleets
+
+
+@dataclass
+class CampaignStatus:
+    chain: str
+    campaign: str
+    name: str
+    state: str
+    gauge: str
+    remaining_epochs: int
+    remaining_amount: int
+    next_reward_amount: int
+    # None once nothing is left to distribute
+    seconds_until_allowed: int | None
+    incentive_balance: int
+    execute_reward_amount: int
+    distributor: str
+    distributor_balance: int
+    # Distributor balance over the remaining epochs of all its campaigns on the chain, None if nothing remains
+    coverage: float | None
+
+
+def campaign_state(state, coverage):
+    if not state.is_setup_complete:
+        return "not setup"
+    if not state.is_reward_epochs_set:
+        return "no epochs"
+    if not state.remaining_epochs:
+        return "exhausted"
+    if coverage is not None and coverage < 1:
+        return "underfunded"
+    if state.execution_allowed and state.seconds_until_next_distribution < DISTRIBUTION_BUFFER:
+        return "due"
+    return "waiting"
+
+
+def _seconds_until_allowed(state):
+    if not state.is_setup_complete or not state.remaining_epochs:
+        return None
+    if state.execution_allowed:
+        return 0
+    return max(state.seconds_until_next_distribution - DISTRIBUTION_BUFFER, 0)
+
+
+def to_status(chain, states):
+    """
+    Status rows from CampaignLens states, coverage is shared by all campaigns of a Distributor
+    """
+    remaining = {}
+    for state in states:
+        remaining[state.distributor_address] = remaining.get(state.distributor_address, 0) + sum(state.remaining_epochs)
+
+    rows = []
+    for state in states:
+        remaining_amount = remaining[state.distributor_address]
+        coverage = state.distributor_reward_balance / remaining_amount if remaining_amount and state.is_setup_complete else None
+        rows.append(CampaignStatus(
+            chain=chain,
+            campaign=str(state.campaign),
+            name=state.name,
+            state=campaign_state(state, coverage),
+            gauge=str(state.receiving_gauge),
+            remaining_epochs=len(state.remaining_epochs),
+            remaining_amount=sum(state.remaining_epochs),
+            next_reward_amount=state.next_reward_amount,
+            seconds_until_allowed=_seconds_until_allowed(state),
+            incentive_balance=state.crvusd_balance,
+            execute_reward_amount=state.execute_reward_amount,
+            distributor=str(state.distributor_address),
+            distributor_balance=state.distributor_reward_balance,
+            coverage=coverage,
+        ))
+    return rows
+
+
+class ChainReader:
+    """
+    Reads one chain through its own web3 connection, readers of different chains run in parallel
+
+    ape contract calls go through the one active provider, this encodes with the ecosystem
+    and sends the eth_call on web3 directly.
+    """
+
+    def __init__(self, web3, ecosystem, lens_address=None):
+        self.web3 = web3
+        self.ecosystem = ecosystem
+        self.lens_address = lens_address
+        self.lens_abi = method_abi(project.CampaignLens.contract_type, "get_campaign_states")
+        self.guards_abi = method_abi(project.Distributor.contract_type, "get_all_guards")
+
+    def _call(self, to, abi, args, block_number, state_override=None):
+        data = self.ecosystem.get_method_selector(abi) + self.ecosystem.encode_calldata(abi, *args)
+        # state overrides are a node extension, only send them when needed
+        overrides = (state_override,) if state_override else ()
+        return_data = self.web3.eth.call({"to": to, "data": data}, block_number, *overrides)
+        return _decode(self.ecosystem, abi, bytes(return_data))
+
+    def discover_campaigns(self, distributors, block_number):
+        """
+        Guards of the Distributors which are contracts, campaigns have to be on the guard list
+        """
+        campaigns = []
+        for distributor in distributors:
+            for guard in self._call(distributor, self.guards_abi, (), block_number):
+                if guard not in campaigns and self.web3.eth.get_code(guard, block_number):
+                    campaigns.append(guard)
+        return campaigns
+
+    def read_states(self, campaigns, block_number):
+        """
+        CampaignLens states of all campaigns at one block, one eth_call per 64 campaigns
+        """
+        if self.lens_address:
+            lens, state_override = self.lens_address, None
+        else:
+            code = project.CampaignLens.contract_type.runtime_bytecode.bytecode
+            lens, state_override = LENS_OVERRIDE_ADDRESS, {LENS_OVERRIDE_ADDRESS: {"code": code}}
+
+        states = []
+        for start in range(0, len(campaigns), MAX_CAMPAIGNS):
+            states += self._read_chunk(lens, campaigns[start:start + MAX_CAMPAIGNS], block_number, state_override)
+        return states
+
+    def _read_chunk(self, lens, campaigns, block_number, state_override):
+        # guard lists also hold multisigs, the lens reverts on them, split until they are isolated and skip them
+        try:
+            return self._call(lens, self.lens_abi, (campaigns,), block_number, state_override)
+        except Exception as error:
+            # revert exceptions differ between web3 backends
+            if "revert" not in str(error).lower():
+                raise
+            if len(campaigns) == 1:
+                return []
+            middle = len(campaigns) // 2
+            return (
+                self._read_chunk(lens, campaigns[:middle], block_number, state_override)
+                + self._read_chunk(lens, campaigns[middle:], block_number, state_override)
+            )
+
+    def read_status(self, fleet):
+        block_number = self.web3.eth.block_number
+        campaigns = list(dict.fromkeys(fleet.campaigns + self.discover_campaigns(fleet.distributors, block_number)))
+        states = self.read_states(campaigns, block_number)
+        # kept for the MetadataCache, sqlite is written outside of the reader threads
+        self.last_read = (states, block_number)
+        return to_status(fleet.chain, states)
+
+
+def read_fleet_status(fleets, max_workers=8, cache_db=None):
+    """
+    Status of all campaigns of all chains, chains are read concurrently
+
+    @param cache_db metadata cache connection, the setup-once fields of every state read are stored for keeper and planner
+    @return list of CampaignStatus ordered like fleets
+    """
+    readers = []
+    for fleet in fleets:
+        # connecting changes global ape state, only the reads run in threads
+        provider = networks.get_provider_from_choice(fleet.provider_choice)
+        if not provider.is_connected:
+            provider.connect()
+        readers.append(ChainReader(provider.web3, provider.network.ecosystem, fleet.lens_address))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda args: args[0].read_status(args[1]), zip(readers, fleets)))
+
+    if cache_db is not None:
+        for reader in readers:
+            MetadataCache(cache_db, reader.web3.eth.chain_id).store_states(*reader.last_read)
+    return [row for rows in results for row in rows]
+
+
+def _amount(value, decimals=18):
+    return f"{value / 10**decimals:,.2f}"
+
+
+def format_status(rows):
+    """
+    Compact table, amounts in whole tokens with 18 decimals
+    """
+    header = ("chain", "campaign", "gauge", "state", "epochs", "next amount", "allowed in", "incentive", "coverage")
+    lines = [header]
+    for row in rows:
+        lines.append((
+            row.chain,
+            row.campaign[:10],
+            row.gauge[:10],
+            row.state,
+            str(row.remaining_epochs),
+            _amount(row.next_reward_amount),
+            "-" if row.seconds_until_allowed is None else f"{row.seconds_until_allowed}s",
+            _amount(row.incentive_balance),
+            "-" if row.coverage is None else f"{row.coverage:.2f}x",
+        ))
+
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join("  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip() for line in lines)
+
+
+def status_json(rows):
+    # amounts stay exact, json numbers above 2**53 lose precision in most readers
+    return json.dumps([
+        {key: str(value) if isinstance(value, int) and not isinstance(value, bool) and value > 2**53 else value
+         for key, value in asdict(row).items()}
+        for row in rows
+    ], indent=2)
@@ -1,12 +1,24 @@
+import asyncio
 import os
 import click
 import time
 import sys
 
-from ape import project
+from ape import convert, networks, project
 
 from ape.cli import ConnectedProviderCommand, account_option
 
+from scripts._campaign_spec import load_campaign_spec
+from scripts._fees import FeeEngine
+from scripts._keeper import MAX_BATCH_CAMPAIGNS, DeadlineKeeper
+from scripts._metadata import MetadataCache, connect_metadata_cache
+from scripts._multicall import read_campaign_snapshots
+from scripts._planner import apply_plan, plan_campaigns, preflight_plan, print_plan, read_campaign_states
+from scripts._preflight import preflight, print_failures
+from scripts._schedule_compiler import to_wei
+from scripts._status import format_status, load_fleet, read_fleet_status, status_json
+from scripts.offline import compile_schedule, simulate_campaign
+
 GUARDS = os.getenv('GUARDS')
 REWARD_TOKEN = os.getenv('REWARD_TOKEN')
 REWARD_TOKEN_DIGITS = os.getenv('REWARD_TOKEN_DIGITS')
@@ -19,6 +31,7 @@ GAUGE_ALLOWLIST = os.getenv('GAUGE_ALLOWLIST')
 DEPLOYED_DISTRIBUTOR = os.getenv('DEPLOYED_DISTRIBUTOR')
 DRY_RUN = os.getenv('DRY_RUN')
 CAMPAIGN_CONTRACT_LIST = os.getenv('CAMPAIGN_CONTRACT_LIST')
+BATCH_EXECUTOR = os.getenv('BATCH_EXECUTOR')
 
 
 @click.group()
@@ -38,360 +51,49 @@ cli.add_command(info)
 
 
 @click.command(cls=ConnectedProviderCommand)
-@account_option()
-def setup_taiko_campaign(ecosystem, network, provider, account):
-    if not DRY_RUN:
-        account.set_autosign(True)
-
-    min_epoch_duration = int(3.5 * 24 * 60 * 60)
-    campaign_contract_list = CAMPAIGN_CONTRACT_LIST.split(",")
-    amount_steady_epochs = 5  # 29 epochs = epoch is 1/2 week
-    #amount_steady_epochs = 31  # 29 epochs = epoch is 1/2 week
-
-
-    print("USDC/USDT: https://taikoscan.io/address/0xfdb6a782aAa9254fAb82eE39b3fd7728C8442f0D")
-
-    campaign_address = campaign_contract_list.pop(0)   
-    gauge_address = "0x79291f833bc0c8e06c5232144a9ac76faef261ab"
-
-    growth_epochs = [300, 600, 1200]
-    steady_epochs = [2100] * amount_steady_epochs 
-    epochs = growth_epochs + steady_epochs
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    print("crvUSD / USDT: https://taikoscan.io/address/0xdb23003932abca63b64422a29e11f9c58b9688f5")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = "0x538e5c90c75247f9978e4270f2fb22cfe86a8253"
-    
-    growth_epochs = [200, 400, 800]
-    steady_epochs = [1400] * amount_steady_epochs
-    epochs = growth_epochs + steady_epochs
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    print("crvUSD/USDC : https://taikoscan.io/address/0xb74370f716f1d552684c98a8b4ddf9859960386c")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = "0x9ccd30a992ec6775ad4b95fc267e7fd28d7f52a9"
-
-    growth_epochs = [200, 400, 800]
-    steady_epochs = [1400] * amount_steady_epochs
-    epochs = growth_epochs + steady_epochs
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-    
-    print("crvUSD/WBTC/WETH (Tricrypto-crvUSD) : https://taikoscan.io/address/0x51a910e5fde25a53d9b80b13d5e948e1a88b245f")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = "0xf536ee5567ef18c0ec3439b2f6dc67e8258e804c"
-
-    growth_epochs = [300, 600, 1200]
-    steady_epochs = [1400] * amount_steady_epochs 
-    epochs = growth_epochs + steady_epochs
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    print("crvUSD/CRV/Taiko (TriCRV-Taiko) : https://taikoscan.io/address/0x9511623fb1c793b875b490fc331df503108e9313")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = "0x5a673f07624cac33039b446a5f08cbb4482f6003"
+@click.argument("spec_file", type=click.Path(exists=True, dir_okay=False))
+def plan_campaign(ecosystem, network, provider, spec_file):
+    """
+    show the transactions still needed to bring the campaigns in SPEC_FILE on-chain
+    """
+    campaign_specs = load_campaign_spec(spec_file)
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaign_specs], cache=MetadataCache.open()))
+    print_plan(plan)
 
-    growth_epochs = [300, 600, 1200]
-    steady_epochs = [2100] * amount_steady_epochs 
-    epochs = growth_epochs + steady_epochs
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    print("Savings crvUSD: https://taikoscan.io/address/0xc09d2e66c7f5ae67b03f4b32f59da8a08cddc50b")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = "0x0cb96b43fdd4074b85e6bf128d0103008bd63f15"
-
-    growth_epochs = [200, 400, 800]
-    steady_epochs = [1400] * amount_steady_epochs
-    epochs = growth_epochs + steady_epochs
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-
-cli.add_command(setup_taiko_campaign)
+cli.add_command(plan_campaign)
 
 
 @click.command(cls=ConnectedProviderCommand)
+@click.argument("spec_file", type=click.Path(exists=True, dir_okay=False))
 @account_option()
-def setup_arbitrum_campaign(ecosystem, network, provider, account):
-    if not DRY_RUN:
-        account.set_autosign(True)
-
-    campaign_contract_list = CAMPAIGN_CONTRACT_LIST.split(",")
-
-    # Import lending gauges from env
-    GAUGE_LEND_ARB_LONG = os.getenv('GAUGE_LEND_ARB_LONG')
-    GAUGE_CRVUSD_ARB_CRV = os.getenv('GAUGE_CRVUSD_ARB_CRV')
-    GAUGE_CRVUSD_WBTC_WETH = os.getenv('GAUGE_CRVUSD_WBTC_WETH')
-
-    min_epoch_duration = int(7 * 24 * 60 * 60)
-    # ARB Long
-    campaign_address = campaign_contract_list.pop(0)    
-    gauge_address = GAUGE_LEND_ARB_LONG
-    epochs = [200, 400, 600, 800, 600, 400, 200]
-
-    # Set up campaign for gauge
-    #setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
+def apply_campaign(ecosystem, network, provider, account, spec_file):
+    """
+    send the transactions still needed for the campaigns in SPEC_FILE as one pipelined batch,
+    re-running after a partial failure only sends what is missing, transactions which revert
+    in the simulation at the pending block are reported and not sent
+    """
+    fee_engine, blockexplorer = setup(ecosystem, network)
+
+    campaign_specs = load_campaign_spec(spec_file)
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaign_specs], cache=MetadataCache.open()))
+    # reverting transactions are reported here and never broadcast
+    preflight_plan(plan, account)
+    print_plan(plan)
+
+    if DRY_RUN or not plan.transactions:
+        return
 
-    # crvUSD/ARB/CRV (CRV-ARB)
-    campaign_address = campaign_contract_list.pop(0)    
-    gauge_address = GAUGE_CRVUSD_ARB_CRV
-    epochs = [6000, 5800, 5600, 5400, 5200, 5000, 4800]
+    account.set_autosign(True)
+    receipts = apply_plan(plan, account, fee_engine=fee_engine)
+    for txn, receipt in zip(plan.transactions, receipts):
+        print(f"{txn.name} ({txn.campaign}): {txn.method} {blockexplorer}/tx/{receipt.txn_hash} failed: {receipt.failed}")
 
-    # Set up campaign for gauge
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
+cli.add_command(apply_campaign)
 
-    # crvUSD/ARB/CRV (CRV-ARB)
-    campaign_address = campaign_contract_list.pop(0)    
-    gauge_address = GAUGE_CRVUSD_WBTC_WETH
-    epochs = [2400, 2400, 2300, 2200, 2100, 2000, 1900]
 
-    # Set up campaign for gauge
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-cli.add_command(setup_arbitrum_campaign)
-
-@click.command(cls=ConnectedProviderCommand)
-@account_option()
-def setup_op_campaign(ecosystem, network, provider, account):
-    if not DRY_RUN:
-        account.set_autosign(True)
-
-    # Import lending gauges from env
-    GAUGE_LEND_CRV_LONG = os.getenv('GAUGE_LEND_CRV_LONG')
-    GAUGE_LEND_OP_LONG = os.getenv('GAUGE_LEND_OP_LONG') 
-    GAUGE_LEND_WBTC_LONG = os.getenv('GAUGE_LEND_WBTC_LONG')
-    GAUGE_LEND_WETH_LONG = os.getenv('GAUGE_LEND_WETH_LONG')
-    GAUGE_LEND_WSTETH_LONG = os.getenv('GAUGE_LEND_WSTETH_LONG')
-    GAUGE_TRICRYPTO_CRVUSD = os.getenv('GAUGE_TRICRYPTO_CRVUSD')
-    GAUGE_TRICRV = os.getenv('GAUGE_TRICRV')
-    GAUGE_WSTETH_ETH = os.getenv('GAUGE_WSTETH_ETH')
-    GAUGE_SCRVUSD = os.getenv('GAUGE_SCRVUSD')
-
-    campaign_contract_list = CAMPAIGN_CONTRACT_LIST.split(",")
-
-    min_epoch_duration = int(7 * 24 * 60 * 60)
-    # CRV/crvUSD Long
-    print(f"***************************************************************")
-    print("CRV/crvUSD Long")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)    
-    gauge_address = GAUGE_LEND_CRV_LONG
-    epochs = [250, 1000, 1250, 1000, 750, 500, 250]
-
-    # Set up campaign for gauge
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    # OP/crvUSD Long
-    print(f"***************************************************************")
-    print("OP/crvUSD Long")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_LEND_OP_LONG
-    # double the amount for OP/crvUSD Long
-    # reverse order for OP/crvUSD Long
-    epochs = [500, 2000, 2500, 2000, 1500, 1000, 500]
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    # WBTC/crvUSD Long
-    print(f"***************************************************************")
-    print("WBTC/crvUSD Long")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_LEND_WBTC_LONG
-    epochs = [250, 1000, 1250, 1000, 750, 500, 250]
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-    
-    # ETH/crvUSD Long
-    print(f"***************************************************************")
-    print("ETH/crvUSD Long")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_LEND_WETH_LONG
-    epochs = [250, 1000, 1250, 1000, 750, 500, 250]
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    # wsETH/crvUSD Long
-    print(f"***************************************************************")
-    print("wsETH/crvUSD Long")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_LEND_WSTETH_LONG
-    epochs = [250, 1000, 1250, 1000, 750, 500, 250]
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    '''
-    campaings for AMM
-    '''
-
-    # crvUSD/WBTC/WETH (Tricrypto-crvUSD)
-    print(f"***************************************************************")
-    print("crvUSD/WBTC/WETH (Tricrypto-crvUSD)")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_TRICRYPTO_CRVUSD
-    total_amm_epochs = 28  # 28 weeks
-
-    epochs = [1071.42857] * total_amm_epochs  # Creates a list of x elements, each with the same value
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-
-    # crvUSD/CRV/OP (TriCRV-Optimism)
-    print(f"***************************************************************")
-    print("crvUSD/CRV/OP (TriCRV-Optimism)")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_TRICRV
-    
-    epochs = [2142.85714] * total_amm_epochs   # Creates a list of x elements, each with the same value
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    # ETH/WSTEH
-    print(f"***************************************************************")
-    print("ETH/WSTEH")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_WSTETH_ETH
-    
-    epochs = [714.28571] * total_amm_epochs   # Creates a list of x elements, each with the same value
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-    # crvUSD/scrvUSD 
-    print(f"***************************************************************")
-    print("crvUSD/scrvUSD")
-    print(f"***************************************************************")
-    campaign_address = campaign_contract_list.pop(0)
-    gauge_address = GAUGE_SCRVUSD
-    
-    epochs = [357.14285] * total_amm_epochs   # Creates a list of x elements, each with the same value
-
-    setup_campaign_for_gauge(campaign_address, gauge_address, min_epoch_duration, account)
-    epochs = convert_to_digits(epochs, min_epoch_duration)
-    set_reward_epochs_for_gauge(campaign_address, epochs, account)
-
-cli.add_command(setup_op_campaign)
-
-
-def setup_campaign_for_gauge(campaign_address, receiving_gauge, min_epoch_duration, account):
-
-    if DRY_RUN:
-        print(f"[DRY RUN]\nWould setup campaign: {campaign_address}\n"
-              f"distributor: {DEPLOYED_DISTRIBUTOR}\n"
-              f"gauge: {receiving_gauge}\n"
-              f"min_epoch_duration: {min_epoch_duration}\n")
-        return
-        
-    single_campaign = project.SingleCampaign.at(campaign_address)
-    is_setup_complete = single_campaign.is_setup_complete()
-    if is_setup_complete:
-        print(f"Campaign already setup for campaign: {campaign_address}")
-        return
-    else:
-        print(f"[DRY RUN]\nWould setup campaign: {campaign_address}\n"
-            f"distributor: {DEPLOYED_DISTRIBUTOR}\n"
-            f"gauge: {receiving_gauge}\n"
-            f"min_epoch_duration: {min_epoch_duration}\n")
-        single_campaign.setup(DEPLOYED_DISTRIBUTOR, receiving_gauge, min_epoch_duration, sender=account, max_priority_fee="10 wei", max_fee="0.1 gwei", gas_limit="400000", transaction_acceptance_timeout=300)
-        print(f"Campaign setup complete for campaign: {campaign_address}")
-    
-def set_reward_epochs_for_gauge(campaign_address, epochs, account):
-    epoch_sum = 0
-    if DRY_RUN:
-        print(f"[DRY RUN]\nWould set reward epochs for gauge: {campaign_address}\n")
-        for i, epoch in enumerate(epochs):
-            epoch_sum += epoch
-            print(f"Epoch {i+1}: {epoch}; sum: {epoch_sum}")
-        return
-        
-    single_campaign = project.SingleCampaign.at(campaign_address)
-    is_reward_epochs_set = single_campaign.is_reward_epochs_set()
-    if is_reward_epochs_set:
-        print(f"Reward epochs already set for campaign: {campaign_address}")
-        return
-    else:
-        print(f"Setting reward epochs for campaign: {campaign_address}\n")  
-        for i, epoch in enumerate(epochs):
-            epoch_sum += epoch
-            print(f"Epoch {i+1}: {epoch}: sum: {epoch_sum}")
-        single_campaign.set_reward_epochs(epochs, sender=account, max_priority_fee="10 wei", max_fee="0.1 gwei", gas_limit="400000", transaction_acceptance_timeout=300)
-        print(f"Reward epochs set for campaign: {campaign_address}")
-
-# Track total rewards across all conversions
-_total_rewards = 0
-_total_distribute_events = 0
-
-def convert_to_digits(epochs: list, min_epoch_duration: int) -> list:
-    global _total_rewards
-    global _total_distribute_events
-    epoch_sum = 0
-    
-    # Print epochs vertically for better readability
-
-    converted = [int(x * 10**int(REWARD_TOKEN_DIGITS)) for x in epochs]
-    print("Epochs")
-    for i, epoch in enumerate(epochs):
-        epoch_sum += epoch
-        print(f"  Epoch {i+1}: {epoch}; sum: {epoch_sum}")
-    
-    _total_rewards += sum(converted)
-    _total_distribute_events += len(epochs)
-    runtime = len(epochs) * min_epoch_duration
-    print(f"\nNumber of epochs: {len(epochs)}")
-    print(f"First reward: {epochs[0]}")
-    print(f"Last reward: {epochs[-1]}")
-    print(f"Rewards sum this call: {sum(converted) / 10**int(REWARD_TOKEN_DIGITS):,.4f}")
-    print(f"Runtime in days: {runtime/24/60/60}")
-    print(f"Runtime in weeks: {runtime/24/60/60/7}")
-    print(f"Total rewards per day: {_total_rewards / 10**int(REWARD_TOKEN_DIGITS) / (runtime/24/60/60):,.4f}")
-    print(f"Total rewards per week: {_total_rewards / 10**int(REWARD_TOKEN_DIGITS) / (runtime/24/60/60/7):,.4f}")
-    print(f"Total rewards allocated so far: {_total_rewards / 10**int(REWARD_TOKEN_DIGITS):,.4f}")
-    print(f"Total distribute events: {_total_distribute_events}")
- 
-    return converted
+# offline commands, also available without ape through python -m scripts.offline
+cli.add_command(simulate_campaign)
+cli.add_command(compile_schedule)
 
 
 @click.command(cls=ConnectedProviderCommand)
@@ -403,7 +105,7 @@ def set_reward_epochs(ecosystem, network, provider, account):
     # Load existing SingleCampaign contract from address
     # USDC/USDT
     new_epochs = [1200 , 750, 600, 450]
-    new_epochs = convert_to_digits(new_epochs)
+    new_epochs = [to_wei(epoch, int(REWARD_TOKEN_DIGITS)) for epoch in new_epochs]
     campaign_address = "0x5d42F882e478e4fdD09D41532B412F1aD60462aF"
     gauge_address = "0x79291F833bC0c8E06C5232144A9Ac76FAEf261Ab"
     single_campaign = project.SingleCampaign.at(campaign_address)
@@ -420,10 +122,13 @@ def set_reward_epochs(ecosystem, network, provider, account):
 
     print(f"is_reward_epochs_set: {is_reward_epochs_set}")
 
-    single_campaign.set_reward_epochs(new_epochs, sender=account)
-
+    # epochs can only be set once, a reverting transaction is not sent
+    _, failures = preflight([(single_campaign.set_reward_epochs, (new_epochs,))], account)
+    print_failures(failures)
+    if failures:
+        return
 
-    single_campaign.set_reward_epochs(new_epochs)
+    single_campaign.set_reward_epochs(new_epochs, sender=account)
 
     is_reward_epochs_set = single_campaign.is_reward_epochs_set
     print(f"is_reward_epochs_set: {is_reward_epochs_set}")
@@ -455,32 +160,95 @@ def run_next_taiko(account):
     "0xfdb6a782aAa9254fAb82eE39b3fd7728C8442f0D",
     "0x9511623fB1C793B875B490FC331df503108E9313"]
 
-    for address in campaign_address:
-        single_campaign = project.SingleCampaign.at(address)
-        next_epoch_info = single_campaign.get_next_epoch_info()
-        DISTRIBUTION_BUFFER = single_campaign.DISTRIBUTION_BUFFER()
-        print(f"DISTRIBUTION_BUFFER: {DISTRIBUTION_BUFFER}")
-        print(f"next run in days: {next_epoch_info[1]/60/60/24}")
-        print(f"next run in hours: {next_epoch_info[1]/60/60}")
-        print(f"next run in seconds: {next_epoch_info[1]}")
-        print(f"amount: {next_epoch_info[0]}")
-        print(f"amount with decimals: {next_epoch_info[0]/10**18}")
-        print(f"execution_allowed: {single_campaign.execution_allowed()}")
-        # print(f"execution_allowed_time: {single_campaign.execution_allowed_time()}")
-        # print(f"execution_allowed_time_buffer: {single_campaign.execution_allowed_time_buffer()}")
-        if next_epoch_info[1]  < DISTRIBUTION_BUFFER:
-            if single_campaign.execution_allowed():
-                print(f"Next epoch info is less than 2 days for campaign: {address}")
-                distribute_reward = single_campaign.distribute_reward(sender=account)
-                print(f"distribute_reward: {distribute_reward}")    
-                next_epoch_info = single_campaign.get_next_epoch_info()
-                print(f"next_epoch_info: {next_epoch_info}")
+    # one aggregated eth_call for all campaigns instead of 4 calls per campaign
+    snapshots = read_campaign_snapshots(campaign_address)
+
+    due = []
+    for snapshot in snapshots:
+        print(f"campaign: {snapshot.address}")
+        if snapshot.is_exhausted:
+            print(f"No remaining reward epochs for campaign: {snapshot.address}")
+            continue
+
+        print(f"DISTRIBUTION_BUFFER: {snapshot.distribution_buffer}")
+        print(f"next run in days: {snapshot.seconds_until_next_distribution/60/60/24}")
+        print(f"next run in hours: {snapshot.seconds_until_next_distribution/60/60}")
+        print(f"next run in seconds: {snapshot.seconds_until_next_distribution}")
+        print(f"amount: {snapshot.next_reward_amount}")
+        print(f"amount with decimals: {snapshot.next_reward_amount/10**18}")
+        print(f"execution_allowed: {snapshot.execution_allowed}")
+        if snapshot.is_due:
+            print(f"Next epoch is inside the distribution buffer for campaign: {snapshot.address}")
+            due.append(snapshot.address)
         else:
             print(f"Nothing executed for campaign, to early or outside of buffer time")
 
+    if not due:
+        return
+
+    if BATCH_EXECUTOR:
+        # one transaction per MAX_BATCH_CAMPAIGNS due campaigns, crvUSD execute rewards are forwarded to account
+        batch_executor = project.BatchExecutor.at(BATCH_EXECUTOR)
+        transactions = [(batch_executor.execute, (due[start:start + MAX_BATCH_CAMPAIGNS],)) for start in range(0, len(due), MAX_BATCH_CAMPAIGNS)]
+    else:
+        transactions = [(project.SingleCampaign.at(address).distribute_reward, ()) for address in due]
+
+    # reverting transactions are not sent, their campaigns are due again on the next run
+    passing, failures = preflight(transactions, account)
+    print_failures(failures)
+
+    for method, args in passing:
+        try:
+            receipt = method(*args, sender=account)
+            print(f"{method.abis[0].name}: {receipt}")
+        except Exception as e:
+            # the next transactions still run
+            print(f"{method.abis[0].name} failed: {e}")
+
+    for snapshot in read_campaign_snapshots(due):
+        print(f"next_epoch_info {snapshot.address}: ({snapshot.next_reward_amount}, {snapshot.seconds_until_next_distribution})")
+
 cli.add_command(run_next_taiko)
 
 
+@click.command(cls=ConnectedProviderCommand)
+@account_option()
+def keeper(ecosystem, network, account):
+    """
+    long running keeper for all campaigns in CAMPAIGN_CONTRACT_LIST, sleeps until the next campaign is due,
+    an execute still pending after FEE_REPLACE_AFTER_BLOCKS is replaced with higher fees
+    """
+    account.set_autosign(True)
+    fee_engine, _ = setup(ecosystem, network)
+
+    campaign_contract_list = CAMPAIGN_CONTRACT_LIST.split(",")
+    keeper = DeadlineKeeper(campaign_contract_list, account, batch_executor_address=BATCH_EXECUTOR, fee_engine=fee_engine, cache=MetadataCache.open())
+    executed = asyncio.run(keeper.run())
+    print(f"All campaigns exhausted, executed: {len(executed)}")
+
+cli.add_command(keeper)
+
+
+@click.command()
+@click.option("--deployments", default="deployments.yaml", type=click.Path(dir_okay=False))
+@click.option("--chain", "chains", multiple=True, help="extra chain or provider, e.g. taiko:mainnet:node, repeatable")
+@click.option("--json", "as_json", is_flag=True, help="print the rows as json")
+def status(deployments, chains, as_json):
+    """
+    state of every campaign in DEPLOYMENTS and CAMPAIGN_CONTRACT_LIST[_<CHAIN>] on all chains,
+    one CampaignLens eth_call per 64 campaigns, chains are read concurrently
+    """
+    fleets = load_fleet(deployments if os.path.exists(deployments) else None, chains)
+    rows = read_fleet_status(fleets, cache_db=connect_metadata_cache())
+
+    if as_json:
+        click.echo(status_json(rows))
+    else:
+        click.echo(format_status(rows))
+
+cli.add_command(status)
+
+
 def setup(ecosystem, network):
 
     click.echo(f"ecosystem: {ecosystem.name}")
@@ -496,4 +264,7 @@ def setup(ecosystem, network):
     else:
         max_fee = "0.1 gwei"
         blockexplorer = "https://sepolia.arbiscan.io"
-    return max_fee, blockexplorer
\ No newline at end of file
+
+    # fees follow eth_feeHistory, the fixed max_fee per ecosystem is only the upper bound
+    fee_engine = FeeEngine(networks.provider.web3, max_fee_cap=convert(max_fee, int))
+    return fee_engine, blockexplorer
\ No newline at end of file
@@ -1,11 +1,19 @@
 import os
 import click
-import time
 
-from ape import project
+from ape import convert, networks, project
+from ape.utils import ZERO_ADDRESS
+from ape.contracts import ContractInstance
 
 from ape.cli import ConnectedProviderCommand, account_option
 
+from scripts._addresses import campaign_proxy_addresses, campaign_salt, create_address, proxy_address
+from scripts._campaign_spec import load_campaign_spec
+from scripts._factory import deploy_campaigns_transactions, guards_only_params
+from scripts._fees import FeeEngine
+from scripts._pipeline import TransactionPipeline
+from scripts._preflight import preflight, print_failures
+
 GUARDS = os.getenv('GUARDS')
 GUARDS_AND_CAMPAIGNS = os.getenv('GUARDS_AND_CAMPAIGNS')
 REWARD_TOKEN = os.getenv('REWARD_TOKEN')
@@ -18,6 +26,11 @@ GAUGE_ALLOWLIST = os.getenv('GAUGE_ALLOWLIST')
 DEPLOYED_DISTRIBUTOR = os.getenv('DEPLOYED_DISTRIBUTOR')
 CRVUSD_ADDRESS = os.getenv('CRVUSD_ADDRESS')
 EXECUTE_REWARD_AMOUNT = os.getenv('EXECUTE_REWARD_AMOUNT')
+PROXY_FACTORY = os.getenv('PROXY_FACTORY')
+SINGLE_CAMPAIGN_IMPLEMENTATION = os.getenv('SINGLE_CAMPAIGN_IMPLEMENTATION')
+
+# must match the DynArray bound of Proxy.deploy_campaigns()
+MAX_PROXIES = 27
 @click.group()
 def cli():
     pass
@@ -39,11 +52,11 @@ cli.add_command(info)
 def deploy(ecosystem, network, provider, account):
     account.set_autosign(True)
    
-    max_fee, blockexplorer = setup(ecosystem, network)
+    fee_engine, blockexplorer = setup(ecosystem, network)
 
     """
     if EXISTING_TEST_GAUGE is None:
-        test_gauge = account.deploy(project.TestGauge, REWARD_TOKEN, RECOVERY_ADDRESS, max_priority_fee="100 wei", max_fee=max_fee, gas_limit="100000")
+        test_gauge = deploy_estimated(account, fee_engine, project.TestGauge, REWARD_TOKEN, RECOVERY_ADDRESS)
     else:
         test_gauge = EXISTING_TEST_GAUGE
 
@@ -55,7 +68,7 @@ def deploy(ecosystem, network, provider, account):
     guards = GUARDS_AND_CAMPAIGNS.split(",")
     click.echo(guards)
 
-    deploy = account.deploy(project.Distributor, guards, REWARD_TOKEN, gauges, RECOVERY_ADDRESS, max_priority_fee="10 wei", max_fee=max_fee, gas_limit="400000")
+    deploy = deploy_estimated(account, fee_engine, project.Distributor, guards, REWARD_TOKEN, gauges, RECOVERY_ADDRESS)
 
 cli.add_command(deploy)
 
@@ -64,9 +77,9 @@ cli.add_command(deploy)
 def deploy_campaign_proxy(ecosystem, network, provider, account):
     account.set_autosign(True)
 
-    max_fee, blockexplorer = setup(ecosystem, network)
+    fee_engine, blockexplorer = setup(ecosystem, network)
 
-    deploy = account.deploy(project.Proxy, 0x9d45a61acA552F49D3998906d4112ae75c130d76, max_priority_fee="10 wei", max_fee=max_fee, gas_limit="400000")
+    deploy = deploy_estimated(account, fee_engine, project.Proxy)
 
 cli.add_command(deploy_campaign_proxy)
 
@@ -77,85 +90,275 @@ cli.add_command(deploy_campaign_proxy)
 def deploy_single_campaign(ecosystem, network, provider, account):
     account.set_autosign(True)
 
-    max_fee, blockexplorer = setup(ecosystem, network)
+    fee_engine, blockexplorer = setup(ecosystem, network)
 
     guards = GUARDS.split(",")
-    single_campaign = account.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, max_priority_fee="1000 wei", max_fee=max_fee, gas_limit="1000000")
+    # with PROXY_FACTORY it is the implementation of the campaigns deploy-period creates
+    single_campaign = deploy_estimated(account, fee_engine, project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, PROXY_FACTORY or ZERO_ADDRESS)
 
     click.echo(single_campaign)
 
 cli.add_command(deploy_single_campaign)
 
 
+@click.command(cls=ConnectedProviderCommand)
+@account_option()
+def deploy_multi_gauge_campaign(ecosystem, network, provider, account):
+    account.set_autosign(True)
+
+    fee_engine, blockexplorer = setup(ecosystem, network)
+
+    guards = GUARDS.split(",")
+    multi_gauge_campaign = deploy_estimated(account, fee_engine, project.MultiGaugeCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT)
+
+    click.echo(multi_gauge_campaign)
+    click.echo(f"Link: {blockexplorer}/address/{multi_gauge_campaign.address}")
+
+cli.add_command(deploy_multi_gauge_campaign)
+
+
+@click.command(cls=ConnectedProviderCommand)
+@account_option()
+def deploy_batch_executor(ecosystem, network, provider, account):
+    account.set_autosign(True)
+
+    fee_engine, blockexplorer = setup(ecosystem, network)
+
+    batch_executor = deploy_estimated(account, fee_engine, project.BatchExecutor)
+
+    click.echo(batch_executor)
+    click.echo(f"Link: {blockexplorer}/address/{batch_executor.address}")
+
+cli.add_command(deploy_batch_executor)
+
+
+@click.command(cls=ConnectedProviderCommand)
+@account_option()
+def deploy_campaign_lens(ecosystem, network, provider, account):
+    account.set_autosign(True)
+
+    fee_engine, blockexplorer = setup(ecosystem, network)
+
+    campaign_lens = deploy_estimated(account, fee_engine, project.CampaignLens)
+
+    click.echo(campaign_lens)
+    click.echo(f"Link: {blockexplorer}/address/{campaign_lens.address}")
+
+cli.add_command(deploy_campaign_lens)
+
+
 @click.command(cls=ConnectedProviderCommand)
 @account_option()
 def deploy_campaigns_with_many_proxies(ecosystem, network, provider, account):
+    """
+    Deploy factory and implementation, then one Proxy.deploy_campaigns() transaction per campaign
+
+    The campaigns are initialized with GUARDS only, setup and reward epochs are left to the guards.
+    """
     account.set_autosign(True)
 
-    max_fee, blockexplorer = setup(ecosystem, network)
+    fee_engine, blockexplorer = setup(ecosystem, network)
 
     guards = GUARDS.split(",")
 
-    single_campaign = account.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, max_priority_fee="1000 wei", max_fee=max_fee, gas_limit="1000000")
-       
+    pipeline = TransactionPipeline(account, fee_engine=fee_engine)
+    proxy = ContractInstance(pipeline.deploy(project.Proxy).contract_address, project.Proxy.contract_type)
+    click.echo(proxy)
+
+    single_campaign = pipeline.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, proxy.address).contract_address
     click.echo(single_campaign)
+    # the campaigns are estimated against the mined factory and implementation
+    pipeline.wait()
 
-    proxy = account.deploy(project.Proxy, max_priority_fee="10 wei", max_fee=max_fee, gas_limit="400000")
-    click.echo(proxy)
+    # a new factory, the salts only have to be unique for it
+    transactions = [(proxy.deploy_campaigns, (single_campaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, [guards_only_params(campaign_salt("many-proxies", i))])) for i in range(25)]
+    _, failures = preflight(transactions, account)
+    print_failures(failures)
+    assert not failures, "deploy_campaigns reverts, no campaign deployed"
+    for method, args in transactions:
+        pipeline.transact(method, *args)
+
+    receipts = pipeline.wait()
+    assert not any(receipt.failed for receipt in receipts), "deployment failed"
 
     single_campaign_contracts = []
-    
-    for i in range(25):
-        proxy_campaign_address = proxy.deploy_proxy(single_campaign, max_priority_fee="10 wei", max_fee=max_fee, gas_limit="400000", sender=account)
-        print(f"Campaign setup complete for campaign: {i} {proxy_campaign_address}")        
-        
+
+    for i, receipt in enumerate(receipts[2:]):
+        proxy_campaign_address = proxy.MultipleNewProxy.from_receipt(receipt)[0].proxies[0]
+        print(f"Campaign deployed and initialized: {i} {proxy_campaign_address}")
+
         single_campaign_contracts.append(proxy_campaign_address)
 
-        with open("single_campaign_contracts.log", "a+") as f:
-            f.write(f"Single Campaign: {single_campaign}\n")
+    with open("single_campaign_contracts.log", "a+") as f:
+        f.write(f"Single Campaign: {single_campaign}\n")
+        for proxy_campaign_address in single_campaign_contracts:
             f.write(f"Single Campaign Proxy: {proxy_campaign_address}\n")
             f.write(f"Link: {blockexplorer}/address/{proxy_campaign_address}\n")
-            f.write(f"Single Campaign Contract List: {[str(contract) for contract in single_campaign_contracts]}\n")
-            f.write(f"{','.join(str(contract) for contract in single_campaign_contracts)}\n")
-            f.write("-" * 80 + "\n")
+        f.write(f"Single Campaign Contract List: {[str(contract) for contract in single_campaign_contracts]}\n")
+        f.write(f"{','.join(str(contract) for contract in single_campaign_contracts)}\n")
+        f.write("-" * 80 + "\n")
 
-        time.sleep(61)
-        
 cli.add_command(deploy_campaigns_with_many_proxies)
 
 
 @click.command(cls=ConnectedProviderCommand)
 @account_option()
-def deploy_campaigns_with_many_proxies_no_loop(ecosystem, network, provider, account):
+@click.argument("label")
+@click.option("--campaigns", "n", default=20, help="number of campaign proxies")
+def deploy_salted_campaigns(ecosystem, network, provider, account, label, n):
+    """
+    Deploy proxy factory, implementation and Distributor back to back, then the salted campaign proxies
+
+    The proxy addresses are computed offline from factory, implementation, account and
+    campaign_salt(label, i), so the Distributor guard list is known before any campaign exists.
+    Proxy.deploy_campaigns() initializes every proxy with GUARDS in the transaction which creates it,
+    setup and reward epochs are left to the guards, e.g. with apply-campaign.
+    """
+    assert n <= MAX_PROXIES, f"at most {MAX_PROXIES} campaigns per period"
     account.set_autosign(True)
 
-    max_fee, blockexplorer = setup(ecosystem, network)
+    fee_engine, blockexplorer = setup(ecosystem, network)
 
     guards = GUARDS.split(",")
+    gauges = GAUGE_ALLOWLIST.split(",")
 
-    single_campaign = account.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, max_priority_fee="1000 wei", max_fee=max_fee, gas_limit="1000000")
-       
-    click.echo(single_campaign)
+    pipeline = TransactionPipeline(account, fee_engine=fee_engine)
+    proxy = ContractInstance(pipeline.deploy(project.Proxy).contract_address, project.Proxy.contract_type)
+    single_campaign = pipeline.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, proxy.address).contract_address
+
+    salts = [campaign_salt(label, i) for i in range(n)]
+    single_campaign_contracts = [proxy_address(proxy.address, single_campaign, salt, account.address) for salt in salts]
+
+    distributor = pipeline.deploy(project.Distributor, guards + single_campaign_contracts, REWARD_TOKEN, gauges, RECOVERY_ADDRESS).contract_address
+    # the proxies are estimated against the mined factory and implementation
+    pipeline.wait()
+
+    params = [guards_only_params(salt) for salt in salts]
+    _, failures = preflight([(proxy.deploy_campaigns, (single_campaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, params))], account)
+    print_failures(failures)
+    assert not failures, "deploy_campaigns reverts, no campaign deployed"
+    pipeline.transact(proxy.deploy_campaigns, single_campaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, params)
+
+    receipts = pipeline.wait()
+    assert not any(receipt.failed for receipt in receipts), "deployment failed"
+
+    with open("single_campaign_contracts.log", "a+") as f:
+        f.write(f"Single Campaign: {single_campaign}\n")
+        f.write(f"Proxy: {proxy.address}\n")
+        f.write(f"Distributor: {distributor}\n")
+        f.write(f"Link: {blockexplorer}/address/{distributor}\n")
+        f.write(f"Salt label: {label}\n")
+        f.write(f"Single Campaign Contract List: {[str(contract) for contract in single_campaign_contracts]}\n")
+        f.write(f"{','.join(str(contract) for contract in single_campaign_contracts)}\n")
+        f.write("-" * 80 + "\n")
+
+    click.echo(f"Distributor: {distributor}")
+    click.echo(','.join(single_campaign_contracts))
+
+cli.add_command(deploy_salted_campaigns)
+
+
+@click.command(cls=ConnectedProviderCommand)
+@account_option()
+@click.argument("spec_file")
+@click.argument("label")
+def deploy_period(ecosystem, network, provider, account, spec_file, label):
+    """
+    Deploy, initialize and configure all campaigns of a spec file through Proxy.deploy_campaigns()
+
+    Uses the implementation and factory from SINGLE_CAMPAIGN_IMPLEMENTATION and PROXY_FACTORY.
+    Without DEPLOYED_DISTRIBUTOR a new Distributor with all campaigns as guards is deployed first.
+    """
+    account.set_autosign(True)
+
+    fee_engine, blockexplorer = setup(ecosystem, network)
+
+    guards = GUARDS.split(",")
+    factory = project.Proxy.at(PROXY_FACTORY)
+
+    proxy_addresses = campaign_proxy_addresses(PROXY_FACTORY, SINGLE_CAMPAIGN_IMPLEMENTATION, account.address, label, 27)
+    distributor = DEPLOYED_DISTRIBUTOR
+    # without DEPLOYED_DISTRIBUTOR the campaigns get the Distributor deployed below
+    campaign_specs = load_campaign_spec(spec_file, proxy_addresses, distributor=distributor or ZERO_ADDRESS)
+    single_campaign_contracts = [campaign_spec.address for campaign_spec in campaign_specs]
+
+    if not distributor:
+        # the next transaction of the account, the campaigns only store the address
+        distributor = create_address(account.address, account.nonce)
+        for campaign_spec in campaign_specs:
+            campaign_spec.distributor = distributor
+
+    # nothing is sent, not even the Distributor, if a deploy_campaigns() transaction reverts
+    transactions = deploy_campaigns_transactions(factory, SINGLE_CAMPAIGN_IMPLEMENTATION, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, campaign_specs, label, proxy_addresses)
+    _, failures = preflight(transactions, account)
+    print_failures(failures)
+    assert not failures, "deploy_campaigns reverts, nothing sent"
+
+    pipeline = TransactionPipeline(account, fee_engine=fee_engine)
+
+    if not DEPLOYED_DISTRIBUTOR:
+        deployed = pipeline.deploy(project.Distributor, guards + single_campaign_contracts, REWARD_TOKEN, GAUGE_ALLOWLIST.split(","), RECOVERY_ADDRESS).contract_address
+        assert deployed == distributor, f"Distributor deployed at {deployed}, campaigns use {distributor}"
+
+    for method, args in transactions:
+        pipeline.transact(method, *args)
+
+    receipts = pipeline.wait()
+    assert not any(receipt.failed for receipt in receipts), "deployment failed"
+
+    with open("single_campaign_contracts.log", "a+") as f:
+        f.write(f"Distributor: {distributor}\n")
+        f.write(f"Link: {blockexplorer}/address/{distributor}\n")
+        f.write(f"Salt label: {label}\n")
+        for campaign_spec in campaign_specs:
+            f.write(f"{campaign_spec.name}: {campaign_spec.address}\n")
+        f.write(f"{','.join(single_campaign_contracts)}\n")
+        f.write("-" * 80 + "\n")
+
+    click.echo(f"{len(campaign_specs)} campaigns in {len(receipts)} transactions")
+    click.echo(','.join(single_campaign_contracts))
+
+cli.add_command(deploy_period)
 
-    proxy = account.deploy(project.Proxy, max_priority_fee="10 wei", max_fee=max_fee, gas_limit="400000")
+
+@click.command(cls=ConnectedProviderCommand)
+@account_option()
+def deploy_campaigns_with_many_proxies_no_loop(ecosystem, network, provider, account):
+    """
+    Deploy factory and implementation, then all campaigns in one Proxy.deploy_campaigns() transaction
+
+    The campaigns are initialized with GUARDS only, setup and reward epochs are left to the guards.
+    """
+    account.set_autosign(True)
+
+    fee_engine, blockexplorer = setup(ecosystem, network)
+
+    guards = GUARDS.split(",")
+
+    proxy = deploy_estimated(account, fee_engine, project.Proxy)
     click.echo(proxy)
 
-    single_campaign_contracts = []
+    single_campaign = deploy_estimated(account, fee_engine, project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, proxy)
+    click.echo(single_campaign)
+
     n = 20
+    # a new factory, the salts only have to be unique for it
+    params = [guards_only_params(campaign_salt("many-proxies", i)) for i in range(n)]
+    args = (single_campaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, params)
 
-    proxy_campaign_addresses = proxy.deploy_multiple_proxies(single_campaign, n, max_priority_fee="10 wei", max_fee=max_fee, gas_limit="400000", sender=account)
-    print(f"Campaign setup complete for campaign: {proxy_campaign_addresses}")        
-    
-    single_campaign_contracts.append(proxy_campaign_addresses)
+    receipt = proxy.deploy_campaigns(*args, **fee_engine.tx_kwargs(), gas_limit=fee_engine.gas_limit(proxy.deploy_campaigns.estimate_gas_cost(*args, sender=account)), sender=account)
+    single_campaign_contracts = proxy.MultipleNewProxy.from_receipt(receipt)[0].proxies
+    print(f"Campaigns deployed and initialized: {single_campaign_contracts}")
 
     with open("single_campaign_contracts.log", "a+") as f:
         f.write(f"Single Campaign: {single_campaign}\n")
-        f.write(f"Single Campaign Proxy: {proxy_campaign_addresses}\n")
-        f.write(f"Link: {blockexplorer}/address/{proxy_campaign_addresses}\n")
-        f.write(f"Single Campaign Contract List: {[str(contract) for contract in proxy_campaign_addresses]}\n")
+        for proxy_campaign_address in single_campaign_contracts:
+            f.write(f"Single Campaign Proxy: {proxy_campaign_address}\n")
+            f.write(f"Link: {blockexplorer}/address/{proxy_campaign_address}\n")
+        f.write(f"Single Campaign Contract List: {[str(contract) for contract in single_campaign_contracts]}\n")
         f.write(f"{','.join(str(contract) for contract in single_campaign_contracts)}\n")
         f.write("-" * 80 + "\n")
-        
+
 cli.add_command(deploy_campaigns_with_many_proxies_no_loop)
 
 def setup(ecosystem, network):
@@ -173,7 +376,18 @@ def setup(ecosystem, network):
     else:
         max_fee = "0.1 gwei"
         blockexplorer = "https://sepolia.arbiscan.io"
-    return max_fee, blockexplorer
+
+    # fees follow eth_feeHistory, the fixed max_fee per ecosystem is only the upper bound
+    fee_engine = FeeEngine(networks.provider.web3, max_fee_cap=convert(max_fee, int))
+    return fee_engine, blockexplorer
+
+def deploy_estimated(account, fee_engine, contract_container, *args):
+    """
+    account.deploy() with the fees of the fee engine and the gas estimate plus its margin
+    """
+    tx_kwargs = fee_engine.tx_kwargs()
+    txn = contract_container.constructor.serialize_transaction(*args, sender=account, **tx_kwargs)
+    return account.deploy(contract_container, *args, **tx_kwargs, gas_limit=fee_engine.estimate_gas(networks.provider, txn))
 
 @click.command(cls=ConnectedProviderCommand)
 @account_option()
@@ -183,26 +397,24 @@ def deploy_many_campaigns(ecosystem, network, provider, account):
     guards = GUARDS.split(",")
     single_campaign_contracts = []
 
-    max_fee, blockexplorer = setup(ecosystem, network)
+    fee_engine, blockexplorer = setup(ecosystem, network)
 
+    pipeline = TransactionPipeline(account, fee_engine=fee_engine)
     for i in range(20):
-        single_campaign = account.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, max_priority_fee="1000 wei", max_fee=max_fee, gas_limit="1000000")
-
-        single_campaign_contracts.append(single_campaign)
+        single_campaign_contracts.append(pipeline.deploy(project.SingleCampaign, guards, CRVUSD_ADDRESS, EXECUTE_REWARD_AMOUNT, ZERO_ADDRESS).contract_address)
 
-        # Log contract address and transaction info
-        with open("single_campaign_contracts.log", "a+") as f:
-            f.write(f"Single Campaign Contract: {single_campaign.address}\n")
-            f.write(f"Link: {blockexplorer}/address/{single_campaign.address}\n")
-            f.write(f"Single Campaign Contract List: {[str(contract) for contract in single_campaign_contracts]}\n")
-            f.write(f"{','.join(str(contract) for contract in single_campaign_contracts)}\n")
-            f.write("-" * 80 + "\n")
+    receipts = pipeline.wait()
+    assert not any(receipt.failed for receipt in receipts), "deployment failed"
 
-        # Sleep for 1 second between deployments
-     
-        time.sleep(61)
+    # Log contract address and transaction info
+    with open("single_campaign_contracts.log", "a+") as f:
+        for single_campaign in single_campaign_contracts:
+            f.write(f"Single Campaign Contract: {single_campaign}\n")
+            f.write(f"Link: {blockexplorer}/address/{single_campaign}\n")
+        f.write(f"Single Campaign Contract List: {[str(contract) for contract in single_campaign_contracts]}\n")
+        f.write(f"{','.join(str(contract) for contract in single_campaign_contracts)}\n")
+        f.write("-" * 80 + "\n")
 
     click.echo(single_campaign_contracts)
-    click.echo(single_campaign)
 
 cli.add_command(deploy_many_campaigns)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import os
+import click
+
+from ape.cli import ConnectedProviderCommand
+
+from scripts._indexer import (
+    EventIndexer,
+    connect,
+    discover_campaigns,
+    execution_lag,
+    gauge_payouts,
+    keeper_payouts,
+    load_deployed_contracts,
+)
+
+INDEXER_DB = os.getenv('INDEXER_DB') or "events.sqlite"
+PROXY_FACTORY = os.getenv('PROXY_FACTORY')
+
+
+@click.group()
+def cli():
+    pass
+
+
+@click.command(cls=ConnectedProviderCommand)
+@click.option("--deployments", default="deployments.yaml", type=click.Path(exists=True, dir_okay=False))
+@click.option("--db", "db_path", default=INDEXER_DB, help="sqlite database, created if missing")
+@click.option("--from-block", default=0, help="first block for contracts without cursor")
+@click.option("--confirmations", default=0, help="blocks behind the head which are not indexed yet")
+@click.option("--workers", default=4, help="contracts fetched concurrently")
+def index(ecosystem, network, provider, deployments, db_path, from_block, confirmations, workers):
+    """
+    pull events of all Distributors in DEPLOYMENTS and their campaigns into a sqlite database
+    """
+    distributors = load_deployed_contracts(deployments, f"{ecosystem.name}:{network.name}")
+    contracts = distributors + discover_campaigns([address for address, _ in distributors])
+    if PROXY_FACTORY:
+        contracts.append((PROXY_FACTORY, "proxy"))
+
+    db = connect(db_path)
+    indexer = EventIndexer(db, max_workers=workers, confirmations=confirmations)
+    indexer.add_contracts(contracts, start_block=from_block)
+    stored = indexer.run()
+
+    for address, count in stored.items():
+        click.echo(f"{address}: {count} new events")
+    click.echo(f"{sum(stored.values())} new events in {db_path}")
+
+cli.add_command(index)
+
+
+@click.command()
+@click.option("--db", "db_path", default=INDEXER_DB, type=click.Path(exists=True, dir_okay=False))
+def report(db_path):
+    """
+    per-gauge amounts, execution lag and keeper payouts from the indexed events
+    """
+    db = connect(db_path)
+
+    click.echo("gauge payouts")
+    for gauge, count, amount in gauge_payouts(db):
+        click.echo(f"  {gauge}: {count} distributions, {amount / 10**18:.4f} tokens")
+
+    click.echo("execution lag")
+    for campaign, block_number, timestamp, lag in execution_lag(db):
+        click.echo(f"  {campaign} block {block_number}: {lag}s")
+
+    click.echo("keeper payouts")
+    for caller, count, amount in keeper_payouts(db):
+        click.echo(f"  {caller}: {count} executions, {amount / 10**18:.4f} crvUSD")
+
+cli.add_command(report)
@@ -0,0 +1,221 @@
+import json
+import os
+import click
+
+from decimal import Decimal
+
+import numpy as np
+import yaml
+
+from eth_utils import encode_hex, is_address
+
+from scripts._addresses import campaign_proxy_addresses
+from scripts._artifacts import init_code_hash, load_artifact, parse_arg
+from scripts._campaign_spec import load_campaign_spec
+from scripts._deployments import encode_deployments, env_deployments, load_deployments
+from scripts._planner import fresh_campaign_state, plan_campaigns, print_plan
+from scripts._schedule_compiler import schedule_totals
+from scripts._simulator import KEEPER_SCENARIOS, WEEK, pad_epochs, simulate_scenarios
+
+# commands of this file run without a node and without importing ape or the compiler:
+#   python -m scripts.offline compile-schedule campaigns/taiko.yaml
+# abi and bytecode come from the last ape compile, see scripts/_artifacts.py
+
+REWARD_TOKEN_DIGITS = os.getenv('REWARD_TOKEN_DIGITS')
+PROXY_FACTORY = os.getenv('PROXY_FACTORY')
+SINGLE_CAMPAIGN_IMPLEMENTATION = os.getenv('SINGLE_CAMPAIGN_IMPLEMENTATION')
+DEPLOYER_ADDRESS = os.getenv('DEPLOYER_ADDRESS')
+
+
+def _campaign_count(spec_file):
+    with open(spec_file) as f:
+        return len(yaml.safe_load(f)["campaigns"])
+
+
+def _offline_campaign_specs(spec_file, label=None, check_addresses=False):
+    # campaigns without address get the predicted proxy of a salt label or zero,
+    # gauges and distributor are only needed for encoding transactions
+    if label:
+        addresses = campaign_proxy_addresses(PROXY_FACTORY, SINGLE_CAMPAIGN_IMPLEMENTATION, DEPLOYER_ADDRESS, label, _campaign_count(spec_file))
+    else:
+        addresses = ["0x" + "0" * 40] * _campaign_count(spec_file)
+    return load_campaign_spec(spec_file, campaign_contract_list=addresses, check_addresses=check_addresses)
+
+
+@click.group()
+def cli():
+    pass
+
+
+@click.command()
+@click.argument("spec_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--runs", default=1000, help="keeper latency samples per scenario")
+@click.option("--seed", default=0)
+def simulate_campaign(spec_file, runs, seed):
+    """
+    simulate the campaigns in SPEC_FILE offline under the keeper scenarios of scripts/_simulator.py,
+    prints end date drift, hours without reward rate on the gauge and the share paid by the planned end
+    """
+    campaign_specs = _offline_campaign_specs(spec_file)
+
+    amounts, counts = pad_epochs([c.epochs for c in campaign_specs])
+    min_epoch_duration = np.array([c.min_epoch_duration for c in campaign_specs])
+    summary = simulate_scenarios(amounts, counts, min_epoch_duration, runs, np.random.default_rng(seed))
+
+    print(f"{len(campaign_specs)} campaigns, {runs} runs per scenario, drift in hours against min_epoch_duration spacing")
+    print(f"{'scenario':<12}{'drift p50':>10}{'drift p95':>10}{'drift max':>10}{'no rate h':>10}{'empty days':>11}{'paid by end':>12}")
+    for i, name in enumerate(KEEPER_SCENARIOS):
+        print(
+            f"{name:<12}"
+            f"{np.median(summary['end_drift_p50'][i]) / 3600:>10.1f}"
+            f"{np.median(summary['end_drift_p95'][i]) / 3600:>10.1f}"
+            f"{summary['end_drift_max'][i].max() / 3600:>10.1f}"
+            f"{summary['zero_rate_hours'][i].mean():>10.1f}"
+            f"{summary['empty_days'][i].mean():>11.1f}"
+            f"{summary['streamed_by_nominal_end'][i].mean():>12.2%}"
+        )
+    print(f"total distributed: {summary['total_distributed'][0, 0]:,.2f}")
+
+cli.add_command(simulate_campaign)
+
+
+@click.command()
+@click.argument("spec_files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def compile_schedule(spec_files):
+    """
+    exact wei reward epochs and totals of every SPEC_FILE, one spec file per chain
+    """
+    for spec_file in spec_files:
+        with open(spec_file) as f:
+            spec = yaml.safe_load(f)
+        digits = int(spec.get("reward_token_digits") or REWARD_TOKEN_DIGITS)
+        campaign_specs = _offline_campaign_specs(spec_file)
+
+        print(f"\n{spec_file}")
+        for c in campaign_specs:
+            print(f"  {c.name}: {len(c.reward_epochs)} epochs, sum {sum(c.reward_epochs)}")
+            print(f"    {c.reward_epochs}")
+
+        totals = schedule_totals(spec_file, campaign_specs)
+        print(f"  campaigns: {totals.campaigns}, distribute events: {totals.distribute_events}")
+        print(f"  total: {totals.total} ({Decimal(totals.total) / 10**digits:,.4f})")
+        print(f"  runtime in weeks: {totals.runtime / WEEK:.1f}, rewards per day: {totals.per_day(digits):,.4f}")
+
+cli.add_command(compile_schedule)
+
+
+@click.command()
+@click.argument("spec_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--label", help="salt label, campaigns get the proxy addresses deploy-period would create")
+@click.option("--calldata", is_flag=True, help="print the encoded calldata of every transaction")
+def dry_run_plan(spec_file, label, calldata):
+    """
+    transactions which bring the campaigns in SPEC_FILE on-chain if none of them is setup yet,
+    the online plan-campaign of campaign_manager.py leaves out what is already done
+    """
+    campaign_specs = _offline_campaign_specs(spec_file, label, check_addresses=True)
+    plan = plan_campaigns(campaign_specs, {c.address: fresh_campaign_state(c.address) for c in campaign_specs})
+    print_plan(plan)
+
+    assert all(is_address(c.distributor) for c in campaign_specs), f"distributor of {spec_file} is no address, set DEPLOYED_DISTRIBUTOR"
+    single_campaign = load_artifact("SingleCampaign")
+    encoded = [single_campaign.encode_call(txn.method, txn.args) for txn in plan.transactions]
+    if calldata:
+        for txn, data in zip(plan.transactions, encoded):
+            print(f"{txn.name} ({txn.campaign}): {txn.method} {encode_hex(data)}")
+    print(f"calldata: {sum(len(data) for data in encoded)} bytes")
+
+cli.add_command(dry_run_plan)
+
+
+@click.command()
+@click.argument("contract")
+@click.argument("args", nargs=-1)
+def encode_constructor(contract, args):
+    """
+    encoded constructor ARGS of CONTRACT for block explorer verification, arrays are comma separated
+
+    python -m scripts.offline encode-constructor SingleCampaign 0xguard1,0xguard2 0xcrvusd 100000000000000000 0xfactory
+    """
+    artifact = load_artifact(contract)
+    types = artifact.constructor_types()
+    assert len(args) == len(types), f"{contract} constructor takes {len(types)} arguments: {', '.join(types)}"
+
+    values = [parse_arg(abi_type, value) for abi_type, value in zip(types, args)]
+    click.echo(f"Encoded constructor arguments: {artifact.encode_constructor(values).hex()}")
+    click.echo(f"Init code hash: {encode_hex(init_code_hash(artifact, values))}")
+    # recorded as source_hash of the deployments.yaml entry, the expected code of encode-constructors needs it
+    click.echo(f"Source hash: {artifact.source_hash}")
+
+cli.add_command(encode_constructor)
+
+
+def _hex_or_none(value):
+    return encode_hex(value) if value is not None else None
+
+
+@click.command()
+@click.argument("chains", nargs=-1)
+@click.option("--deployments", default="deployments.yaml", type=click.Path(exists=True, dir_okay=False))
+@click.option("--from-env", is_flag=True, help="the SingleCampaign and Distributor of the environment instead of DEPLOYMENTS")
+@click.option("--json", "as_json", is_flag=True, help="print the deployments as json, with the expected runtime code")
+def encode_constructors(chains, deployments, from_env, as_json):
+    """
+    constructor arguments, init code hash and runtime code hash of every deployment on CHAINS, e.g. arbitrum:mainnet,
+    all chains if none is given, for contract verification and comparing with eth_getCode
+    """
+    encoded = encode_deployments(env_deployments() if from_env else load_deployments(deployments, chains))
+
+    if as_json:
+        click.echo(json.dumps([
+            {
+                "chain": e.deployment.chain,
+                "name": e.deployment.name,
+                "contract": e.deployment.contract,
+                "address": e.deployment.address,
+                "source_hash": e.deployment.source_hash,
+                "constructor_args": e.constructor_args.hex(),
+                # null unless built from the current source
+                "init_code_hash": _hex_or_none(e.init_code_hash),
+                "code_hash": _hex_or_none(e.code_hash()),
+                "code": _hex_or_none(e.code),
+            }
+            for e in encoded
+        ], indent=2))
+        return
+
+    for e in encoded:
+        click.echo(f"{e.deployment.chain} {e.deployment.name} {e.deployment.contract} {e.deployment.address or ''}")
+        if e.constructor_args:
+            click.echo(f"  constructor args: {e.constructor_args.hex()}")
+        if e.code is None:
+            click.echo("  init code hash and code hash unknown, no source_hash of the current source recorded")
+            continue
+        click.echo(f"  init code hash: {encode_hex(e.init_code_hash)}")
+        click.echo(f"  code hash: {encode_hex(e.code_hash())}")
+    click.echo(f"{len(encoded)} deployments")
+
+cli.add_command(encode_constructors)
+
+
+@click.command()
+@click.argument("label")
+@click.option("--campaigns", "n", default=20, help="number of campaign proxies")
+@click.option("--factory", default=PROXY_FACTORY, help="proxy factory, PROXY_FACTORY by default")
+@click.option("--implementation", default=SINGLE_CAMPAIGN_IMPLEMENTATION, help="SINGLE_CAMPAIGN_IMPLEMENTATION by default")
+@click.option("--deployer", default=DEPLOYER_ADDRESS, help="account which calls the factory, DEPLOYER_ADDRESS by default")
+def predict_addresses(label, n, factory, implementation, deployer):
+    """
+    addresses of the salted campaign proxies for LABEL, as deploy-salted-campaigns and deploy-period create them
+    """
+    assert factory and implementation and deployer, "factory, implementation and deployer are needed"
+    addresses = campaign_proxy_addresses(factory, implementation, deployer, label, n)
+    for i, address in enumerate(addresses):
+        click.echo(f"{i}: {address}")
+    click.echo(",".join(addresses))
+
+cli.add_command(predict_addresses)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,86 @@
+import ape
+import pytest
+
+DAY = 86400
+
+
+def executed_campaigns(batch_executor, tx):
+    return list(tx.events.filter(batch_executor.BatchExecuted)[0].executed_campaigns)
+
+
+def setup_campaign(bob, distributor, test_gauge, campaign, epochs, min_epoch_duration=4 * DAY):
+    campaign.setup(distributor, test_gauge, min_epoch_duration, 1, "test", sender=bob)
+    campaign.set_reward_epochs(epochs, sender=bob)
+
+def test_batch_execute(bob, charlie, distributor, test_gauge, campaigns, reward_token, batch_executor):
+    for campaign in campaigns:
+        setup_campaign(bob, distributor, test_gauge, campaign, [10**18, 2 * 10**18])
+
+    tx = batch_executor.execute(campaigns, sender=charlie)
+
+    assert executed_campaigns(batch_executor, tx) == [c.address for c in campaigns]
+    assert reward_token.balanceOf(test_gauge) == len(campaigns) * 10**18
+    for campaign in campaigns:
+        assert campaign.get_number_of_remaining_epochs() == 1
+
+def test_batch_execute_forwards_execute_reward(bob, charlie, distributor, test_gauge, campaigns, crvusd_token, batch_executor):
+    for campaign in campaigns:
+        setup_campaign(bob, distributor, test_gauge, campaign, [10**18])
+
+    tx = batch_executor.execute(campaigns, sender=charlie)
+
+    assert crvusd_token.balanceOf(charlie) == len(campaigns) * 10**17
+    assert crvusd_token.balanceOf(batch_executor) == 0
+
+    events = tx.events.filter(batch_executor.BatchExecuted)
+    assert len(events) == 1
+    assert events[0].caller == charlie
+    assert events[0].executed_campaigns == [c.address for c in campaigns]
+    assert events[0].skipped == 0
+    assert events[0].execute_reward_amount == len(campaigns) * 10**17
+
+def test_batch_execute_skips_not_allowed(alice, bob, charlie, chain, distributor, test_gauge, campaigns, crvusd_token, batch_executor):
+    # campaigns[0] just distributed, too early
+    setup_campaign(bob, distributor, test_gauge, campaigns[0], [10**18, 10**18])
+    campaigns[0].execute(sender=bob)
+    # campaigns[1] has no remaining epochs
+    setup_campaign(bob, distributor, test_gauge, campaigns[1], [10**18])
+    campaigns[1].execute(sender=bob)
+    # campaigns[2] is not setup
+    # campaigns[3] is due
+    setup_campaign(bob, distributor, test_gauge, campaigns[3], [10**18])
+
+    tx = batch_executor.execute(campaigns, sender=charlie)
+
+    assert executed_campaigns(batch_executor, tx) == [campaigns[3].address]
+    events = tx.events.filter(batch_executor.BatchExecuted)
+    assert events[0].skipped == 3
+    assert events[0].execute_reward_amount == 10**17
+    assert crvusd_token.balanceOf(charlie) == 10**17
+
+def test_batch_execute_without_crvusd(alice, bob, charlie, distributor, test_gauge, campaigns, crvusd_token, batch_executor):
+    setup_campaign(bob, distributor, test_gauge, campaigns[0], [10**18])
+    campaigns[0].recover_token(crvusd_token, bob, 10**18, sender=bob)
+
+    tx = batch_executor.execute([campaigns[0]], sender=charlie)
+
+    assert executed_campaigns(batch_executor, tx) == [campaigns[0].address]
+    assert tx.events.filter(batch_executor.BatchExecuted)[0].execute_reward_amount == 0
+    assert crvusd_token.balanceOf(charlie) == 0
+
+def test_batch_execute_nothing_due(charlie, campaigns, batch_executor):
+    tx = batch_executor.execute(campaigns, sender=charlie)
+
+    assert executed_campaigns(batch_executor, tx) == []
+    assert tx.events.filter(batch_executor.BatchExecuted)[0].skipped == len(campaigns)
+
+def test_batch_execute_skips_failing_execute(alice, bob, charlie, distributor, test_gauge, campaigns, batch_executor, reward_token, diana):
+    setup_campaign(bob, distributor, test_gauge, campaigns[0], [10**18])
+    setup_campaign(bob, distributor, test_gauge, campaigns[1], [10**18])
+    # Distributor runs out of funds after the first campaign
+    distributor.recover_token(reward_token, 10**19 - 10**18, sender=bob)
+
+    tx = batch_executor.execute(campaigns[:2], sender=charlie)
+
+    assert executed_campaigns(batch_executor, tx) == [campaigns[0].address]
+    assert campaigns[1].get_number_of_remaining_epochs() == 1
@@ -0,0 +1,39 @@
+import ape
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 20, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice, charlie):
+    crvusd_token = alice.deploy(project.TestToken)
+    crvusd_token.mint(charlie, 10 ** 19, sender=alice)
+    return crvusd_token
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    # diana is recovery address
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture(scope="module")
+def campaigns(project, alice, bob, crvusd_token):
+    return [alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS) for _ in range(3)]
+
+@pytest.fixture(scope="module")
+def distributor(project, alice, bob, diana, reward_token, test_gauge, campaigns):
+    distributor_contract = alice.deploy(project.Distributor, [bob] + campaigns, reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor_contract, 10 ** 20, sender=bob)
+    return distributor_contract
+
+@pytest.fixture(scope="module")
+def lens(project, alice):
+    return alice.deploy(project.CampaignLens)
+
+@pytest.fixture(scope="module")
+def multicall(project, alice):
+    return alice.deploy(project.Multicall)
@@ -0,0 +1,66 @@
+import pytest
+
+from scripts._lens import read_campaign_lens, to_snapshot
+from scripts._multicall import read_campaign_snapshots
+
+DAY = 86400
+
+
+@pytest.fixture
+def fleet(bob, charlie, campaigns, distributor, test_gauge, crvusd_token, chain):
+    # first: running, second: exhausted, third: not setup
+    running, exhausted, _ = campaigns
+    crvusd_token.transfer(running, 10**18, sender=charlie)
+
+    running.setup(distributor, test_gauge, 4 * DAY, 1, "running", sender=bob)
+    running.set_reward_epochs([10**18, 2 * 10**18, 3 * 10**18], sender=bob)
+    running.distribute_reward(sender=bob)
+
+    exhausted.setup(distributor, test_gauge, 4 * DAY, 2, "exhausted", sender=bob)
+    exhausted.set_reward_epochs([10**18], sender=bob)
+    exhausted.distribute_reward(sender=bob)
+
+    return campaigns
+
+
+def test_get_campaign_states(lens, fleet, distributor, reward_token, test_gauge):
+    running, exhausted, fresh = lens.get_campaign_states(fleet)
+
+    assert running.campaign == fleet[0]
+    assert running.is_setup_complete and running.is_reward_epochs_set
+    assert running.distributor_address == distributor
+    assert running.receiving_gauge == test_gauge
+    assert running.min_epoch_duration == 4 * DAY
+    assert running.name == "running"
+    assert running.have_rewards_started
+    assert running.last_reward_amount == 10**18
+    assert running.remaining_epochs == [2 * 10**18, 3 * 10**18]
+    assert running.next_reward_amount == 2 * 10**18
+    assert 0 < running.seconds_until_next_distribution <= 4 * DAY
+    assert not running.execution_allowed
+    assert running.crvusd_balance == 10**18
+    assert running.next_execution_payment_amount == 10**17
+    assert running.distributor_reward_balance == reward_token.balanceOf(distributor)
+
+    # get_next_epoch_info() and execution_allowed() revert on these
+    assert exhausted.remaining_epochs == []
+    assert exhausted.next_reward_amount == 0
+    assert not exhausted.execution_allowed
+    assert exhausted.crvusd_balance == 0
+
+    assert not fresh.is_setup_complete
+    assert not fresh.execution_allowed
+    assert fresh.distributor_reward_balance == 0
+
+def test_matches_multicall_snapshots(lens, multicall, fleet):
+    snapshots = read_campaign_snapshots(fleet, multicall_address=multicall.address)
+    states = read_campaign_lens(fleet, lens_address=lens.address)
+
+    distribution_buffer = snapshots[0].distribution_buffer
+    assert [to_snapshot(state, distribution_buffer) for state in states] == snapshots
+
+def test_read_campaign_lens_chunks(lens, campaigns):
+    # more campaigns than one call takes
+    addresses = list(campaigns) * 30
+    states = read_campaign_lens(addresses, lens_address=lens.address)
+    assert [state.campaign for state in states] == addresses
@@ -1,7 +1,10 @@
 import ape
 import pytest
 
-@pytest.fixture(scope="module")
+# deployed once per session, ape snapshots the chain after the fixtures and reverts to it after
+# every test, each test starts from the same deployed and funded state without redeploying
+
+@pytest.fixture(scope="session")
 def reward_token(project, alice, bob):
     reward_token = alice.deploy(project.TestToken)
     # mint token to bob
@@ -11,7 +14,7 @@ def reward_token(project, alice, bob):
     print(balance)
     return reward_token
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def lost_token(project, alice, charlie):
     lost_token = alice.deploy(project.TestToken)
     # mint token to charlie
@@ -22,14 +25,14 @@ def lost_token(project, alice, charlie):
     return lost_token
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def test_gauge(project, alice, charlie, diana, reward_token):
     # bob guard address
     # diana is recovery address
     gauge = alice.deploy(project.TestGauge, reward_token, diana)
     return gauge
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def distributor(project, alice, bob, charlie, diana, reward_token, test_gauge):
     # bob guard address
     # diana is recovery address
@@ -0,0 +1,63 @@
+import ape
+import pytest
+
+DAY = 86400
+
+
+@pytest.fixture
+def funded_distributor(bob, reward_token, distributor):
+    reward_token.transfer(distributor, 10 ** 18, sender=bob)
+    return distributor
+
+def test_is_guard(alice, bob, charlie, distributor):
+    assert distributor.is_guard(bob)
+    assert distributor.is_guard(charlie)
+    assert not distributor.is_guard(alice)
+    assert distributor.get_all_guards() == [bob, charlie]
+
+def test_is_receiving_gauge(alice, test_gauge, distributor):
+    assert distributor.is_receiving_gauge(test_gauge)
+    assert not distributor.is_receiving_gauge(alice)
+    assert distributor.get_all_receiving_gauges() == [test_gauge]
+
+def test_send_reward_token_revert_gauge(bob, alice, funded_distributor):
+    with ape.reverts("only reward receiver which are allowed"):
+        funded_distributor.send_reward_token(alice, 10 ** 16, sender=bob)
+
+def test_many_distributions(bob, test_gauge, funded_distributor):
+    # more distributions than campaign_addresses can hold
+    for _ in range(40):
+        funded_distributor.send_reward_token(test_gauge, 10 ** 15, 4 * DAY, sender=bob)
+
+    assert funded_distributor.get_all_campaign_addresses() == [bob]
+    assert funded_distributor.distribution_count(bob) == 40
+
+def test_campaign_addresses_order(bob, charlie, test_gauge, funded_distributor):
+    funded_distributor.send_reward_token(test_gauge, 10 ** 15, sender=charlie)
+    funded_distributor.send_reward_token(test_gauge, 10 ** 15, sender=bob)
+    funded_distributor.send_reward_token(test_gauge, 10 ** 15, sender=charlie)
+
+    assert funded_distributor.get_all_campaign_addresses() == [charlie, bob]
+    assert funded_distributor.distribution_count(charlie) == 2
+    assert funded_distributor.distribution_count(bob) == 1
+
+def test_remove_campaign_address_swaps_last(alice, bob, charlie, test_gauge, funded_distributor):
+    funded_distributor.send_reward_token(test_gauge, 10 ** 15, sender=bob)
+    funded_distributor.send_reward_token(test_gauge, 10 ** 15, sender=charlie)
+
+    funded_distributor.remove_campaign_address(bob, sender=bob)
+    assert funded_distributor.get_all_campaign_addresses() == [charlie]
+
+    # not listed, nothing happens
+    funded_distributor.remove_campaign_address(alice, sender=bob)
+    funded_distributor.remove_campaign_address(bob, sender=bob)
+    assert funded_distributor.get_all_campaign_addresses() == [charlie]
+
+    # listed again with the next distribution, the counter keeps counting
+    funded_distributor.send_reward_token(test_gauge, 10 ** 15, sender=bob)
+    assert funded_distributor.get_all_campaign_addresses() == [charlie, bob]
+    assert funded_distributor.distribution_count(bob) == 2
+
+    funded_distributor.remove_campaign_address(bob, sender=charlie)
+    funded_distributor.remove_campaign_address(charlie, sender=charlie)
+    assert funded_distributor.get_all_campaign_addresses() == []
@@ -0,0 +1,57 @@
+import ape
+import pytest
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+@pytest.fixture(scope="module")
+def gauges(project, alice, diana, reward_token):
+    return [alice.deploy(project.TestGauge, reward_token, diana) for _ in range(14)]
+
+@pytest.fixture(scope="module")
+def batch_distributor(project, alice, bob, charlie, diana, reward_token, gauges):
+    distributor_contract = alice.deploy(project.Distributor, [bob, charlie], reward_token, gauges, diana)
+    reward_token.transfer(distributor_contract, 10 ** 18, sender=bob)
+    return distributor_contract
+
+
+def test_send_reward_tokens(bob, reward_token, gauges, batch_distributor):
+    amounts = [(i + 1) * 10 ** 15 for i in range(len(gauges))]
+    epochs = [WEEK, 4 * DAY] * (len(gauges) // 2)
+
+    tx = batch_distributor.send_reward_tokens(gauges, amounts, epochs, sender=bob)
+
+    for gauge, amount in zip(gauges, amounts):
+        assert reward_token.balanceOf(gauge) == amount
+    events = tx.events.filter(batch_distributor.SentRewardToken)
+    assert [(e.receiving_gauge, e.amount, e._epoch) for e in events] == list(zip(gauges, amounts, epochs))
+
+    assert batch_distributor.get_all_campaign_addresses() == [bob]
+    assert batch_distributor.distribution_count(bob) == len(gauges)
+
+def test_send_reward_tokens_revert_guard(alice, gauges, batch_distributor):
+    with ape.reverts("only reward guards can call this function"):
+        batch_distributor.send_reward_tokens(gauges[:1], [10 ** 15], [WEEK], sender=alice)
+
+def test_send_reward_tokens_revert_length(bob, gauges, batch_distributor):
+    with ape.reverts("gauges, amounts and epochs differ in length"):
+        batch_distributor.send_reward_tokens(gauges[:2], [10 ** 15], [WEEK, WEEK], sender=bob)
+
+def test_send_reward_tokens_revert_empty(bob, gauges, batch_distributor):
+    # an empty batch would register the guard as campaign without any distribution
+    with ape.reverts("no gauges to send reward token to"):
+        batch_distributor.send_reward_tokens([], [], [], sender=bob)
+
+    assert batch_distributor.get_all_campaign_addresses() == []
+
+def test_send_reward_tokens_revert_gauge(alice, bob, reward_token, gauges, batch_distributor):
+    # one gauge which is not allowed reverts the whole batch
+    with ape.reverts("only reward receiver which are allowed"):
+        batch_distributor.send_reward_tokens([gauges[0], alice], [10 ** 15, 10 ** 15], [WEEK, WEEK], sender=bob)
+
+    assert reward_token.balanceOf(gauges[0]) == 0
+
+def test_send_reward_tokens_revert_epoch(bob, gauges, batch_distributor):
+    with ape.reverts("epoch duration must be between 3 days and a year"):
+        batch_distributor.send_reward_tokens(gauges[:1], [10 ** 15], [DAY], sender=bob)
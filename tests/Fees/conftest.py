@@ -0,0 +1,39 @@
+import pytest
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture
+def clock(chain):
+    """
+    now and sleep replacement, sleeping mines a block instead of waiting
+    """
+    class Clock:
+        time = 0
+        sleeps = 0
+
+        def now(self):
+            return self.time
+
+        def sleep(self, seconds):
+            self.time += seconds
+            self.sleeps += 1
+            chain.mine()
+
+    return Clock()
+
+@pytest.fixture
+def fee_history():
+    """
+    eth_feeHistory result, blocks are (gas used ratio, priority fees at the REWARD_PERCENTILES)
+    """
+    def history(next_base_fee, blocks):
+        return {
+            "oldestBlock": 1,
+            "baseFeePerGas": [next_base_fee] * len(blocks) + [next_base_fee],
+            "gasUsedRatio": [ratio for ratio, _ in blocks],
+            "reward": [list(tips) for _, tips in blocks],
+        }
+
+    return history
@@ -0,0 +1,151 @@
+import pytest
+
+from eth_utils import keccak, to_hex
+
+from scripts._fees import FeeEngine, MIN_PRIORITY_FEE, max_base_fee, reward_percentile, suggest_fees
+from scripts._keeper import DeadlineKeeper
+from scripts._pipeline import TransactionPipeline
+
+GWEI = 10**9
+
+# full blocks, tips at the 10th to 90th percentile
+CONGESTED = [(1.0, [1 * GWEI, 2 * GWEI, 3 * GWEI, 5 * GWEI, 8 * GWEI])] * 10
+
+
+def test_quiet_chain_pays_the_minimum_tip(fee_history):
+    # empty blocks include anything, their zero tips are not a price
+    history = fee_history(GWEI, [(0.0, [0] * 5)] * 10 + [(0.3, [0, 0, 1, 2, 3])])
+    fees = suggest_fees(history, target_blocks=3)
+
+    assert fees.base_fee == GWEI
+    assert fees.max_priority_fee == MIN_PRIORITY_FEE
+    assert fees.max_fee == max_base_fee(GWEI, 3) + MIN_PRIORITY_FEE
+
+
+def test_congested_chain_tip_follows_target(fee_history):
+    history = fee_history(20 * GWEI, CONGESTED)
+
+    assert suggest_fees(history, target_blocks=1).max_priority_fee == 8 * GWEI
+    assert suggest_fees(history, target_blocks=2).max_priority_fee == 5 * GWEI
+    assert suggest_fees(history, target_blocks=3).max_priority_fee == 3 * GWEI
+    assert suggest_fees(history, target_blocks=6).max_priority_fee == 2 * GWEI
+    assert suggest_fees(history, target_blocks=20).max_priority_fee == 1 * GWEI
+
+    # inclusion in the next block needs only the next base fee
+    assert suggest_fees(history, target_blocks=1).max_fee == 20 * GWEI + 8 * GWEI
+    # every further block can raise the base fee by 12.5%
+    assert max_base_fee(20 * GWEI, 3) > 20 * GWEI * 81 // 64
+    assert suggest_fees(history, target_blocks=3).max_fee == max_base_fee(20 * GWEI, 3) + 3 * GWEI
+
+
+def test_reward_percentile():
+    assert [reward_percentile(n) for n in (1, 2, 3, 4, 5, 9, 10)] == [90, 75, 50, 50, 25, 25, 10]
+
+
+def test_max_fee_cap(fee_history):
+    history = fee_history(20 * GWEI, CONGESTED)
+    fees = suggest_fees(history, target_blocks=1, max_fee_cap=10 * GWEI)
+
+    assert fees.max_fee == 10 * GWEI
+    assert fees.max_priority_fee == 8 * GWEI
+
+
+def test_engine_on_local_chain(networks, alice, bob, crvusd_token):
+    web3 = networks.provider.web3
+    engine = FeeEngine(web3, target_blocks=2)
+    fees = engine.suggest()
+    # the history ends with the base fee of the next block
+    assert fees.base_fee == engine.fee_history()["baseFeePerGas"][-1]
+    assert fees.max_fee == max_base_fee(fees.base_fee, 2) + MIN_PRIORITY_FEE
+
+    estimate = crvusd_token.mint.estimate_gas_cost(bob, 10, sender=alice)
+    pipeline = TransactionPipeline(alice, fee_engine=engine)
+    pipeline.transact(crvusd_token.mint, bob, 10)
+    receipt = pipeline.wait()[0]
+
+    assert receipt.transaction.max_fee == fees.max_fee
+    assert receipt.transaction.max_priority_fee == MIN_PRIORITY_FEE
+    # estimate plus 20%
+    assert receipt.transaction.gas_limit == estimate * 120 // 100
+    assert receipt.gas_used < receipt.transaction.gas_limit
+
+
+@pytest.fixture
+def congested_pipeline(networks, alice, clock, fee_history):
+    """
+    pipeline with a fee engine in a congested mempool
+
+    The first broadcast never reaches a block but the node keeps reporting it as pending,
+    the fee history turns more congested after the first broadcast.
+    """
+    engine = FeeEngine(networks.provider.web3, target_blocks=3, replace_after_blocks=2)
+    histories = [fee_history(GWEI, [(0.5, [0, 0, 10, 20, 30])] * 10), fee_history(2 * GWEI, CONGESTED)]
+    engine.fee_history = lambda: histories[0] if len(sent) < 1 else histories[1]
+
+    # rebroadcast_after seconds never triggers, only the block count does
+    pipeline = TransactionPipeline(alice, rebroadcast_after=10**9, fee_engine=engine, sleep=clock.sleep, now=clock.now)
+    send = pipeline._send
+    sent = []
+
+    def lossy_send(txn):
+        sent.append(txn)
+        if len(sent) == 1:
+            return to_hex(keccak(txn.serialize_transaction()))
+        return send(txn)
+
+    pipeline._send = lossy_send
+    pipeline.sent = sent
+    return pipeline
+
+
+def test_replace_after_blocks(networks, bob, crvusd_token, congested_pipeline, clock, monkeypatch):
+    pending = congested_pipeline.transact(crvusd_token.mint, bob, 10)
+    first = pending.txn
+    eth = networks.provider.web3.eth
+    get_transaction = eth.get_transaction
+    monkeypatch.setattr(eth, "get_transaction", lambda txn_hash: {"hash": txn_hash} if txn_hash == pending.txn_hashes[0] else get_transaction(txn_hash))
+
+    receipts = congested_pipeline.wait()
+
+    # replaced after 2 blocks instead of rebroadcast_after seconds, mined with the third
+    assert clock.sleeps == 3
+    assert len(pending.txn_hashes) == 2
+    assert receipts[0].txn_hash == pending.txn_hashes[-1]
+    assert first.max_priority_fee == 10
+
+    replacement = receipts[0].transaction
+    assert replacement.nonce == first.nonce
+    # the new suggestion is above the 12.5% bump the node requires
+    assert replacement.max_priority_fee == 3 * GWEI
+    assert replacement.max_fee == max_base_fee(2 * GWEI, 3) + 3 * GWEI
+    assert crvusd_token.balanceOf(bob) == 10
+
+
+def test_empty_fee_history(networks):
+    # a node without history, the base fee of the latest block is used
+    web3 = networks.provider.web3
+    engine = FeeEngine(web3)
+    engine.fee_history = lambda: {"oldestBlock": 0, "baseFeePerGas": [], "gasUsedRatio": [], "reward": []}
+
+    assert engine.suggest().base_fee == web3.eth.get_block("latest")["baseFeePerGas"]
+
+
+def test_replacement_keeps_the_minimum_bump(networks):
+    engine = FeeEngine(networks.provider.web3)
+    engine.suggest = lambda target_blocks=None: suggest_fees({"baseFeePerGas": [GWEI], "gasUsedRatio": []}, 3)
+
+    fees = engine.replacement_fees(10 * GWEI, 2 * GWEI, 9, 8)
+    assert fees.max_fee == 10 * GWEI * 9 // 8 + 1
+    assert fees.max_priority_fee == 2 * GWEI * 9 // 8 + 1
+
+    engine.max_fee_cap = 11 * GWEI
+    assert engine.replacement_fees(10 * GWEI, 2 * GWEI, 9, 8) is None
+
+
+def test_keeper_send_with_fee_engine(networks, alice, bob, crvusd_token):
+    keeper = DeadlineKeeper([], alice, fee_engine=FeeEngine(networks.provider.web3))
+    receipt = keeper.send(crvusd_token.mint, bob, 7)
+
+    assert not receipt.failed
+    assert receipt.transaction.max_priority_fee == MIN_PRIORITY_FEE
+    assert crvusd_token.balanceOf(bob) == 7
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from scripts._gas_baseline import BASELINE_FORMAT, compare_gas, format_report, load_baseline, write_baseline
+
+BASELINE = {
+    "SingleCampaign.execute[distributor_guards=1]": {"gas": 100000, "calldata": 4},
+    "Proxy.deploy_multiple_proxies[proxies=27]": {"gas": 1000000, "calldata": 68},
+    "SingleCampaign.set_reward_epochs[epochs=52]": {"gas": 700000, "calldata": 1732},
+}
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "gas_baseline.json")
+    assert load_baseline(path) == {}
+
+    write_baseline(BASELINE, "vyper 0.4.3", path)
+    assert load_baseline(path) == BASELINE
+
+    with open(path) as f:
+        stored = json.load(f)
+    assert stored["format"] == BASELINE_FORMAT
+    assert stored["compiler"] == "vyper 0.4.3"
+    # sorted, a new baseline only shows the entries that changed in a diff
+    assert list(stored["entries"]) == sorted(BASELINE)
+
+
+def test_unknown_format_is_refused(tmp_path):
+    path = tmp_path / "gas_baseline.json"
+    path.write_text(json.dumps({"format": BASELINE_FORMAT + 1, "entries": {}}))
+
+    with pytest.raises(AssertionError, match="format"):
+        load_baseline(str(path))
+
+
+def test_regressions_beyond_tolerance():
+    measured = {
+        # within 2%
+        "SingleCampaign.execute[distributor_guards=1]": {"gas": 101900, "calldata": 4},
+        # more gas
+        "Proxy.deploy_multiple_proxies[proxies=27]": {"gas": 1030000, "calldata": 68},
+        "SingleCampaign.setup": {"gas": 144506, "calldata": 228},
+    }
+    changes = {change.name: change for change in compare_gas(BASELINE, measured)}
+
+    assert not changes["SingleCampaign.execute[distributor_guards=1]"].regressed(2)
+    assert changes["Proxy.deploy_multiple_proxies[proxies=27]"].regressed(2)
+    assert not changes["Proxy.deploy_multiple_proxies[proxies=27]"].regressed(5)
+    assert changes["Proxy.deploy_multiple_proxies[proxies=27]"].change_percent() == pytest.approx(3)
+    # new and removed entries are reported, not failed
+    assert not changes["SingleCampaign.setup"].regressed(2)
+    assert changes["SingleCampaign.set_reward_epochs[epochs=52]"].gas is None
+    assert not changes["SingleCampaign.set_reward_epochs[epochs=52]"].regressed(2)
+
+
+def test_calldata_growth_is_a_regression():
+    measured = {"SingleCampaign.set_reward_epochs[epochs=52]": {"gas": 700000, "calldata": 1800}}
+    (change, *_) = compare_gas(BASELINE, measured)
+
+    assert change.change_percent() == 0
+    assert change.regressed(2)
+
+
+def test_report():
+    measured = {
+        "SingleCampaign.execute[distributor_guards=1]": {"gas": 95000, "calldata": 4},
+        "Proxy.deploy_multiple_proxies[proxies=27]": {"gas": 1030000, "calldata": 68},
+        "SingleCampaign.setup": {"gas": 144506, "calldata": 228},
+    }
+    report = format_report(compare_gas(BASELINE, measured), 2)
+    lines = report.splitlines()
+
+    assert "4 entries, 1 above the baseline by more than 2%" in report
+    assert "| SingleCampaign.execute[distributor_guards=1] | 95000 | 100000 | -5.00% | 4 | 4 |" in lines
+    assert "| Proxy.deploy_multiple_proxies[proxies=27] | 1030000 | 1000000 | +3.00% **regression** | 68 | 68 |" in lines
+    assert "| SingleCampaign.setup | 144506 |  | new | 228 |  |" in lines
+    # removed entries come last
+    assert lines[-1] == "| SingleCampaign.set_reward_epochs[epochs=52] |  | 700000 | removed |  | 1732 |"
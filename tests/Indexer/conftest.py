@@ -0,0 +1,38 @@
+import ape
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+DAY = 86400
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 22, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice, charlie):
+    crvusd_token = alice.deploy(project.TestToken)
+    crvusd_token.mint(charlie, 10 ** 19, sender=alice)
+    return crvusd_token
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    # diana is recovery address
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture(scope="module")
+def campaign(project, alice, bob, crvusd_token):
+    return alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
+
+@pytest.fixture(scope="module")
+def distributor(project, alice, bob, diana, reward_token, test_gauge, campaign):
+    distributor_contract = alice.deploy(project.Distributor, [bob, campaign], reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor_contract, 10 ** 22, sender=bob)
+    return distributor_contract
+
+@pytest.fixture
+def db(tmp_path):
+    from scripts._indexer import connect
+    return connect(tmp_path / "events.sqlite")
@@ -0,0 +1,105 @@
+import pytest
+
+from scripts._indexer import EventIndexer, discover_campaigns, execution_lag, gauge_payouts, keeper_payouts, load_deployed_contracts
+
+DAY = 86400
+EPOCHS = [10**21, 2 * 10**21, 3 * 10**21]
+
+
+def run_epochs(campaign, alice, chain, n, lag=0):
+    for _ in range(n):
+        campaign.execute(sender=alice)
+        chain.pending_timestamp = chain.pending_timestamp + 4 * DAY + lag
+        chain.mine()
+
+
+@pytest.fixture
+def configured_campaign(bob, charlie, campaign, distributor, test_gauge, crvusd_token):
+    crvusd_token.transfer(campaign, 10**18, sender=charlie)
+    campaign.setup(distributor, test_gauge, 4 * DAY, 1, "indexed", sender=bob)
+    campaign.set_reward_epochs(EPOCHS, sender=bob)
+    return campaign
+
+
+def test_load_deployed_contracts():
+    contracts = load_deployed_contracts("deployments.yaml", "arbitrum:mainnet")
+    assert len(contracts) == 3
+    assert contracts[1] == ("0x2700992F2601b756185F0430E859D5fd4E0a9cDb", "distributor")
+    assert load_deployed_contracts("deployments.yaml", "taiko:mainnet") == []
+
+def test_discover_campaigns(campaign, distributor):
+    # bob is a guard without code
+    assert discover_campaigns([distributor.address]) == [(campaign.address, "campaign")]
+
+def test_index_and_report(db, alice, bob, charlie, configured_campaign, distributor, test_gauge, crvusd_token, chain):
+    campaign = configured_campaign
+    indexer = EventIndexer(db)
+    indexer.add_contracts([(distributor.address, "distributor"), (campaign.address, "campaign")], start_block=0)
+
+    run_epochs(campaign, alice, chain, 2, lag=600)
+    stored = indexer.run()
+    # SentRewardToken per epoch, SetupCompleted, RewardEpochsSet and two events per execute
+    assert stored == {distributor.address: 2, campaign.address: 6}
+
+    assert gauge_payouts(db) == [(test_gauge.address, 2, EPOCHS[0] + EPOCHS[1])]
+    assert keeper_payouts(db) == [(alice.address, 2, 2 * 10**17)]
+    lags = execution_lag(db)
+    assert [row[0] for row in lags] == [campaign.address]
+    # every mined block adds a second
+    assert 600 <= lags[0][3] < 610
+
+    # no new blocks, nothing to fetch
+    assert indexer.run() == {}
+
+    run_epochs(campaign, alice, chain, 1)
+    assert indexer.run() == {distributor.address: 1, campaign.address: 2}
+    assert gauge_payouts(db) == [(test_gauge.address, 3, sum(EPOCHS))]
+    assert len(execution_lag(db)) == 2
+
+def test_rerun_does_not_duplicate(db, alice, bob, charlie, configured_campaign, distributor, test_gauge, crvusd_token, chain):
+    run_epochs(configured_campaign, alice, chain, 1)
+
+    indexer = EventIndexer(db)
+    indexer.add_contracts([(distributor.address, "distributor")])
+    indexer.run()
+    # a lost cursor fetches everything again
+    db.execute("UPDATE cursors SET next_block = 0")
+    indexer.run()
+
+    assert gauge_payouts(db) == [(test_gauge.address, 1, EPOCHS[0])]
+
+def test_adaptive_block_range(db, monkeypatch, alice, bob, charlie, configured_campaign, distributor, test_gauge, crvusd_token, chain):
+    run_epochs(configured_campaign, alice, chain, 3)
+
+    indexer = EventIndexer(db, initial_block_range=64, max_block_range=64)
+    get_logs = indexer.web3.eth.get_logs
+    ranges = []
+
+    def limited_get_logs(params):
+        # like a node which rejects ranges of more than 4 blocks
+        if params["toBlock"] - params["fromBlock"] >= 4:
+            raise ValueError("block range too large")
+        ranges.append((params["fromBlock"], params["toBlock"]))
+        return get_logs(params)
+
+    monkeypatch.setattr(indexer.web3.eth, "get_logs", limited_get_logs)
+    indexer.add_contracts([(distributor.address, "distributor")])
+    indexer.run()
+
+    assert gauge_payouts(db) == [(test_gauge.address, 3, sum(EPOCHS))]
+    # every block fetched exactly once
+    blocks = [block for start, end in ranges for block in range(start, end + 1)]
+    assert blocks == list(range(0, blocks[-1] + 1))
+
+def test_index_proxy_events(db, project, alice, campaign):
+    factory = alice.deploy(project.Proxy)
+    factory.deploy_multiple_proxies(campaign, 3, sender=alice)
+
+    indexer = EventIndexer(db)
+    indexer.add_contracts([(factory.address, "proxy")])
+    # one NewProxy per proxy and the summary
+    assert indexer.run() == {factory.address: 4}
+
+    (proxies,) = db.execute("SELECT proxies FROM MultipleNewProxy").fetchone()
+    new_proxies = [proxy for (proxy,) in db.execute("SELECT proxy FROM NewProxy ORDER BY log_index")]
+    assert proxies.split(",") == new_proxies
@@ -0,0 +1,38 @@
+import ape
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 19, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    # diana is recovery address
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture(scope="module")
+def campaigns(project, alice, bob, charlie, crvusd_token):
+    # bob and charlie are guards of every campaign
+    return [alice.deploy(project.SingleCampaign, [bob, charlie], crvusd_token, 10**17, ZERO_ADDRESS) for _ in range(3)]
+
+@pytest.fixture(scope="module")
+def distributor(project, alice, bob, diana, reward_token, test_gauge, campaigns):
+    distributor_contract = alice.deploy(project.Distributor, [bob] + campaigns, reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor_contract, 10 ** 19, sender=bob)
+    return distributor_contract
+
+@pytest.fixture(scope="module")
+def multicall(project, alice):
+    return alice.deploy(project.Multicall)
+
+@pytest.fixture(scope="module")
+def batch_executor(project, alice):
+    return alice.deploy(project.BatchExecutor)
@@ -0,0 +1,232 @@
+import asyncio
+import math
+import time
+
+import ape
+import pytest
+
+from scripts._keeper import DeadlineKeeper, read_campaign_deadlines
+
+DAY = 86400
+
+
+@pytest.fixture
+def warp(chain):
+    """
+    sleep replacement that moves the local chain forward instead of waiting
+    """
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        chain.pending_timestamp = chain.pending_timestamp + math.ceil(seconds)
+        chain.mine()
+
+    sleep.sleeps = sleeps
+    return sleep
+
+
+def test_read_campaign_deadlines(bob, chain, distributor, test_gauge, campaigns, multicall):
+    campaigns[0].setup(distributor, test_gauge, 4 * DAY, 0, "started", sender=bob)
+    campaigns[0].set_reward_epochs([10**18, 10**18], sender=bob)
+    campaigns[0].distribute_reward(sender=bob)
+    # setup but no epochs set
+    campaigns[1].setup(distributor, test_gauge, 4 * DAY, 1, "no epochs", sender=bob)
+
+    timestamp, deadlines = read_campaign_deadlines([c.address for c in campaigns], multicall_address=multicall.address)
+
+    assert timestamp == chain.blocks.head.timestamp
+    assert deadlines == {campaigns[0].address: campaigns[0].next_execution_allowed_time_buffer()}
+
+
+def test_keeper_runs_all_campaigns_to_the_end(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, warp):
+    durations = [3 * DAY, 4 * DAY, 7 * DAY]
+    epochs = [[10**18] * 3, [10**18] * 2, [10**18] * 2]
+    for i, campaign in enumerate(campaigns):
+        campaign.setup(distributor, test_gauge, durations[i], i, f"campaign {i}", sender=bob)
+        campaign.set_reward_epochs(epochs[i], sender=bob)
+
+    keeper = DeadlineKeeper(
+        [c.address for c in campaigns],
+        charlie,
+        multicall_address=multicall.address,
+        sleep=warp,
+        now=lambda: chain.pending_timestamp,
+    )
+
+    reads = []
+    read_deadlines = keeper.read_deadlines
+    keeper.read_deadlines = lambda addresses: reads.append(list(addresses)) or read_deadlines(addresses)
+
+    executed = asyncio.run(keeper.run())
+
+    assert len(executed) == sum(len(e) for e in epochs)
+    for campaign in campaigns:
+        assert campaign.get_number_of_remaining_epochs() == 0
+
+    # one read of the whole fleet, afterwards only the executed campaigns are read again
+    assert len(reads[0]) == len(campaigns)
+    assert sum(len(r) for r in reads[1:]) == len(executed)
+
+    # the keeper only sleeps until the next deadline, it never wakes up without work
+    assert len(warp.sleeps) <= len(executed)
+
+
+def test_keeper_executes_inside_distribution_buffer(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, warp):
+    min_epoch_duration = 4 * DAY
+    campaign = campaigns[0]
+    campaign.setup(distributor, test_gauge, min_epoch_duration, 0, "campaign", sender=bob)
+    campaign.set_reward_epochs([10**18, 10**18], sender=bob)
+
+    keeper = DeadlineKeeper([campaign.address], charlie, multicall_address=multicall.address, sleep=warp, now=lambda: chain.pending_timestamp)
+    asyncio.run(keeper.run(max_executions=1))
+    first_distribution = campaign.last_reward_distribution_time()
+
+    asyncio.run(keeper.run(max_executions=1))
+    second_distribution = campaign.last_reward_distribution_time()
+
+    # executed at the start of the early window, not after the full epoch
+    lag = second_distribution - (first_distribution + min_epoch_duration - campaign.DISTRIBUTION_BUFFER())
+    assert 0 <= lag <= 2
+
+
+def test_keeper_reschedules_when_execute_fails(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, warp):
+    campaign = campaigns[0]
+    campaign.setup(distributor, test_gauge, 4 * DAY, 0, "campaign", sender=bob)
+    campaign.set_reward_epochs([10**18, 10**18], sender=bob)
+
+    keeper = DeadlineKeeper([campaign.address], charlie, multicall_address=multicall.address, sleep=warp, now=lambda: chain.pending_timestamp)
+
+    execute = keeper.execute
+    def execute_after_race(addresses):
+        # somebody else executes first, the keeper transaction reverts
+        if not keeper.executed and campaign.get_number_of_remaining_epochs() == 2:
+            campaign.execute(sender=bob)
+        return execute(addresses)
+
+    keeper.execute = execute_after_race
+    executed = asyncio.run(keeper.run())
+
+    assert executed == [campaign.address]
+    assert campaign.get_number_of_remaining_epochs() == 0
+
+
+def test_keeper_does_not_block_the_event_loop(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, warp):
+    campaign = campaigns[0]
+    campaign.setup(distributor, test_gauge, 4 * DAY, 0, "campaign", sender=bob)
+    campaign.set_reward_epochs([10**18], sender=bob)
+
+    keeper = DeadlineKeeper([campaign.address], charlie, multicall_address=multicall.address, sleep=warp, now=lambda: chain.pending_timestamp)
+
+    execute = keeper.execute
+    execute_window = []
+    def slow_execute(addresses):
+        # a node which takes a while to mine the transaction
+        execute_window.append(time.monotonic())
+        time.sleep(0.5)
+        execute_window.append(time.monotonic())
+        return execute(addresses)
+
+    keeper.execute = slow_execute
+    ticks = []
+
+    async def other_task():
+        while len(ticks) < 10:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        return await asyncio.gather(keeper.run(), other_task())
+
+    executed, _ = asyncio.run(main())
+
+    assert executed == [campaign.address]
+    # the other task kept running while execute was waiting
+    start, end = execute_window
+    assert len([t for t in ticks if start < t < end]) > 1
+
+
+def test_keeper_with_batch_executor(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, batch_executor, warp):
+    for i, campaign in enumerate(campaigns):
+        campaign.setup(distributor, test_gauge, 4 * DAY, i, f"campaign {i}", sender=bob)
+        campaign.set_reward_epochs([10**18, 10**18], sender=bob)
+
+    keeper = DeadlineKeeper(
+        [c.address for c in campaigns],
+        charlie,
+        multicall_address=multicall.address,
+        batch_executor_address=batch_executor.address,
+        sleep=warp,
+        now=lambda: chain.pending_timestamp,
+    )
+
+    transactions = []
+    execute = keeper.execute
+    keeper.execute = lambda addresses: transactions.append(addresses) or execute(addresses)
+
+    executed = asyncio.run(keeper.run())
+
+    # all campaigns run in lockstep, one transaction per epoch
+    assert len(executed) == 2 * len(campaigns)
+    assert len(transactions) == 2
+    for campaign in campaigns:
+        assert campaign.get_number_of_remaining_epochs() == 0
+
+
+def test_keeper_splits_batches(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, batch_executor, warp):
+    for i, campaign in enumerate(campaigns):
+        campaign.setup(distributor, test_gauge, 4 * DAY, i, f"campaign {i}", sender=bob)
+        campaign.set_reward_epochs([10**18], sender=bob)
+
+    keeper = DeadlineKeeper(
+        [c.address for c in campaigns],
+        charlie,
+        multicall_address=multicall.address,
+        batch_executor_address=batch_executor.address,
+        batch_size=2,
+        sleep=warp,
+        now=lambda: chain.pending_timestamp,
+    )
+
+    batches = []
+    send = keeper.send
+    keeper.send = lambda method, addresses: batches.append(addresses) or send(method, addresses)
+
+    executed = asyncio.run(keeper.run())
+
+    assert sorted(executed) == sorted(c.address for c in campaigns)
+    assert [len(batch) for batch in batches] == [2, 1]
+
+
+def test_keeper_retries_failed_batch(bob, charlie, chain, distributor, test_gauge, campaigns, multicall, batch_executor, warp):
+    for i, campaign in enumerate(campaigns):
+        campaign.setup(distributor, test_gauge, 4 * DAY, i, f"campaign {i}", sender=bob)
+        campaign.set_reward_epochs([10**18], sender=bob)
+
+    keeper = DeadlineKeeper(
+        [c.address for c in campaigns],
+        charlie,
+        multicall_address=multicall.address,
+        batch_executor_address=batch_executor.address,
+        batch_size=2,
+        retry_delay=600,
+        sleep=warp,
+        now=lambda: chain.pending_timestamp,
+    )
+
+    send = keeper.send
+    failures = []
+    def send_failing_once(method, addresses):
+        # e.g. the node drops the first batch, the daemon keeps running
+        if not failures:
+            failures.append(addresses)
+            raise Exception("connection reset")
+        return send(method, addresses)
+
+    keeper.send = send_failing_once
+    executed = asyncio.run(keeper.run())
+
+    assert sorted(executed) == sorted(c.address for c in campaigns)
+    assert 600 in warp.sleeps
+    for campaign in campaigns:
+        assert campaign.get_number_of_remaining_epochs() == 0
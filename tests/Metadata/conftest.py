@@ -0,0 +1,72 @@
+import ape
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+DAY = 86400
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 19, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    # diana is recovery address
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture(scope="module")
+def campaigns(project, alice, bob, charlie, crvusd_token):
+    # bob and charlie are guards of every campaign
+    return [alice.deploy(project.SingleCampaign, [bob, charlie], crvusd_token, 10**17, ZERO_ADDRESS) for _ in range(3)]
+
+@pytest.fixture(scope="module")
+def distributor(project, alice, bob, diana, reward_token, test_gauge, campaigns):
+    distributor_contract = alice.deploy(project.Distributor, [bob] + campaigns, reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor_contract, 10 ** 19, sender=bob)
+    return distributor_contract
+
+@pytest.fixture(scope="module")
+def multicall(project, alice):
+    return alice.deploy(project.Multicall)
+
+@pytest.fixture(scope="module")
+def lens(project, alice):
+    return alice.deploy(project.CampaignLens)
+
+@pytest.fixture
+def setup_campaigns(bob, distributor, test_gauge, campaigns):
+    # the first two campaigns are setup, the third is not
+    for i, campaign in enumerate(campaigns[:2]):
+        campaign.setup(distributor, test_gauge, 4 * DAY, i, f"campaign {i}", sender=bob)
+    return campaigns
+
+@pytest.fixture
+def cache(tmp_path, networks):
+    from scripts._metadata import MetadataCache
+    return MetadataCache.open(str(tmp_path / "metadata.sqlite"))
+
+@pytest.fixture
+def call_counter(monkeypatch):
+    """
+    counts the calls inside aggregated eth_calls of the planner, keeper and cache
+    """
+    import scripts._multicall
+
+    counter = {"eth_call": 0, "calls": 0}
+    aggregate = scripts._multicall.aggregate
+
+    def counting_aggregate(calls, **kwargs):
+        # aggregate_at_block() sends the calls after the first chunk separately, nothing if there are none
+        counter["eth_call"] += len(calls) > 0
+        counter["calls"] += len(calls)
+        return aggregate(calls, **kwargs)
+
+    # planner, keeper and cache read through aggregate_at_block(), which looks aggregate up on every call
+    monkeypatch.setattr(scripts._multicall, "aggregate", counting_aggregate)
+    return counter
@@ -0,0 +1,102 @@
+from scripts._keeper import read_campaign_deadlines
+from scripts._metadata import METADATA_FIELDS, MetadataCache
+from scripts._planner import read_campaign_states
+
+DAY = 86400
+
+
+def test_fill(cache, setup_campaigns, distributor, test_gauge, crvusd_token, bob, charlie, multicall, call_counter):
+    addresses = [c.address for c in setup_campaigns]
+    cached = cache.fill(addresses, multicall_address=multicall.address)
+
+    # the campaign before setup can still change, it is not cached
+    assert list(cached) == addresses[:2]
+    assert cached[addresses[1]] == {
+        "is_setup_complete": True,
+        "distributor_address": distributor.address,
+        "receiving_gauge": test_gauge.address,
+        "min_epoch_duration": 4 * DAY,
+        "id": 1,
+        "name": "campaign 1",
+        "guards": [bob.address, charlie.address],
+        "crvusd_address": crvusd_token.address,
+        "execute_reward_amount": 10**17,
+    }
+    # getBlockNumber() and the fields
+    assert call_counter == {"eth_call": 1, "calls": 1 + 3 * len(METADATA_FIELDS)}
+
+    # one eth_call per fill, only for what is missing
+    assert cache.fill(addresses, multicall_address=multicall.address) == cached
+    assert call_counter == {"eth_call": 2, "calls": 2 + 4 * len(METADATA_FIELDS)}
+    assert cache.fill(addresses[:2], multicall_address=multicall.address) == cached
+    assert call_counter["eth_call"] == 2
+
+
+def test_keyed_by_chain(cache, setup_campaigns, multicall):
+    cache.fill([c.address for c in setup_campaigns], multicall_address=multicall.address)
+
+    other_chain = MetadataCache(cache.db, cache.chain_id + 1)
+    assert other_chain.get_many([c.address for c in setup_campaigns]) == {}
+    # lower case addresses find the same entries
+    assert list(cache.get_many([setup_campaigns[0].address.lower()])) == [setup_campaigns[0].address.lower()]
+
+
+def test_invalidate_on_events(cache, setup_campaigns, bob, multicall, chain):
+    first, second, _ = setup_campaigns
+    cache.fill([first.address, second.address], multicall_address=multicall.address)
+    chain.mine()
+    assert cache.sync_events() == []
+
+    second.set_reward_epochs([10**18], sender=bob)
+
+    # only the campaign with the event is dropped and read again on the next fill
+    assert cache.sync_events() == [second.address]
+    assert list(cache.get_many([first.address, second.address])) == [first.address]
+    assert list(cache.fill([first.address, second.address], multicall_address=multicall.address)) == [first.address, second.address]
+
+    # events before the cached block are not seen again
+    assert cache.sync_events() == []
+    assert list(cache.get_many([first.address, second.address])) == [first.address, second.address]
+
+
+def test_planner_reads_with_cache(cache, setup_campaigns, multicall, call_counter):
+    addresses = [c.address for c in setup_campaigns]
+    uncached = read_campaign_states(addresses, multicall_address=multicall.address)
+    assert call_counter["calls"] == 1 + 7 * 3
+
+    assert read_campaign_states(addresses, multicall_address=multicall.address, cache=cache) == uncached
+    # the setup campaigns skip is_setup_complete, distributor, gauge and min_epoch_duration
+    call_counter["calls"] = 0
+    assert read_campaign_states(addresses, multicall_address=multicall.address, cache=cache) == uncached
+    assert call_counter["calls"] == 1 + 3 + 3 + 7
+
+
+def test_keeper_reads_with_cache(cache, setup_campaigns, bob, multicall, call_counter):
+    for campaign in setup_campaigns[:2]:
+        campaign.set_reward_epochs([10**18, 10**18], sender=bob)
+    addresses = [c.address for c in setup_campaigns]
+
+    _, uncached = read_campaign_deadlines(addresses, multicall_address=multicall.address)
+    _, first = read_campaign_deadlines(addresses, multicall_address=multicall.address, cache=cache)
+
+    call_counter["calls"] = 0
+    _, cached = read_campaign_deadlines(addresses, multicall_address=multicall.address, cache=cache)
+
+    assert uncached == first == cached
+    assert list(cached) == addresses[:2]
+    # timestamp, block number, 2 calls for each setup campaign, 3 for the one before setup
+    assert call_counter["calls"] == 2 + 2 + 2 + 3
+
+
+def test_status_fills_cache(cache, setup_campaigns, lens, chain):
+    from ape import networks
+    from scripts._status import ChainReader
+
+    reader = ChainReader(networks.provider.web3, networks.provider.network.ecosystem, lens.address)
+    block_number = chain.blocks.head.number
+    cache.store_states(reader.read_states([c.address for c in setup_campaigns], block_number), block_number)
+
+    cached = cache.get_many([c.address for c in setup_campaigns], ("is_setup_complete", "name", "id", "receiving_gauge"))
+    assert [values["name"] for values in cached.values()] == ["campaign 0", "campaign 1"]
+    # the lens has no guards, fill() reads these campaigns once more
+    assert cache.get_many([setup_campaigns[0].address]) == {}
@@ -0,0 +1,33 @@
+import ape
+import pytest
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    # mint token to bob
+    reward_token.mint(bob, 10 ** 20, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice, charlie):
+    crvusd_token = alice.deploy(project.TestToken)
+    # mint token to charlie
+    crvusd_token.mint(charlie, 10 ** 19, sender=alice)
+    return crvusd_token
+
+@pytest.fixture(scope="module")
+def test_gauges(project, alice, diana, reward_token):
+    # diana is recovery address
+    return [alice.deploy(project.TestGauge, reward_token, diana) for _ in range(3)]
+
+@pytest.fixture(scope="module")
+def multi_gauge_campaign(project, alice, bob, charlie, crvusd_token):
+    # bob and charlie are guards, 1 crvUSD per execute()
+    return alice.deploy(project.MultiGaugeCampaign, [bob, charlie], crvusd_token, 10**18)
+
+@pytest.fixture(scope="module")
+def distributor(project, alice, bob, diana, reward_token, test_gauges, multi_gauge_campaign):
+    # one guard entry for all gauges of the campaign
+    distributor_contract = alice.deploy(project.Distributor, [bob, multi_gauge_campaign], reward_token, test_gauges, diana)
+    reward_token.transfer(distributor_contract, 10 ** 20, sender=bob)
+    return distributor_contract
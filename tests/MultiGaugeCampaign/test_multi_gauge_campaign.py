@@ -0,0 +1,194 @@
+import asyncio
+import math
+
+import ape
+import pytest
+
+from scripts._keeper import DeadlineKeeper
+
+DAY = 86400
+
+
+@pytest.fixture
+def configured_campaign(bob, distributor, multi_gauge_campaign, test_gauges):
+    multi_gauge_campaign.setup(distributor, 3 * DAY + DAY // 2, 1, "taiko", sender=bob)
+    epochs = [
+        [10**18, 2 * 10**18, 3 * 10**18],
+        [5 * 10**17] * 3,
+        [4 * 10**18],
+    ]
+    multi_gauge_campaign.set_reward_epochs(test_gauges, epochs, sender=bob)
+    return epochs
+
+
+def advance(chain, seconds):
+    chain.pending_timestamp = chain.pending_timestamp + seconds
+    chain.mine()
+
+
+def test_initial_state(bob, charlie, multi_gauge_campaign, crvusd_token):
+    assert multi_gauge_campaign.get_all_guards() == [bob, charlie]
+    assert multi_gauge_campaign.crvusd_address() == crvusd_token
+    assert multi_gauge_campaign.min_epoch_duration() == 7 * DAY
+    assert not multi_gauge_campaign.is_setup_complete()
+    assert multi_gauge_campaign.get_all_receiving_gauges() == []
+
+def test_setup(bob, distributor, multi_gauge_campaign):
+    multi_gauge_campaign.setup(distributor, 4 * DAY, 3, "test", sender=bob)
+
+    assert multi_gauge_campaign.distributor_address() == distributor
+    assert multi_gauge_campaign.min_epoch_duration() == 4 * DAY
+    assert multi_gauge_campaign.id() == 3
+    assert multi_gauge_campaign.name() == "test"
+
+    with ape.reverts("Setup already completed"):
+        multi_gauge_campaign.setup(distributor, 4 * DAY, 3, "test", sender=bob)
+
+def test_setup_revert_not_guard(alice, distributor, multi_gauge_campaign):
+    with ape.reverts("only guards can call this function"):
+        multi_gauge_campaign.setup(distributor, 4 * DAY, 1, "test", sender=alice)
+
+def test_set_reward_epochs(multi_gauge_campaign, test_gauges, configured_campaign):
+    assert multi_gauge_campaign.get_all_receiving_gauges() == test_gauges
+    for gauge, epochs in zip(test_gauges, configured_campaign):
+        assert multi_gauge_campaign.get_all_epochs(gauge) == epochs
+        assert multi_gauge_campaign.get_number_of_remaining_epochs(gauge) == len(epochs)
+
+def test_set_reward_epochs_revert(alice, bob, multi_gauge_campaign, test_gauges, configured_campaign):
+    with ape.reverts("only guards can call this function"):
+        multi_gauge_campaign.set_reward_epochs([alice], [[1]], sender=alice)
+
+    with ape.reverts("Reward epochs can only be set once"):
+        multi_gauge_campaign.set_reward_epochs([test_gauges[0]], [[1]], sender=bob)
+
+    with ape.reverts("Gauges and reward epochs differ in length"):
+        multi_gauge_campaign.set_reward_epochs([alice], [], sender=bob)
+
+    with ape.reverts("Must set between 1 and 52 epochs"):
+        multi_gauge_campaign.set_reward_epochs([alice], [[]], sender=bob)
+
+    with ape.reverts("Reward amount exceeds uint128"):
+        multi_gauge_campaign.set_reward_epochs([alice], [[2**128]], sender=bob)
+
+def test_distribute_all_gauges_in_lockstep(bob, multi_gauge_campaign, reward_token, test_gauges, configured_campaign, chain):
+    epoch_duration = multi_gauge_campaign.min_epoch_duration()
+
+    for i in range(3):
+        tx = multi_gauge_campaign.distribute_reward(sender=bob)
+
+        # the shorter schedule drops out, the others continue
+        due = [epochs for epochs in configured_campaign if i < len(epochs)]
+        assert len(tx.events.filter(multi_gauge_campaign.RewardDistributed)) == len(due)
+        for gauge, epochs in zip(test_gauges, configured_campaign):
+            assert reward_token.balanceOf(gauge) == sum(epochs[:i + 1])
+            assert multi_gauge_campaign.get_all_epochs(gauge) == epochs[i + 1:]
+
+        advance(chain, epoch_duration)
+
+    with ape.reverts("No remaining reward epochs"):
+        multi_gauge_campaign.distribute_reward(sender=bob)
+
+def test_distribute_respects_min_epoch_duration(bob, multi_gauge_campaign, configured_campaign, chain):
+    multi_gauge_campaign.distribute_reward(sender=bob)
+
+    with ape.reverts("Minimum time between distributions not met"):
+        multi_gauge_campaign.distribute_reward(sender=bob)
+
+    assert not multi_gauge_campaign.execution_allowed()
+    advance(chain, multi_gauge_campaign.min_epoch_duration() - multi_gauge_campaign.DISTRIBUTION_BUFFER())
+    assert multi_gauge_campaign.execution_allowed()
+    multi_gauge_campaign.distribute_reward(sender=bob)
+
+def test_distribute_revert_not_setup(bob, multi_gauge_campaign):
+    with ape.reverts("Setup not completed"):
+        multi_gauge_campaign.distribute_reward(sender=bob)
+
+def test_execute_pays_incentive_once(alice, charlie, multi_gauge_campaign, crvusd_token, test_gauges, configured_campaign, chain):
+    crvusd_token.transfer(multi_gauge_campaign, 2 * 10**18, sender=charlie)
+    assert multi_gauge_campaign.next_execution_payment_amount() == 10**18
+
+    tx = multi_gauge_campaign.execute(sender=alice)
+
+    assert crvusd_token.balanceOf(alice) == 10**18
+    assert tx.events.filter(multi_gauge_campaign.ExecuteRewardDistributed)[0].distributed_gauges == len(test_gauges)
+
+    with ape.reverts("Too early"):
+        multi_gauge_campaign.execute(sender=alice)
+
+def test_distribute_skips_refused_gauge(alice, bob, multi_gauge_campaign, reward_token, test_gauges, configured_campaign, chain):
+    multi_gauge_campaign.distribute_reward(sender=bob)
+    advance(chain, multi_gauge_campaign.min_epoch_duration())
+
+    # gauges added later join the next distribution, one the Distributor does not allow blocks no other gauge
+    multi_gauge_campaign.set_reward_epochs([alice], [[10**18]], sender=bob)
+    for i in range(1, 3):
+        tx = multi_gauge_campaign.distribute_reward(sender=bob)
+
+        assert [log.receiving_gauge for log in tx.events.filter(multi_gauge_campaign.RewardDistributed)] == test_gauges[:2]
+        failed = tx.events.filter(multi_gauge_campaign.RewardDistributionFailed)
+        assert [(log.receiving_gauge, log.reward_amount) for log in failed] == [(alice, 10**18)]
+        assert reward_token.balanceOf(test_gauges[0]) == sum(configured_campaign[0][:i + 1])
+        # the refused epoch is kept for the next distribution
+        assert multi_gauge_campaign.get_all_epochs(alice) == [10**18]
+        advance(chain, multi_gauge_campaign.min_epoch_duration())
+
+    assert multi_gauge_campaign.execution_allowed()
+    with ape.reverts("Distributor refused every gauge"):
+        multi_gauge_campaign.distribute_reward(sender=bob)
+
+def test_distribute_revert_distributor_without_code(alice, bob, multi_gauge_campaign, test_gauges):
+    multi_gauge_campaign.setup(alice, 3 * DAY, 1, "taiko", sender=bob)
+    multi_gauge_campaign.set_reward_epochs(test_gauges[:1], [[10**18]], sender=bob)
+
+    with ape.reverts("Distributor has no code"):
+        multi_gauge_campaign.distribute_reward(sender=bob)
+
+def test_recover_token(bob, charlie, diana, crvusd_token, multi_gauge_campaign):
+    crvusd_token.transfer(multi_gauge_campaign, 10**18, sender=charlie)
+    multi_gauge_campaign.recover_token(crvusd_token, bob, 10**18, sender=bob)
+    assert crvusd_token.balanceOf(bob) == 10**18
+
+    with ape.reverts("only guards allowed to receive token"):
+        multi_gauge_campaign.recover_token(crvusd_token, diana, 1, sender=bob)
+
+def test_keeper_views(bob, multi_gauge_campaign, test_gauges, chain):
+    assert not multi_gauge_campaign.is_reward_epochs_set()
+    assert multi_gauge_campaign.get_number_of_remaining_epochs() == 0
+
+    epoch_duration = 4 * DAY
+    multi_gauge_campaign.setup(multi_gauge_campaign, epoch_duration, 1, "taiko", sender=bob)
+    multi_gauge_campaign.set_reward_epochs(test_gauges[:2], [[10**18] * 2, [10**18] * 3], sender=bob)
+
+    # the same views as the SingleCampaign, without argument the longest schedule counts
+    assert multi_gauge_campaign.is_reward_epochs_set()
+    assert multi_gauge_campaign.get_number_of_remaining_epochs() == 3
+    assert multi_gauge_campaign.get_number_of_remaining_epochs(test_gauges[0]) == 2
+    assert multi_gauge_campaign.get_number_of_remaining_epochs(test_gauges[2]) == 0
+    assert multi_gauge_campaign.next_execution_allowed_time_buffer() == epoch_duration - multi_gauge_campaign.DISTRIBUTION_BUFFER()
+
+def test_deadline_keeper_runs_campaign_to_the_end(project, alice, charlie, multi_gauge_campaign, reward_token, test_gauges, configured_campaign, chain):
+    multicall = alice.deploy(project.Multicall)
+
+    async def warp(seconds):
+        chain.pending_timestamp = chain.pending_timestamp + math.ceil(seconds)
+        chain.mine()
+
+    keeper = DeadlineKeeper([multi_gauge_campaign.address], charlie, multicall_address=multicall.address, sleep=warp, now=lambda: chain.pending_timestamp)
+    executed = asyncio.run(keeper.run())
+
+    assert len(executed) == max(len(epochs) for epochs in configured_campaign)
+    assert multi_gauge_campaign.get_number_of_remaining_epochs() == 0
+    for gauge, epochs in zip(test_gauges, configured_campaign):
+        assert reward_token.balanceOf(gauge) == sum(epochs)
+
+def test_deadline_keeper_reports_refused_gauge(project, alice, bob, charlie, multi_gauge_campaign, test_gauges, configured_campaign, chain, capsys):
+    multicall = alice.deploy(project.Multicall)
+    multi_gauge_campaign.set_reward_epochs([alice], [[10**18]], sender=bob)
+
+    keeper = DeadlineKeeper([multi_gauge_campaign.address], charlie, multicall_address=multicall.address, now=lambda: chain.pending_timestamp)
+    assert asyncio.run(keeper.run(max_executions=1)) == [multi_gauge_campaign.address]
+
+    out = capsys.readouterr().out
+    assert f"keeper: campaign {multi_gauge_campaign.address} could not send {10**18} to gauge {alice.address}, refused by the Distributor" in out
+    # the allowed gauges got their first epoch
+    assert [multi_gauge_campaign.get_number_of_remaining_epochs(gauge) for gauge in test_gauges] == [len(epochs) - 1 for epochs in configured_campaign]
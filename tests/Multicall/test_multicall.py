@@ -0,0 +1,121 @@
+import ape
+import pytest
+
+from scripts._multicall import MAX_CALLS, CampaignSnapshot, aggregate, aggregate_at_block, method_abi, read_campaign_snapshots
+
+DAY = 86400
+WEEK = 604800
+
+
+def setup_campaigns(bob, distributor, test_gauge, campaigns, min_epoch_duration=4 * DAY):
+    for i, campaign in enumerate(campaigns):
+        campaign.setup(distributor, test_gauge, min_epoch_duration, i, f"campaign {i}", sender=bob)
+        campaign.set_reward_epochs([(i + 1) * 10**18, 2 * 10**18], sender=bob)
+
+def test_aggregate_matches_direct_calls(project, bob, distributor, test_gauge, campaigns, multicall):
+    setup_campaigns(bob, distributor, test_gauge, campaigns)
+    contract_type = project.SingleCampaign.contract_type
+
+    calls = []
+    for campaign in campaigns:
+        calls.append((campaign.address, method_abi(contract_type, "get_next_epoch_info"), ()))
+        calls.append((campaign.address, method_abi(contract_type, "get_all_epochs"), ()))
+        calls.append((campaign.address, method_abi(contract_type, "name"), ()))
+
+    results = aggregate(calls, multicall_address=multicall.address)
+
+    assert len(results) == 3 * len(campaigns)
+    for i, campaign in enumerate(campaigns):
+        assert tuple(results[3 * i]) == tuple(campaign.get_next_epoch_info())
+        assert list(results[3 * i + 1]) == list(campaign.get_all_epochs())
+        assert results[3 * i + 2] == campaign.name()
+
+def test_aggregate_failed_call_is_none(project, campaigns, multicall):
+    # campaigns are not setup, execution_allowed() reverts
+    abi = method_abi(project.SingleCampaign.contract_type, "execution_allowed")
+    results = aggregate([(campaign.address, abi, ()) for campaign in campaigns], multicall_address=multicall.address)
+
+    assert results == [None] * len(campaigns)
+
+def test_aggregate3_revert_without_allow_failure(campaigns, multicall):
+    # execution_allowed() selector, reverts before setup
+    with ape.reverts("call failed"):
+        multicall.aggregate3([(campaigns[0], False, "0xf4812a48")])
+
+def test_aggregate_at_block(project, chain, campaigns, multicall, monkeypatch):
+    abi = method_abi(project.SingleCampaign.contract_type, "id")
+    calls = [(campaigns[0].address, abi, ())] * (MAX_CALLS + 1)
+
+    sent = []
+    monkeypatch.setattr("scripts._multicall.aggregate", lambda calls, **kwargs: sent.append((len(calls), kwargs.get("block_id"))) or aggregate(calls, **kwargs))
+    block_number, results = aggregate_at_block(calls, multicall_address=multicall.address)
+
+    assert block_number == chain.blocks.head.number
+    assert results == [campaigns[0].id()] * len(calls)
+    # getBlockNumber() fills the first chunk, the rest is read at the block it returned
+    assert sent == [(MAX_CALLS, None), (2, block_number)]
+
+def test_multicall_block_info(chain, multicall):
+    assert multicall.getBlockNumber() == chain.blocks.head.number
+    assert multicall.getCurrentBlockTimestamp() >= chain.blocks.head.timestamp
+
+def test_campaign_snapshots(bob, distributor, test_gauge, campaigns, multicall):
+    setup_campaigns(bob, distributor, test_gauge, campaigns)
+
+    snapshots = read_campaign_snapshots([c.address for c in campaigns], multicall_address=multicall.address)
+
+    for i, (campaign, snapshot) in enumerate(zip(campaigns, snapshots)):
+        assert snapshot.address == campaign.address
+        assert snapshot.next_reward_amount == (i + 1) * 10**18
+        assert snapshot.seconds_until_next_distribution == 0
+        assert snapshot.execution_allowed
+        assert snapshot.remaining_epochs == 2
+        assert snapshot.distribution_buffer == campaign.DISTRIBUTION_BUFFER()
+        assert snapshot.is_due
+
+def test_campaign_snapshots_after_distribution(bob, chain, distributor, test_gauge, campaigns, multicall):
+    min_epoch_duration = 4 * DAY
+    setup_campaigns(bob, distributor, test_gauge, campaigns, min_epoch_duration)
+    campaigns[0].distribute_reward(sender=bob)
+
+    snapshots = read_campaign_snapshots([c.address for c in campaigns], multicall_address=multicall.address)
+    assert not snapshots[0].is_due
+    assert not snapshots[0].execution_allowed
+    assert snapshots[0].remaining_epochs == 1
+    assert snapshots[0].seconds_until_next_distribution > snapshots[0].distribution_buffer
+    assert snapshots[1].is_due
+
+    # move into the distribution buffer
+    chain.pending_timestamp = chain.pending_timestamp + min_epoch_duration - campaigns[0].DISTRIBUTION_BUFFER()
+    chain.mine()
+
+    snapshots = read_campaign_snapshots([campaigns[0].address], multicall_address=multicall.address)
+    assert snapshots[0].is_due
+
+def test_campaign_snapshots_exhausted_and_not_setup(bob, distributor, test_gauge, campaigns, multicall):
+    campaigns[0].setup(distributor, test_gauge, 4 * DAY, 0, "exhausted", sender=bob)
+    campaigns[0].set_reward_epochs([10**18], sender=bob)
+    campaigns[0].distribute_reward(sender=bob)
+
+    snapshots = read_campaign_snapshots([c.address for c in campaigns[:2]], multicall_address=multicall.address)
+
+    # all epochs distributed
+    assert snapshots[0].is_exhausted
+    assert not snapshots[0].is_due
+    assert snapshots[0].remaining_epochs == 0
+
+    # never setup
+    assert snapshots[1].is_exhausted
+    assert not snapshots[1].execution_allowed
+    assert not snapshots[1].is_due
+
+def test_campaign_snapshot_without_distribution_buffer(distributor, multicall):
+    # a contract which is no campaign fails every call, it is never due
+    snapshots = read_campaign_snapshots([distributor.address], multicall_address=multicall.address)
+
+    assert snapshots[0].distribution_buffer is None
+    assert not snapshots[0].is_due
+
+    # only the buffer failed
+    snapshot = CampaignSnapshot(distributor.address, 10**18, 0, True, 1, None)
+    assert not snapshot.is_due
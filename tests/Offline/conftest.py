@@ -0,0 +1,14 @@
+import ape
+import pytest
+
+from scripts._artifacts import load_artifact
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def single_campaign_artifact(project, tmp_path_factory):
+    # reading the project compiles it, the manifest is current afterwards
+    project.SingleCampaign.contract_type
+    return load_artifact("SingleCampaign", cache_dir=str(tmp_path_factory.mktemp("artifacts")))
@@ -0,0 +1,92 @@
+import dataclasses
+import json
+
+import ape
+import pytest
+
+from click.testing import CliRunner
+from eth_utils import keccak
+
+from scripts._addresses import campaign_salt
+from scripts._artifacts import contract_source_hash
+from scripts._deployments import MINIMAL_PROXY, encode_deployments, load_deployments
+from scripts.offline import cli
+
+PROXIES = """
+ethereum:local:
+  campaign-1:
+    name: salted period
+    CampaignProxies:
+      factory: "{factory}"
+      implementation: "{implementation}"
+      deployer: "{deployer}"
+      label: test-period
+      count: 3
+    SingleCampaign:
+      address: "{implementation}"
+      args: ["{guard}", "{crvusd}", 100000000000000000, "{factory}"]
+      source_hash: "{source_hash}"
+"""
+
+
+@pytest.fixture(scope="module")
+def factory(project, alice):
+    return alice.deploy(project.Proxy)
+
+@pytest.fixture(scope="module")
+def implementation(project, alice, bob, crvusd_token, factory):
+    return alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, factory)
+
+
+def test_distributors_of_deployments_yaml(networks, project, alice):
+    deployments = load_deployments("deployments.yaml", ["arbitrum:mainnet"])
+    assert [d.contract for d in deployments] == ["Distributor"] * 3
+    assert deployments[0].address == "0xa7808B10367E6a88a8334a51De9bfE5aF4C0B7D5"
+
+    # compiled from the 2024 sources, only the constructor arguments are known
+    assert all(e.code is None and e.init_code_hash is None and e.code_hash() is None for e in encode_deployments(deployments))
+
+    # the constructor only stores its arguments, the arbitrum deployment can be replayed from the current source
+    encoded = encode_deployments([dataclasses.replace(deployments[0], source_hash=contract_source_hash("Distributor"))])
+    guards, reward_token, gauges, recovery_address = deployments[0].args
+    distributor = alice.deploy(project.Distributor, guards.split(","), reward_token, gauges.split(","), recovery_address)
+    data = bytes(networks.provider.get_receipt(distributor.txn_hash).transaction.data)
+
+    assert keccak(data) == encoded[0].init_code_hash
+    assert data.endswith(encoded[0].constructor_args)
+    assert bytes(networks.provider.web3.eth.get_code(distributor.address)) == encoded[0].code
+
+
+def test_salted_period(tmp_path, networks, alice, bob, crvusd_token, implementation, factory):
+    path = tmp_path / "deployments.yaml"
+    path.write_text(PROXIES.format(factory=factory.address, implementation=implementation.address, deployer=alice.address, guard=bob.address, crvusd=crvusd_token.address, source_hash=contract_source_hash("SingleCampaign")))
+
+    encoded = encode_deployments(load_deployments(str(path)))
+    proxies = [e for e in encoded if e.deployment.contract == MINIMAL_PROXY]
+    assert len(proxies) == 3
+
+    factory.deploy_multiple_proxies_salted(implementation, [campaign_salt("test-period", i) for i in range(3)], sender=alice)
+    web3 = networks.provider.web3
+    for e in proxies:
+        assert bytes(web3.eth.get_code(e.deployment.address)) == e.code
+
+    # the implementation itself was deployed with the listed args
+    single_campaign = encoded[-1]
+    assert single_campaign.deployment.contract == "SingleCampaign"
+    assert bytes(web3.eth.get_code(implementation.address)) == single_campaign.code
+    assert keccak(bytes(networks.provider.get_receipt(implementation.txn_hash).transaction.data)) == single_campaign.init_code_hash
+
+
+def test_encode_constructors_command():
+    result = CliRunner().invoke(cli, ["encode-constructors", "arbitrum:mainnet"])
+    assert result.exit_code == 0, result.output
+    assert result.output.count("constructor args: ") == 3
+    assert result.output.count("init code hash and code hash unknown") == 3
+    assert "3 deployments" in result.output
+
+def test_encode_constructors_json():
+    result = CliRunner().invoke(cli, ["encode-constructors", "arbitrum:mainnet", "--json"])
+    assert result.exit_code == 0, result.output
+    deployments = json.loads(result.output)
+    assert [d["code"] for d in deployments] == [None] * 3
+    assert all(d["constructor_args"] for d in deployments)
@@ -0,0 +1,93 @@
+import json
+import subprocess
+import sys
+
+import ape
+import pytest
+
+from click.testing import CliRunner
+
+from scripts._addresses import create_address
+from scripts._artifacts import load_artifact, parse_arg
+from scripts.offline import cli
+
+SPEC = """
+distributor: "0x00000000000000000000000000000000000000d1"
+reward_token_digits: 18
+min_epoch_duration: 345600
+
+campaigns:
+  - name: first
+    gauge: "0x00000000000000000000000000000000000000a1"
+    epochs: [1, 2, {amount: 3, repeat: 4}]
+  - name: second
+    gauge: "0x00000000000000000000000000000000000000a2"
+    epochs: [5, 6]
+"""
+
+
+def test_artifact_matches_project(project, single_campaign_artifact):
+    contract_type = project.SingleCampaign.contract_type
+    assert single_campaign_artifact.abi == [abi.model_dump(mode="json", by_alias=True, exclude_none=True) for abi in contract_type.abi]
+    assert single_campaign_artifact.deployment_bytecode == bytes(contract_type.deployment_bytecode.to_bytes())
+    assert single_campaign_artifact.runtime_bytecode == bytes(contract_type.runtime_bytecode.to_bytes())
+
+
+def test_artifact_cache_by_source_hash(single_campaign_artifact, tmp_path):
+    cache_dir = str(tmp_path / "artifacts")
+    load_artifact("SingleCampaign", cache_dir=cache_dir)
+    # the cached artifact is used without the manifest
+    cached = load_artifact("SingleCampaign", manifest_path=str(tmp_path / "missing.json"), cache_dir=cache_dir)
+    assert cached == single_campaign_artifact
+
+
+def test_stale_manifest(tmp_path):
+    with open(".build/__local__.json") as f:
+        manifest = json.load(f)
+    manifest["sources"]["contracts/SingleCampaign.vy"]["content"] += "# changed\n"
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest))
+
+    with pytest.raises(AssertionError, match="run ape compile"):
+        load_artifact("SingleCampaign", manifest_path=str(manifest_path), cache_dir="")
+
+
+def test_init_code_and_address(networks, alice, bob, charlie, crvusd_token, single_campaign_artifact, project):
+    args = [[bob.address, charlie.address], crvusd_token.address, 10**17, alice.address]
+    predicted = create_address(alice.address, alice.nonce)
+
+    campaign = alice.deploy(project.SingleCampaign, *args)
+    assert campaign.address == predicted
+    receipt = networks.provider.get_receipt(campaign.txn_hash)
+    assert bytes(receipt.transaction.data) == single_campaign_artifact.init_code(args)
+
+
+def test_encode_call_matches_ape(project, alice, bob, single_campaign_artifact):
+    campaign = project.SingleCampaign.deploy([bob], bob, 10**17, alice, sender=alice)
+    args = ([10**18, 2 * 10**18], 3 * 10**18, 0, 5)
+    assert single_campaign_artifact.encode_call("set_reward_schedule", args) == bytes(campaign.set_reward_schedule.encode_input(*args))
+
+
+def test_parse_arg():
+    assert parse_arg("address[]", "0x01, 0x02,") == ["0x01", "0x02"]
+    assert parse_arg("uint256", "0x10") == 16
+    assert parse_arg("uint256", "100") == 100
+    assert parse_arg("bool", "true") is True
+    assert parse_arg("bytes32", "0x" + "ab" * 32) == b"\xab" * 32
+
+
+def test_dry_run_plan(tmp_path, single_campaign_artifact):
+    spec_file = tmp_path / "campaign.yaml"
+    spec_file.write_text(SPEC)
+
+    result = CliRunner().invoke(cli, ["dry-run-plan", str(spec_file), "--calldata"])
+    assert result.exit_code == 0, result.output
+    assert "4 transactions, 0 conflicts" in result.output
+    # first has a linear tail, second is sent as packed epochs
+    assert "set_reward_schedule 0x" in result.output
+    assert "set_reward_epochs_packed 0x" in result.output
+
+
+def test_offline_cli_without_ape():
+    code = "import sys; import scripts.offline; sys.exit('ape' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
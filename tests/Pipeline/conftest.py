@@ -0,0 +1,36 @@
+import ape
+import pytest
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 19, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    # diana is recovery address
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture
+def clock(chain):
+    """
+    now and sleep replacement, sleeping mines a block instead of waiting
+    """
+    class Clock:
+        time = 0
+        sleeps = 0
+
+        def now(self):
+            return self.time
+
+        def sleep(self, seconds):
+            self.time += seconds
+            self.sleeps += 1
+            chain.mine()
+
+    return Clock()
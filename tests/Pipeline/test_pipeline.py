@@ -0,0 +1,107 @@
+import ape
+import pytest
+
+from eth_utils import keccak, to_hex
+from ape.utils import ZERO_ADDRESS
+
+from scripts._addresses import create_address
+from scripts._pipeline import TransactionPipeline, send_pipelined
+
+DAY = 86400
+
+
+def test_create_address(project, alice):
+    nonce = alice.nonce
+    campaign = alice.deploy(project.TestToken)
+    assert campaign.address == create_address(alice.address, nonce)
+
+
+def test_deploy_and_setup_pipelined(project, alice, bob, crvusd_token, test_gauge, reward_token, clock):
+    pipeline = TransactionPipeline(alice, sleep=clock.sleep, now=clock.now)
+    start_nonce = alice.nonce
+
+    deployments = [pipeline.deploy(project.SingleCampaign, [alice], crvusd_token, 10**17, ZERO_ADDRESS, gas_limit=2500000) for _ in range(5)]
+    campaigns = [ape.contracts.ContractInstance(d.contract_address, project.SingleCampaign.contract_type) for d in deployments]
+    distributor = pipeline.deploy(project.Distributor, [alice] + [c.address for c in campaigns], reward_token, [test_gauge], alice, gas_limit=3000000)
+    for i, campaign in enumerate(campaigns):
+        # the campaign is not deployed yet, no gas estimation
+        pipeline.transact(campaign.setup, distributor.contract_address, test_gauge, 4 * DAY, i, f"campaign {i}", gas_limit=500000)
+
+    receipts = pipeline.wait()
+
+    assert len(receipts) == 11
+    assert not any(receipt.failed for receipt in receipts)
+    assert [receipt.transaction.nonce for receipt in receipts] == list(range(start_nonce, start_nonce + 11))
+    assert [receipt.contract_address for receipt in receipts[:5]] == [c.address for c in campaigns]
+    for i, campaign in enumerate(campaigns):
+        assert campaign.id() == i
+        assert campaign.distributor_address() == distributor.contract_address
+
+
+def test_send_pipelined(alice, bob, crvusd_token):
+    receipts = send_pipelined([(crvusd_token.mint, (bob, i)) for i in range(1, 4)], alice)
+    assert [receipt.transaction.nonce for receipt in receipts] == sorted(receipt.transaction.nonce for receipt in receipts)
+    assert crvusd_token.balanceOf(bob) == 6
+
+
+@pytest.fixture
+def dropping_pipeline(alice, clock):
+    """
+    pipeline which loses the first broadcast, like a node dropping the transaction
+    """
+    pipeline = TransactionPipeline(alice, rebroadcast_after=60, sleep=clock.sleep, now=clock.now)
+    send = pipeline._send
+    sent = []
+
+    def lossy_send(txn):
+        sent.append(txn)
+        if len(sent) == 1:
+            return to_hex(keccak(txn.serialize_transaction()))
+        return send(txn)
+
+    pipeline._send = lossy_send
+    return pipeline
+
+
+def test_rebroadcast_dropped_transaction(bob, crvusd_token, dropping_pipeline, clock):
+    pending = dropping_pipeline.transact(crvusd_token.mint, bob, 10)
+
+    receipts = dropping_pipeline.wait()
+
+    # the same signed transaction is sent again after rebroadcast_after
+    assert clock.time >= 60
+    assert pending.txn_hashes == [receipts[0].txn_hash]
+    assert crvusd_token.balanceOf(bob) == 10
+
+
+def test_replace_stuck_transaction(networks, bob, crvusd_token, dropping_pipeline, clock, monkeypatch):
+    pending = dropping_pipeline.transact(crvusd_token.mint, bob, 10, max_fee="10 gwei", max_priority_fee="1 gwei")
+    # the node still knows the dropped transaction, it is stuck
+    eth = networks.provider.web3.eth
+    get_transaction = eth.get_transaction
+    monkeypatch.setattr(eth, "get_transaction", lambda txn_hash: {"hash": txn_hash} if txn_hash == pending.txn_hashes[0] else get_transaction(txn_hash))
+
+    receipts = dropping_pipeline.wait()
+
+    assert len(pending.txn_hashes) == 2
+    assert receipts[0].txn_hash == pending.txn_hashes[-1]
+    assert receipts[0].transaction.nonce == pending.nonce
+    assert receipts[0].transaction.max_fee > 10 * 10**9 * 11 // 10
+    assert crvusd_token.balanceOf(bob) == 10
+
+
+def test_unsigned_replacement_keeps_the_signed_transaction(networks, alice, bob, crvusd_token, dropping_pipeline, clock, monkeypatch):
+    pending = dropping_pipeline.transact(crvusd_token.mint, bob, 10, max_fee="10 gwei", max_priority_fee="1 gwei")
+    signed = pending.txn
+    eth = networks.provider.web3.eth
+    get_transaction = eth.get_transaction
+    monkeypatch.setattr(eth, "get_transaction", lambda txn_hash: {"hash": txn_hash} if txn_hash == pending.txn_hashes[0] else get_transaction(txn_hash))
+    # the signer refuses the replacement
+    monkeypatch.setattr(type(alice), "sign_transaction", lambda self, txn, **kwargs: None)
+
+    receipts = dropping_pipeline.wait()
+
+    # the first signed transaction was sent again, no unsigned replacement
+    assert pending.txn is signed
+    assert pending.txn_hashes == [receipts[0].txn_hash]
+    assert crvusd_token.balanceOf(bob) == 10
@@ -0,0 +1,245 @@
+import ape
+import pytest
+
+from scripts._campaign_spec import expand_epochs, load_campaign_spec
+from scripts._planner import apply_plan, plan_campaigns, preflight_plan, print_plan, read_campaign_states
+from scripts._schedule import CAMPAIGN_VERSION, encode_reward_schedule
+
+DAY = 86400
+
+SPEC = """
+distributor: "{distributor}"
+reward_token_digits: 18
+min_epoch_duration: 345600
+
+campaigns:
+  - name: first
+    gauge: "{gauge}"
+    epochs: [1, 2, {{amount: 3, repeat: 2}}]
+  - name: second
+    gauge: ${{TEST_PLANNER_GAUGE}}
+    epochs: [{{amount: 1071.42857, repeat: 3}}]
+  - name: third
+    id: 7
+    gauge: "{gauge}"
+    min_epoch_duration: 604800
+    epochs: [5]
+"""
+
+
+@pytest.fixture
+def spec_file(tmp_path, monkeypatch, distributor, test_gauge):
+    monkeypatch.setenv("TEST_PLANNER_GAUGE", test_gauge.address)
+    path = tmp_path / "campaign.yaml"
+    path.write_text(SPEC.format(distributor=distributor.address, gauge=test_gauge.address))
+    return path
+
+
+@pytest.fixture
+def campaign_specs(spec_file, campaigns):
+    return load_campaign_spec(spec_file, [c.address for c in campaigns])
+
+
+def test_expand_epochs():
+    assert expand_epochs([300, 600, {"amount": 2100, "repeat": 3}]) == [300, 600, 2100, 2100, 2100]
+    assert expand_epochs([{"start": 6000, "step": -200, "count": 3}, 100]) == [6000, 5800, 5600, 100]
+
+def test_encode_reward_schedule():
+    schedule = encode_reward_schedule([300, 600, 1200] + [2100] * 5)
+    assert schedule.args() == ([300, 600, 1200], 2100, 0, 5)
+    assert encode_reward_schedule([6000, 5800, 5600, 5400, 5200]).args() == ([], 6000, -200, 5)
+    # short tails stay explicit
+    assert encode_reward_schedule([300, 600, 2100, 2100, 2100]) is None
+    assert encode_reward_schedule([5]) is None
+
+def test_load_campaign_spec(campaign_specs, campaigns, distributor, test_gauge):
+    assert [c.address for c in campaign_specs] == [c.address for c in campaigns]
+    assert [c.id for c in campaign_specs] == [0, 1, 7]
+    assert [c.min_epoch_duration for c in campaign_specs] == [4 * DAY, 4 * DAY, 7 * DAY]
+    assert campaign_specs[0].reward_epochs == [10**18, 2 * 10**18, 3 * 10**18, 3 * 10**18]
+    # no float rounding
+    assert campaign_specs[1].reward_epochs == [1071428570000000000000] * 3
+    assert campaign_specs[1].gauge == test_gauge.address
+    assert campaign_specs[2].distributor == distributor.address
+
+@pytest.mark.parametrize("spec_name", ["taiko", "arbitrum", "optimism"])
+def test_load_repo_campaign_specs(spec_name):
+    # gauges and distributor of the repo specs come from the environment
+    campaign_specs = load_campaign_spec(f"campaigns/{spec_name}.yaml", [f"0x{i:040x}" for i in range(1, 20)], check_addresses=False)
+    assert campaign_specs
+    for campaign_spec in campaign_specs:
+        assert 0 < len(campaign_spec.reward_epochs) <= 52
+
+def test_unset_variable_is_an_error(tmp_path, monkeypatch, campaigns, distributor):
+    monkeypatch.delenv("TEST_PLANNER_GAUGE", raising=False)
+    path = tmp_path / "campaign.yaml"
+    path.write_text(SPEC.format(distributor=distributor.address, gauge=distributor.address))
+
+    with pytest.raises(AssertionError, match="TEST_PLANNER_GAUGE is not set"):
+        load_campaign_spec(path, [c.address for c in campaigns])
+
+    # only the reward epochs are needed
+    campaign_specs = load_campaign_spec(path, [c.address for c in campaigns], check_addresses=False)
+    assert campaign_specs[1].gauge == "${TEST_PLANNER_GAUGE}"
+
+def test_invalid_address_is_an_error(tmp_path, campaigns, test_gauge):
+    path = tmp_path / "campaign.yaml"
+    path.write_text(SPEC.format(distributor="0x1234", gauge=test_gauge.address))
+
+    with pytest.raises(AssertionError, match="distributor of campaign first is no address: 0x1234"):
+        load_campaign_spec(path, [c.address for c in campaigns])
+
+def test_plan_new_campaigns(campaign_specs, campaigns, multicall, capsys):
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns], multicall_address=multicall.address))
+
+    assert [(t.campaign, t.method) for t in plan.transactions] == [
+        (c.address, method) for c in campaigns for method in ("setup", "set_reward_epochs_packed")
+    ]
+    # 1071.42857 * 10**18 is 107142857 units of 10**13, 4 bytes per epoch
+    assert plan.transactions[3].args == (bytes([13, 4]) + (107142857).to_bytes(4, "big") * 3,)
+    assert plan.conflicts == []
+    assert plan.complete == []
+
+    print_plan(plan)
+    assert f"second ({campaigns[1].address}): set_reward_epochs_packed 3 epochs in 14 bytes, sum: {3 * 1071428570000000000000}" in capsys.readouterr().out
+
+def test_apply_plan(bob, campaign_specs, campaigns, multicall):
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns], multicall_address=multicall.address))
+    receipts = apply_plan(plan, bob)
+
+    assert len(receipts) == 6
+    assert not any(receipt.failed for receipt in receipts)
+    # one nonce after the other, nothing was re-sent
+    assert [receipt.transaction.nonce for receipt in receipts] == list(range(receipts[0].transaction.nonce, receipts[0].transaction.nonce + 6))
+
+    for campaign_spec, campaign in zip(campaign_specs, campaigns):
+        assert campaign.receiving_gauge() == campaign_spec.gauge
+        assert campaign.id() == campaign_spec.id
+        assert campaign.name() == campaign_spec.name
+        assert list(campaign.get_all_epochs()) == campaign_spec.reward_epochs
+
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns], multicall_address=multicall.address))
+    assert plan.transactions == []
+    assert plan.complete == [c.address for c in campaigns]
+
+def test_preflight_plan(bob, charlie, diana, campaign_specs, campaigns, multicall, capsys):
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns], multicall_address=multicall.address))
+    first = campaign_specs[0]
+    # the other guard runs setup() between planning and sending
+    campaigns[0].setup(first.distributor, first.gauge, first.min_epoch_duration, first.id, first.name, sender=charlie)
+
+    preflight_plan(plan, bob)
+
+    # set_reward_epochs of the first campaign would pass, it is dropped with the reverting setup
+    assert [(t.campaign, t.method) for t in plan.transactions] == [
+        (c.address, method) for c in campaigns[1:] for method in ("setup", "set_reward_epochs_packed")
+    ]
+    assert plan.failures == [
+        f"first ({campaigns[0].address}): setup reverts: Setup already completed",
+        f"first ({campaigns[0].address}): set_reward_epochs_packed dropped, another transaction of the campaign reverts",
+    ]
+
+    receipts = apply_plan(plan, bob)
+    assert len(receipts) == 4
+    assert not any(receipt.failed for receipt in receipts)
+
+
+def test_preflight_plan_reports_all_failures(diana, campaign_specs, campaigns, multicall, capsys):
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns], multicall_address=multicall.address))
+
+    # diana is no guard, every transaction would revert
+    preflight_plan(plan, diana)
+
+    assert plan.transactions == []
+    assert len(plan.failures) == 6
+    assert all(failure.endswith("reverts: only guards can call this function") for failure in plan.failures)
+    print_plan(plan)
+    assert "0 transactions, 0 conflicts, 6 reverting" in capsys.readouterr().out
+
+def test_plan_after_partial_apply(bob, campaign_specs, campaigns, multicall):
+    # first campaign fully done, second only setup, third only epochs
+    first, second, third = campaign_specs
+    campaigns[0].setup(first.distributor, first.gauge, first.min_epoch_duration, first.id, first.name, sender=bob)
+    campaigns[0].set_reward_epochs(first.reward_epochs, sender=bob)
+    campaigns[1].setup(second.distributor, second.gauge, second.min_epoch_duration, second.id, second.name, sender=bob)
+    campaigns[2].set_reward_epochs(third.reward_epochs, sender=bob)
+
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns], multicall_address=multicall.address))
+
+    assert [(t.campaign, t.method) for t in plan.transactions] == [
+        (campaigns[1].address, "set_reward_epochs_packed"),
+        (campaigns[2].address, "setup"),
+    ]
+    assert plan.complete == [campaigns[0].address]
+
+def test_plan_distributed_campaign_is_complete(bob, campaign_specs, campaigns, multicall):
+    first = campaign_specs[0]
+    campaigns[0].setup(first.distributor, first.gauge, first.min_epoch_duration, first.id, first.name, sender=bob)
+    campaigns[0].set_reward_epochs(first.reward_epochs, sender=bob)
+    campaigns[0].distribute_reward(sender=bob)
+
+    plan = plan_campaigns(campaign_specs[:1], read_campaign_states([campaigns[0].address], multicall_address=multicall.address))
+
+    assert plan.transactions == []
+    assert plan.conflicts == []
+    assert plan.complete == [campaigns[0].address]
+
+def test_plan_conflict(bob, campaign_specs, campaigns, multicall, distributor):
+    first, second = campaign_specs[:2]
+    # setup with the wrong gauge
+    campaigns[0].setup(first.distributor, distributor, first.min_epoch_duration, first.id, first.name, sender=bob)
+    # epochs differ from spec
+    campaigns[1].set_reward_epochs([1], sender=bob)
+
+    plan = plan_campaigns(campaign_specs[:2], read_campaign_states([c.address for c in campaigns[:2]], multicall_address=multicall.address))
+
+    # nothing is sent for campaigns which are configured differently
+    assert plan.transactions == []
+    assert len(plan.conflicts) == 2
+    assert "gauge" in plan.conflicts[0]
+    assert "epochs" in plan.conflicts[1]
+
+def test_plan_reward_schedule(tmp_path, bob, campaigns, distributor, test_gauge, multicall):
+    path = tmp_path / "schedule.yaml"
+    path.write_text(f"""
+distributor: "{distributor.address}"
+reward_token_digits: 18
+min_epoch_duration: 345600
+campaigns:
+  - name: ramp
+    gauge: "{test_gauge.address}"
+    epochs: [0.3, 0.6, 1.2, {{amount: 2.1, repeat: 5}}]
+  - name: decline
+    gauge: "{test_gauge.address}"
+    epochs: [{{start: 0.6, step: -0.02, count: 7}}]
+""")
+    campaign_specs = load_campaign_spec(path, [c.address for c in campaigns])
+    plan = plan_campaigns(campaign_specs, read_campaign_states([c.address for c in campaigns[:2]], multicall_address=multicall.address))
+
+    assert [t.method for t in plan.transactions] == ["setup", "set_reward_schedule"] * 2
+    assert plan.transactions[1].args == ([3 * 10**17, 6 * 10**17, 12 * 10**17], 21 * 10**17, 0, 5)
+
+    apply_plan(plan, bob)
+    for campaign_spec, campaign in zip(campaign_specs, campaigns):
+        assert list(campaign.get_all_epochs()) == campaign_spec.reward_epochs
+
+def test_plan_legacy_campaign(tmp_path, campaigns, distributor, test_gauge, multicall):
+    path = tmp_path / "schedule.yaml"
+    path.write_text(f"""
+distributor: "{distributor.address}"
+reward_token_digits: 18
+min_epoch_duration: 345600
+campaigns:
+  - name: ramp
+    gauge: "{test_gauge.address}"
+    epochs: [0.3, 0.6, 1.2, {{amount: 2.1, repeat: 5}}]
+""")
+    campaign_specs = load_campaign_spec(path, [c.address for c in campaigns])
+    states = read_campaign_states([campaigns[0].address], multicall_address=multicall.address)
+    assert states[campaigns[0].address].version == CAMPAIGN_VERSION == campaigns[0].VERSION()
+
+    # campaigns deployed from 0.9.1 bytecode have no set_reward_schedule()
+    states[campaigns[0].address].version = "0.9.1"
+    plan = plan_campaigns(campaign_specs, states)
+    assert [t.method for t in plan.transactions] == ["setup", "set_reward_epochs"]
+    assert plan.transactions[1].args == (campaign_specs[0].reward_epochs,)
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import scripts._schedule_compiler as schedule_compiler
+from scripts._campaign_spec import load_campaign_spec
+from scripts._schedule_compiler import compile_schedules, compile_schedules_cached, schedule_totals
+
+
+def test_sums_to_budget():
+    epochs, = compile_schedules(["1071.42857"], [[1, 1, 1]], 18)
+    assert sum(epochs) == 1071428570000000000000
+    # two wei of dust, equal remainders, the first two epochs get one each
+    assert epochs == [357142856666666666667, 357142856666666666667, 357142856666666666666]
+
+
+def test_dust_largest_remainder():
+    # 10 * [3, 3, 2] / 8 = [3.75, 3.75, 2.5], the two larger remainders get the dust first
+    assert compile_schedules([10], [[3, 3, 2]], 0) == [[4, 4, 2]]
+    # equal remainders, earlier epochs first
+    assert compile_schedules([11], [[1, 1, 1, 1]], 0) == [[3, 3, 3, 2]]
+    # decimal weights keep their ratio, 7 * [0.5, 1.25, 1.75] / 3.5 = [1, 2.5, 3.5]
+    assert compile_schedules([7], [[0.5, 1.25, 1.75]], 0) == [[1, 3, 3]]
+
+
+def test_many_gauges_one_pass():
+    rng = random.Random(0)
+    budgets = [str(rng.randint(1, 10**6) / 7) for _ in range(2000)]
+    shapes = [[rng.randint(0, 100) + 1 for _ in range(rng.randint(1, 52))] for _ in range(2000)]
+
+    compiled = compile_schedules(budgets, shapes, 18)
+
+    for budget, shape, epochs in zip(budgets, shapes, compiled):
+        assert len(epochs) == len(shape)
+        assert sum(epochs) == schedule_compiler.to_wei(budget, 18)
+
+
+def test_cache(tmp_path, monkeypatch):
+    first = compile_schedules_cached([7500], [[1, 4, 5, 4, 3, 2, 1]], 18, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*args):
+        raise AssertionError("compiled again")
+
+    monkeypatch.setattr(schedule_compiler, "compile_schedules", fail)
+    assert compile_schedules_cached([7500], [[1, 4, 5, 4, 3, 2, 1]], 18, cache_dir=tmp_path) == first
+    with pytest.raises(AssertionError, match="compiled again"):
+        compile_schedules_cached([7501], [[1, 4, 5, 4, 3, 2, 1]], 18, cache_dir=tmp_path)
+
+
+def test_budget_spec(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule_compiler, "SCHEDULE_CACHE", "")
+    spec_file = tmp_path / "budget.yaml"
+    spec_file.write_text(
+        "reward_token_digits: 18\n"
+        "min_epoch_duration: 604800\n"
+        "campaigns:\n"
+        "  - name: shaped\n"
+        "    gauge: '0x0000000000000000000000000000000000000001'\n"
+        "    budget: 1000\n"
+        "    shape: [1, {amount: 2, repeat: 2}]\n"
+        "  - name: explicit\n"
+        "    gauge: '0x0000000000000000000000000000000000000002'\n"
+        "    epochs: [300, 700]\n"
+    )
+    shaped, explicit = load_campaign_spec(spec_file, [f"0x{i:040x}" for i in range(1, 3)])
+
+    assert shaped.reward_epochs == [200 * 10**18, 400 * 10**18, 400 * 10**18]
+    assert shaped.epochs == [200, 400, 400]
+    assert explicit.reward_epochs == [300 * 10**18, 700 * 10**18]
+
+    totals = schedule_totals("budget", [shaped, explicit])
+    assert totals.total == 2000 * 10**18
+    assert totals.distribute_events == 5
+    assert totals.runtime == 3 * 604800
+
+
+def test_optimism_amm_budgets(monkeypatch):
+    monkeypatch.setattr(schedule_compiler, "SCHEDULE_CACHE", "")
+    campaign_specs = load_campaign_spec("campaigns/optimism.yaml", [f"0x{i:040x}" for i in range(1, 10)], check_addresses=False)
+
+    amm = campaign_specs[5:]
+    # the rounded per-epoch amounts these replace missed the budgets by up to 0.0002 tokens
+    assert [sum(c.reward_epochs) for c in amm] == [budget * 10**18 for budget in (30000, 60000, 20000, 10000)]
+    assert all(len(c.reward_epochs) == 28 for c in amm)
@@ -0,0 +1,12 @@
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def campaign(project, alice, bob, crvusd_token):
+    # bob is the only guard
+    return alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, ZERO_ADDRESS)
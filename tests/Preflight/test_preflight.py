@@ -0,0 +1,67 @@
+from eth_abi import encode
+
+from scripts._preflight import (
+    ERROR_SELECTOR,
+    PANIC_SELECTOR,
+    decode_revert_reason,
+    encode_call,
+    preflight,
+    revert_reason,
+    simulate_calls,
+)
+
+DAY = 86400
+
+
+def test_decode_revert_reason():
+    assert decode_revert_reason(ERROR_SELECTOR + encode(["string"], ["Too early"])) == "Too early"
+    assert decode_revert_reason(PANIC_SELECTOR + encode(["uint256"], [0x11])) == "panic 0x11"
+    assert decode_revert_reason(b"") == "reverted without reason"
+    assert decode_revert_reason("0x12345678") == "revert data 0x12345678"
+
+    # JSON-RPC error objects carry the data, eth-tester only the message
+    data = "0x" + (ERROR_SELECTOR + encode(["string"], ["Setup not completed"])).hex()
+    assert revert_reason({"code": 3, "message": "execution reverted", "data": data}) == "Setup not completed"
+    assert revert_reason(Exception("execution reverted: Too early")) == "Too early"
+
+
+def test_preflight(bob, charlie, campaign, crvusd_token):
+    transactions = [
+        (campaign.setup, (bob, bob, 4 * DAY, 1, "campaign")),
+        (campaign.setup, (bob, bob, DAY, 1, "campaign")),
+        (campaign.set_reward_epochs, ([10**18],)),
+        (campaign.execute, ()),
+    ]
+    passing, failures = preflight(transactions, bob)
+
+    assert passing == [transactions[0], transactions[2]]
+    assert [(f.index, f.method, f.reason) for f in failures] == [
+        (1, "setup", "epoch duration must be between 3 days and a year"),
+        (3, "execute", "Setup not completed"),
+    ]
+    assert failures[0].to == campaign.address
+    assert failures[0].args == (bob, bob, DAY, 1, "campaign")
+
+    # simulation sends nothing
+    assert not campaign.is_setup_complete()
+
+    _, failures = preflight(transactions[:1], charlie)
+    assert failures[0].reason == "only guards can call this function"
+
+
+def test_simulate_calls_batch(networks, bob, campaign, monkeypatch):
+    # a node with batch support answers all calls in one request
+    web3 = networks.provider.web3
+    calls = [encode_call(campaign.set_reward_epochs, ([1],), bob), encode_call(campaign.execute, (), bob)]
+    data = "0x" + (ERROR_SELECTOR + encode(["string"], ["Setup not completed"])).hex()
+    batches = []
+
+    def make_batch_request(requests):
+        batches.append(requests)
+        return [{"jsonrpc": "2.0", "id": 0, "result": "0x"}, {"jsonrpc": "2.0", "id": 1, "error": {"code": 3, "message": "execution reverted", "data": data}}]
+
+    monkeypatch.setattr(web3.provider, "make_batch_request", make_batch_request, raising=False)
+
+    assert simulate_calls(web3, calls) == [None, "Setup not completed"]
+    assert len(batches) == 1
+    assert [params[1] for _, params in batches[0]] == ["pending", "pending"]
@@ -0,0 +1,26 @@
+import ape
+import pytest
+
+@pytest.fixture(scope="module")
+def reward_token(project, alice, bob):
+    reward_token = alice.deploy(project.TestToken)
+    reward_token.mint(bob, 10 ** 19, sender=alice)
+    return reward_token
+
+@pytest.fixture(scope="module")
+def crvusd_token(project, alice):
+    return alice.deploy(project.TestToken)
+
+@pytest.fixture(scope="module")
+def test_gauge(project, alice, diana, reward_token):
+    # diana is recovery address
+    return alice.deploy(project.TestGauge, reward_token, diana)
+
+@pytest.fixture(scope="module")
+def proxy(project, alice):
+    return alice.deploy(project.Proxy)
+
+@pytest.fixture(scope="module")
+def single_campaign(project, alice, bob, charlie, crvusd_token, proxy):
+    # implementation of all proxies, only proxy can initialize them
+    return alice.deploy(project.SingleCampaign, [bob, charlie], crvusd_token, 10**17, proxy)
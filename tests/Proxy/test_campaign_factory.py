@@ -0,0 +1,154 @@
+import ape
+import pytest
+
+from scripts._addresses import campaign_proxy_addresses, campaign_salt
+from scripts._campaign_spec import load_campaign_spec
+from scripts._factory import deploy_campaigns_transactions, guards_only_params, send_deploy_campaigns
+from scripts._pipeline import TransactionPipeline
+from scripts._preflight import preflight
+
+DAY = 86400
+EMPTY = "0x0000000000000000000000000000000000000000"
+
+
+def campaign_params(label, i, distributor, gauge, epochs):
+    return (campaign_salt(label, i), distributor, gauge, 4 * DAY, i, f"campaign {i}", epochs)
+
+
+def test_implementation_can_not_be_initialized(bob, single_campaign, proxy, crvusd_token):
+    assert single_campaign.is_initialized()
+    assert single_campaign.FACTORY() == proxy
+
+    with ape.reverts("only the factory can initialize"):
+        single_campaign.initialize([bob], crvusd_token, 0, EMPTY, EMPTY, 0, 0, "", [], sender=bob)
+
+def test_third_party_can_not_initialize_proxy(project, alice, bob, charlie, single_campaign, proxy, crvusd_token, reward_token, test_gauge, diana):
+    tx = proxy.deploy_proxy(single_campaign, sender=bob)
+    campaign = project.SingleCampaign.at(proxy.NewProxy.from_receipt(tx)[0].proxy)
+    assert not campaign.is_initialized()
+    assert campaign.get_all_guards() == []
+    # a clone inherits the factory of the implementation
+    assert campaign.FACTORY() == proxy
+
+    # a clone already listed as guard can not be taken over to drain the Distributor
+    distributor = alice.deploy(project.Distributor, [bob, campaign], reward_token, [test_gauge], diana)
+    with ape.reverts("only the factory can initialize"):
+        campaign.initialize([charlie], crvusd_token, 0, distributor, test_gauge, 4 * DAY, 0, "hijack", [10**18], sender=charlie)
+
+    assert not campaign.is_initialized()
+    assert campaign.get_all_guards() == []
+
+def test_implementation_of_another_factory(project, alice, bob, crvusd_token):
+    # the factory of the implementation is the only one which can initialize its clones
+    other = alice.deploy(project.Proxy)
+    implementation = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, alice)
+
+    with ape.reverts():
+        other.deploy_campaigns(implementation, [bob], crvusd_token, 0, [(campaign_salt("other", 0), EMPTY, EMPTY, 0, 0, "", [])], sender=alice)
+
+def test_deploy_campaigns(project, alice, bob, charlie, diana, single_campaign, proxy, crvusd_token, reward_token, test_gauge):
+    n = 3
+    epochs = [10**18, 2 * 10**18]
+    campaigns = campaign_proxy_addresses(proxy.address, single_campaign.address, alice.address, "factory", n)
+    # Distributor first, the campaigns do not exist yet
+    distributor = alice.deploy(project.Distributor, [bob] + campaigns, reward_token, [test_gauge], diana)
+    reward_token.transfer(distributor, 3 * n * 10**18, sender=bob)
+
+    tx = proxy.deploy_campaigns(
+        single_campaign,
+        [bob, charlie],
+        crvusd_token,
+        10**17,
+        [campaign_params("factory", i, distributor, test_gauge, epochs) for i in range(n)],
+        sender=alice,
+    )
+
+    assert proxy.MultipleNewProxy.from_receipt(tx)[0].proxies == campaigns
+    for i, address in enumerate(campaigns):
+        campaign = project.SingleCampaign.at(address)
+        assert campaign.get_all_guards() == [bob, charlie]
+        assert campaign.crvusd_address() == crvusd_token
+        assert campaign.distributor_address() == distributor
+        assert campaign.receiving_gauge() == test_gauge
+        assert campaign.min_epoch_duration() == 4 * DAY
+        assert campaign.id() == i
+        assert campaign.name() == f"campaign {i}"
+        assert campaign.get_all_epochs() == epochs
+
+        campaign.execute(sender=charlie)
+        assert campaign.get_all_epochs() == epochs[1:]
+
+    assert reward_token.balanceOf(test_gauge) == n * epochs[0]
+
+def test_deploy_campaigns_without_setup(project, alice, bob, single_campaign, proxy, crvusd_token, test_gauge):
+    tx = proxy.deploy_campaigns(single_campaign, [bob], crvusd_token, 0, [guards_only_params(campaign_salt("later", 0))], sender=alice)
+
+    campaign = project.SingleCampaign.at(proxy.MultipleNewProxy.from_receipt(tx)[0].proxies[0])
+    assert campaign.is_initialized()
+    assert campaign.get_all_guards() == [bob]
+    assert campaign.min_epoch_duration() == 7 * DAY
+    # setup and epochs are left to the guards
+    assert not campaign.is_setup_complete()
+    assert not campaign.is_reward_epochs_set()
+    campaign.setup(alice, test_gauge, 4 * DAY, 0, "later", sender=bob)
+    campaign.set_reward_epochs([10**18], sender=bob)
+
+    with ape.reverts("only the factory can initialize"):
+        campaign.initialize([alice], crvusd_token, 0, EMPTY, EMPTY, 0, 0, "", [], sender=alice)
+
+def test_deploy_campaigns_invalid_params(alice, bob, single_campaign, proxy, crvusd_token, test_gauge):
+    with ape.reverts("epoch duration must be between 3 days and a year"):
+        proxy.deploy_campaigns(single_campaign, [bob], crvusd_token, 0, [(campaign_salt("invalid", 0), alice.address, test_gauge, DAY, 0, "", [10**18])], sender=alice)
+
+SPEC = """
+reward_token_digits: 18
+min_epoch_duration: 345600
+
+campaigns:
+  - name: first
+    gauge: "{gauge}"
+    epochs: [1, 2, 3]
+  - name: second
+    gauge: "{gauge}"
+    epochs: [{{amount: 4, repeat: 4}}]
+  - name: third
+    gauge: "{gauge}"
+    epochs: [5]
+"""
+
+def test_send_deploy_campaigns(project, tmp_path, alice, bob, diana, single_campaign, proxy, crvusd_token, reward_token, test_gauge):
+    spec_file = tmp_path / "campaign.yaml"
+    spec_file.write_text(SPEC.format(gauge=test_gauge.address))
+    proxy_addresses = campaign_proxy_addresses(proxy.address, single_campaign.address, alice.address, "spec", 27)
+    campaign_specs = load_campaign_spec(spec_file, proxy_addresses)
+
+    pipeline = TransactionPipeline(alice)
+    distributor = pipeline.deploy(project.Distributor, [bob] + [c.address for c in campaign_specs], reward_token, [test_gauge], diana, gas_limit=2000000).contract_address
+    for campaign_spec in campaign_specs:
+        campaign_spec.distributor = distributor
+    # two campaigns per transaction for the test
+    send_deploy_campaigns(pipeline, proxy, single_campaign, [bob], crvusd_token, 10**17, campaign_specs, "spec", proxy_addresses, campaigns_per_transaction=2)
+    receipts = pipeline.wait()
+
+    assert len(receipts) == 3
+    assert not any(receipt.failed for receipt in receipts)
+    for campaign_spec in campaign_specs:
+        campaign = project.SingleCampaign.at(campaign_spec.address)
+        assert campaign.name() == campaign_spec.name
+        assert campaign.distributor_address() == distributor
+        assert campaign.get_all_epochs() == campaign_spec.reward_epochs
+
+def test_deploy_campaigns_preflight(project, tmp_path, alice, bob, proxy, crvusd_token, test_gauge):
+    # an implementation of another factory reverts in preflight, nothing is sent
+    implementation = alice.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, alice)
+    spec_file = tmp_path / "campaign.yaml"
+    spec_file.write_text(SPEC.format(gauge=test_gauge.address))
+    proxy_addresses = campaign_proxy_addresses(proxy.address, implementation.address, alice.address, "spec", 27)
+    campaign_specs = load_campaign_spec(spec_file, proxy_addresses, distributor=bob.address)
+
+    transactions = deploy_campaigns_transactions(proxy, implementation, [bob], crvusd_token, 10**17, campaign_specs, "spec", proxy_addresses, campaigns_per_transaction=2)
+    _, failures = preflight(transactions, alice)
+
+    assert len(transactions) == 2
+    assert [failure.index for failure in failures] == [0, 1]
+    assert all(failure.method == "deploy_campaigns" for failure in failures)
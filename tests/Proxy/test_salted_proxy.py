@@ -0,0 +1,85 @@
+import ape
+import pytest
+
+from ape.utils import ZERO_ADDRESS
+
+from scripts._addresses import campaign_proxy_addresses, campaign_salt, create_address, proxy_address
+from scripts._pipeline import TransactionPipeline
+
+
+def test_deploy_proxy_salted(bob, single_campaign, proxy):
+    salt = campaign_salt("test", 0)
+    expected = proxy_address(proxy.address, single_campaign.address, salt, bob.address)
+
+    tx = proxy.deploy_proxy_salted(single_campaign, salt, sender=bob)
+
+    assert len(ape.chain.provider.get_code(expected)) > 0
+    assert proxy.NewProxy.from_receipt(tx)[0].proxy == expected
+
+def test_deploy_proxy_salted_twice(bob, single_campaign, proxy):
+    salt = campaign_salt("test", 1)
+    proxy.deploy_proxy_salted(single_campaign, salt, sender=bob)
+
+    with ape.reverts():
+        proxy.deploy_proxy_salted(single_campaign, salt, sender=bob)
+
+def test_proxy_address_depends_on_all_inputs(alice, bob, single_campaign, proxy, crvusd_token):
+    salt = campaign_salt("test", 0)
+    addresses = {
+        proxy_address(proxy.address, single_campaign.address, salt, bob.address),
+        proxy_address(crvusd_token.address, single_campaign.address, salt, bob.address),
+        proxy_address(proxy.address, crvusd_token.address, salt, bob.address),
+        proxy_address(proxy.address, single_campaign.address, campaign_salt("test", 1), bob.address),
+        proxy_address(proxy.address, single_campaign.address, campaign_salt("other", 0), bob.address),
+        proxy_address(proxy.address, single_campaign.address, salt, alice.address),
+    }
+    assert len(addresses) == 6
+
+def test_salt_is_bound_to_caller(alice, bob, single_campaign, proxy):
+    salt = campaign_salt("squat", 0)
+    # somebody else uses the same salt first
+    proxy.deploy_proxy_salted(single_campaign, salt, sender=alice)
+
+    tx = proxy.deploy_proxy_salted(single_campaign, salt, sender=bob)
+
+    assert proxy.NewProxy.from_receipt(tx)[0].proxy == proxy_address(proxy.address, single_campaign.address, salt, bob.address)
+
+def test_deploy_multiple_proxies_salted(bob, single_campaign, proxy):
+    n = 5
+    salts = [campaign_salt("multiple", i) for i in range(n)]
+
+    tx = proxy.deploy_multiple_proxies_salted(single_campaign, salts, sender=bob)
+
+    proxies = proxy.MultipleNewProxy.from_receipt(tx)[0].proxies
+    assert proxies == campaign_proxy_addresses(proxy.address, single_campaign.address, bob.address, "multiple", n)
+
+def test_distributor_before_campaigns(project, alice, bob, charlie, crvusd_token, reward_token, test_gauge, diana):
+    n = 5
+    pipeline = TransactionPipeline(alice)
+    start_nonce = alice.nonce
+
+    # every address is known before anything is mined, as in deploy-salted-campaigns
+    proxy = pipeline.deploy(project.Proxy, gas_limit=1000000).contract_address
+    single_campaign = pipeline.deploy(project.SingleCampaign, [bob], crvusd_token, 10**17, proxy, gas_limit=2500000).contract_address
+    campaigns = campaign_proxy_addresses(proxy, single_campaign, alice.address, "period", n)
+    distributor = pipeline.deploy(project.Distributor, [bob] + campaigns, reward_token, [test_gauge], diana, gas_limit=2000000).contract_address
+    pipeline.wait()
+
+    factory = ape.contracts.ContractInstance(proxy, project.Proxy.contract_type)
+    params = [(campaign_salt("period", i), ZERO_ADDRESS, ZERO_ADDRESS, 0, 0, "", []) for i in range(n)]
+    pipeline.transact(factory.deploy_campaigns, single_campaign, [bob], crvusd_token, 10**17, params)
+
+    receipts = pipeline.wait()
+
+    assert not any(receipt.failed for receipt in receipts)
+    assert single_campaign == create_address(alice.address, start_nonce + 1)
+    assert project.Distributor.at(distributor).guards(n) == campaigns[-1]
+    for address in campaigns:
+        # initialized with the guards when created, nobody else can take the guard slot
+        campaign = project.SingleCampaign.at(address)
+        assert campaign.get_all_guards() == [bob]
+        with ape.reverts("only the factory can initialize"):
+            campaign.initialize([charlie], crvusd_token, 0, distributor, test_gauge, 4 * 86400, 0, "", [10**18], sender=charlie)
+
+    # the guards finish the campaigns
+    project.SingleCampaign.at(campaigns[0]).setup(distributor, test_gauge, 4 * 86400, 0, "period 0", sender=bob)
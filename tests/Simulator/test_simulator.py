@@ -0,0 +1,96 @@
+import ape
+import numpy as np
+import pytest
+
+from scripts._simulator import (
+    DAY,
+    DISTRIBUTION_BUFFER,
+    KEEPER_SCENARIOS,
+    WEEK,
+    distribution_times,
+    gauge_stream,
+    pad_epochs,
+    simulate,
+    simulate_scenarios,
+)
+
+
+def test_distribution_times():
+    counts = np.array([3, 2])
+    latency = np.array([[10, 60, 60], [0, 3 * DISTRIBUTION_BUFFER, 60]])
+
+    # as soon as allowed, the second campaign is late by three buffers
+    times = distribution_times(counts, 4 * DAY, latency, start_time=1000)
+    assert times[0].tolist() == [1010, 1010 + 4 * DAY - DISTRIBUTION_BUFFER + 60, 1010 + 2 * (4 * DAY - DISTRIBUTION_BUFFER + 60)]
+    # epochs after the count repeat the last distribution
+    assert times[1].tolist() == [1000, 1000 + 4 * DAY + 2 * DISTRIBUTION_BUFFER, 1000 + 4 * DAY + 2 * DISTRIBUTION_BUFFER]
+
+    # a keeper aiming before the buffer is held back by the contract
+    early = distribution_times(counts, 4 * DAY, np.zeros((2, 3)), keeper_target=-DAY)
+    assert early[0, 1] == 4 * DAY - DISTRIBUTION_BUFFER
+
+
+def test_gauge_stream_rolls_over_leftover():
+    amounts, counts = pad_epochs([[WEEK * 10, WEEK * 4]])
+    times = np.array([[0, WEEK // 2]])
+
+    rates, period_finish = gauge_stream(times, amounts, counts)
+
+    # half of the first week is left and streamed again with the second deposit
+    assert rates[0].tolist() == [10, 4 + 5]
+    assert period_finish[0].tolist() == [WEEK, WEEK // 2 + WEEK]
+
+
+def test_gap_and_conservation():
+    amounts, counts = pad_epochs([[700, 700, 700], [100, 200]])
+    # the first campaign is a day late for its second epoch, weekly epochs leave no overlap
+    latency = np.zeros((2, 3))
+    latency[0, 1] = DAY
+
+    result = simulate(amounts, counts, WEEK, latency, keeper_target=0, days=30)
+
+    assert result.zero_rate_seconds.tolist() == [DAY, 0]
+    assert result.end_drift.tolist() == [DAY, 0]
+    assert result.daily.sum(axis=-1).tolist() == pytest.approx([2100, 300])
+    # one day without rewards, the last day of the schedule is streamed after the nominal end
+    assert result.streamed_by_nominal_end[0] == pytest.approx(2000)
+    assert np.sum(result.daily[0, :21] == 0) == 1
+
+
+def test_simulate_scenarios():
+    amounts, counts = pad_epochs([[100] * 52, [300, 600, 1200]])
+    summary = simulate_scenarios(amounts, counts, np.array([WEEK, 302400]), 50, np.random.default_rng(0))
+
+    assert summary["end_drift_p50"].shape == (len(KEEPER_SCENARIOS), 50)
+    # the punctual keeper uses the buffer every epoch and finishes early
+    assert np.all(summary["end_drift_max"][0] < 0)
+    assert np.all(summary["streamed_by_nominal_end"] <= 1 + 1e-9)
+
+
+@pytest.mark.parametrize("keeper_target", [-DISTRIBUTION_BUFFER, 0, -2 * DISTRIBUTION_BUFFER])
+def test_matches_contract(keeper_target, bob, campaign, distributor, test_gauge, reward_token, chain):
+    reward_epochs = [10**18 * (i + 1) for i in range(6)]
+    min_epoch_duration = 4 * DAY
+    campaign.setup(distributor, test_gauge, min_epoch_duration, 0, "simulated", sender=bob)
+    campaign.set_reward_epochs(reward_epochs, sender=bob)
+
+    rng = np.random.default_rng(-keeper_target)
+    latency = rng.integers(0, 6 * 60 * 60, (1, len(reward_epochs)))
+    amounts, counts = pad_epochs([reward_epochs])
+    start_time = chain.pending_timestamp + 100
+    result = simulate(amounts, counts, min_epoch_duration, latency, start_time=start_time, keeper_target=keeper_target)
+
+    timestamps = []
+    for k, t in enumerate(result.times[0]):
+        if k > 0:
+            # one second earlier than the simulator allows reverts
+            chain.pending_timestamp = timestamps[-1] + min_epoch_duration - DISTRIBUTION_BUFFER - 1
+            with ape.reverts("Minimum time between distributions not met"):
+                campaign.distribute_reward(sender=bob)
+
+        chain.pending_timestamp = int(t)
+        receipt = campaign.distribute_reward(sender=bob)
+        timestamps.append(receipt.timestamp)
+
+    assert timestamps == result.times[0].tolist()
+    assert reward_token.balanceOf(test_gauge) == result.total_distributed[0]
@@ -1,7 +1,12 @@
 import ape
 import pytest
 
-@pytest.fixture(scope="module")
+from ape.utils import ZERO_ADDRESS
+
+# deployed once per session, ape snapshots the chain after the fixtures and reverts to it after
+# every test, each test starts from the same deployed and funded state without redeploying
+
+@pytest.fixture(scope="session")
 def reward_token(project, alice, bob):
     reward_token = alice.deploy(project.TestToken)
     # mint token to bob
@@ -12,7 +17,7 @@ def reward_token(project, alice, bob):
     print(balance)
     return reward_token
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def crvusd_token(project, alice, charlie):
     crvusd_token = alice.deploy(project.TestToken)
     # mint token to charlie
@@ -22,25 +27,25 @@ def crvusd_token(project, alice, charlie):
     print(balance)
     return crvusd_token
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def test_gauge(project, alice, charlie, diana, reward_token):
     # bob guard address
     # diana is recovery address
     gauge = alice.deploy(project.TestGauge, reward_token, diana)
     return gauge
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def single_campaign(project, alice, bob, charlie, crvusd_token):
     # Deploy with bob and charlie as guards
     # Add crvUSD token address and execute_reward_amount parameters 
     execute_reward_amount = 10**18  # 1 token as reward
     # Send crvUSD tokens to contract for execute rewards
 
-    contract = alice.deploy(project.SingleCampaign, [bob, charlie], crvusd_token, execute_reward_amount)
+    contract = alice.deploy(project.SingleCampaign, [bob, charlie], crvusd_token, execute_reward_amount, ZERO_ADDRESS)
 
     return contract
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def distributor(project, alice, bob, charlie, diana, reward_token, test_gauge, single_campaign):
     # bob guard address
     # diana is recovery address
@@ -54,7 +59,7 @@ def distributor(project, alice, bob, charlie, diana, reward_token, test_gauge, s
  
     return distributor_contract
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def proxy(project, alice):
     # Deploy proxy contract
     proxy_contract = alice.deploy(project.Proxy)
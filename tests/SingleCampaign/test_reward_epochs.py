@@ -0,0 +1,45 @@
+import ape
+import pytest
+
+DAY = 86400
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 52])
+def test_get_all_epochs_order(charlie, single_campaign, n):
+    epochs = [(i + 1) * 10**18 for i in range(n)]
+    single_campaign.set_reward_epochs(epochs, sender=charlie)
+
+    assert single_campaign.get_all_epochs() == epochs
+    assert single_campaign.reward_epoch_count() == n
+    assert single_campaign.reward_epoch_cursor() == 0
+
+
+def test_cursor_moves_with_distributions(bob, charlie, distributor, single_campaign, reward_token, test_gauge, chain):
+    epochs = [5 * 10**17, 10**18, 3 * 10**17, 7 * 10**17, 2 * 10**17]
+    min_epoch_duration = 3 * DAY
+
+    single_campaign.set_reward_epochs(epochs, sender=charlie)
+    single_campaign.setup(distributor.address, test_gauge.address, min_epoch_duration, 1, "test", sender=charlie)
+
+    for i, amount in enumerate(epochs):
+        assert single_campaign.get_next_epoch_info()[0] == amount
+        single_campaign.distribute_reward(sender=bob)
+
+        assert single_campaign.reward_epoch_cursor() == i + 1
+        assert single_campaign.get_all_epochs() == epochs[i + 1:]
+        assert single_campaign.get_number_of_remaining_epochs() == len(epochs) - i - 1
+        assert reward_token.balanceOf(test_gauge) == sum(epochs[:i + 1])
+
+        chain.pending_timestamp = chain.pending_timestamp + min_epoch_duration
+        chain.mine()
+
+    with ape.reverts("No remaining reward epochs"):
+        single_campaign.distribute_reward(sender=bob)
+
+
+def test_set_reward_epochs_revert_amount_too_large(charlie, single_campaign):
+    with ape.reverts("Reward amount exceeds uint128"):
+        single_campaign.set_reward_epochs([10**18, 2**128], sender=charlie)
+
+    single_campaign.set_reward_epochs([10**18, 2**128 - 1], sender=charlie)
+    assert single_campaign.get_all_epochs() == [10**18, 2**128 - 1]
@@ -0,0 +1,69 @@
+import ape
+import pytest
+
+from scripts._schedule import decode_packed_reward_epochs, encode_packed_reward_epochs
+
+DAY = 86400
+TOKEN = 10**18
+
+
+@pytest.mark.parametrize("reward_epochs", [
+    [300 * TOKEN, 600 * TOKEN, 1200 * TOKEN] + [2100 * TOKEN] * 5,
+    [1071428570000000000000] * 28,
+    [k * 10**15 + 1 for k in range(52)],
+    [5],
+    [2**128 - 1, 0],
+])
+def test_packed_matches_set_reward_epochs(charlie, single_campaign, reward_epochs):
+    payload = encode_packed_reward_epochs(reward_epochs)
+    assert decode_packed_reward_epochs(payload) == reward_epochs
+
+    receipt = single_campaign.set_reward_epochs_packed(payload, sender=charlie)
+
+    assert single_campaign.get_all_epochs() == reward_epochs
+    assert single_campaign.get_number_of_remaining_epochs() == len(reward_epochs)
+    # same event as set_reward_epochs(), indexer and planner see the amounts
+    assert receipt.events[0].reward_epochs == reward_epochs
+
+
+def test_encoding():
+    assert encode_packed_reward_epochs([300 * TOKEN, 600 * TOKEN, 1200 * TOKEN]) == bytes.fromhex("1401" "03" "06" "0c")
+    # 1071.42857 tokens is 107142857 units of 10**13
+    assert encode_packed_reward_epochs([1071428570000000000000]).hex() == "0d04" + (107142857).to_bytes(4, "big").hex()
+
+
+def test_distribute_packed(bob, charlie, distributor, single_campaign, reward_token, test_gauge, chain):
+    reward_epochs = [10**17, 3 * 10**17, 10**18]
+    single_campaign.set_reward_epochs_packed(encode_packed_reward_epochs(reward_epochs), sender=charlie)
+    single_campaign.setup(distributor.address, test_gauge.address, 3 * DAY, 1, "test", sender=charlie)
+
+    for i, amount in enumerate(reward_epochs):
+        single_campaign.distribute_reward(sender=bob)
+        assert reward_token.balanceOf(test_gauge) == sum(reward_epochs[:i + 1])
+        chain.pending_timestamp = chain.pending_timestamp + 3 * DAY
+        chain.mine()
+
+
+@pytest.mark.parametrize("payload, message", [
+    (bytes.fromhex("0001"), "Must set between 1 and 52 epochs"),
+    (bytes.fromhex("0000") + b"\x01" * 4, "Epoch width must be between 1 and 16 bytes"),
+    (bytes.fromhex("0011") + b"\x01" * 17, "Epoch width must be between 1 and 16 bytes"),
+    (bytes.fromhex("0002") + b"\x01" * 5, "Payload length does not match epoch width"),
+    (bytes.fromhex("0001") + b"\x01" * 53, "Must set between 1 and 52 epochs"),
+    (bytes.fromhex("2701") + b"\x01", "Unit exponent exceeds 38"),
+    (bytes.fromhex("0110") + b"\xff" * 16, "Reward amount exceeds uint128"),
+])
+def test_packed_reverts(charlie, single_campaign, payload, message):
+    with ape.reverts(message):
+        single_campaign.set_reward_epochs_packed(payload, sender=charlie)
+
+
+def test_packed_revert_not_guard(alice, single_campaign):
+    with ape.reverts("only guards can call this function"):
+        single_campaign.set_reward_epochs_packed(encode_packed_reward_epochs([TOKEN]), sender=alice)
+
+
+def test_packed_only_once(charlie, single_campaign):
+    single_campaign.set_reward_epochs([TOKEN], sender=charlie)
+    with ape.reverts("Reward epochs can only be set once"):
+        single_campaign.set_reward_epochs_packed(encode_packed_reward_epochs([TOKEN]), sender=charlie)
@@ -0,0 +1,79 @@
+import ape
+import pytest
+
+DAY = 86400
+
+
+@pytest.mark.parametrize("ramp, start, step, count", [
+    ([300, 600, 1200], 2100, 0, 5),
+    ([], 1071, 0, 28),
+    ([], 6000, -200, 7),
+    ([250, 1000], 1250, -250, 5),
+    ([1, 2, 3], 0, 0, 0),
+    ([], 10, 5, 52),
+])
+def test_get_all_epochs_schedule(charlie, single_campaign, ramp, start, step, count):
+    single_campaign.set_reward_schedule(ramp, start, step, count, sender=charlie)
+
+    assert single_campaign.get_all_epochs() == ramp + [start + step * k for k in range(count)]
+    assert single_campaign.get_number_of_remaining_epochs() == len(ramp) + count
+    assert single_campaign.is_reward_epochs_set()
+
+
+def test_distribute_schedule(bob, charlie, distributor, single_campaign, reward_token, test_gauge, chain):
+    ramp = [10**17, 3 * 10**17]
+    start, step, count = 10**18, -10**17, 4
+    epochs = ramp + [start + step * k for k in range(count)]
+    min_epoch_duration = 3 * DAY
+
+    single_campaign.set_reward_schedule(ramp, start, step, count, sender=charlie)
+    single_campaign.setup(distributor.address, test_gauge.address, min_epoch_duration, 1, "test", sender=charlie)
+
+    for i, amount in enumerate(epochs):
+        assert single_campaign.get_next_epoch_info()[0] == amount
+        single_campaign.distribute_reward(sender=bob)
+
+        assert single_campaign.get_all_epochs() == epochs[i + 1:]
+        assert reward_token.balanceOf(test_gauge) == sum(epochs[:i + 1])
+
+        chain.pending_timestamp = chain.pending_timestamp + min_epoch_duration
+        chain.mine()
+
+    with ape.reverts("No remaining reward epochs"):
+        single_campaign.distribute_reward(sender=bob)
+
+
+def test_set_reward_schedule_revert_not_guard(alice, single_campaign):
+    with ape.reverts("only guards can call this function"):
+        single_campaign.set_reward_schedule([], 10**18, 0, 4, sender=alice)
+
+
+def test_set_reward_schedule_revert_already_set(charlie, single_campaign):
+    single_campaign.set_reward_epochs([10**18], sender=charlie)
+
+    with ape.reverts("Reward epochs can only be set once"):
+        single_campaign.set_reward_schedule([], 10**18, 0, 4, sender=charlie)
+
+
+def test_set_reward_schedule_revert_invalid_length(charlie, single_campaign):
+    with ape.reverts("Must set between 1 and 52 epochs"):
+        single_campaign.set_reward_schedule([], 10**18, 0, 0, sender=charlie)
+
+    with ape.reverts("Must set between 1 and 52 epochs"):
+        single_campaign.set_reward_schedule([1, 2, 3], 10**18, 0, 50, sender=charlie)
+
+
+def test_set_reward_schedule_revert_amount(charlie, single_campaign):
+    # the last epoch would be negative
+    with ape.reverts("Reward amount exceeds uint128"):
+        single_campaign.set_reward_schedule([], 1000, -200, 7, sender=charlie)
+
+    with ape.reverts("Reward amount exceeds uint128"):
+        single_campaign.set_reward_schedule([], 2**128 - 10, 1, 11, sender=charlie)
+
+    with ape.reverts("Step exceeds int128"):
+        single_campaign.set_reward_schedule([], 0, 2**127, 1, sender=charlie)
+
+    # the decline ends exactly at 0
+    single_campaign.set_reward_schedule([], 1200, -200, 7, sender=charlie)
+    assert single_campaign.get_all_epochs()[-1] == 0
@@ -0,0 +1,138 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from scripts._status import format_status, load_fleet, status_json, to_status
+
+DAY = 86400
+
+
+@pytest.fixture
+def fleet(bob, charlie, campaigns, distributor, test_gauge, crvusd_token):
+    # first: running, second: exhausted, third: not setup
+    running, exhausted, _ = campaigns
+    crvusd_token.transfer(running, 10**18, sender=charlie)
+
+    running.setup(distributor, test_gauge, 4 * DAY, 1, "running", sender=bob)
+    running.set_reward_epochs([10**18, 2 * 10**18, 3 * 10**18], sender=bob)
+    running.distribute_reward(sender=bob)
+
+    exhausted.setup(distributor, test_gauge, 4 * DAY, 2, "exhausted", sender=bob)
+    exhausted.set_reward_epochs([10**18], sender=bob)
+    exhausted.distribute_reward(sender=bob)
+
+    return campaigns
+
+
+def test_discover_campaigns(reader, lens, fleet, distributor, chain):
+    # eth-tester has no state overrides, the lens has to be deployed
+    reader.lens_address = lens.address
+    # bob has no code, the token is skipped by the lens read
+    campaigns = reader.discover_campaigns([distributor.address], chain.blocks.head.number)
+    assert campaigns[-3:] == [c.address for c in fleet]
+
+    states = reader.read_states(campaigns, chain.blocks.head.number)
+    assert [s.campaign for s in states] == [c.address for c in fleet]
+
+
+def test_read_status(reader, lens, fleet, distributor, reward_token, chain):
+    reader.lens_address = lens.address
+    states = reader.read_states([c.address for c in fleet], chain.blocks.head.number)
+    running, exhausted, fresh = to_status("ethereum:local", states)
+
+    assert running.state == "waiting"
+    assert running.remaining_epochs == 2
+    assert running.remaining_amount == 5 * 10**18
+    assert running.next_reward_amount == 2 * 10**18
+    assert 0 < running.seconds_until_allowed <= 4 * DAY - 2 * 60 * 60
+    assert running.incentive_balance == 10**18
+    assert running.distributor == distributor.address
+    # the exhausted campaign shares the Distributor and needs nothing more
+    assert running.coverage == reward_token.balanceOf(distributor) / (5 * 10**18)
+
+    assert exhausted.state == "exhausted"
+    assert exhausted.seconds_until_allowed is None
+    assert fresh.state == "not setup"
+    assert fresh.coverage is None
+
+    chain.pending_timestamp += 4 * DAY
+    chain.mine()
+    states = reader.read_states([fleet[0].address], chain.blocks.head.number)
+    assert to_status("ethereum:local", states)[0].state == "due"
+    assert to_status("ethereum:local", states)[0].seconds_until_allowed == 0
+
+
+def test_underfunded(reader, lens, fleet, distributor, reward_token, diana, chain):
+    reader.lens_address = lens.address
+    states = reader.read_states([c.address for c in fleet], chain.blocks.head.number)
+    for state in states:
+        state.distributor_reward_balance = 10**18
+
+    running = to_status("ethereum:local", states)[0]
+    assert running.coverage == 0.2
+    assert running.state == "underfunded"
+
+
+def test_format_and_json(reader, lens, fleet, chain):
+    reader.lens_address = lens.address
+    rows = to_status("ethereum:local", reader.read_states([c.address for c in fleet], chain.blocks.head.number))
+
+    table = format_status(rows).splitlines()
+    assert table[0].split()[:4] == ["chain", "campaign", "gauge", "state"]
+    assert len(table) == 4
+
+    decoded = json.loads(status_json(rows))
+    assert decoded[0]["campaign"] == fleet[0].address
+    # above 2**53, kept exact as string
+    assert decoded[0]["remaining_amount"] == str(5 * 10**18)
+
+
+def test_load_fleet(tmp_path, monkeypatch, distributor, campaigns):
+    deployments = tmp_path / "deployments.yaml"
+    deployments.write_text(f"ethereum:local:\n  campaign-1:\n    Distributor:\n      address: {distributor.address}\n")
+    monkeypatch.setenv("CAMPAIGN_CONTRACT_LIST_TAIKO_MAINNET", f"{campaigns[0].address},{campaigns[1].address}")
+    monkeypatch.setenv("CAMPAIGN_LENS_TAIKO_MAINNET", campaigns[2].address)
+    monkeypatch.delenv("CAMPAIGN_CONTRACT_LIST", raising=False)
+
+    taiko, local = load_fleet(str(deployments), ["taiko:mainnet:node"])
+
+    assert taiko.chain == "taiko:mainnet"
+    assert taiko.provider_choice == "taiko:mainnet:node"
+    assert taiko.campaigns == [campaigns[0].address, campaigns[1].address]
+    assert taiko.lens_address == campaigns[2].address
+
+    assert local.chain == "ethereum:local"
+    assert local.provider_choice == "ethereum:local"
+    assert local.distributors == [distributor.address]
+    assert local.lens_address is None
+
+
+def test_load_fleet_fork_chains(monkeypatch, campaigns):
+    for key in list(os.environ):
+        if key.startswith("CAMPAIGN_CONTRACT_LIST"):
+            monkeypatch.delenv(key)
+    # "-" and ":" both become "_", the chain is looked up in the known networks
+    monkeypatch.setenv("CAMPAIGN_CONTRACT_LIST_ARBITRUM_MAINNET_FORK", campaigns[0].address)
+    monkeypatch.setenv("CAMPAIGN_CONTRACT_LIST_ETHEREUM_MAINNET", campaigns[1].address)
+
+    fork, mainnet = load_fleet(None)
+
+    assert fork.chain == "arbitrum:mainnet-fork"
+    assert fork.campaigns == [campaigns[0].address]
+    assert mainnet.chain == "ethereum:mainnet"
+
+
+def test_load_fleet_unknown_chain(monkeypatch, campaigns):
+    monkeypatch.setenv("CAMPAIGN_CONTRACT_LIST_NOT_A_CHAIN", campaigns[0].address)
+
+    with pytest.raises(AssertionError, match="CAMPAIGN_CONTRACT_LIST_NOT_A_CHAIN does not name a known chain"):
+        load_fleet(None)
+
+
+def test_status_without_numpy():
+    # numpy is only needed by the simulator
+    code = "import sys; sys.modules['numpy'] = None; import scripts._status"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0